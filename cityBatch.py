@@ -0,0 +1,271 @@
+import argparse
+import colorsys
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+# The modules of the city generator import each other by name, as in the maya scripts folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cityGenerator"))
+import cityPlan
+
+'''
+List of procedures in the module:
+    def main(argv = None):
+        Generates a range of cities from the command line.
+    def parseArguments(argv):
+        Reads the arguments of the command line.
+    def defaultEnvironment(daytime):
+        Gives the environment colour the user interface starts with.
+    def startWorker(format_):
+        Prepares a worker process for generating cities.
+    def generateCity(task):
+        Generates one city and writes it to a file.
+    def report(results, seconds):
+        Describes the throughput of a batch of cities.
+'''
+
+# The formats the cities can be written in. The maya scenes are built by
+# cityGenerator.city(...) in maya.standalone, so the script has to be run with mayapy
+# for them, while glTF and USD are written from the plan in plain Python.
+MAYA_FORMATS = {"mb": "mayaBinary", "ma": "mayaAscii"}
+FORMATS = ["mb", "ma", "glb", "usda"]
+
+def main(argv = None):
+    '''
+    Generates a range of cities from the command line.
+
+    argv: List with the arguments, or None to use sys.argv.
+    On exit: A city has been generated for every seed in the range and written to
+             the output directory, by a pool of worker processes unless only one
+             process is asked for. A line has been printed for every city as it was
+             finished, and the throughput of the batch has been printed at the end.
+             0 is returned if all the cities were written, otherwise 1.
+    '''
+    options = parseArguments(argv)
+    if not os.path.isdir(options["output"]):
+        os.makedirs(options["output"])
+    tasks = [(options, seed) for seed in range(options["seeds"][0], options["seeds"][1])]
+    start = time.time()
+    pool = None
+    if options["processes"] > 1:
+        pool = multiprocessing.Pool(options["processes"], startWorker, (options["format"],))
+        results = pool.imap_unordered(generateCity, tasks)
+    else:
+        startWorker(options["format"])
+        results = (generateCity(task) for task in tasks)
+    finished = []
+    try:
+        for result in results:
+            seed, path, seconds, size, error = result
+            if error == None:
+                print("seed %d: %s, %d bytes in %.2f s" % (seed, path, size, seconds))
+            else:
+                print("seed %d failed after %.2f s:\n%s" % (seed, seconds, error))
+            sys.stdout.flush()
+            finished.append(result)
+    finally:
+        if pool != None:
+            pool.close()
+            pool.join()
+    print(report(finished, time.time() - start))
+    if len([result for result in finished if result[4] != None]) > 0:
+        return 1
+    return 0
+
+def parseArguments(argv):
+    '''
+    Reads the arguments of the command line.
+
+    argv: List with the arguments, or None to use sys.argv.
+    On exit: A dictionary is returned with the arguments of cityGenerator.city(...)
+             under their names there, the range of "seeds" as a pair of the first
+             seed and the seed after the last, the "output" directory, the "format"
+             of the files and the number of worker "processes". The defaults are
+             those of the user interface, see cityGui.py. The script exits with a
+             message if the arguments are wrong or maya is needed but missing.
+    '''
+    parser = argparse.ArgumentParser(description = "Generates cities without the user interface, one for every seed.")
+    parser.add_argument("first", type = int, help = "the first seed")
+    parser.add_argument("last", type = int, help = "the last seed")
+    parser.add_argument("output", help = "the directory the cities are written to")
+    parser.add_argument("--format", choices = FORMATS, default = "mb",
+                        help = "mb and ma need mayapy, glb and usda plain Python (default mb)")
+    parser.add_argument("--processes", type = int, default = multiprocessing.cpu_count(),
+                        help = "the number of cities generated at the same time (default: all cores)")
+    parser.add_argument("--name", default = "Helsinki", help = "the name of the cities, followed by the seed")
+    parser.add_argument("--size", type = int, nargs = 2, default = (100, 100), metavar = ("WIDTH", "DEPTH"))
+    parser.add_argument("--height", type = int, nargs = 2, default = (4, 30), metavar = ("MIN", "MAX"),
+                        help = "the range of the house heights")
+    parser.add_argument("--width", type = int, nargs = 2, default = (5, 20), metavar = ("MIN", "MAX"),
+                        help = "the range of the house widths")
+    parser.add_argument("--no-windows", dest = "windows", action = "store_false")
+    parser.add_argument("--booleans", action = "store_true")
+    parser.add_argument("--no-deformers", dest = "deformers", action = "store_false")
+    parser.add_argument("--recessed", action = "store_true")
+    parser.add_argument("--night", dest = "daytime", action = "store_false")
+    parser.add_argument("--glow", action = "store_true", help = "all windows glow at night")
+    parser.add_argument("--environment", type = float, nargs = 3, default = None, metavar = ("R", "G", "B"),
+                        help = "the environment colour (default: the sky of the user interface)")
+    parser.add_argument("--colours", type = float, nargs = 6, default = (0, 1, 1, 0, 1, 1),
+                        metavar = ("H1", "S1", "V1", "H2", "S2", "V2"),
+                        help = "the hsv range of the house colours, with the hue in degrees")
+    parser.add_argument("--streaming", action = "store_true")
+    parser.add_argument("--bake-deformers", dest = "bakeDeformers", action = "store_true")
+    parser.add_argument("--instancing", action = "store_true")
+    parser.add_argument("--instance-tolerance", dest = "instanceTolerance", type = float, default = 0.0)
+    parser.add_argument("--cache-size", dest = "cacheSize", type = int, default = 200)
+    parser.add_argument("--plan-cache", dest = "planCache", default = None)
+    parser.add_argument("--block-streams", dest = "blockStreams", action = "store_true")
+    parser.add_argument("--lod-distances", dest = "lodDistances", type = float, nargs = 2, default = None,
+                        metavar = ("NEAR", "FAR"))
+    parser.add_argument("--culling", action = "store_true")
+    parser.add_argument("--cull-margin", dest = "cullMargin", type = float, default = 10.0)
+    parser.add_argument("--tree-spacing", dest = "treeSpacing", type = float, default = None,
+                        help = "fill the parks with trees at least this far apart")
+    parser.add_argument("--tree-variants", dest = "treeVariants", type = int, default = 0,
+                        help = "instance the trees from this many prebuilt variants")
+    arguments = parser.parse_args(argv)
+    if arguments.last < arguments.first:
+        parser.error("the last seed is smaller than the first")
+    if arguments.processes < 1:
+        parser.error("at least one process is needed")
+    if arguments.format in MAYA_FORMATS:
+        try:
+            import maya.standalone
+        except ImportError:
+            parser.error("the %s format needs maya, run the script with mayapy" % arguments.format)
+    options = vars(arguments)
+    options["seeds"] = (options.pop("first"), options.pop("last") + 1)
+    options["size"] = tuple(options["size"])
+    options["houseHeightInt"] = tuple(options.pop("height"))
+    options["houseWidthInt"] = tuple(options.pop("width"))
+    colours = options.pop("colours")
+    options["colourRange"] = (tuple(colours[:3]), tuple(colours[3:]))
+    if options["environment"] == None:
+        options["environment"] = defaultEnvironment(options["daytime"])
+    if not options["windows"]:
+        options["booleans"] = False
+        options["recessed"] = False
+    if options["recessed"]:
+        options["booleans"] = False
+    return options
+
+def defaultEnvironment(daytime):
+    '''
+    Gives the environment colour the user interface starts with.
+
+    daytime: Boolean variable which is true if it is day and false if it is night.
+    On exit: A triple with the rgb value of the environment colour of the user
+             interface for the time of day is returned.
+    '''
+    value = 1
+    if not daytime:
+        value = 0.054
+    return colorsys.hsv_to_rgb(204 / 360.0, 0.451, value)
+
+def startWorker(format_):
+    '''
+    Prepares a worker process for generating cities.
+
+    format_: The format the cities are written in.
+    On exit: For the maya formats, maya has been started without a user interface.
+             Every worker process runs its own maya, so the pool needs as many
+             licenses as it has processes.
+    '''
+    if format_ in MAYA_FORMATS:
+        import maya.standalone
+        maya.standalone.initialize(name = "python")
+
+def generateCity(task):
+    '''
+    Generates one city and writes it to a file.
+
+    task: Pair with the dictionary made by parseArguments(...) and the seed.
+    On exit: The city of the seed has been generated and written to the output
+             directory, in a file named after the city and the seed. For the maya
+             formats the scene has been cleared, the city has been generated with
+             cityGenerator.city(...) and the scene has been saved, for glTF and USD
+             the city has been planned and written by gltfExport.exportGlb(...) or
+             usdExport.exportUsda(...). The blocks are never planned in processes of
+             their own, since the worker processes can not start any. A tuple is
+             returned with the seed, the path, the time it took in seconds, the
+             number of bytes written and None, or with the traceback as the last
+             element if the city could not be generated.
+    '''
+    options, seed = task
+    name_ = "%s%d" % (options["name"], seed)
+    path = os.path.join(options["output"], "%s.%s" % (name_, options["format"]))
+    start = time.time()
+    try:
+        if options["format"] in MAYA_FORMATS:
+            import maya.cmds as cmds
+            import cityGenerator
+            cmds.file(new = True, force = True)
+            cityGenerator.builtCities.clear()
+            cityGenerator.city(name_, options["size"], options["houseHeightInt"], options["houseWidthInt"],
+                               options["windows"], options["booleans"], options["deformers"], options["daytime"],
+                               options["glow"], options["environment"], options["colourRange"],
+                               streaming = options["streaming"], recessed = options["recessed"],
+                               bakeDeformers = options["bakeDeformers"], instancing = options["instancing"],
+                               instanceTolerance = options["instanceTolerance"], cacheSize = options["cacheSize"],
+                               seed = seed, planCache = options["planCache"], blockStreams = options["blockStreams"],
+                               lodDistances = options["lodDistances"], culling = options["culling"],
+                               cullMargin = options["cullMargin"], treeSpacing = options["treeSpacing"],
+                               treeVariants = options["treeVariants"])
+            cmds.file(rename = path)
+            cmds.file(save = True, type = MAYA_FORMATS[options["format"]], force = True)
+            paths = [path]
+        else:
+            params = cityPlan.cityParams(options["size"], options["houseHeightInt"], options["houseWidthInt"],
+                                         options["windows"], options["booleans"], options["deformers"],
+                                         options["daytime"], options["glow"], options["colourRange"],
+                                         options["streaming"], options["recessed"], options["blockStreams"],
+                                         options["treeSpacing"])
+            plan = None
+            if options["planCache"] != None:
+                plan = cityPlan.cachedPlan(options["planCache"], params, seed)
+            cached = plan != None
+            if not cached:
+                plan = cityPlan.startPlan(params, seed)
+            if options["format"] == "glb":
+                import gltfExport
+                gltfExport.exportGlb(plan, path, options["environment"])
+                paths = [path]
+            else:
+                import usdExport
+                paths = usdExport.exportUsda(plan, path, options["environment"])
+            if not cached and options["planCache"] != None:
+                cityPlan.storePlan(options["planCache"], plan)
+        size = sum([os.path.getsize(p) for p in paths])
+    except Exception:
+        return (seed, path, time.time() - start, 0, traceback.format_exc())
+    return (seed, path, time.time() - start, size, None)
+
+def report(results, seconds):
+    '''
+    Describes the throughput of a batch of cities.
+
+    results: List with the tuples returned by generateCity(...).
+    seconds: The time the whole batch took.
+    On exit: A string is returned with the number of cities written and failed,
+             the total time, the cities per hour, the shortest, mean and longest
+             time of a city, the amount of data written and how many times faster
+             the batch was than generating the cities one after another.
+    '''
+    written = [result for result in results if result[4] == None]
+    lines = ["%d cities written, %d failed in %.1f s" % (len(written), len(results) - len(written), seconds)]
+    if len(written) > 0 and seconds > 0:
+        times = [result[2] for result in written]
+        total = sum([result[2] for result in results])
+        lines.append("%.1f cities per hour" % (len(written) * 3600.0 / seconds))
+        lines.append("%.2f / %.2f / %.2f s per city (shortest / mean / longest)"
+                     % (min(times), sum(times) / len(times), max(times)))
+        lines.append("%.1f MB written, %.2f MB/s" % (sum([result[3] for result in written]) / 1e6,
+                                                     sum([result[3] for result in written]) / 1e6 / seconds))
+        lines.append("%.2f times faster than one city at a time" % (total / seconds))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    sys.exit(main())
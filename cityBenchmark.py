@@ -0,0 +1,272 @@
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+
+# Importing cityBatch also puts the folder of the city generator on the path.
+import cityBatch
+
+'''
+List of procedures in the module:
+    def main(argv = None):
+        Runs the benchmarks and compares them with a baseline.
+    def parseArguments(argv):
+        Reads the arguments of the command line.
+    def configurations(sizes):
+        Lists the configurations the city generator is benchmarked with.
+    def runCity(task):
+        Generates one city with the fake maya and measures it.
+    def benchmark(configuration, seed, repeat, pool):
+        Measures the generation of a city with a configuration.
+    def compare(results, baseline, thresholds):
+        Finds the metrics that have regressed compared with a baseline.
+    def formatRow(name_, result):
+        Formats the metrics of a configuration as a line of the table.
+'''
+
+# The cities are generated with the fake maya of fakeMaya.py, which counts the
+# commands and the polygons, in a new process for every run so that the peak memory
+# of the process belongs to that run. The wall time is the time of the fake maya and
+# the generator, without the time maya would spend on the commands, which the cost
+# model of fakeMaya estimates instead.
+
+# The sizes of the cities, in scene units.
+SIZES = (50, 100, 200, 500, 1000, 2000)
+
+# The size the features are varied at.
+FEATURE_SIZE = 100
+
+# The metrics that are compared with the baseline, with the increase, as a fraction
+# of the baseline value, that counts as a regression. The counts do not change
+# between runs, so a small increase means that the generator does more work, while
+# the wall time and memory vary from run to run.
+THRESHOLDS = {"seconds": 0.25, "peakMemory": 0.15, "commandCount": 0.02, "cost": 0.02,
+              "nodes": 0.02, "polygons": 0.02}
+
+# The wall time is only compared for configurations that took at least this many
+# seconds in the baseline, since shorter runs vary too much from run to run.
+MIN_SECONDS = 1.0
+
+def main(argv = None):
+    '''
+    Runs the benchmarks and compares them with a baseline.
+
+    argv: List with the arguments, or None to use sys.argv.
+    On exit: Every configuration has been benchmarked, a table with the results has
+             been printed and the results have been written to the output file as
+             JSON. If a baseline was given, the metrics that regressed beyond their
+             thresholds have been printed with the commands whose counts grew most,
+             and 1 is returned if there were any, otherwise 0.
+    '''
+    options = parseArguments(argv)
+    baseline = None
+    if options.baseline != None:
+        baseline = json.load(open(options.baseline))
+    thresholds = dict(THRESHOLDS)
+    for threshold in options.threshold:
+        metric, fraction = threshold.split("=")
+        thresholds[metric] = float(fraction)
+    results = {"seed": options.seed, "repeat": options.repeat, "configurations": {}}
+    pool = multiprocessing.Pool(1, maxtasksperchild = 1)
+    try:
+        print("%-40s %9s %9s %11s %8s %10s %9s" % ("configuration", "seconds", "commands", "cost (ms)", "nodes",
+                                                   "polygons", "memory"))
+        for name_, configuration in configurations(options.sizes):
+            result = benchmark(configuration, options.seed, options.repeat, pool)
+            results["configurations"][name_] = result
+            print(formatRow(name_, result))
+            sys.stdout.flush()
+    finally:
+        pool.close()
+        pool.join()
+    output = open(options.output, "w")
+    try:
+        json.dump(results, output, indent = 1, sort_keys = True)
+    finally:
+        output.close()
+    if baseline == None:
+        return 0
+    if baseline.get("seed") != options.seed:
+        print("The baseline was made with seed %s, the counts can not be compared." % baseline.get("seed"))
+        return 1
+    regressions = compare(results, baseline, thresholds)
+    for line in regressions:
+        print(line)
+    if len(regressions) > 0:
+        return 1
+    print("No regressions compared with %s." % options.baseline)
+    return 0
+
+def parseArguments(argv):
+    '''
+    Reads the arguments of the command line.
+
+    argv: List with the arguments, or None to use sys.argv.
+    On exit: An argparse.Namespace with the output file, the baseline file or None,
+             the sizes, the seed, the number of runs of every configuration and the
+             list of thresholds given as METRIC=FRACTION is returned.
+    '''
+    parser = argparse.ArgumentParser(description = "Benchmarks the city generator with the fake maya.")
+    parser.add_argument("output", help = "the JSON file the results are written to")
+    parser.add_argument("--baseline", default = None,
+                        help = "a JSON file written earlier, to fail on regressions compared with it")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = list(SIZES),
+                        help = "the city sizes of the size sweep (default: %s)" % " ".join([str(s) for s in SIZES]))
+    parser.add_argument("--seed", type = int, default = 1)
+    parser.add_argument("--repeat", type = int, default = 3,
+                        help = "the number of runs of every configuration, of which the fastest counts")
+    parser.add_argument("--threshold", action = "append", default = [], metavar = "METRIC=FRACTION",
+                        help = "changes the threshold of a metric, one of %s" % ", ".join(sorted(THRESHOLDS)))
+    options = parser.parse_args(argv)
+    for threshold in options.threshold:
+        if not "=" in threshold or not threshold.split("=")[0] in THRESHOLDS:
+            parser.error("the threshold %s is not METRIC=FRACTION for a known metric" % threshold)
+    if options.repeat < 1:
+        parser.error("every configuration needs at least one run")
+    return options
+
+def configurations(sizes):
+    '''
+    Lists the configurations the city generator is benchmarked with.
+
+    sizes: List with the city sizes of the size sweep.
+    On exit: A list is returned with pairs of a name and a dictionary with the size,
+             windows, booleans, deformers and daytime arguments of
+             cityGenerator.city(...). The first configurations sweep the sizes with
+             windows, deformers and daylight, as in the user interface, and the rest
+             try every combination of the features at FEATURE_SIZE. Booleans are
+             only tried with windows.
+    '''
+    result = []
+    for size in sizes:
+        result.append({"size": size, "windows": True, "booleans": False, "deformers": True, "daytime": True})
+    for windows, booleans in ((False, False), (True, False), (True, True)):
+        for deformers in (True, False):
+            for daytime in (True, False):
+                configuration = {"size": FEATURE_SIZE, "windows": windows, "booleans": booleans,
+                                 "deformers": deformers, "daytime": daytime}
+                if not configuration in result:
+                    result.append(configuration)
+    names = []
+    for configuration in result:
+        features = [feature for feature in ("windows", "booleans", "deformers") if configuration[feature]]
+        features.append(("night", "day")[configuration["daytime"]])
+        names.append(("size%d-" % configuration["size"]) + "-".join(features))
+    return list(zip(names, result))
+
+def runCity(task):
+    '''
+    Generates one city with the fake maya and measures it.
+
+    task: Pair with a configuration made by configurations(...) and the seed.
+    On exit: The fake maya has been installed without keeping the calls and the
+             city has been generated with the colours and environment of the user
+             interface. A dictionary is returned with the wall time in seconds, the
+             number of commands, the number of every command, the cost of the
+             commands in milliseconds, the number of nodes, the number of polygons
+             shown, counting every instance of a shape, and the peak resident
+             memory of the process in bytes, or None where that can not be measured.
+             Meant to run in a process of its own.
+    '''
+    configuration, seed = task
+    environment = cityBatch.defaultEnvironment(configuration["daytime"])
+    import fakeMaya
+    scene = fakeMaya.install(keepCalls = False)
+    import cityGenerator
+    start = time.time()
+    cityGenerator.city("Benchmark", (configuration["size"], configuration["size"]), (4, 30), (5, 20),
+                       configuration["windows"], configuration["booleans"], configuration["deformers"],
+                       configuration["daytime"], False, environment, ((0, 1, 1), (0, 1, 1)), seed = seed)
+    seconds = time.time() - start
+    peakMemory = None
+    try:
+        import resource
+        peakMemory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            # Linux gives kilobytes, macOS bytes.
+            peakMemory = peakMemory * 1024
+    except ImportError:
+        pass
+    commands = dict([(name_, sums[0]) for name_, sums in scene.summary("command").items()])
+    polygons = sum([node.faces * len(node.parents) for node in scene.nodes.values() if node.type == "mesh"])
+    return {"seconds": seconds, "commandCount": scene.callCount, "commands": commands, "cost": scene.cost,
+            "nodes": len(scene.nodes), "polygons": polygons, "peakMemory": peakMemory}
+
+def benchmark(configuration, seed, repeat, pool):
+    '''
+    Measures the generation of a city with a configuration.
+
+    configuration: Dictionary made by configurations(...).
+    seed: The seed of the city.
+    repeat: The number of runs.
+    pool: multiprocessing.Pool that starts a new process for every task.
+    On exit: The city has been generated repeat times by runCity(...), each time in
+             a new process. The result of the fastest run is returned with the
+             configuration added, with the highest peak memory of the runs.
+    '''
+    runs = [pool.apply(runCity, ((configuration, seed),)) for i in range(repeat)]
+    result = min(runs, key = lambda run: run["seconds"])
+    memories = [run["peakMemory"] for run in runs if run["peakMemory"] != None]
+    if len(memories) > 0:
+        result["peakMemory"] = max(memories)
+    result.update(configuration)
+    return result
+
+def compare(results, baseline, thresholds):
+    '''
+    Finds the metrics that have regressed compared with a baseline.
+
+    results: Dictionary with the results made by main(...).
+    baseline: Dictionary with results read from the baseline file.
+    thresholds: Dictionary from the metrics to the fraction they may grow by, see
+                THRESHOLDS.
+    On exit: A list is returned with a line for every metric of a configuration in
+             both results that grew by more than its threshold, followed by the
+             three commands whose counts grew most. Configurations missing from the
+             baseline are skipped, and so is the wall time of configurations that
+             took less than MIN_SECONDS in the baseline.
+    '''
+    lines = []
+    for name_ in sorted(results["configurations"]):
+        old = baseline["configurations"].get(name_)
+        if old == None:
+            continue
+        new = results["configurations"][name_]
+        regressed = False
+        for metric in sorted(thresholds):
+            if new.get(metric) == None or old.get(metric) == None or old[metric] <= 0:
+                continue
+            if metric == "seconds" and old[metric] < MIN_SECONDS:
+                continue
+            change = float(new[metric]) / old[metric] - 1
+            if change > thresholds[metric]:
+                lines.append("%s: %s regressed from %.6g to %.6g (%+.1f%%, threshold %.1f%%)"
+                             % (name_, metric, old[metric], new[metric], change * 100, thresholds[metric] * 100))
+                regressed = True
+        if regressed:
+            growth = [(new["commands"].get(c, 0) - old["commands"].get(c, 0), c)
+                      for c in set(new["commands"]) | set(old["commands"])]
+            growth = [g for g in sorted(growth, reverse = True)[:3] if g[0] > 0]
+            if len(growth) > 0:
+                lines.append("    most added commands: " + ", ".join(["%s %+d" % (c, g) for g, c in growth]))
+    return lines
+
+def formatRow(name_, result):
+    '''
+    Formats the metrics of a configuration as a line of the table.
+
+    name_: The name of the configuration.
+    result: Dictionary with the metrics, see runCity(...).
+    On exit: A string with the name, the wall time, the number of commands, the
+             cost, the number of nodes and polygons and the peak memory in megabytes
+             is returned.
+    '''
+    memory = "-"
+    if result["peakMemory"] != None:
+        memory = "%.1f MB" % (result["peakMemory"] / 1e6)
+    return "%-40s %9.2f %9d %11.1f %8d %10d %9s" % (name_, result["seconds"], result["commandCount"], result["cost"],
+                                                   result["nodes"], result["polygons"], memory)
+
+if __name__ == "__main__":
+    sys.exit(main())
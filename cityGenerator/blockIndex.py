@@ -0,0 +1,153 @@
+import math
+
+'''
+List of procedures in the module:
+    class BlockIndex:
+        A BlockIndex object is a uniform grid over the blocks of the city that
+        answers spatial queries without looking at every block.
+
+        def __init__(self, areas, cellSize = None, bounds = None):
+            Initializes a BlockIndex object and sorts the blocks into grid cells.
+        def addBlock(self, area):
+            Adds a block to the index.
+        def __len__(self):
+            Returns the number of blocks in the index.
+        def cellRange(self, minPoint, maxPoint):
+            Returns the range of grid cells covered by a rectangle.
+        def blocksInRectangle(self, minPoint, maxPoint):
+            Finds the blocks intersecting a rectangle.
+    def rectanglesIntersect(area, other):
+        Checks if two rectangles intersect.
+'''
+
+class BlockIndex:
+    '''
+    A BlockIndex object is a uniform grid over the blocks of the city. It is
+    built once per city from the list returned by StreetTree.listAreas() and
+    every block is stored in all the grid cells its rectangle overlaps. Since
+    the blocks all have roughly the same size, a cell size close to the average
+    block side means that a block is stored in at most a few cells and a query
+    only has to look at the cells it covers.
+
+    Attributes:
+        areas: The list of blocks. Each element is a tuple containing two tuples
+               with the coordinates for the minimum and the maximum points of the block.
+        cellSize: The side length of a grid cell.
+        origin: Tuple with the minimum x- and z-coordinates of the grid.
+        columns: Number of grid cells along the x-axis.
+        rows: Number of grid cells along the z-axis.
+        cells: List with one list of block indices for every grid cell, stored
+               row by row.
+    '''
+    def __init__(self, areas, cellSize = None, bounds = None):
+        '''
+        Initializes a BlockIndex object and sorts the blocks into grid cells.
+
+        self: Object that is to be initialized.
+        areas: See Attributes. May be empty if the blocks are added later with
+               addBlock(...), in which case cellSize and bounds must be given.
+        cellSize: See Attributes. If None, the average side length of the blocks
+                  is used.
+        bounds: Tuple containing two tuples with the minimum and maximum coordinates
+                the grid should cover. If None, the bounding box of the blocks is used.
+        On exit: The grid has been created and every block index has been added to
+                 all the cells the block overlaps.
+        '''
+        self.areas = []
+        if bounds != None:
+            minX, minZ = bounds[0]
+            maxX, maxZ = bounds[1]
+        elif len(areas) == 0:
+            minX = minZ = maxX = maxZ = 0.0
+        else:
+            minX = min(a[0][0] for a in areas)
+            minZ = min(a[0][1] for a in areas)
+            maxX = max(a[1][0] for a in areas)
+            maxZ = max(a[1][1] for a in areas)
+        if cellSize == None:
+            sides = sum((a[1][0] - a[0][0]) + (a[1][1] - a[0][1]) for a in areas)
+            cellSize = sides / (2.0 * max(1, len(areas)))
+        self.cellSize = max(cellSize, 1e-6)
+        self.origin = (minX, minZ)
+        self.columns = max(1, int(math.ceil((maxX - minX) / self.cellSize)))
+        self.rows = max(1, int(math.ceil((maxZ - minZ) / self.cellSize)))
+        self.cells = [[] for i in range(self.columns * self.rows)]
+        for area in areas:
+            self.addBlock(area)
+
+    def addBlock(self, area):
+        '''
+        Adds a block to the index.
+
+        self: Object of the class BlockIndex.
+        area: Tuple containing two tuples with the coordinates for the minimum and
+              the maximum points of the block.
+        On exit: The block has been appended to areas and added to all the grid cells
+                 it overlaps. The index of the block is returned.
+        '''
+        i = len(self.areas)
+        self.areas.append(area)
+        columns, rows = self.cellRange(area[0], area[1])
+        for row in rows:
+            for column in columns:
+                self.cells[row * self.columns + column].append(i)
+        return i
+
+    def __len__(self):
+        '''
+        Returns the number of blocks in the index.
+        '''
+        return len(self.areas)
+
+    def cellRange(self, minPoint, maxPoint):
+        '''
+        Returns the range of grid cells covered by a rectangle.
+
+        self: Object of the class BlockIndex.
+        minPoint: Tuple containing the minimum x- and z-coordinates of the rectangle.
+        maxPoint: Tuple containing the maximum x- and z-coordinates of the rectangle.
+        On exit: A tuple with the range of columns and the range of rows covered by
+                 the rectangle is returned. The ranges are clamped to the grid.
+        '''
+        column0 = int(math.floor((minPoint[0] - self.origin[0]) / self.cellSize))
+        column1 = int(math.floor((maxPoint[0] - self.origin[0]) / self.cellSize))
+        row0 = int(math.floor((minPoint[1] - self.origin[1]) / self.cellSize))
+        row1 = int(math.floor((maxPoint[1] - self.origin[1]) / self.cellSize))
+        column0 = min(max(column0, 0), self.columns - 1)
+        column1 = min(max(column1, 0), self.columns - 1)
+        row0 = min(max(row0, 0), self.rows - 1)
+        row1 = min(max(row1, 0), self.rows - 1)
+        return (range(column0, column1 + 1), range(row0, row1 + 1))
+
+    def blocksInRectangle(self, minPoint, maxPoint):
+        '''
+        Finds the blocks intersecting a rectangle.
+
+        self: Object of the class BlockIndex.
+        minPoint: Tuple containing the minimum x- and z-coordinates of the rectangle.
+        maxPoint: Tuple containing the maximum x- and z-coordinates of the rectangle.
+        On exit: A sorted list with the indices of all blocks that intersect or touch
+                 the rectangle is returned.
+        '''
+        found = set()
+        columns, rows = self.cellRange(minPoint, maxPoint)
+        for row in rows:
+            for column in columns:
+                for i in self.cells[row * self.columns + column]:
+                    if i in found:
+                        continue
+                    if rectanglesIntersect(self.areas[i], (minPoint, maxPoint)):
+                        found.add(i)
+        return sorted(found)
+
+def rectanglesIntersect(area, other):
+    '''
+    Checks if two rectangles intersect.
+
+    area: Tuple containing two tuples with the coordinates for the minimum and
+          the maximum points of the first rectangle.
+    other: The second rectangle, in the same way.
+    On exit: True is returned if the rectangles intersect or touch, otherwise False.
+    '''
+    return (area[0][0] <= other[1][0] and area[1][0] >= other[0][0] and
+            area[0][1] <= other[1][1] and area[1][1] >= other[0][1])
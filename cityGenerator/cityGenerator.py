@@ -1,9 +1,17 @@
 import maya.cmds as cmds
-import random, math
-import streets
+import sys
 import trafficLight
 import park
 import tools
+import blockIndex
+import mesh
+import deform
+import houseCache
+import cityPlan
+import lod
+import frustum
+import cityScene
+import profiler
 
 '''
 List of procedures in the module:
@@ -11,58 +19,92 @@ List of procedures in the module:
         A House object represents a house in the city.
         def __init__(self, name_, type, height, width, depth):
             Initializes a House object with the given parameters.
-        def addDeformer(self):
+        def addDeformer(self, deformation):
             Adds one or two deformers to a house.
+        def bakeDeformer(self, deformation):
+            Deforms the mesh of a house the same way as addDeformer(...) without
+            creating any deformers.
+        def shapeKey(self, tolerance):
+            Describes the shape of the house for the house cache.
         def moveHouse(self, newCoor):
             Moves house to new Coordinates.
-        def makeWindows(self, name_, windowShaders, booleans):
-            Creates windows for a cylinder or pipe house. 
+        def commit(self, shading = None):
+            Creates the polygonal house object from the mesh description.
+        def addWindows(self, facade, booleans, recessed = False):
+            Adds the windows to the house.
     class BoxHouse(House):
         Subclass of the class House, which represents houses based on the polygon 
         primitive box.
         def __init__(self, name_, height, width, depth, shader):
-            Initializes a BoxHouse object, and creates a polygonal house object based on a
-            box primitive.
-        def makeWindows(self, name_, windowShaders, booleans):
-            Creates windows for a box house.
+            Initializes a BoxHouse object, and creates the mesh description for a house
+            based on a box.
+        def houseMesh(self, material, facade = None):
+            Creates the mesh for a box house.
     class CylinderHouse(House):
         Subclass of the class House, which represents houses based on the polygon 
         primitive cylinder.
         def __init__(self, name_, height, radius, sides, shader):
-            Initializes a CylinderHouse object, and creates a polygonal house object based on a
-            cylinder primitive.
+            Initializes a CylinderHouse object, and creates the mesh description for a house
+            based on a cylinder.
+        def houseMesh(self, material, facade = None):
+            Creates the mesh for a cylinder house.
+        def shapeKey(self, tolerance):
+            Describes the shape of the house for the house cache.
     class PipeHouse(House):
         Subclass of the class House, which represents houses based on the polygon 
         primitive pipe.
         def __init__(self, name_, height, radius, sides, thickness, shader):
-            Initializes a PipeHouse object, and creates a polygonal house object based on a
-            pipe primitive.
-        def addDeformer(self):
+            Initializes a PipeHouse object, and creates the mesh description for a house
+            based on a pipe.
+        def houseMesh(self, material, facade = None):
+            Creates the mesh for a pipe house.
+        def shapeKey(self, tolerance):
+            Describes the shape of the house for the house cache.
+        def addDeformer(self, deformation):
             Adds one or two deformers to a pipe house.
     class Block:
         A Block object repesents a block in the city.
         def __init__(self, width, depth, center):
             Initializes a Block object and creates a pavement on the block.
-    def makeWindowColumn(windowWidth, windowHeight, num, floorHeight):
-        Creates a column with the specified number of windows.
-    def assignWindowShaders(window, windowNum, shaders):
-        Assigns shaders to all the windows for a house.
-    def makeHouseShaders(num, colourRange):
+    class CityBuild:
+        A CityBuild object remembers what was built for a city, so that the city can
+        be regenerated.
+        def __init__(self, plan, environment, options, houseShaders, treeShaders, windowShaders, streetLightGeom, cache, cityBlocks, lodSettings = None, view = None, treeLibrary = None):
+            Initializes a CityBuild object for a city without blocks.
+        def updateView(self):
+            Finds the part of the ground the culling camera may see.
+        def inView(self, blockPlan):
+            Checks if the block may be seen by the culling camera.
+        def blocksInView(self):
+            Finds the blocks that may be seen by the culling camera.
+    def makeHouseShaders(colours):
         Creates a number of shaders for houses.
+    def updateHouseShaders(shaders, oldColours, colours):
+        Changes the colours of existing house shaders.
     def makeNecessaryShaders(daytime):
         Creates shaders that are needed for the city.
-    def makeWindowShaders(daytime, glow, environment):
+    def makeWindowShaders(daytime, glow, environment, incandescence):
         Creates shaders for windows.
-    def makeLights(daytime, name_):
+    def makeLights(daytime, name_, rotation):
         Creates lights for the city.
     def makeCamera(name_, environment):
         Creates a camera with the given background colour. 
-    def makeZoneHeihgts(size, houseHeightInt):
-        Creates a list of six different height ranges for the houses in the city.
-    def makeHouse(name_, heightInt, wxd, houseShaders, treeShaders, windowShaders, windows, booleans, deformer):
+    def cameraFrustum(camera, margin = 0.0):
+        Creates a Frustum object for a camera in the scene.
+    def findTreeLibrary(variants, colours):
+        Finds a tree library of an earlier city that can be reused.
+    def makeHouse(name_, plan, houseShaders, treeShaders, windowShaders, booleans, recessed = False, bakeDeformers = False, cache = None, shading = None, treeLibrary = None):
         Creates a house.
-    def city(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange):
+    def makeHouseProxy(name_, plan, houseShaders, level, shading = None):
+        Creates a simplified house for a level of detail.
+    def city(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange, streaming = False, recessed = False, bakeDeformers = False, instancing = False, instanceTolerance = 0.0, cacheSize = 200, seed = None, planCache = None, blockStreams = False, workers = 0, lodDistances = None, lodCamera = None, culling = False, cullCamera = None, cullMargin = 10.0, profile = None, treeSpacing = None, treeVariants = 0):
         Generates the city.       
+    def buildCity(name_, plan, environment, bakeDeformers = False, instancing = False, instanceTolerance = 0.0, cacheSize = 200, workers = 0, lodDistances = None, lodCamera = None, culling = False, cullCamera = None, cullMargin = 10.0, treeVariants = 0, profiler_ = None):
+        Builds a planned city in maya.
+    def buildBlock(name_, build, blockPlan, shading, seen = True):
+        Builds the house or park on a block.
+    def regenerateCity(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange, recessed = False, workers = 0):
+        Rebuilds the blocks of a city whose inputs have changed.
 '''
 
 class House:
@@ -81,6 +123,11 @@ class House:
                deformer driver name and the deformer handle transform name.
         twist: If a twist deformer has been added to the house this is a tuple containing the 
                deformer driver name and the deformer handle transform name.
+        mesh: Object of the class mesh.Mesh with the geometry of the house, which is 
+              turned into a polygonal object by commit().
+        windowMesh: If the windows are to be subtracted from the house with boolean 
+                    difference, this is an object of the class mesh.Mesh with the 
+                    windows, otherwise None.
     '''
     def __init__(self, name_, type, height, width, depth):
         '''
@@ -102,33 +149,67 @@ class House:
         self.depth = depth
         self.flare = None
         self.twist = None
+        self.mesh = None
+        self.windowMesh = None
         
-    def addDeformer(self):
+    def addDeformer(self, deformation):
         '''
         Adds one or two deformers to a house.
         
         self : Object of the class House.       
+        deformation: Tuple with the height the flare handle is moved to (None if it
+                     is not moved), the end flare, the curve of the flare and the end 
+                     angle of the twist (None if the house gets no twist), see 
+                     cityPlan.drawDeformation(...).
         On exit : A flare deformer has been added to the object house.name. 
         A twist deformer is occasionally added on top of that. 
-        Some of the deformers' attributes have been randomly set.
+        The deformers' attributes have been set from the deformation.
         '''
+        flareY, endFlare, curve, endAngle = deformation
         cmds.select(self.name)
         self.flare = cmds.nonLinear(type = "flare")
-        moveFlare = random.choice(["Yes", "No"])
-        if (moveFlare == "Yes"): 
-            cmds.xform(self.flare, translation = (0, random.uniform(self.height / 2.0, self.height + self.height / 4.0), 0))
-        endFlare = random.uniform(0.3, 1.5)
+        if (flareY != None): 
+            cmds.xform(self.flare, translation = (0, flareY, 0))
         cmds.setAttr(self.flare[0] + ".endFlareX", endFlare)
         cmds.setAttr(self.flare[0] + ".endFlareZ", endFlare)
-        cmds.setAttr(self.flare[0] + ".curve", random.uniform(-0.4, min((self.height/min(self.width, self.depth)) * 0.3, 0.9)))
+        cmds.setAttr(self.flare[0] + ".curve", curve)
         cmds.xform(self.flare, scale = (0,self.height / 2, 0))
-        twist = random.randint(0, 6)
-        if (twist == 0):
-            if not(self.type == "box" and (self.width/self.depth > 1.5 or self.depth/self.width > 1.5)):
-                cmds.select(self.name)
-                self.twist = cmds.nonLinear(type = "twist")
-                cmds.setAttr(self.twist[0] + ".endAngle", random.randint(-90, 90))
-                cmds.xform(self.twist, scale = (0,self.height / 2, 0))
+        if (endAngle != None):
+            cmds.select(self.name)
+            self.twist = cmds.nonLinear(type = "twist")
+            cmds.setAttr(self.twist[0] + ".endAngle", endAngle)
+            cmds.xform(self.twist, scale = (0,self.height / 2, 0))
+
+    def bakeDeformer(self, deformation):
+        '''
+        Deforms the mesh of a house the same way as addDeformer(...) without
+        creating any deformers.
+        
+        self: Object of the class House.
+        deformation: Tuple describing the deformers, see addDeformer(...).
+        On exit: The flare and the occasional twist have been evaluated directly on 
+                 the vertices of self.mesh (and self.windowMesh) using 
+                 deform.bakeDeformation(...). The handles are placed where
+                 addDeformer(...) places them, at the center of the house or moved
+                 along the y-axis. The attributes
+                 flare and twist remain None since no deformer nodes are created.
+        '''
+        meshes = [self.mesh]
+        if self.windowMesh != None:
+            meshes.append(self.windowMesh)
+        deform.bakeDeformation(meshes, self.height, deformation)
+
+    def shapeKey(self, tolerance):
+        '''
+        Describes the shape of the house for the house cache.
+        
+        self: Object of the class House.
+        tolerance: See the attributes of houseCache.HouseCache.
+        On exit: A tuple is returned with the type and the height, width and depth
+                 of the house rounded to the tolerance.
+        '''
+        return (self.type, houseCache.quantize(self.height, tolerance), houseCache.quantize(self.width, tolerance),
+                houseCache.quantize(self.depth, tolerance))
             
     def moveHouse(self, newCoor):
         '''
@@ -147,58 +228,57 @@ class House:
         if (self.twist != None):
             cmds.select(self.twist)
             cmds.move(newCoor[0], newCoor[1], x = True, z = True)
+
+    def commit(self, shading = None):
+        '''
+        Creates the polygonal house object from the mesh description.
         
-    def makeWindows(self, name_, windowShaders, booleans):
+        self: Object of the class House.
+        shading: Object of the class tools.ShadingBatch that collects the shader 
+                 assignments of the house, or None to assign them right away. Not
+                 used if the house has a separate window mesh.
+        On exit: A polygonal object has been created from self.mesh using 
+                 tools.commitMesh(...). If the house has a separate window mesh,
+                 it has been created as well and subtracted from the house using
+                 boolean difference. The House object's name attribute has been 
+                 updated.
+        '''
+        name_ = self.name
+        if self.windowMesh != None:
+            # The boolean operation needs the shaders to be assigned.
+            shading = None
+        self.name = tools.commitMesh(self.mesh, name_, shading)[0]
+        if self.windowMesh != None:
+            window = tools.commitMesh(self.windowMesh, "window")
+            cmds.polySubdivideFacet(window[0])
+            result = cmds.polyBoolOp(self.name, window[0], op = 2, n = name_)
+            self.name = result[0]
+            cmds.delete(self.name, ch = True)
+
+    def addWindows(self, facade, booleans, recessed = False):
         '''
-        Creates windows for a cylinder or pipe house. 
+        Adds the windows to the house.
         
         self: Object of the class House.
-        name_: A string with the name the polygonal house object will have.
-        windowShader: A list with shaders for the windows.
+        facade: Tuple with the columns, windowWidth, windowHeight, heightNum, floorHeight
+                and materials arguments of mesh.windowMesh(...).
         booleans: A boolean variable which determines whether the windows should be 
                   combined with the house using boolean difference or not. 
-        On exit: Columns of windows are created using makeWindowColumn(...) and these
-                 are then duplicated around the house. The windows are assigned shaders
-                 using assignWindowShaders(...), and are then combined with the 
-                 house. The House object's name attribute is updated.        
-        '''
-        windowHeight = random.uniform(0.5,1.9)
-        # Make sure the window height is not too close to 1.6 since the window edge
-        # in that case will be too close to a edge loop on the house and the boolean
-        # operation will fail.
-        if booleans and (windowHeight > 1.59 and windowHeight < 1.61):
-            windowHeight = random.choice([1.59, 1.61])
-        floorHeight = int(math.ceil(windowHeight))
-        heightNum = int((self.height - (1 + floorHeight/2.0))/floorHeight)
-        if heightNum == 0:
-            return
-        angleR = 2.0 * math.pi / self.sides
-        angleD = math.degrees(angleR)
-        distance = math.cos(angleR / 2.0) * self.radius
-        sideWidth = 2.0 * self.radius * math.sin(angleR / 2.0)
-        windowWidth = random.uniform((sideWidth -0.2)/ 2.0, sideWidth - 0.2)
-        if windowWidth <= 0.1:
-            return
-        windowColumn = makeWindowColumn(windowWidth, windowHeight, heightNum, floorHeight)
-        cmds.rotate(90 - angleD / 2.0, windowColumn[0], y = True)
-        for j in range(self.sides): # Copy the column faces around the house. 
-            cmds.polyChipOff(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]", dup = True, kft = True, 
-                             translate = (math.sin(math.pi/2.0 - angleR/2.0 + angleR * j) * distance,0,math.cos(math.pi/2.0 - angleR/2.0 + angleR * j) *  distance))
-            cmds.select(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]")
-            cmds.rotate(angleD, y = True)
-            cmds.delete(all = True, ch = True)
-            cmds.refresh()
-        cmds.delete(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]")
-        windowNum = self.sides * heightNum
-        assignWindowShaders(windowColumn, windowNum, windowShaders)
-        cmds.select(windowColumn[0] + ".f[0:" + str(windowNum * 6 - 1) +"]")
-        cmds.polySubdivideFacet()
-        if booleans == True:
-            result = cmds.polyBoolOp(self.name,windowColumn[0], op = 2, n = name_)
+        recessed: A boolean variable which determines whether the windows should be 
+                  cut into the walls of the house directly. Overrides booleans.
+        On exit: If recessed is true self.mesh has been recreated by houseMesh(...) with 
+                 the windows recessed into the walls. Otherwise, if booleans is false 
+                 the window mesh has been appended to self.mesh so that the house and
+                 the windows become one object, and if booleans is true it has been 
+                 stored in self.windowMesh.
+        '''
+        if recessed:
+            # The house shader is always the first material of the house mesh.
+            self.mesh = self.houseMesh(self.mesh.materials[0], facade)
+        elif booleans:
+            self.windowMesh = mesh.windowMesh(*facade)
         else:
-            result = cmds.polyUnite(self.name,windowColumn[0], n = name_)
-        self.name = result[0]
-        cmds.delete(all = True, ch = True)
+            self.mesh.append(mesh.windowMesh(*facade))
         
 class BoxHouse(House):
     '''
@@ -210,8 +290,8 @@ class BoxHouse(House):
     '''
     def __init__(self, name_, height, width, depth, shader):
         '''
-        Initializes a BoxHouse object, and creates a polygonal house object based on a
-        box primitive.
+        Initializes a BoxHouse object, and creates the mesh description for a house
+        based on a box.
         
         self: Object that is to be initialized.
         name_: name_: A string with the name the polygonal house object will have.
@@ -219,94 +299,26 @@ class BoxHouse(House):
         width: The width of the house.
         depth: The depth of the house.
         shader: Shader that will be assigned to the house. 
-        On exit: A BoxHouse object has been initialized and a polygonal house has 
-                 been created out of a box primitive. A foundation for the house has
-                 also been created and united with the box. The given shader has been 
-                 assigned to the house. 
+        On exit: A BoxHouse object has been initialized and the mesh for a box house
+                 with a foundation has been created using mesh.boxHouseMesh(...). The 
+                 given shader has been assigned to all faces. The polygonal object is 
+                 created later by commit().
         '''
         House.__init__(self, name_, "box", height, width, depth)
-        n = cmds.polyCube(n = "house_", w = width, h = height, d = depth, sy = height)
-        cmds.xform(n[0], translation = (0, height/2.0, 0))
-        f = cmds.polyCube(n = "foundation", w = width + 0.3, h = 0.8, d = depth + 0.3)
-        cmds.xform(f[0], translation = (0,0.4,0))
-        n = cmds.polyUnite(n[0],f[0], n = name_)
-        self.name = n[0]
-        cmds.sets(n[0], edit=True, forceElement= shader[1])
-        cmds.delete(self.name, ch = True)
-  
-    def makeWindows(self, name_, windowShaders, booleans):
+        self.mesh = self.houseMesh(shader[1])
+
+    def houseMesh(self, material, facade = None):
         '''
-        Creates windows for a box house. 
+        Creates the mesh for a box house.
         
         self: Object of the class BoxHouse.
-        name_: A string with the name the house will have.
-        windowShader: A list with shaders for the windows.
-        booleans: A boolean variable which determines whether the windows should be 
-                  combined with the house using boolean difference or not. 
-        On exit: Columns of windows are created using makeWindowColumn(...) and these
-                 are then duplicated around the house. The windows are assigned shaders
-                 using assignWindowShaders(...), and are then combined with the 
-                 house. The House object's name attribute is updated.        
-        '''
-        windowHeight = random.uniform(0.5,1.9)
-        # Make sure the window height is not too close to 1.6 since the window edge
-        # in that case will be too close to a edge loop on the house and the boolean
-        # operation will fail.
-        if booleans and (windowHeight > 1.59 and windowHeight < 1.61):
-            windowHeight = random.choice([1.59, 1.61])
-        windowWidth = random.uniform(1, 3)
-        floorHeight = int(math.ceil(windowHeight))
-        heightNum = max(0,int((self.height - (1 + floorHeight/2.0))/floorHeight))
-        if heightNum == 0:
-            return
-        widthNum = max(0,int((self.width - 0.3) / (windowWidth)))
-        if (widthNum != 0):
-            # Makes it possible for houses to have less windows or no windows on a side.
-            widthNum = widthNum - random.randint(0, min(2, widthNum)) 
-        # Space between window columns along the width of the house.
-        widthSpace = (self.width - (widthNum * windowWidth)) /(widthNum + 1) 
-        depthNum = max(0,int((self.depth - 0.3)/ windowWidth))
-        if (depthNum != 0):
-            # Makes it possible for houses to have less windows or no windows on a side.
-            depthNum = depthNum - random.randint(0, min(2, depthNum))
-        if (depthNum == 0) and (widthNum == 0):
-            return
-        # Space between window columns along the width of the house.
-        depthSpace = (self.depth - (depthNum * windowWidth)) / (depthNum + 1)
-        windowColumn = makeWindowColumn(windowWidth,windowHeight, heightNum, floorHeight)
-        for j in range(widthNum):
-            # Duplicates all the faces of the first window column and translates the duplicates along the width.
-            cmds.polyChipOff(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]", dup = True, kft = True, 
-                             translate = (-self.width/2.0 + windowWidth/2.0 + widthSpace + (windowWidth + widthSpace) * j,
-                             0, self.depth/2.0))
-            cmds.polyChipOff(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]", dup = True, kft = True, 
-                             translate =  (-self.width/2.0 + windowWidth/2.0 + widthSpace + (windowWidth + widthSpace) * j, 
-                             0, -self.depth/2.0))       
-            cmds.delete(all = True, ch = True)   
-            cmds.refresh()
-        cmds.select(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]")
-        cmds.rotate(90, y = True)
-        for j in range(depthNum):
-            # Duplicates all the faces of the first window column and translates the duplicates along the depth.
-            cmds.polyChipOff(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]", dup = True, kft = True,
-                             translate = (self.width/2.0, 0, -self.depth/2.0 + windowWidth/2.0 + depthSpace + (windowWidth + depthSpace) * j), ws = True)
-            cmds.polyChipOff(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]", dup = True, kft = True,
-                             translate = (-self.width/2.0, 0, -self.depth/2.0 + windowWidth/2.0 + depthSpace + (windowWidth + depthSpace) * j), ws = True)
-            cmds.delete(all = True, ch = True)
-            cmds.refresh()
-        cmds.select(windowColumn[0] + ".f[0:" + str((heightNum * 6) - 1) + "]")
-        cmds.delete()
-        windowNum = widthNum * heightNum * 2 + depthNum * heightNum * 2 # Total number of windows.
-        assignWindowShaders(windowColumn, windowNum, windowShaders)
-        cmds.select(windowColumn[0] + ".f[0:" + str(windowNum * 6 - 1) +"]")
-        cmds.polySubdivideFacet()
-        if booleans:
-            result = cmds.polyBoolOp(self.name,windowColumn[0], op = 2, n = name_)
-        else:
-            result = cmds.polyUnite(self.name,windowColumn[0], n = name_)
-        self.name = result[0]
-        cmds.delete(self.name, ch = True) 
-        
+        material: Name of the shading group for the house.
+        facade: If not None, the windows that are recessed into the walls, see 
+                mesh.addFacade(...).
+        On exit: The mesh created by mesh.boxHouseMesh(...) is returned.
+        '''
+        return mesh.boxHouseMesh(self.height, self.width, self.depth, material, facade)
+  
 class CylinderHouse(House):
     '''
     Subclass of the class House, which represents houses based on the polygon 
@@ -330,22 +342,38 @@ class CylinderHouse(House):
         radius: See Attributes.
         sides: See Attributes.
         shader: Shader that will be assigned to the house. 
-        On exit: A CylinderHouse object has been initialized and a polygonal house has 
-                 been created out of a cylinder primitive. A foundation for the house has
-                 also been created and united with the box. The given shader has been 
-                 assigned to the house. 
+        On exit: A CylinderHouse object has been initialized and the mesh for a cylinder
+                 house with a foundation has been created using mesh.cylinderHouseMesh(...).
+                 The given shader has been assigned to all faces. The polygonal object is 
+                 created later by commit().
         '''
         House.__init__(self, name_, "cylinder", height, radius * 2, radius * 2)
         self.radius = radius
         self.sides = sides
-        n = cmds.polyCylinder(n = name_, r = radius, h = height, sx = sides, sy = height)
-        cmds.xform(n[0], translation = (0,height/2.0,0))
-        f = cmds.polyCylinder(n = "foundation", r = radius + 0.15, height = 0.8, sx = sides)
-        cmds.xform(f[0], translation = (0, 0.4, 0))
-        n = cmds.polyUnite(n[0],f[0], n = name_)
-        self.name = n[0]
-        cmds.sets(n[0], edit=True, forceElement= shader[1])
-        cmds.delete(self.name, ch = True)
+        self.mesh = self.houseMesh(shader[1])
+
+    def houseMesh(self, material, facade = None):
+        '''
+        Creates the mesh for a cylinder house.
+        
+        self: Object of the class CylinderHouse.
+        material: Name of the shading group for the house.
+        facade: If not None, the windows that are recessed into the walls, see 
+                mesh.addFacade(...).
+        On exit: The mesh created by mesh.cylinderHouseMesh(...) is returned.
+        '''
+        return mesh.cylinderHouseMesh(self.height, self.radius, self.sides, material, facade)
+
+    def shapeKey(self, tolerance):
+        '''
+        Describes the shape of the house for the house cache.
+        
+        self: Object of the class CylinderHouse.
+        tolerance: See the attributes of houseCache.HouseCache.
+        On exit: A tuple is returned with the type, the height and the radius rounded
+                 to the tolerance and the number of sides of the house.
+        '''
+        return (self.type, houseCache.quantize(self.height, tolerance), houseCache.quantize(self.radius, tolerance), self.sides)
         
 class PipeHouse(House):
     '''
@@ -372,38 +400,55 @@ class PipeHouse(House):
         sides: See Attributes.
         thickness: See Attributes.
         shader: Shader that will be assigned to the house. 
-        On exit: A PipeHouse object has been initialized and a polygonal house has 
-                 been created out of a pipe primitive. A foundation for the house has
-                 also been created and united with the box. The given shader has been 
-                 assigned to the house. 
+        On exit: A PipeHouse object has been initialized and the mesh for a pipe house 
+                 with a foundation has been created using mesh.pipeHouseMesh(...). The 
+                 given shader has been assigned to all faces. The polygonal object is 
+                 created later by commit().
         '''
         House.__init__(self, name_, "pipe", height, radius * 2, radius * 2)
         self.radius = radius
         self.sides = sides
         self.thickness = thickness
-        # The actual height of a pipe object in maya is half of the height it is given. Therefore here h = 2 * height.
-        n = cmds.polyPipe(n = name_, r = radius, h = 2 * height, t = thickness, sa = sides, sh = height)
-        cmds.xform(n[0], translation = (0,height/2.0,0))
-        f = cmds.polyPipe(n = "foundation", r = radius + 0.15, height = 0.8 * 2, t = thickness + 0.3, sa = sides)
-        cmds.xform(f[0], translation = (0, 0.4, 0))
-        n = cmds.polyUnite(n[0],f[0], n = name_)
-        self.name = n[0]
-        cmds.sets(n[0], edit=True, forceElement=shader[1])
-        cmds.delete(self.name, ch = True)
+        self.mesh = self.houseMesh(shader[1])
+
+    def houseMesh(self, material, facade = None):
+        '''
+        Creates the mesh for a pipe house.
+        
+        self: Object of the class PipeHouse.
+        material: Name of the shading group for the house.
+        facade: If not None, the windows that are recessed into the outer wall, see 
+                mesh.addFacade(...).
+        On exit: The mesh created by mesh.pipeHouseMesh(...) is returned.
+        '''
+        return mesh.pipeHouseMesh(self.height, self.radius, self.sides, self.thickness, material, facade)
+
+    def shapeKey(self, tolerance):
+        '''
+        Describes the shape of the house for the house cache.
         
+        self: Object of the class PipeHouse.
+        tolerance: See the attributes of houseCache.HouseCache.
+        On exit: A tuple is returned with the type, the height, the radius and the
+                 thickness rounded to the tolerance, and the number of sides of the house.
+        '''
+        return (self.type, houseCache.quantize(self.height, tolerance), houseCache.quantize(self.radius, tolerance), self.sides,
+                houseCache.quantize(self.thickness, tolerance))
         
-    def addDeformer(self):
+        
+    def addDeformer(self, deformation):
         '''
         Adds one or two deformers to a pipe house.
         
         self : Object of the class PipeHouse.       
+        deformation: Tuple describing the deformers, see House.addDeformer(...).
         On exit : A flare deformer has been added to the object house.name. 
         A twist deformer is occasionally added on top of that. Since in maya 
         the actual height of a pipe is half of the height it is given, the
-        deformers have to be scaled up. Some of the deformers' attributes have 
-        been randomly set.
+        deformers have to be scaled up. The deformers' attributes have been set
+        from the deformation.
         '''
-        House.addDeformer(self)
+        House.addDeformer(self, deformation)
         if (self.flare != None):
             cmds.select(self.flare)
             cmds.scale(self.height/2.0, y = True)
@@ -441,66 +486,162 @@ class Block:
         cmds.xform(self.obj, translation = (center[0], 0.1,center[1]))    
         cmds.sets(self.obj[0], edit=True, forceElement="pavementMaterialGroup")
 
-def makeWindowColumn(windowWidth, windowHeight, num, floorHeight):
+class CityBuild:
     '''
-    Creates a column with the specified number of windows.
+    A CityBuild object remembers what buildCity(...) created for a city, so that
+    regenerateCity(...) can rebuild only the blocks whose inputs have changed. The 
+    pavements and street lights of the blocks only depend on the street structure 
+    and the time of day, so they are not part of the blocks here.
     
-    windowWidth: The width of the windows.
-    windowHeight: The height of the windows.
-    num = The number of windows in the column.
-    floorHeight: The height of one floor.
-    On exit: A column of windows of the given size has been created.
-    '''
-    window = cmds.polyCube(w = windowWidth, h = windowHeight, d = 0.1)
-    cmds.xform(window, translation = (0, 0.8 + floorHeight,0))
-    for i in range(1,num):
-        cmds.polyChipOff(window[0] + ".f[0:5]", dup = True, kft = True, translate = (0,(i * floorHeight),0))
-    cmds.delete(all = True, ch = True)
-    cmds.refresh()
-    return window    
-        
-def assignWindowShaders(window, windowNum, shaders):
+    Attributes:
+        plan: Object of the class cityPlan.CityPlan that the city was built from.
+        environment: Triple with the colour value of the environment.
+        options: Tuple with the bakeDeformers, instancing, instanceTolerance and 
+                 cacheSize arguments of buildCity(...).
+        houseShaders: The list of house shaders made by makeHouseShaders(...).
+        treeShaders: The list of tree shaders made by park.makeTreeShaders(...).
+        windowShaders: The list of window shaders made by makeWindowShaders(...).
+        streetLightGeom: The street light that the parks instance.
+        cache: Object of the class houseCache.HouseCache, or None.
+        cityBlocks: The BlockIndex returned by buildCity(...).
+        lodSettings: None, or a tuple with the camera and the distances the levels of
+                     detail of the houses and parks are chosen from.
+        view: None, or an object of the class frustum.Frustum. Blocks outside it are
+              built without details, see buildBlock(...).
+        viewRectangle: None, or the rectangle on the ground under the part of view
+                       up to the tallest house, see updateView().
+        treeLibrary: Object of the class park.TreeLibrary that the trees of the parks
+                     and streets are instanced from, or None.
+        nodes: List with a list of node names for every block in plan.blocks, with 
+               the house or park, or its LOD group, and any deformer handles of the 
+               house.
     '''
-    Assigns shaders to all the windows for a house.
-    
-    window: The polygonal object whose faces form the windows.
-    windowNum: The number of windows in the object window.
-    shaders: A list of shaders for the windows.
-    On exit: A shader has been assigned seperately to every window
-             in the window object. 
-    '''
-    for i in range(windowNum):
-        light = random.random()
-        if light < 0.2:
-            shader = random.choice(shaders)
-        else:
-            shader = shaders[0]
-        cmds.sets(window[0] + ".f[" + str(i * 6) + ":" + str((i + 1) * 6) + "]", edit=True, forceElement= shader[1])
+    def __init__(self, plan, environment, options, houseShaders, treeShaders, windowShaders, streetLightGeom, cache, cityBlocks, lodSettings = None, view = None, treeLibrary = None):
+        '''
+        Initializes a CityBuild object for a city without blocks.
+        
+        self: Object that is to be initialized.
+        plan: See Attributes.
+        environment: See Attributes.
+        options: See Attributes.
+        houseShaders: See Attributes.
+        treeShaders: See Attributes.
+        windowShaders: See Attributes.
+        streetLightGeom: See Attributes.
+        cache: See Attributes.
+        cityBlocks: See Attributes.
+        lodSettings: See Attributes.
+        view: See Attributes.
+        treeLibrary: See Attributes.
+        On exit: A CityBuild object has been initialized with an empty list of nodes.
+        '''
+        self.plan = plan
+        self.environment = environment
+        self.options = options
+        self.houseShaders = houseShaders
+        self.treeShaders = treeShaders
+        self.windowShaders = windowShaders
+        self.streetLightGeom = streetLightGeom
+        self.cache = cache
+        self.cityBlocks = cityBlocks
+        self.lodSettings = lodSettings
+        self.view = view
+        self.treeLibrary = treeLibrary
+        self.nodes = []
+        self.updateView()
+
+    def updateView(self):
+        '''
+        Finds the part of the ground the culling camera may see.
+
+        self: Object of the class CityBuild.
+        On exit: If there is a culling camera, viewRectangle has been set to the
+                 rectangle on the ground under the part of self.view up to the
+                 tallest house the plan allows, or the trees in a park if they are
+                 taller. Blocks outside it can not be seen.
+        '''
+        self.viewRectangle = None
+        if self.view != None:
+            self.viewRectangle = self.view.groundRectangle(max(5.0, self.plan.params["houseHeightInt"][1]))
+
+    def inView(self, blockPlan):
+        '''
+        Checks if the block may be seen by the culling camera.
         
-def makeHouseShaders(num, colourRange):
+        self: Object of the class CityBuild.
+        blockPlan: Dictionary describing the block, made by cityPlan.planBlock(...).
+        On exit: True is returned if there is no culling camera, or if the block is
+                 inside viewRectangle and the box over the block up to the top of
+                 the house, or of the trees in a park, intersects self.view.
+                 Otherwise False is returned.
+        '''
+        if self.view == None:
+            return True
+        area = blockPlan["area"]
+        # Most of the blocks that can not be seen are outside the rectangle.
+        if self.viewRectangle == None or not blockIndex.rectanglesIntersect(area, self.viewRectangle):
+            return False
+        height = 5.0
+        if blockPlan["type"] == "house":
+            height = max(height, blockPlan["height"])
+        return self.view.intersectsArea(area, height)
+
+    def blocksInView(self):
+        '''
+        Finds the blocks that may be seen by the culling camera.
+
+        self: Object of the class CityBuild.
+        On exit: A set is returned with the indices of the blocks in self.cityBlocks
+                 for which inView(...) is true. Only the blocks that
+                 self.cityBlocks finds in viewRectangle are checked against the
+                 frustum.
+        '''
+        if self.view == None:
+            return set(range(len(self.cityBlocks)))
+        if self.viewRectangle == None:
+            return set()
+        candidates = self.cityBlocks.blocksInRectangle(self.viewRectangle[0], self.viewRectangle[1])
+        return set([i for i in candidates if self.inView(self.plan.blocks[i])])
+
+# The CityBuild object of every city built in this maya session, by name.
+builtCities = {}
+
+def makeHouseShaders(colours):
     '''
     Creates a number of shaders for houses.
     
-    num: The number of shaders that will be created.
-    colourRange: A tuple containing two triples with hsv colour values. These 
-                 colour values gives the range for the hue, saturation and value 
-                 the shaders will have.
-    On exit: The specified number of shaders have been created and added to a list. 
-             All the shaders have colours within the given colour range. The list
+    colours: List with a hsv triple for every shader that will be created, see 
+             cityPlan.CityPlan.
+    On exit: A shader has been created for every colour and added to a list. The list
              is returned.
     '''
     shaderList = []    
-    for i in range(num):
-        hue = tools.getRandomValue((colourRange[0][0]/360.0,colourRange[1][0]/360.0))
-        saturation = tools.getRandomValue((colourRange[0][1],colourRange[1][1]))
-        value = tools.getRandomValue((colourRange[0][2],colourRange[1][2]))
-        RGB = tools.convertToRgb((hue*360, saturation, value))
+    for colour in colours:
+        RGB = tools.convertToRgb(colour)
         shader = tools.makeShader((RGB[0], RGB[1], RGB[2]))
         cmds.setAttr(shader[0] + ".reflectivity", 0.000)
         cmds.setAttr(shader[0] + ".specularColor", 0.120, 0.120, 0.120)
         shaderList.append(shader)
     return shaderList
 
+def updateHouseShaders(shaders, oldColours, colours):
+    '''
+    Changes the colours of existing house shaders.
+    
+    shaders: A list of shaders made by makeHouseShaders(...).
+    oldColours: The list of hsv triples the shaders were made with.
+    colours: List with the new hsv triple of every shader.
+    On exit: Every shader whose colour has changed has been given the new colour. 
+             The number of changed shaders is returned.
+    '''
+    changed = 0
+    for shader, oldColour, colour in zip(shaders, oldColours, colours):
+        if oldColour != colour:
+            RGB = tools.convertToRgb(colour)
+            cmds.setAttr(shader[0] + ".color", RGB[0], RGB[1], RGB[2])
+            changed = changed + 1
+    return changed
+
 def makeNecessaryShaders(daytime):
     '''
     Creates shaders that are needed for the city. 
@@ -514,7 +655,7 @@ def makeNecessaryShaders(daytime):
     park.makeParkShaders()
     trafficLight.makeLightShaders(daytime)
     
-def makeWindowShaders(daytime, glow, environment):
+def makeWindowShaders(daytime, glow, environment, incandescence):
     '''
     Creates shaders for windows.
     
@@ -523,6 +664,8 @@ def makeWindowShaders(daytime, glow, environment):
           or if some windows will be dark.
     environment: Triple containing the colour value the environment windows will be given
                  if daytime is true.
+    incandescence: List with the incandescence of the four glowing shaders that are 
+                   created if daytime is false.
     On exit: A list of shaders is returned. If daytime is true this list contains only one
              shader. 
     '''
@@ -539,9 +682,8 @@ def makeWindowShaders(daytime, glow, environment):
                 windowShader = tools.makeShader((0,0,0),"glassMaterial")
                 cmds.setAttr(windowShader[0] + ".reflectivity",1.000)
                 shaderList.append(windowShader)
-        for i in range(4):            
+        for inc in incandescence:            
             windowShader = tools.makeShader((1.0,0.75,0),"glassMaterial")
-            inc = random.uniform(0.1,0.6)
             incR = inc * 1
             incG = inc * 0.922
             incB = inc * 0.399
@@ -550,17 +692,17 @@ def makeWindowShaders(daytime, glow, environment):
             shaderList.append(windowShader)
     return shaderList
     
-def makeLights(daytime, name_):
+def makeLights(daytime, name_, rotation):
     '''
     Creates lights for the city.
     
     daytime: Boolean variable which is true if it is day and false if it is night.
-    On exit: A directional light has been created and rotated randomly. If daytime
+    rotation: Tuple with the rotation of the directional light around the x- and y-axis.
+    On exit: A directional light has been created and rotated. If daytime
              is true a ambient light has also been created.    
     '''
     light = cmds.directionalLight(name = name_ + "directionalLight", rs = True)
-    rotatex = random.randint(-90,0)
-    rotatey = random.randint(0,360)
+    rotatex, rotatey = rotation
     cmds.xform(name_ + "directionalLight", rotation = (rotatex,rotatey,0), translation = (0,50,0),relative = True, ws = True)
     if daytime == False:
         cmds.setAttr(light + ".intensity", 0.05)
@@ -575,82 +717,175 @@ def makeCamera(name_, environment):
     name_: The name the camera is given.
     environment: The colour the backround for the camera will have.
     On exit: A camera with the given background colour has been created and 
-             made active.
+             made active. The name of the camera transform is returned.
     '''
     camera_ = cmds.camera(n = name_)
     cmds.setAttr(camera_[1] + ".backgroundColor", environment[0], environment[1],environment[2])
     cmds.camera(camera_[0], edit = True, position = [0,100,250], rotation = [-23,0,0])
     cmds.lookThru(camera_[0])
-    
-def makeZoneHeights(size, houseHeightInt):
+    return camera_[0]
+
+def cameraFrustum(camera, margin = 0.0):
     '''
-    Creates a list of six different height ranges for the houses in the city.
-    
-    size: Tuple defining the size of the city.
-    houseHeightInt: Tuple determining the minimum and the maximum height for the houses in the city.
-    On exit: A list containing six tuples specifying the height range for houses in the city zones 
-             is returned. The first element in the list is the height range for the central zone, 
-             while the last element is the height range for the zone furthest away from the city
-             center.
-    '''
-    heightChange = (houseHeightInt[1] - houseHeightInt[0]) / 9.0
-    heightIntList = [] 
-    heightIntList.append((houseHeightInt[1] - (heightChange * 2), houseHeightInt[1]))
-    heightIntList.append((houseHeightInt[1] - (heightChange * 4), houseHeightInt[1] - (heightChange * 2)))
-    heightIntList.append((houseHeightInt[1] - (heightChange * 6), houseHeightInt[1] - (heightChange * 4)))
-    heightIntList.append((houseHeightInt[1] - (heightChange * 7), houseHeightInt[1] - (heightChange * 6)))
-    heightIntList.append((houseHeightInt[1] - (heightChange * 8), houseHeightInt[1] - (heightChange * 6)))
-    heightIntList.append((houseHeightInt[1] - (heightChange * 9), houseHeightInt[1] - (heightChange * 8)))
-    return heightIntList
+    Creates a Frustum object for a camera in the scene.
     
+    camera: The name of the transform of the camera.
+    margin: The distance the sides of the frustum are moved outwards.
+    On exit: An object of the class frustum.Frustum with the current placement, 
+             field of view and clipping planes of the camera is returned.
+    '''
+    matrix = cmds.xform(camera, query = True, matrix = True, worldSpace = True)
+    horizontalFov = cmds.camera(camera, query = True, horizontalFieldOfView = True)
+    verticalFov = cmds.camera(camera, query = True, verticalFieldOfView = True)
+    near = cmds.camera(camera, query = True, nearClipPlane = True)
+    far = cmds.camera(camera, query = True, farClipPlane = True)
+    return frustum.Frustum(matrix, horizontalFov, verticalFov, near, far, margin)
+
+def findTreeLibrary(variants, colours):
+    '''
+    Finds a tree library of an earlier city that can be reused.
+
+    variants: The number of tree variants wanted.
+    colours: List with the hsv triples of the crown shaders, see cityPlan.CityPlan.
+    On exit: If a city in builtCities has a park.TreeLibrary with the same number of
+             variants and crown colours that is still in the scene, it is returned.
+             Otherwise None is returned.
+    '''
+    for build in builtCities.values():
+        library = build.treeLibrary
+        if (library != None and library.variants == variants and build.plan.treeColours == colours
+            and library.exists()):
+            return library
+    return None
     
-def makeHouse(name_, heightInt, wxd, houseShaders, treeShaders, windowShaders, windows, booleans, deformer):
+def makeHouse(name_, plan, houseShaders, treeShaders, windowShaders, booleans, recessed = False, bakeDeformers = False, cache = None, shading = None, treeLibrary = None):
     '''
     Creates a house.
     
     name_: Name the house will be given.
-    heightInt: The range for the height of the house.
-    wxd: A tuple defining the width and the depth of the house.
+    plan: Dictionary describing the house, made by cityPlan.planHouse(...).
     houseShaders: A list of shaders for the house.
     treeShaders: A list of shaders for the tree crowns.
     windowShaders: A list of shaders for the windows.
-    windows: A boolean variable which specifies if the house should have windows.
     booleans: A boolean variable which determines whether the windows should be 
               combined with the house using boolean difference or not. 
-    deformers: A boolean variable which determines whether deformers will be 
-               added to the house or not.
+    recessed: A boolean variable which determines whether the windows should be cut 
+              into the walls of the house directly instead of using booleans.
+    bakeDeformers: A boolean variable which determines whether the deformers should be
+                   baked into the mesh of the house instead of added as deformer nodes.
+    cache: Object of the class houseCache.HouseCache, or None. If given, houses without
+           live deformers are instanced from prototypes kept in the hidden group 
+           "houseLibrary", which has to exist.
+    shading: Object of the class tools.ShadingBatch that collects the shader 
+             assignments of the house, or None to assign them right away. Houses that
+             become prototypes assign their shaders right away.
+    treeLibrary: Object of the class park.TreeLibrary, or None. If given, the street
+                 trees are instances of its variants.
     On exit: A house of either the class BoxHouse, CylinderHouse or PipeHouse has
-             been created and wanted features added. The House object is returned.
-    
+             been created with the planned windows, deformers and street trees. The 
+             House object is returned. If the cache has a prototype with the same 
+             shape, the house is an instance of the prototype and no new geometry has
+             been built. The sizes of the prototype differ from the planned ones by
+             less than the tolerance of the cache, and the instance is scaled by
+             this small difference so that the house fills its lot as planned.
+             Otherwise, if a cache is given, the house has been built as a new
+             prototype in "houseLibrary" and the returned house is an instance of
+             it. If the tolerance of the cache is larger than 0, the shaders of the
+             house and the windows are not part of the shape, so an instance has the
+             colours of its prototype.
     '''
-    shader = random.choice(houseShaders)
-    houseShape = random.choice(["box", "cylinder", "pipe"])
-    height = int(random.uniform(heightInt[0], heightInt[1]))
+    shader = houseShaders[plan["shader"]]
+    houseShape = plan["shape"]
     if (houseShape == "box"):
-        width = wxd[0]
-        depth = wxd[1]
-        h = BoxHouse(name_, height, width, depth, shader)
+        h = BoxHouse(name_, plan["height"], plan["width"], plan["depth"], shader)
     if (houseShape == "cylinder"):
-        radius = min(wxd[0], wxd[1])  / 2.0
-        sides = random.randint(3, 20)
-        h = CylinderHouse(name_, height, radius, sides, shader)
+        h = CylinderHouse(name_, plan["height"], plan["radius"], plan["sides"], shader)
     if (houseShape == "pipe"):
-        radius = min(wxd[0], wxd[1])  / 2.0
-        sides = random.randint(3, 20)
-        thickness = random.uniform(min(1, radius - 0.2), max(radius - 2, min(1.1, radius - 0.5)))
-        h = PipeHouse(name_, height, radius, sides, thickness, shader) 
-    if (windows == True):
-        h.makeWindows(name_, windowShaders, booleans)
-    if (deformer == True):
-        h.addDeformer()
-    if (houseShape == "cylinder") or (houseShape == "pipe"):
-        park.placeStreetTrees(h, wxd, treeShaders)
+        h = PipeHouse(name_, plan["height"], plan["radius"], plan["sides"], plan["thickness"], shader) 
+    facade = plan["facade"]
+    if facade != None:
+        # The plan gives the window shaders as indices.
+        facade = tuple(facade[:5]) + ([windowShaders[i][1] for i in facade[5]],)
+    deformation = plan["deformation"]
+    liveDeformers = (deformation != None) and not bakeDeformers
+    key = None
+    prototype = None
+    if cache != None and not liveDeformers:
+        # Houses with live deformers can not share their shape with other houses.
+        key = (h.shapeKey(cache.tolerance), houseCache.facadeKey(facade, cache.tolerance),
+               houseCache.deformationKey(deformation, max(h.width, h.depth) / 2.0, cache.tolerance))
+        if cache.tolerance <= 0:
+            key = key + (shader[1],)
+        prototype = cache.get(key)
+        if prototype != None:
+            prototype, height, width, depth = prototype
+            h.name = cmds.instance(prototype, n = name_)[0]
+            cmds.parent(h.name, world = True)
+            if (height, width, depth) != (h.height, h.width, h.depth):
+                # Only the difference within the tolerance is scaled away.
+                cmds.xform(h.name, scale = (h.width / width, h.height / height, h.depth / depth))
+    if prototype == None:
+        if facade != None:
+            h.addWindows(facade, booleans, recessed)
+        if deformation != None and bakeDeformers:
+            h.bakeDeformer(deformation)
+        if key != None:
+            # The instances need the shaders of the prototype.
+            shading = None
+        h.commit(shading)
+        if liveDeformers:
+            h.addDeformer(deformation)
+        if key != None:
+            cmds.parent(h.name, "houseLibrary")
+            for evicted in cache.put(key, (h.name, h.height, h.width, h.depth)):
+                # The instances of an evicted prototype keep its shape alive.
+                cmds.delete(evicted[0])
+            h.name = cmds.instance(h.name, n = name_)[0]
+            cmds.parent(h.name, world = True)
+    park.placeStreetTrees(h, plan["streetTrees"], treeShaders, treeLibrary)
     cmds.refresh()
     return h
+
+def makeHouseProxy(name_, plan, houseShaders, level, shading = None):
+    '''
+    Creates a simplified house for a level of detail.
+    
+    name_: String specifying the name of the house.
+    plan: Dictionary describing the house, made by cityPlan.planHouse(...).
+    houseShaders: A list of shaders for the house.
+    level: 1 for the house without windows and street trees and with at most half 
+           as many sides, or 2 for a single box with the size of the house.
+    shading: See makeHouse(...).
+    On exit: The simplified house has been created at the origin from a mesh 
+             description. The planned deformation has been baked into level 1, while 
+             level 2 is not deformed. The name of the polygonal object is returned.
+    '''
+    shader = houseShaders[plan["shader"]]
+    houseShape = plan["shape"]
+    if level == 2:
+        if houseShape == "box":
+            size = (plan["width"], plan["height"], plan["depth"])
+        else:
+            size = (plan["radius"] * 2, plan["height"], plan["radius"] * 2)
+        proxy = mesh.Mesh()
+        mesh.addBox(proxy, (0, 0, 0), size, shader[1])
+        return tools.commitMesh(proxy, name_, shading)[0]
+    if (houseShape == "box"):
+        h = BoxHouse(name_, plan["height"], plan["width"], plan["depth"], shader)
+    else:
+        sides = max(3, plan["sides"] // 2)
+    if (houseShape == "cylinder"):
+        h = CylinderHouse(name_, plan["height"], plan["radius"], sides, shader)
+    if (houseShape == "pipe"):
+        h = PipeHouse(name_, plan["height"], plan["radius"], sides, plan["thickness"], shader)
+    if plan["deformation"] != None:
+        h.bakeDeformer(plan["deformation"])
+    h.commit(shading)
+    return h.name
     
 
 
-def city(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange):
+def city(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange, streaming = False, recessed = False, bakeDeformers = False, instancing = False, instanceTolerance = 0.0, cacheSize = 200, seed = None, planCache = None, blockStreams = False, workers = 0, lodDistances = None, lodCamera = None, culling = False, cullCamera = None, cullMargin = 10.0, profile = None, treeSpacing = None, treeVariants = 0):
     '''
     Generates the city.
     
@@ -670,63 +905,377 @@ def city(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformer
     colourRange: A tuple containing two triples with hsv colour values. These 
                  colour values gives the range for the hue, saturation and value 
                  the house shaders will have.
+    streaming: Boolean variable which determines whether the blocks should be created 
+               while the street structure is being split, instead of after it is finished.
+               The first houses then appear right away, but the same seed gives a
+               different city than without streaming, since the houses draw random
+               numbers between the splits. Only the build is incremental: the plans
+               of the blocks, the BlockIndex and the nodes of every block are kept
+               for the whole city, as regenerateCity(...) needs them, so the memory
+               used still grows with the size of the city.
+    recessed: Boolean variable which determines whether the windows should be cut into
+              the walls of the houses by subdividing the facades, instead of being 
+              attached with booleans or by combining the meshes. This gives the look 
+              of the booleans at the cost of combining the meshes and works for any 
+              city size. Overrides booleans.
+    bakeDeformers: Boolean variable which determines whether the flare and twist of the 
+                   houses should be computed directly on the vertices when the houses 
+                   are created, instead of adding deformer nodes that maya has to 
+                   evaluate. The same seed gives the same deformations.
+    instancing: Boolean variable which determines whether houses with the same shape 
+                should be instances of one hidden prototype instead of separate 
+                objects. Houses with deformer nodes are never instanced, so the 
+                deformers should be baked or turned off.
+    instanceTolerance: The largest difference in size, in scene units, between houses
+                       that may share a prototype. An instance is scaled by the
+                       difference to the size of its house. With a tolerance larger
+                       than 0 houses with different shaders share prototypes as well.
+                       A larger tolerance builds fewer houses but gives less
+                       variety. With 0 only identical houses are instanced.
+    cacheSize: The largest number of prototypes kept for instancing. The least 
+               recently used prototype is forgotten when there are more.
+    seed: If not None, the random module is seeded with it before the city is planned.
+          Otherwise the current state of the random module is used.
+    planCache: Path of a directory where the plans of cities with a seed are kept. If 
+               the directory has a plan for the same parameters and seed, the city is
+               built from it without planning, otherwise the new plan is added.
+    blockStreams: Boolean variable which determines whether every block should draw 
+                  its random numbers from its own stream, derived from the seed and 
+                  the position of the block in the street structure. The blocks can 
+                  then be planned in parallel, and streaming does not change the 
+                  city, but the same seed gives a different city than without block
+                  streams.
+    workers: The number of processes that plan the blocks at the same time when 
+             blockStreams is true. The city is the same for any number of workers. 
+             Inside the maya GUI on Windows, multiprocessing.set_executable(...) has 
+             to be pointed at mayapy first.
+    lodDistances: None, or a pair of distances from the camera. If given, every house
+                  is built in three levels of detail: the full house, a simplified 
+                  house without windows and street trees and with fewer sides, and a 
+                  box, which are shown beyond the first and the second distance. The 
+                  parks get two levels, the full park and a cube of grass. The levels
+                  can be switched later with the lod module without rebuilding.
+    lodCamera: The name of the camera the levels of detail are chosen from. If None, 
+               the render camera of the city is used.
+    culling: Boolean variable which determines whether the blocks outside the view of
+             a camera should be built without details. The pavements, streets and 
+             traffic lights are built as usual, but the houses are single boxes and 
+             the parks cubes of grass, without windows, trees or street lights, so 
+             that shadows and reflections stay plausible. Meant for still renders.
+    cullCamera: The name of the camera used for culling. If None, the render camera 
+                of the city is used.
+    cullMargin: The distance outside the view of the camera within which blocks are 
+                still built with all details.
+    treeSpacing: None, or the smallest gap between the crowns of the trees in the
+                 parks. If given, the squares of the parks are filled with as many
+                 trees as fit by Poisson-disk sampling, see cityPlan.scatterTrees(...),
+                 which makes dense parks with hundreds of trees in big squares. With
+                 None at most nine trees are scattered in a square, as always.
+    treeVariants: The number of tree variants built for the whole city. If larger
+                  than 0, every tree in the parks and along the streets is an
+                  instance of the variant with its crown colour and the closest
+                  shape, scaled to its size, see park.TreeLibrary, instead of a mesh
+                  of its own. This builds the vegetation of a city with dense parks
+                  in a fraction of the time and memory, at the cost of some variety
+                  in the shapes of the trees. The plan does not change. Every
+                  crown colour gets at least one variant. The variants stay in the
+                  scene, and regenerateCity(...) and later cities with the same
+                  number of variants and crown colours reuse them, see
+                  findTreeLibrary(...).
+    profile: None, True or the path of a file. If not None, every phase of generating
+             the city and every block is measured by a profiler.Profiler: the time,
+             the maya commands, the nodes created and deleted and, if tracemalloc is
+             tracing, the change in the memory used by Python. Without profile
+             nothing is measured and the city is generated at full speed.
     On exit: A city with houses, trees, parks, traffic lights and street lights has been 
              generated. The height of the houses decrease the further away from the city center
-             they are. 
+             they are. The city has been planned with the cityPlan module, which draws 
+             all the random numbers, and built from the plan using buildCity(...). A 
+             BlockIndex over the blocks of the city is returned, in which block i is the 
+             i:th object created in the "blocks" group. If instancing is used, a report 
+             of how many houses were instanced has been printed, and with
+             treeVariants a report of how many trees were.
+             If blockStreams is true and a seed is given, the city can later be changed 
+             with regenerateCity(...).
+             If profile is not None, a summary of the phases has been printed, a
+             pair with the BlockIndex and the profiler.Report is returned instead,
+             and if profile is a path the report has been written to it as JSON,
+             which chrome://tracing and Perfetto also open as a timeline.
+    '''
+    profiler_ = profiler.NULL
+    if profile != None:
+        # The modules whose maya commands are counted.
+        profiler_ = profiler.Profiler([sys.modules[__name__], park, trafficLight, tools, lod])
+        profiler_.start()
+    try:
+        with profiler_.phase("city", "city"):
+            with profiler_.phase("startPlan", "plan"):
+                params = cityPlan.cityParams(size, houseHeightInt, houseWidthInt, windows, booleans, deformers,
+                                             daytime, glow, colourRange, streaming, recessed, blockStreams,
+                                             treeSpacing)
+                cached = None
+                if planCache != None and seed != None:
+                    cached = cityPlan.cachedPlan(planCache, params, seed)
+                plan = cached
+                if plan == None:
+                    # The blocks are planned while the city is being built, see buildCity(...).
+                    plan = cityPlan.startPlan(params, seed)
+            cityBlocks = buildCity(name_, plan, environment, bakeDeformers, instancing, instanceTolerance, cacheSize,
+                                   workers, lodDistances, lodCamera, culling, cullCamera, cullMargin, treeVariants,
+                                   profiler_)
+            if cached == None and planCache != None and seed != None:
+                with profiler_.phase("storePlan", "plan"):
+                    cityPlan.storePlan(planCache, plan)
+    finally:
+        if profile != None:
+            profiler_.stop()
+    if profile == None:
+        return cityBlocks
+    report = profiler_.report()
+    print(report.summary())
+    if profile != True:
+        report.write(profile)
+    return (cityBlocks, report)
+
+def buildCity(name_, plan, environment, bakeDeformers = False, instancing = False, instanceTolerance = 0.0, cacheSize = 200, workers = 0, lodDistances = None, lodCamera = None, culling = False, cullCamera = None, cullMargin = 10.0, treeVariants = 0, profiler_ = None):
     '''
+    Builds a planned city in maya.
+    
+    name_: String specifying the name of the city.
+    plan: Object of the class cityPlan.CityPlan, either complete or just started by 
+          cityPlan.startPlan(...).
+    environment: Triple specifying the colour value the environment will have.
+    bakeDeformers: See city(...).
+    instancing: See city(...).
+    instanceTolerance: See city(...).
+    cacheSize: See city(...).
+    workers: See city(...).
+    lodDistances: See city(...).
+    lodCamera: See city(...).
+    culling: See city(...).
+    cullCamera: See city(...).
+    cullMargin: See city(...).
+    treeVariants: See city(...).
+    profiler_: Object of the class profiler.Profiler that measures the phases of
+               building the city and every block, or None.
+    On exit: The city in the plan has been built without drawing any random numbers. 
+             If the plan was not complete, the blocks have been planned one at a time 
+             by cityPlan.iterBlockPlans(...) while they were built, and the plan is 
+             complete. A BlockIndex over the blocks of the city is returned, as 
+             described in city(...). The phases and blocks have been measured by
+             profiler_.
+    '''
+    params = plan.params
+    size = params["size"]
+    houseWidthInt = params["houseWidthInt"]
+    daytime = params["daytime"]
+    if profiler_ == None:
+        profiler_ = profiler.NULL
     cmds.flushUndo()
-    houseShaders = makeHouseShaders(40,colourRange)
-    makeNecessaryShaders(daytime)
-    treeShaders = park.makeTreeShaders(10)   
-    windowShaders = makeWindowShaders(daytime, glow, environment)
-    makeCamera(name_+ "RenderCam", environment)
-    makeLights(daytime, name_)
-    ground = cmds.polyPlane(n = "Ground", w = size[0], h = size[1])
-    cmds.sets(ground[0], edit=True, forceElement="streetMaterialGroup")
-    streetLightGeom = trafficLight.makeStreetLight()
-    dir = random.choice(["horisontal","vertical"])
-    # Make the binary tree forming the street structure for the city
-    if (dir == "horisontal"):
-        firstSplit = random.uniform(-size[1] / 2.0 + houseWidthInt[0] + 8 ,size[1] / 2.0  -houseWidthInt[0] - 8)
-    else:
-        firstSplit = random.uniform(-size[0] / 2.0 + houseWidthInt[0] + 8 ,size[0] / 2.0  -houseWidthInt[0] - 8)
-    cityStreets = streets.Street((dir,firstSplit), (-size[0] / 2.0,-size[1] / 2.0), (size[0] / 2.0, size[1] / 2.0))
-    cityStreets.split_((-size[0] / 2.0,-size[1] / 2.0), (size[0] / 2.0, size[1] / 2.0), houseWidthInt[1] + 8, houseWidthInt[0] + 8)
-    list = []
-    areas = cityStreets.listAreas((-size[0] / 2.0,-size[1] / 2.0), (size[0] / 2.0, size[1] / 2.0),list)
-    heightIntList = makeZoneHeights(size, houseHeightInt) # Make a list with 6 different height ranges for the houses.
-    maxCenterDistance = math.sqrt(math.pow((size[0] / 2.0), 2) + math.pow((size[1] / 2.0), 2))
-    zoneWidth = maxCenterDistance/6 # The thickness of each circular zone.
-    blockList = []
+    with profiler_.phase("makeHouseShaders"):
+        houseShaders = makeHouseShaders(plan.houseColours)
+    with profiler_.phase("makeNecessaryShaders"):
+        makeNecessaryShaders(daytime)
+    treeLibrary = None
+    if treeVariants > 0:
+        treeLibrary = findTreeLibrary(treeVariants, plan.treeColours)
+    with profiler_.phase("makeTreeShaders"):
+        if treeLibrary != None:
+            # The variants that are already built keep their shaders.
+            treeShaders = treeLibrary.shaders
+        else:
+            treeShaders = park.makeTreeShaders(plan.treeColours)
+    with profiler_.phase("makeWindowShaders"):
+        windowShaders = makeWindowShaders(daytime, params["glow"], environment, plan.windowIncandescence)
+    with profiler_.phase("makeCamera"):
+        renderCam = makeCamera(name_+ "RenderCam", environment)
+    with profiler_.phase("makeLights"):
+        makeLights(daytime, name_, plan.lightRotation)
+    with profiler_.phase("makeGround"):
+        ground = cmds.polyPlane(n = "Ground", w = size[0], h = size[1])
+        cmds.sets(ground[0], edit=True, forceElement="streetMaterialGroup")
+    with profiler_.phase("makeStreetLight"):
+        streetLightGeom = trafficLight.makeStreetLight()
+    # Spatial index for rectangle queries, with cells of about one block.
+    # regenerateCity(...) finds the blocks in view of the culling camera with it.
+    cityBlocks = blockIndex.BlockIndex([], (houseWidthInt[0] + houseWidthInt[1]) / 2.0 + 8,
+                                       ((-size[0] / 2.0,-size[1] / 2.0), (size[0] / 2.0, size[1] / 2.0)))
     cmds.group(n = "houses", empty = True)
     cmds.group(n = "parks", empty = True)
-    for i in areas:
-        centerx = (i[0][0] + i[1][0]) / 2.0
-        centerz = (i[0][1] + i[1][1]) / 2.0
-        width = (i[1][0] - i[0][0]) - 4
-        depth = (i[1][1] - i[0][1]) - 4
-        blockList.append(Block(width, depth, (centerx, centerz))) # Create Block object. 
-        centerDistance = math.sqrt(math.pow(centerx, 2) + math.pow(centerz, 2))
-        blockType = random.random() # Determine if house or park should be created.
-        if blockType < 0.8:
-            zone = int(math.floor(centerDistance / zoneWidth)) # Check which zone the house is in.
-            house = makeHouse(name_ + "House", heightIntList[zone], (width - 4,depth - 4), houseShaders, treeShaders, windowShaders, windows, booleans, deformers)
-            house.moveHouse((centerx,centerz))
-            cmds.delete(house.name, ch = True)
-            cmds.parent(house.name, "houses")
-        elif blockType < 0.9:
-            park_ = park.makeFountainPark((width - 3,depth - 3), treeShaders, daytime, streetLightGeom)
-            cmds.xform(park_[0], translation = (centerx,0,centerz), r = True)
-            cmds.parent(park_[0], "parks")
-        else:
-            park_ = park.makePark((width - 3,depth - 3), treeShaders, daytime, streetLightGeom)
-            cmds.xform(park_[0], translation = (centerx,0,centerz), r = True)
-            cmds.parent(park_[0], "parks")
-    trafficLight.placeStreetLight(blockList,daytime,streetLightGeom)
-    trafficLight.trafficLights(cityStreets,size,daytime)
-    cmds.hide(streetLightGeom[0])
-    # Group all blocks together.
     cmds.group(n = "blocks", empty = True)
-    for i in blockList:
-        cmds.parent(i.obj[0], "blocks")
-        
\ No newline at end of file
+    cache = None
+    if instancing:
+        cache = houseCache.HouseCache(cacheSize, instanceTolerance)
+        cmds.group(n = "houseLibrary", empty = True)
+        cmds.hide("houseLibrary")
+    lodSettings = None
+    if lodDistances != None:
+        if lodCamera == None:
+            lodCamera = renderCam
+        lodSettings = (lodCamera, lodDistances)
+    view = None
+    if culling:
+        if cullCamera == None:
+            cullCamera = renderCam
+        view = cameraFrustum(cullCamera, cullMargin)
+    if treeVariants > 0 and treeLibrary == None:
+        treeLibrary = park.TreeLibrary(treeVariants, treeShaders)
+    build = CityBuild(plan, environment, (bakeDeformers, instancing, instanceTolerance, cacheSize),
+                      houseShaders, treeShaders, windowShaders, streetLightGeom, cache, cityBlocks, lodSettings, view,
+                      treeLibrary)
+    # The house and window shaders are assigned for the whole city at once at the end.
+    shading = tools.ShadingBatch()
+    culled = 0
+    with profiler_.phase("blocks"):
+        # Planning a block also splits the streets, all at once before the first
+        # block or along the way when streaming.
+        for blockPlan in profiler_.iterate(cityPlan.iterBlockPlans(plan, workers), "planBlock"):
+            with profiler_.phase(blockPlan["type"], "block", {"index": len(build.nodes)}):
+                cityBlocks.addBlock(blockPlan["area"])
+                center, width, depth = cityScene.blockPavement(blockPlan["area"])
+                block = Block(width, depth, center) # Create Block object.
+                seen = build.inView(blockPlan)
+                if seen:
+                    with profiler_.phase("placeStreetLight"):
+                        trafficLight.placeStreetLight([block],daytime,streetLightGeom)
+                else:
+                    culled = culled + 1
+                cmds.parent(block.obj[0], "blocks")
+                build.nodes.append(buildBlock(name_, build, blockPlan, shading, seen))
+    with profiler_.phase("assignShaders"):
+        shading.commit()
+    with profiler_.phase("trafficLights"):
+        trafficLight.trafficLights(plan.streets,size,daytime,plan.trafficLights)
+    cmds.hide(streetLightGeom[0])
+    if cache != None:
+        print(cache.report())
+    if treeLibrary != None:
+        print(treeLibrary.report())
+    if view != None:
+        print("Frustum culling: %d of %d blocks built without details" % (culled, len(plan.blocks)))
+    builtCities[name_] = build
+    return cityBlocks
+
+def buildBlock(name_, build, blockPlan, shading, seen = True):
+    '''
+    Builds the house or park on a block.
+    
+    name_: String specifying the name of the city.
+    build: Object of the class CityBuild with the shaders and options of the city.
+    blockPlan: Dictionary describing the block, made by cityPlan.planBlock(...).
+    shading: Object of the class tools.ShadingBatch for the shader assignments of
+             the house.
+    seen: False if the block can not be seen by the culling camera, see
+          CityBuild.inView(...).
+    On exit: The house or park has been built on the block and parented to the 
+             "houses" or "parks" group. If build.lodSettings is not None, the house or
+             park is the most detailed level of a LOD group with the simpler levels 
+             made by makeHouseProxy(...) or park.makeParkProxy(...), and the LOD group
+             has been parented instead. If the block is not seen, only the
+             box of level 2 of the house or the cube of grass of the park has been 
+             built. A list is returned with the name of the house, park or LOD group 
+             and the deformer handles of the house.
+    '''
+    params = build.plan.params
+    daytime = params["daytime"]
+    bakeDeformers = build.options[0]
+    (centerx, centerz), width, depth = cityScene.blockPavement(blockPlan["area"])
+    if not seen:
+        # Only the rough mass of the house or park is built.
+        if blockPlan["type"] == "house":
+            node = makeHouseProxy(name_ + "HouseProxy", blockPlan, build.houseShaders, 2, shading)
+            cmds.xform(node, translation = (centerx,0,centerz))
+            cmds.parent(node, "houses")
+        else:
+            node = park.makeParkProxy((width - 3,depth - 3))[0]
+            cmds.xform(node, translation = (centerx,0.15,centerz))
+            cmds.parent(node, "parks")
+        return [node]
+    if blockPlan["type"] == "house":
+        house = makeHouse(name_ + "House", blockPlan, build.houseShaders, build.treeShaders, build.windowShaders, params["booleans"], params["recessed"], bakeDeformers, build.cache, shading, build.treeLibrary)
+        house.moveHouse((centerx,centerz))
+        cmds.delete(house.name, ch = True)
+        node = house.name
+        if build.lodSettings != None:
+            levels = [house.name]
+            for level in (1, 2):
+                proxy = makeHouseProxy(name_ + "HouseProxy", blockPlan, build.houseShaders, level, shading)
+                cmds.xform(proxy, translation = (centerx,0,centerz))
+                levels.append(proxy)
+            node = lod.makeLodGroup(name_ + "HouseLod", levels, (centerx,centerz), build.lodSettings[0], build.lodSettings[1])
+        cmds.parent(node, "houses")
+        nodes = [node]
+        for deformer in (house.flare, house.twist):
+            if deformer != None:
+                nodes.append(deformer[1])
+        return nodes
+    elif blockPlan["type"] == "fountainPark":
+        park_ = park.makeFountainPark(blockPlan, (width - 3,depth - 3), build.treeShaders, daytime, build.streetLightGeom, build.treeLibrary)
+    else:
+        park_ = park.makePark(blockPlan, (width - 3,depth - 3), build.treeShaders, daytime, build.streetLightGeom, build.treeLibrary)
+    cmds.xform(park_[0], translation = (centerx,0,centerz), r = True)
+    node = park_[0]
+    if build.lodSettings != None:
+        proxy = park.makeParkProxy((width - 3,depth - 3))
+        cmds.xform(proxy[0], translation = (centerx,0.15,centerz))
+        node = lod.makeLodGroup(name_ + "ParkLod", [park_[0], proxy[0]], (centerx,centerz), build.lodSettings[0], build.lodSettings[1])
+    cmds.parent(node, "parks")
+    return [node]
+
+def regenerateCity(name_, size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, environment, colourRange, recessed = False, workers = 0):
+    '''
+    Rebuilds the blocks of a city whose inputs have changed.
+    
+    name_: String specifying the name of a city built in this maya session.
+    size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow,
+    environment, colourRange, recessed: The new arguments, see city(...).
+    workers: See city(...).
+    On exit: If the city was built with a seed and block streams, and the new 
+             arguments give the same street structure, time of day and environment,
+             the city has been planned again with the same seed, streaming and tree
+             spacing. The colours of the house shaders have been updated in place,
+             and only the houses and parks whose inputs (see
+             cityPlan.blockInputs(...)) have changed have been deleted and built
+             again. All other nodes have been left in place. The BlockIndex of the
+             city is returned.
+             Otherwise nothing has been changed and None is returned, and the city 
+             has to be cleared and generated again with city(...).
+    '''
+    build = builtCities.get(name_)
+    if build == None:
+        return None
+    old = build.plan
+    if old.seed == None or not old.params["blockStreams"]:
+        return None
+    if (daytime, glow, tuple(environment)) != (old.params["daytime"], old.params["glow"], tuple(build.environment)):
+        return None
+    params = cityPlan.cityParams(size, houseHeightInt, houseWidthInt, windows, booleans, deformers,
+                                 daytime, glow, colourRange, old.params["streaming"], recessed, True,
+                                 old.params["treeSpacing"])
+    # Planning does not touch maya, so the whole city is planned before anything is changed.
+    plan = cityPlan.planCity(params, old.seed, workers)
+    if (plan.streets.toDict() != old.streets.toDict() or plan.blockSeed != old.blockSeed or 
+        plan.treeColours != old.treeColours or plan.lightRotation != old.lightRotation):
+        return None
+    updateHouseShaders(build.houseShaders, old.houseColours, plan.houseColours)
+    build.plan = plan
+    # The index only has to check the blocks under the view of the culling camera.
+    build.updateView()
+    seen = build.blocksInView()
+    shading = tools.ShadingBatch()
+    # The parks instance the street light, which would copy it hidden.
+    cmds.showHidden(build.streetLightGeom[0])
+    rebuilt = 0
+    for index in range(len(plan.blocks)):
+        blockPlan = plan.blocks[index]
+        if blockPlan["inputs"] == old.blocks[index]["inputs"]:
+            continue
+        nodes = [node for node in build.nodes[index] if cmds.objExists(node)]
+        if nodes != []:
+            cmds.delete(nodes)
+        build.nodes[index] = buildBlock(name_, build, blockPlan, shading, index in seen)
+        rebuilt = rebuilt + 1
+    shading.commit()
+    cmds.hide(build.streetLightGeom[0])
+    print("Regenerated %d of %d blocks" % (rebuilt, len(plan.blocks)))
+    return build.cityBlocks
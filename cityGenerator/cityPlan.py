@@ -0,0 +1,1108 @@
+import random, math
+import os, json, pickle, zlib, hashlib
+import multiprocessing
+import streets
+import mesh
+
+'''
+List of procedures in the module:
+    class CityPlan:
+        A CityPlan object holds every decision made for a city, so that the city can
+        be built in maya without drawing any random numbers.
+
+        def __init__(self, params, seed = None):
+            Initializes an empty CityPlan object.
+        def isComplete(self):
+            Checks if all the blocks and the traffic lights have been planned.
+        def toDict(self):
+            Converts the plan to a dictionary with only lists, numbers and strings.
+        def save(self, path):
+            Writes the plan to a file.
+    def planFromDict(data):
+        Creates a CityPlan object from a dictionary made by CityPlan.toDict().
+    def loadPlan(path):
+        Reads a plan written by CityPlan.save(...).
+    def cityParams(size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, colourRange, streaming = False, recessed = False, blockStreams = False, treeSpacing = None):
+        Collects the parameters that decide what a city looks like.
+    def paramsKey(params, seed):
+        Creates the name of a plan in the plan cache.
+    def cachedPlan(cacheDir, params, seed):
+        Looks up a plan in the plan cache.
+    def storePlan(cacheDir, plan):
+        Adds a plan to the plan cache.
+    def getRandomValue(range):
+        Picks a random value between a start point and endpoint, wrapping back to 0
+        when reaching 1.
+    def windowShaderCount(daytime, glow):
+        Returns the number of window shaders makeWindowShaders(...) creates.
+    def makeZoneHeights(size, houseHeightInt):
+        Creates a list of six different height ranges for the houses in the city.
+    def planCity(params, seed = None, workers = 0):
+        Plans a whole city.
+    def startPlan(params, seed = None):
+        Plans the shaders, the lights and the first street of a city.
+    def iterBlockPlans(plan, workers = 0):
+        Generator that plans the blocks of a city and yields them one at a time.
+    def blockSeed(seed, street, side):
+        Derives the seed of the random stream of a block.
+    def planBlockStream(plan, task, heightIntList, zoneWidth):
+        Plans a block with its own random stream.
+    def startWorker(plan, heightIntList, zoneWidth):
+        Prepares a worker process for planning blocks.
+    def planWorkerBlock(task):
+        Plans a block in a worker process.
+    def planBlock(plan, area, heightIntList, zoneWidth, rng = random):
+        Plans what is built on a block.
+    def blockInputs(plan, heightInt = None):
+        Collects the parameters of the city that the plan of a block depends on.
+    def pickWindowShaders(windowNum, shaderCount, rng = random):
+        Picks shaders for all the windows for a house.
+    def boxWindowLayout(height, width, depth, shaderCount, booleans, recessed = False, rng = random):
+        Places the windows for a box house.
+    def prismWindowLayout(height, radius, sides, shaderCount, booleans, recessed = False, rng = random):
+        Places the windows for a cylinder or pipe house.
+    def drawDeformation(type, height, width, depth, rng = random):
+        Picks the deformers for a house.
+    def planHouse(heightInt, wxd, plan, rng = random):
+        Plans a house.
+    def streetTreeRows(wxd):
+        Places rows of street trees on empty areas around a cylinder or pipe house.
+    def planTree(shaderCount, rng = random):
+        Plans a tree.
+    def treeBox(tree, x, z):
+        Computes the bounding rectangle of a planned tree.
+    def planTreesInSquare(squareBbox, shaderCount, rng = random, spacing = None):
+        Places trees randomly in a given square.
+    def scatterTrees(squareBbox, shaderCount, spacing, rng = random, attempts = 30):
+        Fills a square with trees by Poisson-disk sampling.
+    def planFountain(rng = random):
+        Plans a fountain.
+    def planFountainPark(wxd, shaderCount, rng = random, treeSpacing = None):
+        Plans a park with a fountain in the middle.
+    def planPark(wxd, shaderCount, rng = random, treeSpacing = None):
+        Plans a park block with paths and trees.
+    def pickTrafficLight():
+        Picks the type of a traffic light.
+    def planTrafficLights(street):
+        Picks the traffic lights for every street in the city.
+'''
+
+# The plans are made without maya, by drawing the random numbers in exactly the
+# order the city used to draw them while it was being built. A city built from a
+# plan is therefore the same as the one the seed always gave. With block streams
+# every block instead draws from its own random.Random object, seeded from the
+# city and the position of the block in the street tree, so that the blocks can
+# be planned in any order and by several processes. All the shaders in a plan are
+# given as indices into the lists of shaders the builder creates.
+PLAN_VERSION = 4
+
+class CityPlan:
+    '''
+    A CityPlan object holds every decision made for a city: the colours of the
+    shaders, the direction of the light, the street structure, what is built on
+    every block and which traffic lights are placed. cityGenerator.city(...) builds
+    the city from a plan without drawing any random numbers, so a saved plan can be
+    built again without planning it.
+
+    Attributes:
+        params: Dictionary made by cityParams(...) with the parameters of the city.
+        seed: The seed the random numbers were drawn with, or None if the current
+              state of the random module was used.
+        houseColours: List with a hsv triple for every house shader, with the hue
+                      between 0 and 360.
+        treeColours: List with a hsv triple for every tree crown shader.
+        windowIncandescence: List with the incandescence of the glowing window
+                             shaders. Empty during the day.
+        lightRotation: Tuple with the rotation of the directional light around the x-
+                       and y-axis.
+        streets: Object of the class streets.StreetTree with the street structure.
+        blocks: List with a dictionary for every block that has been planned, in
+                the order the blocks are created. See planBlock(...).
+        trafficLights: List with a pair of traffic light types for every street, see
+                       planTrafficLights(...), or None if the blocks have not all been
+                       planned yet.
+        blockSeed: If params["blockStreams"] is true, the seed the random streams of
+                   the blocks are derived from, see blockSeed(...). Otherwise None.
+    '''
+    def __init__(self, params, seed = None):
+        '''
+        Initializes an empty CityPlan object.
+
+        self: Object that is to be initialized.
+        params: See Attributes.
+        seed: See Attributes.
+        On exit: A CityPlan object without any decisions has been initialized.
+        '''
+        self.params = params
+        self.seed = seed
+        self.houseColours = []
+        self.treeColours = []
+        self.windowIncandescence = []
+        self.lightRotation = (0, 0)
+        self.streets = None
+        self.blocks = []
+        self.trafficLights = None
+        self.blockSeed = None
+
+    def isComplete(self):
+        '''
+        Checks if all the blocks and the traffic lights have been planned.
+
+        self: Object of the class CityPlan.
+        On exit: True is returned if the plan is complete, otherwise False.
+        '''
+        return self.trafficLights != None
+
+    def toDict(self):
+        '''
+        Converts the plan to a dictionary with only lists, numbers and strings.
+
+        self: Object of the class CityPlan.
+        On exit: A dictionary that can be written as JSON is returned. The plan is
+                 not changed.
+        '''
+        return {"version": PLAN_VERSION,
+                "params": self.params,
+                "seed": self.seed,
+                "houseColours": self.houseColours,
+                "treeColours": self.treeColours,
+                "windowIncandescence": self.windowIncandescence,
+                "lightRotation": self.lightRotation,
+                "streets": self.streets.toDict(),
+                "blocks": self.blocks,
+                "trafficLights": self.trafficLights,
+                "blockSeed": self.blockSeed}
+
+    def save(self, path):
+        '''
+        Writes the plan to a file.
+
+        self: Object of the class CityPlan.
+        path: The path of the file. If it ends with ".json" the plan is written as
+              JSON, otherwise as compressed binary data.
+        On exit: The plan has been written to the file.
+        '''
+        data = self.toDict()
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(data, f)
+        else:
+            with open(path, "wb") as f:
+                f.write(zlib.compress(pickle.dumps(data, 2)))
+
+def planFromDict(data):
+    '''
+    Creates a CityPlan object from a dictionary made by CityPlan.toDict().
+
+    data: The dictionary.
+    On exit: A CityPlan object with the decisions in the dictionary is returned. A
+             ValueError is raised if the dictionary was made by another version of
+             the planner.
+    '''
+    if data.get("version") != PLAN_VERSION:
+        raise ValueError("The plan was made by another version of the city generator.")
+    plan = CityPlan(data["params"], data["seed"])
+    plan.houseColours = data["houseColours"]
+    plan.treeColours = data["treeColours"]
+    plan.windowIncandescence = data["windowIncandescence"]
+    plan.lightRotation = data["lightRotation"]
+    plan.streets = streets.streetTreeFromDict(data["streets"])
+    plan.blocks = data["blocks"]
+    plan.trafficLights = data["trafficLights"]
+    plan.blockSeed = data["blockSeed"]
+    return plan
+
+def loadPlan(path):
+    '''
+    Reads a plan written by CityPlan.save(...).
+
+    path: The path of the file. Files ending with ".json" are read as JSON, other
+          files as compressed binary data. Only binary files written by this module
+          should be read, since they are unpickled.
+    On exit: The CityPlan object in the file is returned.
+    '''
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+    else:
+        with open(path, "rb") as f:
+            data = pickle.loads(zlib.decompress(f.read()))
+    return planFromDict(data)
+
+def cityParams(size, houseHeightInt, houseWidthInt, windows, booleans, deformers, daytime, glow, colourRange, streaming = False, recessed = False, blockStreams = False, treeSpacing = None):
+    '''
+    Collects the parameters that decide what a city looks like.
+
+    See cityGenerator.city(...) for the parameters.
+    On exit: A dictionary with the parameters is returned. Parameters that only
+             change how the city is built in maya, such as the name, the environment
+             colour or instancing, are left out.
+    '''
+    return {"size": list(size),
+            "houseHeightInt": list(houseHeightInt),
+            "houseWidthInt": list(houseWidthInt),
+            "windows": windows,
+            "booleans": booleans,
+            "deformers": deformers,
+            "daytime": daytime,
+            "glow": glow,
+            "colourRange": [list(colourRange[0]), list(colourRange[1])],
+            "streaming": streaming,
+            "recessed": recessed,
+            "blockStreams": blockStreams,
+            "treeSpacing": treeSpacing}
+
+def paramsKey(params, seed):
+    '''
+    Creates the name of a plan in the plan cache.
+
+    params: Dictionary made by cityParams(...).
+    seed: The seed of the plan.
+    On exit: A string with a hash of the parameters, the seed and the version of
+             the planner is returned.
+    '''
+    text = json.dumps([PLAN_VERSION, params, seed], sort_keys = True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def cachedPlan(cacheDir, params, seed):
+    '''
+    Looks up a plan in the plan cache.
+
+    cacheDir: The directory with the cached plans.
+    params: Dictionary made by cityParams(...).
+    seed: The seed of the plan.
+    On exit: The cached CityPlan object is returned, or None if there is no plan for
+             the parameters and the seed.
+    '''
+    path = os.path.join(cacheDir, paramsKey(params, seed) + ".plan")
+    if not os.path.isfile(path):
+        return None
+    return loadPlan(path)
+
+def storePlan(cacheDir, plan):
+    '''
+    Adds a plan to the plan cache.
+
+    cacheDir: The directory with the cached plans. It is created if needed.
+    plan: A complete CityPlan object with a seed.
+    On exit: The plan has been written in binary to the cache directory, named
+             after paramsKey(...). The path of the file is returned.
+    '''
+    if not os.path.isdir(cacheDir):
+        os.makedirs(cacheDir)
+    path = os.path.join(cacheDir, paramsKey(plan.params, plan.seed) + ".plan")
+    plan.save(path)
+    return path
+
+def getRandomValue(range):
+    '''
+    Picks a random value between a start point and endpoint, wrapping back to 0
+    when reaching 1.
+
+    range: A tuple defining the range from which the value will be picked.
+    On exit: A random value between 0 and 1 has been picked so that the
+             following is true:
+             range[0] <=  range[1] --> range[0] <= value <= range[1]
+             range[1] < range[0] --> (value > range[0] or value < range[1])
+             The random value is returned.
+    '''
+    if range[0] <= range[1]:
+        randomValue = random.uniform(range[0],range[1])
+    else:
+        randomValue = random.uniform(range[0],1 + range[1])
+        if randomValue > 1:
+             randomValue = randomValue - 1
+    return randomValue
+
+def windowShaderCount(daytime, glow):
+    '''
+    Returns the number of window shaders makeWindowShaders(...) creates.
+
+    daytime: Boolean variable which is true if it is day and false if it is night.
+    glow: Boolean variable which specifies if all windows will glow at night.
+    On exit: The number of window shaders is returned. The first one is the shader
+             most windows get.
+    '''
+    if daytime:
+        return 1
+    if glow:
+        return 4
+    return 5
+
+def makeZoneHeights(size, houseHeightInt):
+    '''
+    Creates a list of six different height ranges for the houses in the city.
+
+    size: Tuple defining the size of the city.
+    houseHeightInt: Tuple determining the minimum and the maximum height for the houses in the city.
+    On exit: A list containing six tuples specifying the height range for houses in the city zones
+             is returned. The first element in the list is the height range for the central zone,
+             while the last element is the height range for the zone furthest away from the city
+             center.
+    '''
+    heightChange = (houseHeightInt[1] - houseHeightInt[0]) / 9.0
+    heightIntList = []
+    heightIntList.append((houseHeightInt[1] - (heightChange * 2), houseHeightInt[1]))
+    heightIntList.append((houseHeightInt[1] - (heightChange * 4), houseHeightInt[1] - (heightChange * 2)))
+    heightIntList.append((houseHeightInt[1] - (heightChange * 6), houseHeightInt[1] - (heightChange * 4)))
+    heightIntList.append((houseHeightInt[1] - (heightChange * 7), houseHeightInt[1] - (heightChange * 6)))
+    heightIntList.append((houseHeightInt[1] - (heightChange * 8), houseHeightInt[1] - (heightChange * 6)))
+    heightIntList.append((houseHeightInt[1] - (heightChange * 9), houseHeightInt[1] - (heightChange * 8)))
+    return heightIntList
+
+def planCity(params, seed = None, workers = 0):
+    '''
+    Plans a whole city.
+
+    params: Dictionary made by cityParams(...).
+    seed: If not None, the random module is seeded with it before planning.
+    workers: See iterBlockPlans(...).
+    On exit: A complete CityPlan object is returned. Nothing has been created in maya.
+    '''
+    plan = startPlan(params, seed)
+    for block in iterBlockPlans(plan, workers):
+        pass
+    return plan
+
+def startPlan(params, seed = None):
+    '''
+    Plans the shaders, the lights and the first street of a city.
+
+    params: Dictionary made by cityParams(...).
+    seed: If not None, the random module is seeded with it before planning.
+    On exit: A CityPlan object is returned with the colours of the shaders, the
+             rotation of the light and the root street, and if params["blockStreams"]
+             is true the seed of the random streams of the blocks. The blocks are
+             planned by iterBlockPlans(...).
+    '''
+    if seed != None:
+        random.seed(seed)
+    plan = CityPlan(params, seed)
+    colourRange = params["colourRange"]
+    for i in range(40):
+        hue = getRandomValue((colourRange[0][0]/360.0,colourRange[1][0]/360.0))
+        saturation = getRandomValue((colourRange[0][1],colourRange[1][1]))
+        value = getRandomValue((colourRange[0][2],colourRange[1][2]))
+        plan.houseColours.append((hue*360, saturation, value))
+    for i in range(10):
+        hue = random.randint(75, 120)
+        saturation = random.uniform(0.6, 1)
+        value = random.uniform(0.15, 0.6)
+        plan.treeColours.append((hue, saturation, value))
+    if not params["daytime"]:
+        for i in range(4):
+            plan.windowIncandescence.append(random.uniform(0.1,0.6))
+    plan.lightRotation = (random.randint(-90,0), random.randint(0,360))
+    size = params["size"]
+    houseWidthInt = params["houseWidthInt"]
+    dir = random.choice(["horisontal","vertical"])
+    # The root of the binary tree forming the street structure for the city.
+    if (dir == "horisontal"):
+        firstSplit = random.uniform(-size[1] / 2.0 + houseWidthInt[0] + 8 ,size[1] / 2.0  -houseWidthInt[0] - 8)
+    else:
+        firstSplit = random.uniform(-size[0] / 2.0 + houseWidthInt[0] + 8 ,size[0] / 2.0  -houseWidthInt[0] - 8)
+    plan.streets = streets.StreetTree((dir,firstSplit), (-size[0] / 2.0,-size[1] / 2.0), (size[0] / 2.0, size[1] / 2.0))
+    if params["blockStreams"]:
+        plan.blockSeed = random.getrandbits(64)
+    return plan
+
+def iterBlockPlans(plan, workers = 0):
+    '''
+    Generator that plans the blocks of a city and yields them one at a time.
+
+    plan: Object of the class CityPlan made by startPlan(...), or a complete plan.
+    workers: The number of processes that plan blocks at the same time if
+             params["blockStreams"] is true. With 0 or 1 the blocks are planned
+             in this process. The plan is the same for any number of workers.
+    On exit: If the plan was complete, its blocks have been yielded. Otherwise the
+             street structure has been split, every block has been planned with
+             planBlock(...), appended to plan.blocks and yielded, and once the last
+             block has been yielded the traffic lights have been planned.
+             If params["blockStreams"] is false, all blocks draw from the random
+             module one after the other. If params["streaming"] is also true the
+             blocks are planned while the street structure is being split, which
+             gives a different city for the same seed.
+             If params["blockStreams"] is true, every block is planned by
+             planBlockStream(...) with its own random stream, so that the blocks
+             can be planned by a pool of worker processes. The blocks are yielded
+             in the same order either way, and streaming does not change the city.
+    '''
+    if plan.isComplete():
+        for block in plan.blocks:
+            yield block
+        return
+    params = plan.params
+    size = params["size"]
+    houseWidthInt = params["houseWidthInt"]
+    if params["streaming"]:
+        leaves = plan.streets.iterLeaves(houseWidthInt[1] + 8, houseWidthInt[0] + 8)
+    else:
+        plan.streets.split_(houseWidthInt[1] + 8, houseWidthInt[0] + 8)
+        leaves = plan.streets.listLeaves()
+    heightIntList = makeZoneHeights(size, params["houseHeightInt"]) # Make a list with 6 different height ranges for the houses.
+    maxCenterDistance = math.sqrt(math.pow((size[0] / 2.0), 2) + math.pow((size[1] / 2.0), 2))
+    zoneWidth = maxCenterDistance/6 # The thickness of each circular zone.
+    tasks = ((i, side, plan.streets.sideRectangle(i, side)) for i, side in leaves)
+    pool = None
+    if not params["blockStreams"]:
+        blocks = (planBlock(plan, task[2], heightIntList, zoneWidth) for task in tasks)
+    elif workers > 1:
+        # The workers only need the parameters, the shader counts and the seed.
+        shared = CityPlan(params, plan.seed)
+        shared.houseColours = plan.houseColours
+        shared.treeColours = plan.treeColours
+        shared.blockSeed = plan.blockSeed
+        pool = multiprocessing.Pool(workers, startWorker, (shared, heightIntList, zoneWidth))
+        # The street structure is split before the pool is used, and imap returns
+        # the blocks in the order of the tasks.
+        blocks = pool.imap(planWorkerBlock, list(tasks), 16)
+    else:
+        blocks = (planBlockStream(plan, task, heightIntList, zoneWidth) for task in tasks)
+    try:
+        for block in blocks:
+            plan.blocks.append(block)
+            yield block
+    finally:
+        if pool != None:
+            pool.terminate()
+            pool.join()
+    plan.trafficLights = planTrafficLights(plan.streets)
+
+def blockSeed(seed, street, side):
+    '''
+    Derives the seed of the random stream of a block.
+
+    seed: The seed of the random streams of the blocks, see CityPlan.
+    street: The index of the street the block is next to, see
+            streets.StreetTree.listLeaves().
+    side: The side of the street the block is on.
+    On exit: An integer seed is returned, which is the same on every platform and
+             every time for the same arguments.
+    '''
+    text = "%d/%d/%d" % (seed, street, side)
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:16], 16)
+
+def planBlockStream(plan, task, heightIntList, zoneWidth):
+    '''
+    Plans a block with its own random stream.
+
+    plan: Object of the class CityPlan with the parameters, the colours and the
+          block seed of the city.
+    task: Tuple with the index of the street, the side and the area of the block.
+    heightIntList: List made by makeZoneHeights(...).
+    zoneWidth: The thickness of each circular zone around the city center.
+    On exit: The block has been planned by planBlock(...) with a random.Random
+             object seeded by blockSeed(...), and the dictionary is returned with
+             the street and side added. The result only depends on the arguments,
+             not on the random module or on the other blocks.
+    '''
+    street, side, area = task
+    rng = random.Random(blockSeed(plan.blockSeed, street, side))
+    block = planBlock(plan, area, heightIntList, zoneWidth, rng)
+    block["street"] = street
+    block["side"] = side
+    return block
+
+# The state of a worker process, set by startWorker(...).
+workerState = None
+
+def startWorker(plan, heightIntList, zoneWidth):
+    '''
+    Prepares a worker process for planning blocks.
+
+    plan: See planBlockStream(...).
+    heightIntList: See planBlockStream(...).
+    zoneWidth: See planBlockStream(...).
+    On exit: The arguments have been stored in workerState, so that they do not
+             have to be sent to the worker with every block.
+    '''
+    global workerState
+    workerState = (plan, heightIntList, zoneWidth)
+
+def planWorkerBlock(task):
+    '''
+    Plans a block in a worker process.
+
+    task: See planBlockStream(...).
+    On exit: The block has been planned by planBlockStream(...) using the state
+             stored by startWorker(...), and the dictionary is returned.
+    '''
+    plan, heightIntList, zoneWidth = workerState
+    return planBlockStream(plan, task, heightIntList, zoneWidth)
+
+def planBlock(plan, area, heightIntList, zoneWidth, rng = random):
+    '''
+    Plans what is built on a block.
+
+    plan: Object of the class CityPlan.
+    area: Tuple containing two tuples with the coordinates for the minimum and the
+          maximum points of the block.
+    heightIntList: List made by makeZoneHeights(...).
+    zoneWidth: The thickness of each circular zone around the city center.
+    rng: The random module, or a random.Random object with the random stream of
+         the block.
+    On exit: A dictionary is returned with the area of the block, its "type",
+             which is "house" (80%), "fountainPark" (10%) or "park" (10%), and the
+             "inputs" made by blockInputs(...). The rest of the dictionary is made by
+             planHouse(...), planFountainPark(...) or planPark(...). The houses are
+             lower the further they are from the city center.
+    '''
+    centerx = (area[0][0] + area[1][0]) / 2.0
+    centerz = (area[0][1] + area[1][1]) / 2.0
+    width = (area[1][0] - area[0][0]) - 4
+    depth = (area[1][1] - area[0][1]) - 4
+    centerDistance = math.sqrt(math.pow(centerx, 2) + math.pow(centerz, 2))
+    blockType = rng.random() # Determine if house or park should be created.
+    if blockType < 0.8:
+        zone = int(math.floor(centerDistance / zoneWidth)) # Check which zone the house is in.
+        block = planHouse(heightIntList[zone], (width - 4,depth - 4), plan, rng)
+        block["type"] = "house"
+        block["inputs"] = blockInputs(plan, heightIntList[zone])
+    elif blockType < 0.9:
+        block = planFountainPark((width - 3,depth - 3), len(plan.treeColours), rng, plan.params["treeSpacing"])
+        block["type"] = "fountainPark"
+        block["inputs"] = blockInputs(plan)
+    else:
+        block = planPark((width - 3,depth - 3), len(plan.treeColours), rng, plan.params["treeSpacing"])
+        block["type"] = "park"
+        block["inputs"] = blockInputs(plan)
+    block["area"] = area
+    return block
+
+def blockInputs(plan, heightInt = None):
+    '''
+    Collects the parameters of the city that the plan of a block depends on.
+
+    plan: Object of the class CityPlan.
+    heightInt: The range for the height of a house, or None for a park.
+    On exit: A dictionary is returned with the height range ("zone"), the number of
+             house, tree and window "shaders", the "windows" settings (None without
+             windows, otherwise if they use booleans and if they are recessed), if
+             there are "deformers" and the time of day ("daytime"). The windows and
+             deformers are None for parks. With block streams, two blocks with the
+             same random stream and the same inputs have the same plan, see
+             cityGenerator.regenerateCity(...).
+    '''
+    params = plan.params
+    inputs = {"zone": None,
+              "shaders": [len(plan.houseColours), len(plan.treeColours),
+                          windowShaderCount(params["daytime"], params["glow"])],
+              "windows": None,
+              "deformers": None,
+              "daytime": params["daytime"]}
+    if heightInt != None:
+        inputs["zone"] = list(heightInt)
+        if params["windows"]:
+            inputs["windows"] = [params["booleans"], params["recessed"]]
+        inputs["deformers"] = params["deformers"]
+    return inputs
+
+def pickWindowShaders(windowNum, shaderCount, rng = random):
+    '''
+    Picks shaders for all the windows for a house.
+
+    windowNum: The number of windows the house has.
+    shaderCount: The number of window shaders.
+    rng: See planBlock(...).
+    On exit: A list is returned with the index of the shader for every window. Every
+             window has a 20% chance of getting a random shader, and otherwise gets
+             the first shader.
+    '''
+    windowMaterials = []
+    for i in range(windowNum):
+        light = rng.random()
+        if light < 0.2:
+            shader = rng.randrange(shaderCount)
+        else:
+            shader = 0
+        windowMaterials.append(shader)
+    return windowMaterials
+
+def boxWindowLayout(height, width, depth, shaderCount, booleans, recessed = False, rng = random):
+    '''
+    Places the windows for a box house.
+
+    height: The height of the house.
+    width: The width of the house.
+    depth: The depth of the house.
+    shaderCount: The number of window shaders.
+    booleans: A boolean variable which determines whether the windows should be
+              combined with the house using boolean difference or not.
+    recessed: A boolean variable which determines whether the windows should be
+              cut into the walls of the house directly. Overrides booleans.
+    rng: See planBlock(...).
+    On exit: The size and number of the windows have been picked randomly and
+             columns of windows have been placed on all four sides of the house.
+             The windows have been assigned shaders using pickWindowShaders(...).
+             A facade tuple as described in planHouse(...) is returned, or None if
+             the house gets no windows.
+    '''
+    windowHeight = rng.uniform(0.5,1.9)
+    # Make sure the window height is not too close to 1.6 since the window edge
+    # in that case will be too close to a edge loop on the house and the boolean
+    # operation will fail.
+    if booleans and not recessed and (windowHeight > 1.59 and windowHeight < 1.61):
+        windowHeight = rng.choice([1.59, 1.61])
+    windowWidth = rng.uniform(1, 3)
+    floorHeight = int(math.ceil(windowHeight))
+    heightNum = max(0,int((height - (1 + floorHeight/2.0))/floorHeight))
+    if heightNum == 0:
+        return None
+    widthNum = max(0,int((width - 0.3) / (windowWidth)))
+    if (widthNum != 0):
+        # Makes it possible for houses to have less windows or no windows on a side.
+        widthNum = widthNum - rng.randint(0, min(2, widthNum))
+    # Space between window columns along the width of the house.
+    widthSpace = (width - (widthNum * windowWidth)) /(widthNum + 1)
+    depthNum = max(0,int((depth - 0.3)/ windowWidth))
+    if (depthNum != 0):
+        # Makes it possible for houses to have less windows or no windows on a side.
+        depthNum = depthNum - rng.randint(0, min(2, depthNum))
+    if (depthNum == 0) and (widthNum == 0):
+        return None
+    # Space between window columns along the width of the house.
+    depthSpace = (depth - (depthNum * windowWidth)) / (depthNum + 1)
+    windowNum = widthNum * heightNum * 2 + depthNum * heightNum * 2 # Total number of windows.
+    columns = mesh.boxWindowColumns(width, depth, windowWidth, widthNum, widthSpace, depthNum, depthSpace)
+    return (columns, windowWidth, windowHeight, heightNum, floorHeight,
+            pickWindowShaders(windowNum, shaderCount, rng))
+
+def prismWindowLayout(height, radius, sides, shaderCount, booleans, recessed = False, rng = random):
+    '''
+    Places the windows for a cylinder or pipe house.
+
+    height: The height of the house.
+    radius: The radius of the house.
+    sides: The number of sides of the house.
+    shaderCount: The number of window shaders.
+    booleans: A boolean variable which determines whether the windows should be
+              combined with the house using boolean difference or not.
+    recessed: A boolean variable which determines whether the windows should be
+              cut into the walls of the house directly. Overrides booleans.
+    rng: See planBlock(...).
+    On exit: The size of the windows has been picked randomly and a column of
+             windows has been placed on every side of the house. The windows have
+             been assigned shaders using pickWindowShaders(...). A facade tuple as
+             described in planHouse(...) is returned, or None if the house is too
+             small for windows.
+    '''
+    windowHeight = rng.uniform(0.5,1.9)
+    # Make sure the window height is not too close to 1.6 since the window edge
+    # in that case will be too close to a edge loop on the house and the boolean
+    # operation will fail.
+    if booleans and not recessed and (windowHeight > 1.59 and windowHeight < 1.61):
+        windowHeight = rng.choice([1.59, 1.61])
+    floorHeight = int(math.ceil(windowHeight))
+    heightNum = int((height - (1 + floorHeight/2.0))/floorHeight)
+    if heightNum == 0:
+        return None
+    angleR = 2.0 * math.pi / sides
+    sideWidth = 2.0 * radius * math.sin(angleR / 2.0)
+    windowWidth = rng.uniform((sideWidth -0.2)/ 2.0, sideWidth - 0.2)
+    if windowWidth <= 0.1:
+        return None
+    windowNum = sides * heightNum
+    return (mesh.prismWindowColumns(radius, sides), windowWidth, windowHeight,
+            heightNum, floorHeight, pickWindowShaders(windowNum, shaderCount, rng))
+
+def drawDeformation(type, height, width, depth, rng = random):
+    '''
+    Picks the deformers for a house.
+
+    type: The type of the house ("box", "cylinder" or "pipe").
+    height: The height of the house.
+    width: The width of the house.
+    depth: The depth of the house.
+    rng: See planBlock(...).
+    On exit: A tuple is returned with the height the flare handle is moved to (None
+             if it is not moved), the end flare, the curve of the flare and the end
+             angle of the twist (None if the house gets no twist). Long box houses
+             never get a twist.
+    '''
+    flareY = None
+    endAngle = None
+    moveFlare = rng.choice(["Yes", "No"])
+    if (moveFlare == "Yes"):
+        flareY = rng.uniform(height / 2.0, height + height / 4.0)
+    endFlare = rng.uniform(0.3, 1.5)
+    curve = rng.uniform(-0.4, min((height/min(width, depth)) * 0.3, 0.9))
+    twist = rng.randint(0, 6)
+    if (twist == 0):
+        if not(type == "box" and (width/depth > 1.5 or depth/width > 1.5)):
+            endAngle = rng.randint(-90, 90)
+    return (flareY, endFlare, curve, endAngle)
+
+def planHouse(heightInt, wxd, plan, rng = random):
+    '''
+    Plans a house.
+
+    heightInt: The range for the height of the house.
+    wxd: A tuple defining the width and the depth of the area of the house.
+    plan: Object of the class CityPlan, used for its parameters and the number of
+          shaders.
+    rng: See planBlock(...).
+    On exit: A dictionary is returned with the index of the house "shader", the
+             "shape" ("box", "cylinder" or "pipe"), the "height", the "width" and
+             "depth" of a box or the "radius", "sides" and for a pipe "thickness" of
+             the other shapes, the "facade", the "deformation" and the "streetTrees".
+             The facade is None or a tuple with the columns, windowWidth,
+             windowHeight, heightNum, floorHeight and window shader indices for
+             mesh.windowMesh(...). The deformation is None or a tuple made by
+             drawDeformation(...). The street trees are a list made by
+             streetTreeRows(...), with a list of trees made by planTree(...) added
+             to every row.
+    '''
+    params = plan.params
+    house = {}
+    house["shader"] = rng.randrange(len(plan.houseColours))
+    house["shape"] = rng.choice(["box", "cylinder", "pipe"])
+    house["height"] = height = int(rng.uniform(heightInt[0], heightInt[1]))
+    if (house["shape"] == "box"):
+        house["width"] = width = wxd[0]
+        house["depth"] = depth = wxd[1]
+    else:
+        house["radius"] = radius = min(wxd[0], wxd[1])  / 2.0
+        house["sides"] = sides = rng.randint(3, 20)
+        width = depth = radius * 2
+    if (house["shape"] == "pipe"):
+        house["thickness"] = rng.uniform(min(1, radius - 0.2), max(radius - 2, min(1.1, radius - 0.5)))
+    facade = None
+    if params["windows"]:
+        shaderCount = windowShaderCount(params["daytime"], params["glow"])
+        if house["shape"] == "box":
+            facade = boxWindowLayout(height, width, depth, shaderCount, params["booleans"], params["recessed"], rng)
+        else:
+            facade = prismWindowLayout(height, radius, sides, shaderCount, params["booleans"], params["recessed"], rng)
+    house["facade"] = facade
+    deformation = None
+    if params["deformers"]:
+        deformation = drawDeformation(house["shape"], height, width, depth, rng)
+    house["deformation"] = deformation
+    rows = []
+    if house["shape"] != "box":
+        rows = streetTreeRows(wxd)
+        for row in rows:
+            # A row always has at least one tree.
+            row["trees"] = [planTree(len(plan.treeColours), rng) for i in range(max(1, row["num"]))]
+    house["streetTrees"] = rows
+    return house
+
+def streetTreeRows(wxd):
+    '''
+    Places rows of street trees on empty areas around a cylinder or pipe house.
+
+    wxd: Tuple containing the width and depth of the area the house and
+         the trees will take up.
+    On exit: If there is a lot of empty space on the same block as the house, a list
+             with two rows is returned, otherwise an empty list. Every row is a
+             dictionary with the number of trees "num", the coordinates "coor" of the
+             center of the row and the direction "dir" of the row ("horisontal" or
+             "vertical"), see park.makeRowOfStreetTrees(...).
+    '''
+    rows = []
+    if wxd[0]/wxd[1] >= 1.5: # Check if there is too much empty space on the block.
+        distance = (wxd[0] - wxd[1]) / 2.0 # distance between the house and the street.
+        if distance > wxd[1]:
+            num = int((distance + 1.5) / 2.8)
+            dir = "horisontal"
+        else:
+            num = int((wxd[1] + 3)/ 2.8)
+            dir = "vertical"
+        rows.append({"num": num, "coor": ((wxd[1] + distance)/ 2.0 + 1,0), "dir": dir})
+        rows.append({"num": num, "coor": ((-wxd[1] - distance)/ 2.0 - 1,0), "dir": dir})
+    if wxd[1]/wxd[0] >= 1.5: # Check if there is too much empty space on the block.
+        distance = (wxd[1] - wxd[0]) / 2.0 # distance between the house and the street.
+        if distance > wxd[0]:
+            num = int((distance + 1.5) / 2.8)
+            dir = "vertical"
+        else:
+            num = int((wxd[0] + 3)/ 2.8)
+            dir = "horisontal"
+        rows.append({"num": num, "coor": (0,(wxd[0] + distance)/ 2.0 + 1), "dir": dir})
+        rows.append({"num": num, "coor": (0, (-wxd[0] - distance)/ 2.0 - 1), "dir": dir})
+    return rows
+
+# The range of the height of the tree trunks and of how far the tops of the crowns
+# are pulled up, and the range of the scale of the crowns, which are spheres with
+# radius 0.5 before they are scaled.
+TREE_HEIGHTS = (0.3, 1.5)
+TREE_SCALES = (0.7, 1.8)
+
+def planTree(shaderCount, rng = random):
+    '''
+    Plans a tree.
+
+    shaderCount: The number of tree crown shaders.
+    rng: See planBlock(...).
+    On exit: A list is returned with the height of the trunk, how far the top of the
+             crown is pulled up, the index of the crown shader and the scale of the
+             crown, see park.makeTree(...).
+    '''
+    height = rng.uniform(TREE_HEIGHTS[0],TREE_HEIGHTS[1])
+    translation = rng.uniform(TREE_HEIGHTS[0],TREE_HEIGHTS[1])
+    shader = rng.randrange(shaderCount)
+    scale_ = rng.uniform(TREE_SCALES[0],TREE_SCALES[1])
+    return [height, translation, shader, scale_]
+
+def treeBox(tree, x, z):
+    '''
+    Computes the bounding rectangle of a planned tree.
+
+    tree: List made by planTree(...).
+    x: The x-coordinate of the tree.
+    z: The z-coordinate of the tree.
+    On exit: A tuple with the minimum x- and z-coordinates and the maximum x- and
+             z-coordinates of the tree seen from above is returned. The crown is a
+             sphere with radius 0.5 scaled by the scale of the tree, which is always
+             wider than the trunk.
+    '''
+    radius = 0.5 * tree[3]
+    return (x - radius, z - radius, x + radius, z + radius)
+
+def planTreesInSquare(squareBbox, shaderCount, rng = random, spacing = None):
+    '''
+    Places trees randomly in a given square.
+
+    squareBbox: A list of two tuples containing the x- and z-coordinates for the
+                bounding box of a square.
+    shaderCount: The number of tree crown shaders.
+    rng: See planBlock(...).
+    spacing: None, or the smallest gap between the crowns of two trees.
+    On exit: A dictionary is returned with the "bbox" of the square and the "trees",
+             which is a list where each tree made by planTree(...) has its x- and
+             z-coordinates appended. If spacing is None, at most nine trees have been
+             placed randomly using a dart throwing algorithm which gives up after six
+             failed attempts. As when the trees were placed in maya, the last tree is
+             always left out. Otherwise the square has been filled with trees by
+             scatterTrees(...).
+    '''
+    if spacing != None:
+        return {"bbox": squareBbox, "trees": scatterTrees(squareBbox, shaderCount, spacing, rng)}
+    treeList = []
+    positions = []
+    while True:
+        failCount = 0
+        tree = planTree(shaderCount, rng)
+        treeList.append(tree)
+        box = treeBox(tree, 0, 0)
+        radius = (box[2] - box[0]) / 2.0
+        coorx = rng.uniform(squareBbox[0][0] + radius, squareBbox[1][0] - radius)
+        coorz = rng.uniform(squareBbox[0][1] + radius, squareBbox[1][1] - radius)
+        positions.append((coorx, coorz))
+        while True:
+            failed = False
+            for j in range(len(treeList)):
+                bbox1 = treeBox(tree, coorx, coorz)
+                bbox2 = treeBox(treeList[j], positions[j][0], positions[j][1])
+                # Check if the tree intersects with element j in treeList.
+                xinters = (bbox1[0] < bbox2[2] and bbox1[0] > bbox2[0])\
+                       or (bbox2[0] < bbox1[2] and bbox2[0] > bbox1[0])
+                zinters = (bbox1[1] < bbox2[3] and bbox1[1] > bbox2[1])\
+                       or (bbox2[1] < bbox1[3] and bbox2[1] > bbox1[1])
+                if xinters and zinters:
+                    coorx = rng.uniform(squareBbox[0][0] + radius, squareBbox[1][0] - radius)
+                    coorz = rng.uniform(squareBbox[0][1] + radius, squareBbox[1][1] - radius)
+                    positions[-1] = (coorx, coorz)
+                    failCount = failCount + 1
+                    failed = True
+                    break
+            if (failed == False) or (failCount > 5):
+                break
+        if (failCount > 5) or (len(treeList) == 10):
+            break
+    # Leave out the last tree, which was not successfully placed.
+    treeList.pop()
+    trees = [treeList[i] + list(positions[i]) for i in range(len(treeList))]
+    return {"bbox": squareBbox, "trees": trees}
+
+def scatterTrees(squareBbox, shaderCount, spacing, rng = random, attempts = 30):
+    '''
+    Fills a square with trees by Poisson-disk sampling.
+
+    squareBbox: See planTreesInSquare(...).
+    shaderCount: The number of tree crown shaders.
+    spacing: The smallest gap between the crowns of two trees.
+    rng: See planBlock(...).
+    attempts: The number of places tried around a tree for the next one.
+    On exit: A list is returned with trees made by planTree(...) with their x- and
+             z-coordinates appended, whose crowns lie inside the square and are at
+             least spacing apart. Every tree after the first has been planned and
+             tried at random places at one to two times the smallest distance from a
+             random tree that may still have room around it. If none of the places
+             had room, the tree has been left out and the other tree is not tried
+             again. The square is then full, so the number of trees grows with its
+             area. The crowns are only checked against the trees in the 3 x 3 cells
+             of a grid around the new tree, since the cells are as wide as the
+             largest distance between two trees that touch.
+    '''
+    (minx, minz), (maxx, maxz) = squareBbox
+    cellSize = TREE_SCALES[1] + spacing
+    grid = {}
+    trees = []
+    def fits(x, z, radius):
+        if x - radius < minx or x + radius > maxx or z - radius < minz or z + radius > maxz:
+            return False
+        column = int(math.floor((x - minx) / cellSize))
+        row = int(math.floor((z - minz) / cellSize))
+        for i in range(column - 1, column + 2):
+            for j in range(row - 1, row + 2):
+                for other in grid.get((i, j), ()):
+                    distance = radius + 0.5 * other[3] + spacing
+                    if (other[4] - x) ** 2 + (other[5] - z) ** 2 < distance ** 2:
+                        return False
+        return True
+    def add(tree, x, z):
+        tree.extend([x, z])
+        trees.append(tree)
+        cell = (int(math.floor((x - minx) / cellSize)), int(math.floor((z - minz) / cellSize)))
+        grid.setdefault(cell, []).append(tree)
+    for i in range(attempts):
+        # The first tree that fits in the square is placed anywhere in it.
+        tree = planTree(shaderCount, rng)
+        radius = 0.5 * tree[3]
+        if maxx - minx >= 2 * radius and maxz - minz >= 2 * radius:
+            add(tree, rng.uniform(minx + radius, maxx - radius), rng.uniform(minz + radius, maxz - radius))
+            break
+    active = list(trees)
+    while active != []:
+        index = rng.randrange(len(active))
+        parent = active[index]
+        tree = planTree(shaderCount, rng)
+        radius = 0.5 * tree[3]
+        distance = 0.5 * parent[3] + radius + spacing
+        for i in range(attempts):
+            angle = rng.uniform(0, 2 * math.pi)
+            length = rng.uniform(distance, 2 * distance)
+            x = parent[4] + length * math.cos(angle)
+            z = parent[5] + length * math.sin(angle)
+            if fits(x, z, radius):
+                add(tree, x, z)
+                active.append(tree)
+                break
+        else:
+            active[index] = active[-1]
+            active.pop()
+    return trees
+
+def planFountain(rng = random):
+    '''
+    Plans a fountain.
+
+    rng: See planBlock(...).
+    On exit: A dictionary is returned with the scale and the height of every step
+             of the basin ("steps"), of the inside of the basin ("basin") and of
+             every step of the pillar ("stepsUp") as pairs, and the "top"
+             decoration as a tuple with its height, its type ("cube", "cylinder",
+             "prism", "cone" or "sphere"), the curve of its flare (None if it has
+             no flare) and the end angle of its twist (None if it has no twist).
+             See park.makeFountain(...).
+    '''
+    fountain = {"steps": [], "stepsUp": []}
+    steps = rng.randint(1,3)
+    for i in range(steps):
+        scale_ = rng.uniform(0.6, 0.95)
+        translation = rng.uniform(0.1, 0.6)
+        fountain["steps"].append((scale_, translation))
+    scale_ = rng.uniform(0.3,0.6)
+    translation = rng.uniform(0.2,0.4)
+    fountain["basin"] = (scale_, translation)
+    stepsUp = rng.randint(1,3)
+    for i in range(stepsUp):
+        scale_ = rng.uniform(0.4,0.9)
+        translation = rng.uniform(0.05,1)
+        fountain["stepsUp"].append((scale_, translation))
+    height = rng.uniform(0.1,0.6)
+    # Decide which type of object will form the top.
+    type = rng.choice(["cube", "cylinder", "prism", "cone", "sphere"])
+    curve = None
+    endAngle = None
+    flare = rng.choice([0,1])
+    if flare == 1:
+        curve = rng.uniform(-3,3)
+    twist = rng.choice([0,1])
+    if type == "cube" or type == "prism":
+        if twist == 1:
+            endAngle = rng.randint(-500, 500)
+    fountain["top"] = (height, type, curve, endAngle)
+    return fountain
+
+def planFountainPark(wxd, shaderCount, rng = random, treeSpacing = None):
+    '''
+    Plans a park with a fountain in the middle.
+
+    wxd: A tuple containing the width and the depth of the park.
+    shaderCount: The number of tree crown shaders.
+    rng: See planBlock(...).
+    treeSpacing: The spacing of planTreesInSquare(...).
+    On exit: A dictionary is returned with the "fountain" made by planFountain() and
+             the four "squares" with trees around the paths, made by
+             planTreesInSquare(...). See park.makeFountainPark(...).
+    '''
+    fountain = planFountain(rng)
+    squares = [planTreesInSquare(((-wxd[0]/2.0, -wxd[1]/2.0), (-1,-1)), shaderCount, rng, treeSpacing),
+               planTreesInSquare(((-wxd[0]/2.0, 1),(-1, wxd[1]/2.0)), shaderCount, rng, treeSpacing),
+               planTreesInSquare(((1, -wxd[1]/2.0),(wxd[0]/2.0, -1)), shaderCount, rng, treeSpacing),
+               planTreesInSquare(((1,1),(wxd[0]/2.0, wxd[1]/2.0)), shaderCount, rng, treeSpacing)]
+    return {"fountain": fountain, "squares": squares}
+
+def planPark(wxd, shaderCount, rng = random, treeSpacing = None):
+    '''
+    Plans a park block with paths and trees.
+
+    wxd: A tuple containing the width and the depth of the park.
+    shaderCount: The number of tree crown shaders.
+    rng: See planBlock(...).
+    treeSpacing: The spacing of planTreesInSquare(...).
+    On exit: A dictionary is returned with the direction "dir" of the first path
+             ("horisontal" or "vertical"), the coordinates of the three "paths" and
+             the four "squares" with trees around the paths, made by
+             planTreesInSquare(...). See park.makePark(...).
+    '''
+    # Decide if the first path should be horisontal (along the x-axis) or vertical (along the z-axis).
+    dir = rng.choice(["horisontal", "vertical"])
+    if dir == "horisontal":
+        path1 = rng.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the first path.
+        path2 = rng.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the second path.
+        path3 = rng.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the third path.
+        squareBboxes = [((-wxd[0]/2.0, -wxd[1]/2.0), (path2 - 0.5, path1 - 1)),
+                        ((-wxd[0]/2.0, path1 + 1), (path3 - 0.5, wxd[1]/2.0)),
+                        ((path2 + 0.5, -wxd[1]/2.0), (wxd[0]/2.0, path1 - 1)),
+                        ((path3 + 0.5, path1 + 1), (wxd[0]/2.0, wxd[1]/2.0))]
+    else:
+        path1 = rng.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the first path.
+        path2 = rng.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the second path.
+        path3 = rng.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the third path.
+        squareBboxes = [((-wxd[0]/2.0, -wxd[1]/2.0), (path1 - 1, path2 - 0.5)),
+                        ((-wxd[0]/2.0, path2 + 0.5), (path1 - 1, wxd[1]/2.0)),
+                        ((path1 + 1, -wxd[1]/2.0), (wxd[0]/2.0, path3 - 0.5)),
+                        ((path1 + 1, path3 + 0.5), (wxd[0]/2.0, wxd[1]/2.0))]
+    squares = [planTreesInSquare(bbox, shaderCount, rng, treeSpacing) for bbox in squareBboxes]
+    return {"dir": dir, "paths": (path1, path2, path3), "squares": squares}
+
+def pickTrafficLight():
+    '''
+    Picks the type of a traffic light.
+
+    On exit: The index of the traffic light type in the list used by
+             trafficLight.placeTrafficLights(...) is returned: 0 (red, 40%), 3
+             (green, 40%), 2 (yellow, 10%) or 1 (red and yellow, 10%).
+    '''
+    num = random.random()
+    if num > 0.6:
+        return 0
+    elif num > 0.2:
+        return 3
+    elif num > 0.1:
+        return 2
+    return 1
+
+def planTrafficLights(street):
+    '''
+    Picks the traffic lights for every street in the city.
+
+    street: An object of the class streets.StreetTree.
+    On exit: A list is returned with a pair for every street, in the order the
+             streets are stored in the tree, with the types picked by
+             pickTrafficLight() for the start and the end of the street.
+    '''
+    return [(pickTrafficLight(), pickTrafficLight()) for i in range(len(street))]
@@ -0,0 +1,688 @@
+import math
+import colorsys
+import mesh
+import deform
+import streets
+
+'''
+List of procedures in the module:
+    def blockPavement(area):
+        Computes the pavement of a block.
+    def streetLightPositions(center, width, depth):
+        Places the street lights around a block.
+    def parkLightPositions(plan):
+        Places the street lights at the paths of a park.
+    def parkFences(plan, wxd):
+        Places the fences around a park.
+    def trafficLightPlacements(street, size, choices):
+        Places the traffic lights at the ends of the streets.
+    def streetTreePositions(row):
+        Places the trees in a row of street trees.
+    def treeScale(tree):
+        Computes how the tree prototype is scaled to look like a planned tree.
+    def blockProps(blockPlan):
+        Lists the copies of prototypes that are placed on a block.
+    def trafficLightProps(street, size, choices):
+        Lists the copies of the traffic light prototypes in the city.
+    def propGroup(name_):
+        Returns the group the copies of a prototype belong to.
+    def blockMesh(blockPlan, booleans, recessed):
+        Creates the mesh of the house or the park on a block.
+    def houseMesh(plan, booleans, recessed):
+        Creates the mesh of a planned house.
+    def parkMesh(plan, wxd):
+        Creates the mesh of the fences and the fountain of a planned park.
+    def fenceMesh(fences, spacing = FENCE_SPACING):
+        Creates one mesh with a number of fences.
+    def groundMesh(size):
+        Creates the mesh of the ground under the city.
+    def prototypeMesh(name_):
+        Creates the mesh of a prototype.
+    def materialColours(plan, environment):
+        Lists the colour of every material in a city.
+    def addSphere(mesh_, center, radius, rings, segments, material):
+        Adds a sphere to a mesh.
+    def addCone(mesh_, base, radius, height, sides, material, heightSegments = 1):
+        Adds a cone to a mesh.
+    def addFence(mesh_, startPoint, endPoint, axis, spacing = FENCE_SPACING):
+        Adds a fence between two points to a mesh.
+    def fountainProfile(fountain):
+        Computes the outline of a planned fountain.
+    def addFountain(mesh_, fountain):
+        Adds a planned fountain to a mesh.
+    def addFountainTop(mesh_, top, y):
+        Adds the top decoration of a planned fountain to a mesh.
+    def fountainMesh(fountain):
+        Creates the mesh of a planned fountain.
+'''
+
+# This module describes what buildCity(...) puts in the scene, from the plan alone
+# and without maya, so that a city can be written to other file formats. Objects
+# the city has many identical copies of are described once as prototypes and then
+# placed as props, tuples with the name of the prototype, the translation, the
+# rotation around the y-axis in degrees and the scale along the x-, y- and z-axis.
+# The prototypes are:
+#     "pavement": A box of height 0.2 and width and depth 1.
+#     "grass": A box of height 0.3 and width and depth 1.
+#     "streetLight": A street light, see trafficLight.makeStreetLight().
+#     "trafficLightR", "trafficLightRY", "trafficLightY" and "trafficLightG": The
+#         traffic lights, see trafficLight.makeTrafficLight(...).
+#     "tree0", "tree1", ...: A tree for every tree crown colour, see park.makeTree(...).
+#     "streetTreeBase": The platform and fence around a street tree, see
+#         park.makeStreetTree(...).
+# The geometry of the props is simplified, the houses, fences and fountains are the
+# same as in maya. The materials are named after the shading groups in maya, with
+# the house, window and tree crown shaders numbered as in the lists of the plan:
+# "houseMaterial%dGroup", "glassMaterial%dGroup" and "treeMaterial%dGroup".
+
+# The traffic light types in the order of the indices in CityPlan.trafficLights.
+TRAFFIC_LIGHT_TYPES = ("R", "RY", "Y", "G")
+
+# The smallest distance between the poles of a fence.
+FENCE_SPACING = 0.8
+
+def blockPavement(area):
+    '''
+    Computes the pavement of a block.
+
+    area: Tuple containing two tuples with the x- and z-coordinates for the minimum
+          and the maximum points of the block.
+    On exit: A tuple is returned with the x- and z-coordinates of the center, the
+             width and the depth of the pavement, which leaves room for the streets
+             around the block.
+    '''
+    center = ((area[0][0] + area[1][0]) / 2.0, (area[0][1] + area[1][1]) / 2.0)
+    width = (area[1][0] - area[0][0]) - 4
+    depth = (area[1][1] - area[0][1]) - 4
+    return (center, width, depth)
+
+def streetLightPositions(center, width, depth):
+    '''
+    Places the street lights around a block.
+
+    center: Tuple with the x- and z-coordinates of the center of the pavement.
+    width: The width of the pavement.
+    depth: The depth of the pavement.
+    On exit: A list is returned with the x- and z-coordinates of every street light.
+             The lights are evenly spread along the edges of the pavement, about 5
+             units apart, and come in pairs on opposite edges: first the pairs along
+             the width and then the pairs along the depth.
+    '''
+    positions = []
+    widthNumber = int(width / 5.0 - 1) #number of objects placed along the width of the block
+    widthDistance = width / (widthNumber + 1) #distance between every object
+    depthNumber = int(depth / 5.0 - 1) #number of objects placed along the depth of the block
+    depthDistance = depth / (depthNumber + 1) #distance between every object
+    for j in range(widthNumber):
+        positions.append((center[0] - width/2.0 + (j+1) * widthDistance, center[1] - depth/2.0 + 0.2))
+        positions.append((center[0] - width/2.0 + (j+1) * widthDistance, center[1] + depth/2.0 - 0.2))
+    for j in range(depthNumber):
+        positions.append((center[0] - width/2.0 + 0.2, center[1] - depth/2.0 + (j+1) * depthDistance))
+        positions.append((center[0] + width/2.0 - 0.2, center[1] - depth/2.0 + (j+1) * depthDistance))
+    return positions
+
+def parkLightPositions(plan):
+    '''
+    Places the street lights at the paths of a park.
+
+    plan: Dictionary made by cityPlan.planPark(...) or cityPlan.planFountainPark(...).
+    On exit: A list is returned with the x- and z-coordinates of the four street
+             lights, relative to the center of the park. In a park with paths they
+             stand at the corners where the paths meet, and in a fountain park
+             around the fountain.
+    '''
+    if not "paths" in plan:
+        return [(-1.5,-0.9), (-1.5,0.9), (1.5,-0.9), (1.5,0.9)]
+    path1, path2, path3 = plan["paths"]
+    if plan["dir"] == "horisontal":
+        # path1 is a z-coordinate and path2 and path3 are x-coordinates.
+        return [(path3 - 1.5,path1 + 0.9), (path3 + 1.5,path1 + 0.9),
+                (path2 - 1.5,path1 - 0.9), (path2 + 1.5,path1 - 0.9)]
+    # path1 is a x-coordinate and path2 and path3 are z-coordinates.
+    return [(path1 + 0.9,path3 - 1.5), (path1 + 0.9,path3 + 1.5),
+            (path1 - 0.9,path2 - 1.5), (path1 - 0.9,path2 + 1.5)]
+
+def parkFences(plan, wxd):
+    '''
+    Places the fences around a park.
+
+    plan: Dictionary made by cityPlan.planPark(...) or cityPlan.planFountainPark(...).
+    wxd: A tuple containing the width and the depth of the park.
+    On exit: A list is returned with the start point, the end point and the axis of
+             the eight fences around the park, as arguments for park.makeFence(...).
+             The fences leave openings where the paths leave the park.
+    '''
+    w = wxd[0]/2.0
+    d = wxd[1]/2.0
+    if not "paths" in plan:
+        return [((-w,d), (-1,d), "x"), ((1,d), (w,d), "x"),
+                ((w,d), (w,1), "z"), ((w,-1), (w,-d), "z"),
+                ((w,-d), (1,-d), "x"), ((-1,-d), (-w,-d), "x"),
+                ((-w,-d), (-w,-1), "z"), ((-w,1), (-w,d), "z")]
+    path1, path2, path3 = plan["paths"]
+    if plan["dir"] == "horisontal":
+        return [((-w,-d), (path2 -0.5,-d), "x"), ((path2 + 0.5,-d), (w,-d), "x"),
+                ((w,-d), (w,path1 - 1), "z"), ((w,path1 + 1), (w,d), "z"),
+                ((w,d), (path3 + 0.5,d), "x"), ((path3 - 0.5,d), (-w,d), "x"),
+                ((-w,d), (-w,path1 + 1), "z"), ((-w,path1 - 1), (-w,-d), "z")]
+    return [((-w,-d), (path1 -1,-d), "x"), ((path1 + 1,-d), (w,-d), "x"),
+            ((w,-d), (w,path3 - 0.5), "z"), ((w,path3 + 0.5), (w,d), "z"),
+            ((w,d), (path1 + 1,d), "x"), ((path1 - 1,d), (-w,d), "x"),
+            ((-w,d), (-w,path2 + 0.5), "z"), ((-w,path2 - 0.5), (-w,-d), "z")]
+
+def trafficLightPlacements(street, size, choices):
+    '''
+    Places the traffic lights at the ends of the streets.
+
+    street: An object of the class streets.StreetTree.
+    size: Tuple that contains the x- and z-components for the size of the city.
+    choices: List with a pair of traffic light types for every street, see
+             cityPlan.planTrafficLights(...).
+    On exit: A list is returned with a tuple for every traffic light, with the index
+             of its type in TRAFFIC_LIGHT_TYPES, its x- and z-coordinates and its
+             rotation around the y-axis in degrees.
+             The lights come in pairs, one on each side of the street, at the start
+             and at the end of every street except at the edge of the city. The
+             streets are visited in the order they are stored in the tree.
+    '''
+    placements = []
+    for i in range(len(street)):
+        type1, type2 = choices[i]
+        start = street.startPoint(i)
+        end = street.endPoint(i)
+        if street.direction[i] == streets.HORISONTAL:
+            if start[0] != -size[0]/2.0:
+                placements.append((type1, start[0]+3, start[1] + 2.2, 90))
+                placements.append((type1, start[0]+3, start[1] - 2.2, 90))
+            if end[0] != size[0]/2.0:
+                placements.append((type2, end[0]-3, end[1] + 2.2, -90))
+                placements.append((type2, end[0]-3, end[1] - 2.2, -90))
+        else:
+            if start[1] != -size[1]/2.0:
+                placements.append((type1, start[0] + 2.2, start[1] + 3, 0))
+                placements.append((type1, start[0] - 2.2, start[1] + 3, 0))
+            if end[1] != size[1]/2.0:
+                placements.append((type2, end[0] + 2.2, end[1] - 3, 180))
+                placements.append((type2, end[0] - 2.2, end[1] - 3, 180))
+    return placements
+
+def streetTreePositions(row):
+    '''
+    Places the trees in a row of street trees.
+
+    row: Dictionary describing the row, see park.makeRowOfStreetTrees(...).
+    On exit: A list is returned with the x- and z-coordinates of every tree in the
+             row, relative to the center of the house. The trees are 2.8 units apart.
+    '''
+    num = len(row["trees"])
+    start = -(num - 1)/2.0 * 2.8
+    coor = row["coor"]
+    if row["dir"] == "vertical":
+        # The row is rotated 90 degrees around the y-axis.
+        return [(coor[0], coor[1] - start - i * 2.8) for i in range(num)]
+    return [(coor[0] + start + i * 2.8, coor[1]) for i in range(num)]
+
+def treeScale(tree):
+    '''
+    Computes how the tree prototype is scaled to look like a planned tree.
+
+    tree: List made by cityPlan.planTree(...).
+    On exit: A tuple with the scale along the x-, y- and z-axis is returned. The
+             prototype has a trunk of height 1 and an unscaled crown, so the crown
+             is scaled by the scale of the tree and the whole tree is stretched to
+             the height of the trunk and the scaled crown. How far the top of the
+             crown is pulled up is left out.
+    '''
+    height, translation, shader, scale_ = tree[:4]
+    return (scale_, (height + 1.1 * scale_) / 2.1, scale_)
+
+def blockProps(blockPlan):
+    '''
+    Lists the copies of prototypes that are placed on a block.
+
+    blockPlan: Dictionary describing the block, made by cityPlan.planBlock(...).
+    On exit: A list of props is returned, with the pavement, the street lights
+             around it and the trees, the street tree platforms and the squares of
+             grass of the house or the park, and for a park the street lights
+             along its paths. The props are placed in world space.
+    '''
+    center, width, depth = blockPavement(blockPlan["area"])
+    cx, cz = center
+    props = [("pavement", (cx, 0, cz), 0, (width, 1, depth))]
+    for x, z in streetLightPositions(center, width, depth):
+        props.append(("streetLight", (x, 0, z), 0, (1, 1, 1)))
+    if blockPlan["type"] == "house":
+        for row in blockPlan["streetTrees"]:
+            rotation = 0
+            if row["dir"] == "vertical":
+                rotation = 90
+            for tree, (x, z) in zip(row["trees"], streetTreePositions(row)):
+                props.append(("streetTreeBase", (cx + x, 0, cz + z), rotation, (1, 1, 1)))
+                props.append(("tree%d" % tree[2], (cx + x, 0, cz + z), rotation, treeScale(tree)))
+        return props
+    for square in blockPlan["squares"]:
+        squareBbox = square["bbox"]
+        x = (squareBbox[0][0] + squareBbox[1][0]) / 2.0
+        z = (squareBbox[0][1] + squareBbox[1][1]) / 2.0
+        props.append(("grass", (cx + x, 0, cz + z), 0,
+                      (squareBbox[1][0] - squareBbox[0][0], 1, squareBbox[1][1] - squareBbox[0][1])))
+        for tree in square["trees"]:
+            props.append(("tree%d" % tree[2], (cx + tree[4], 0, cz + tree[5]), 0, treeScale(tree)))
+    for x, z in parkLightPositions(blockPlan):
+        props.append(("streetLight", (cx + x, 0, cz + z), 0, (1, 1, 1)))
+    return props
+
+def trafficLightProps(street, size, choices):
+    '''
+    Lists the copies of the traffic light prototypes in the city.
+
+    street: See trafficLightPlacements(...).
+    size: See trafficLightPlacements(...).
+    choices: See trafficLightPlacements(...).
+    On exit: A list is returned with a prop for every traffic light placed by
+             trafficLightPlacements(...).
+    '''
+    return [("trafficLight" + TRAFFIC_LIGHT_TYPES[type], (x, 0, z), rotation, (1, 1, 1))
+            for type, x, z, rotation in trafficLightPlacements(street, size, choices)]
+
+def propGroup(name_):
+    '''
+    Returns the group the copies of a prototype belong to.
+
+    name_: The name of the prototype.
+    On exit: The name of the group in the scene that buildCity(...) in cityGenerator
+             puts the copies in is returned: "blocks", "parks", "streetLights",
+             "trafficLights" or "trees".
+    '''
+    if name_ == "pavement":
+        return "blocks"
+    if name_ == "grass":
+        return "parks"
+    if name_ == "streetLight":
+        return "streetLights"
+    if name_.startswith("trafficLight"):
+        return "trafficLights"
+    return "trees"
+
+def blockMesh(blockPlan, booleans, recessed):
+    '''
+    Creates the mesh of the house or the park on a block.
+
+    blockPlan: Dictionary describing the block, made by cityPlan.planBlock(...).
+    booleans: See houseMesh(...).
+    recessed: See houseMesh(...).
+    On exit: A Mesh object is returned with the house made by houseMesh(...) or the
+             fences and fountain made by parkMesh(...), relative to the center of
+             the block.
+    '''
+    if blockPlan["type"] == "house":
+        return houseMesh(blockPlan, booleans, recessed)
+    center, width, depth = blockPavement(blockPlan["area"])
+    return parkMesh(blockPlan, (width - 3,depth - 3))
+
+def houseMesh(plan, booleans, recessed):
+    '''
+    Creates the mesh of a planned house.
+
+    plan: Dictionary describing the house, made by cityPlan.planHouse(...).
+    booleans: A boolean variable which determines whether the windows are cut
+              into the house.
+    recessed: A boolean variable which determines whether the windows are recessed
+              into the walls of the house.
+    On exit: A Mesh object is returned with the house at the origin, built as
+             makeHouse(...) in cityGenerator builds it with baked deformers. Windows
+             that maya would subtract with booleans are recessed into the walls
+             instead, which looks the same.
+    '''
+    material = "houseMaterial%dGroup" % plan["shader"]
+    facade = plan["facade"]
+    if facade != None:
+        facade = tuple(facade[:5]) + (["glassMaterial%dGroup" % i for i in facade[5]],)
+    recessedFacade = None
+    if recessed or booleans:
+        recessedFacade = facade
+    houseShape = plan["shape"]
+    if houseShape == "box":
+        house = mesh.boxHouseMesh(plan["height"], plan["width"], plan["depth"], material, recessedFacade)
+    if houseShape == "cylinder":
+        house = mesh.cylinderHouseMesh(plan["height"], plan["radius"], plan["sides"], material, recessedFacade)
+    if houseShape == "pipe":
+        house = mesh.pipeHouseMesh(plan["height"], plan["radius"], plan["sides"], plan["thickness"], material,
+                                   recessedFacade)
+    if facade != None and recessedFacade == None:
+        house.append(mesh.windowMesh(*facade))
+    if plan["deformation"] != None:
+        deform.bakeDeformation([house], plan["height"], plan["deformation"])
+    return house
+
+def parkMesh(plan, wxd):
+    '''
+    Creates the mesh of the fences and the fountain of a planned park.
+
+    plan: Dictionary made by cityPlan.planPark(...) or cityPlan.planFountainPark(...).
+    wxd: A tuple containing the width and the depth of the park.
+    On exit: A Mesh object is returned with the fences placed by parkFences(...) and,
+             in a fountain park, the fountain, relative to the center of the park.
+    '''
+    park = fenceMesh(parkFences(plan, wxd))
+    if "fountain" in plan:
+        addFountain(park, plan["fountain"])
+    return park
+
+def fenceMesh(fences, spacing = FENCE_SPACING):
+    '''
+    Creates one mesh with a number of fences.
+
+    fences: List with the start point, the end point and the axis of every fence,
+            see parkFences(...).
+    spacing: The smallest distance between the poles, see addFence(...).
+    On exit: A Mesh object is returned with every fence added by addFence(...), in
+             the order of the list, so that the runs of fence around a park can be
+             built as one object.
+    '''
+    fence = mesh.Mesh()
+    for startPoint, endPoint, axis in fences:
+        addFence(fence, startPoint, endPoint, axis, spacing)
+    return fence
+
+def groundMesh(size):
+    '''
+    Creates the mesh of the ground under the city.
+
+    size: Tuple with the x- and z-components for the size of the city.
+    On exit: A Mesh object is returned with a single face covering the city, facing
+             up and with the street material.
+    '''
+    ground = mesh.Mesh()
+    w = size[0] / 2.0
+    d = size[1] / 2.0
+    first = ground.vertexCount()
+    for x, z in [(-w, d), (w, d), (w, -d), (-w, -d)]:
+        ground.addVertex(x, 0, z)
+    ground.addFace([first, first + 1, first + 2, first + 3], ground.materialId("streetMaterialGroup"))
+    return ground
+
+def prototypeMesh(name_):
+    '''
+    Creates the mesh of a prototype.
+
+    name_: The name of the prototype, see the top of the module.
+    On exit: A Mesh object is returned with the prototype standing on the origin.
+    '''
+    prototype = mesh.Mesh()
+    if name_ == "pavement":
+        mesh.addBox(prototype, (0, 0, 0), (1, 0.2, 1), "pavementMaterialGroup")
+    elif name_ == "grass":
+        mesh.addBox(prototype, (0, 0, 0), (1, 0.3, 1), "grassMaterialGroup")
+    elif name_ == "streetLight":
+        mesh.addBox(prototype, (0, 0, 0), (0.1, 2.4, 0.1), "blackMetalGroup")
+        mesh.addBox(prototype, (0, 2.4, 0), (0.37, 0.08, 0.37), "blackMetalGroup")
+        mesh.addBox(prototype, (0, 2.48, 0), (0.3, 0.22, 0.3), "whiteLightGroup")
+        mesh.addCylinder(prototype, (0, 2.7, 0), 0.2, 0.1, 4, "blackMetalGroup")
+        mesh.addBox(prototype, (0, 2.8, 0), (0.04, 0.5, 0.04), "blackMetalGroup")
+    elif name_.startswith("trafficLight"):
+        glow = name_[len("trafficLight"):]
+        mesh.addBox(prototype, (0, 0, 0), (0.1, 2, 0.1), "blackMetalGroup")
+        mesh.addBox(prototype, (0, 2, 0), (0.3, 0.7, 0.3), "blackMetalGroup")
+        # The lamps from the top: red, yellow and green.
+        lamps = [("red", glow == "R" or glow == "RY"), ("yellow", glow == "Y" or glow == "RY"),
+                 ("green", glow == "G")]
+        for i in range(3):
+            colour, lit = lamps[i]
+            if lit:
+                colour = colour + "Light"
+            mesh.addBox(prototype, (0, 2.475 - i * 0.225, 0.15), (0.2, 0.2, 0.04), colour + "Group")
+    elif name_ == "streetTreeBase":
+        mesh.addCylinder(prototype, (0, 0.2, 0), 0.8, 0.1, 20, "fountainMaterialGroup")
+        for i in range(10):
+            start = prototype.vertexCount()
+            mesh.addBox(prototype, (0.7, 0.15, 0), (0.04, 0.6, 0.04), "blackMetalGroup")
+            prototype.rotateY(36 * i, start)
+        mesh.addPipe(prototype, (0, 0.4, 0), 0.67, 0.04, 0.1, 20, "blackMetalGroup")
+        mesh.addPipe(prototype, (0, 0.6, 0), 0.67, 0.04, 0.1, 20, "blackMetalGroup")
+    elif name_.startswith("tree"):
+        mesh.addCylinder(prototype, (0, 0.2, 0), 0.07, 1, 8, "trunkMaterialGroup")
+        addSphere(prototype, (0, 1.6, 0), 0.5, 8, 12, "treeMaterial%sGroup" % name_[len("tree"):])
+    return prototype
+
+def materialColours(plan, environment):
+    '''
+    Lists the colour of every material in a city.
+
+    plan: Object of the class cityPlan.CityPlan.
+    environment: Triple with the colour value of the environment, which the windows
+                 reflect during the day.
+    On exit: A dictionary is returned from the name of every material to a tuple
+             with its RGB colour and its RGB incandescence, with the same values as
+             the shaders maya gets.
+    '''
+    daytime = plan.params["daytime"]
+    colours = {"streetMaterialGroup": (0.145,0.145,0.145), "pavementMaterialGroup": (0.701,0.628,0.594),
+               "fountainMaterialGroup": (0.691,0.683,0.596), "grassMaterialGroup": (0.043,0.392,0.008),
+               "fenceMaterialGroup": (0.373,0.269,0.168), "trunkMaterialGroup": (0.124,0.043,0.000),
+               "blackMetalGroup": (0.090, 0.090, 0.090), "greenGroup": (0.0, 0.4, 0.0),
+               "redGroup": (0.6, 0.0, 0.0), "yellowGroup": (0.6,0.6,0.0),
+               "greenLightGroup": (0.0, 1.0, 0.0), "redLightGroup": (1.0, 0.0, 0.0),
+               "yellowLightGroup": (1.0,1.0,0.0), "whiteLightGroup": (0.474, 0.487, 0.334)}
+    materials = dict([(name_, (colour, (0, 0, 0))) for name_, colour in colours.items()])
+    if daytime:
+        glowing = {"greenLightGroup": (0.0,0.128,0.0), "redLightGroup": (1.0, 0.118, 0.118),
+                   "yellowLightGroup": (0.12, 0.09, 0.0)}
+    else:
+        glowing = {"whiteLightGroup": (0.4,0.4,0.4), "greenLightGroup": (0.0,0.812,0.0),
+                   "redLightGroup": (1.0, 0.0, 0.0), "yellowLightGroup": (0.725, 0.532, 0.0)}
+    for name_, incandescence in glowing.items():
+        materials[name_] = (colours[name_], incandescence)
+    for i in range(len(plan.houseColours)):
+        h, s, v = plan.houseColours[i]
+        materials["houseMaterial%dGroup" % i] = (colorsys.hsv_to_rgb(h / 360.0, s, v), (0, 0, 0))
+    for i in range(len(plan.treeColours)):
+        h, s, v = plan.treeColours[i]
+        materials["treeMaterial%dGroup" % i] = (colorsys.hsv_to_rgb(h / 360.0, s, v), (0, 0, 0))
+    # The window shaders in the order makeWindowShaders(...) creates them.
+    windows = []
+    if daytime:
+        windows.append((tuple(environment), (0, 0, 0)))
+    else:
+        if not plan.params["glow"]:
+            windows.append(((0, 0, 0), (0, 0, 0)))
+        for inc in plan.windowIncandescence:
+            windows.append(((1.0,0.75,0), (inc, inc * 0.922, inc * 0.399)))
+    for i in range(len(windows)):
+        materials["glassMaterial%dGroup" % i] = windows[i]
+    return materials
+
+def addSphere(mesh_, center, radius, rings, segments, material):
+    '''
+    Adds a sphere to a mesh.
+
+    mesh_: Object of the class mesh.Mesh.
+    center: Tuple with the coordinates for the center of the sphere.
+    radius: The radius of the sphere.
+    rings: Number of segments from the bottom to the top of the sphere.
+    segments: Number of segments around the sphere.
+    material: Name of the shading group for the faces.
+    On exit: A closed sphere with a vertex at each pole has been added to the mesh.
+    '''
+    materialId = mesh_.materialId(material)
+    bottom = mesh_.addVertex(center[0], center[1] - radius, center[2])
+    for i in range(1, rings):
+        angle = math.pi * i / rings
+        ringRadius = radius * math.sin(angle)
+        y = center[1] - radius * math.cos(angle)
+        for x, z in mesh.circlePoints(ringRadius, segments):
+            mesh_.addVertex(center[0] + x, y, center[2] + z)
+    top = mesh_.addVertex(center[0], center[1] + radius, center[2])
+    first = bottom + 1
+    for j in range(segments):
+        k = (j + 1) % segments
+        mesh_.addFace([bottom, first + k, first + j], materialId)
+    mesh.addWall(mesh_, first, segments, rings - 2, materialId)
+    last = first + (rings - 2) * segments
+    for j in range(segments):
+        k = (j + 1) % segments
+        mesh_.addFace([last + j, last + k, top], materialId)
+
+def addCone(mesh_, base, radius, height, sides, material, heightSegments = 1):
+    '''
+    Adds a cone to a mesh.
+
+    mesh_: Object of the class mesh.Mesh.
+    base: Tuple with the coordinates for the center of the bottom of the cone.
+    radius: The radius of the bottom of the cone.
+    height: The height of the cone.
+    sides: Number of sides around the cone.
+    material: Name of the shading group for the faces.
+    heightSegments: Number of segments the sides are divided in along the y-axis.
+    On exit: A cone with one polygon at the bottom and a vertex at the tip has been
+             added to the mesh.
+    '''
+    materialId = mesh_.materialId(material)
+    first = mesh_.vertexCount()
+    for i in range(heightSegments):
+        y = base[1] + height * i / float(heightSegments)
+        for x, z in mesh.circlePoints(radius * (1 - i / float(heightSegments)), sides):
+            mesh_.addVertex(base[0] + x, y, base[2] + z)
+    tip = mesh_.addVertex(base[0], base[1] + height, base[2])
+    mesh.addWall(mesh_, first, sides, heightSegments - 1, materialId)
+    last = first + (heightSegments - 1) * sides
+    for j in range(sides):
+        k = (j + 1) % sides
+        mesh_.addFace([last + j, last + k, tip], materialId)
+    mesh_.addFace([first + j for j in range(sides - 1, -1, -1)], materialId)
+
+def addFence(mesh_, startPoint, endPoint, axis, spacing = FENCE_SPACING):
+    '''
+    Adds a fence between two points to a mesh.
+
+    mesh_: Object of the class mesh.Mesh.
+    startPoint: Tuple with the x- and z-coordinates where the fence starts.
+    endPoint: Tuple with the x- and z-coordinates where the fence ends.
+    axis: String that specifies along which axis the fence runs, "x" or "z".
+    spacing: The smallest distance between the poles.
+    On exit: The two bars and the poles of the fence have been added to the mesh
+             as boxes with the fence material. The poles divide the fence evenly
+             from the start point to the end point, as many as fit at least spacing
+             apart, with a single pole at the start of a fence shorter than spacing.
+    '''
+    if axis == "x":
+        a = 0
+    else:
+        a = 1
+    length = abs(startPoint[a] - endPoint[a])
+    poleNumber = int(length / spacing)
+    if poleNumber != 0:
+        distance = float(endPoint[a] - startPoint[a]) / poleNumber
+    else:
+        distance = 0
+    middle = list(startPoint)
+    middle[a] = startPoint[a] + (endPoint[a] - startPoint[a])/2.0
+    barSize = [0.05, 0.05]
+    barSize[a] = length
+    poleSize = [0.05, 0.05]
+    poleSize[a] = 0.1
+    for y in (0.775, 0.475):
+        mesh.addBox(mesh_, (middle[0], y, middle[1]), (barSize[0], 0.05, barSize[1]), "fenceMaterialGroup")
+    for i in range(poleNumber + 1):
+        pole = list(startPoint)
+        pole[a] = startPoint[a] + i * distance
+        mesh.addBox(mesh_, (pole[0], 0.2, pole[1]), (poleSize[0], 0.7, poleSize[1]), "fenceMaterialGroup")
+
+def fountainProfile(fountain):
+    '''
+    Computes the outline of a planned fountain.
+
+    fountain: Dictionary made by cityPlan.planFountain().
+    On exit: A list is returned with the radius and the height of every ring of
+             the fountain, from the bottom edge to the top. Every step of the plan
+             first scales the top of the fountain and then moves it up, as the
+             extrusions of the top of a cylinder would.
+    '''
+    radius = 1.0
+    height = 0.3
+    profile = [(radius, 0.2), (radius, height)]
+    extrusions = list(fountain["steps"]) + [(0.9, -0.3), tuple(fountain["basin"])] + list(fountain["stepsUp"])
+    for scale_, translation in extrusions:
+        radius = radius * scale_
+        profile.append((radius, height))
+        height = height + translation
+        profile.append((radius, height))
+    return profile
+
+def addFountain(mesh_, fountain):
+    '''
+    Adds a planned fountain to a mesh.
+
+    mesh_: Object of the class mesh.Mesh.
+    fountain: Dictionary made by cityPlan.planFountain().
+    On exit: The outline made by fountainProfile(...) has been revolved with 20
+             sides, closed at the bottom and the top and given the fountain
+             material. The top decoration has been added on top of it by
+             addFountainTop(...).
+    '''
+    materialId = mesh_.materialId("fountainMaterialGroup")
+    profile = fountainProfile(fountain)
+    sides = 20
+    first = mesh_.vertexCount()
+    for radius, height in profile:
+        for x, z in mesh.circlePoints(radius, sides):
+            mesh_.addVertex(x, height, z)
+    for i in range(len(profile) - 1):
+        low = first + i * sides
+        high = low + sides
+        for j in range(sides):
+            k = (j + 1) % sides
+            mesh_.addFace([low + j, low + k, high + k, high + j], materialId)
+    mesh_.addFace([first + j for j in range(sides - 1, -1, -1)], materialId)
+    top = first + (len(profile) - 1) * sides
+    mesh_.addFace([top + j for j in range(sides)], materialId)
+    addFountainTop(mesh_, fountain["top"], max([height for radius, height in profile]))
+
+def addFountainTop(mesh_, top, y):
+    '''
+    Adds the top decoration of a planned fountain to a mesh.
+
+    mesh_: Object of the class mesh.Mesh.
+    top: Tuple with the height, the type, the flare curve and the twist angle of
+         the top, see cityPlan.planFountain().
+    y: The height of the top of the fountain, where the decoration stands.
+    On exit: The primitive of the type has been added standing on the y-axis at y,
+             with the fountain material and the sizes and subdivisions the
+             primitives of maya used to get: a box of width 0.2, a cylinder or cone
+             of radius 0.1 with 20 sides, or a triangular prism with sides of 0.1,
+             all with 10 segments along the height, or a sphere with the height as
+             its diameter. The planned flare and twist have been baked into its
+             vertices by deform.flare(...) and deform.twist(...), with the handles
+             fitted to the decoration as maya's nonlinear deformers are.
+    '''
+    height, type, curve, endAngle = top
+    material = "fountainMaterialGroup"
+    part = mesh.Mesh()
+    base = (0, y, 0)
+    if type == "cube":
+        mesh.addBox(part, base, (0.2, height, 0.2), material, 10)
+    elif type == "cylinder":
+        mesh.addCylinder(part, base, 0.1, height, 20, material, 10)
+    elif type == "prism":
+        mesh.addCylinder(part, base, 0.1 / math.sqrt(3), height, 3, material, 10)
+    elif type == "cone":
+        addCone(part, base, 0.1, height, 20, material, 10)
+    else:
+        addSphere(part, (0, y + height / 2.0, 0), height / 2.0, 20, 20, material)
+    center = (0, y + height / 2.0, 0)
+    if curve != None:
+        deform.flare(part.points, center, height / 2.0, 1.0, curve)
+    if endAngle != None:
+        deform.twist(part.points, center, height / 2.0, endAngle)
+    mesh_.append(part)
+
+def fountainMesh(fountain):
+    '''
+    Creates the mesh of a planned fountain.
+
+    fountain: Dictionary made by cityPlan.planFountain().
+    On exit: A Mesh object with the fountain made by addFountain(...) is returned.
+    '''
+    fountain_ = mesh.Mesh()
+    addFountain(fountain_, fountain)
+    return fountain_
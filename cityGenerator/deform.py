@@ -0,0 +1,133 @@
+import math
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+'''
+List of procedures in the module:
+    def deformerParameter(points, center, halfHeight):
+        Computes where the vertices are along the axis of a nonlinear deformer.
+    def flare(points, center, halfHeight, endFlare, curve, startFlare = 1.0):
+        Applies a flare deformation to the vertices of a mesh.
+    def twist(points, center, halfHeight, endAngle, startAngle = 0.0):
+        Applies a twist deformation to the vertices of a mesh.
+    def bakeDeformation(meshes, height, deformation):
+        Deforms the meshes of a house the way its planned deformers would.
+'''
+
+# The functions below evaluate Maya's flare and twist deformers directly on the
+# flat point array of a mesh.Mesh, so that a house can be deformed before it is
+# created instead of getting live deformer nodes. The deformer handle is assumed
+# to be upright, centered at center and scaled to halfHeight along the y-axis,
+# which is how House.addDeformer(...) sets the handles up. As in Maya, the
+# deformation is clamped outside the low and high bounds (-1 and 1 in handle space).
+# NumPy is used when it is available, otherwise the points are deformed one by one.
+
+def deformerParameter(points, center, halfHeight):
+    '''
+    Computes where the vertices are along the axis of a nonlinear deformer.
+
+    points: Array with the x-, y- and z-coordinates of every vertex after each other.
+    center: Tuple with the coordinates for the center of the deformer handle.
+    halfHeight: The scale of the deformer handle along the y-axis.
+    On exit: A list (or NumPy array) is returned with a value for every vertex that
+             goes from 0 at the low bound to 1 at the high bound of the deformer.
+    '''
+    if numpy != None:
+        y = numpy.frombuffer(points, dtype = numpy.float64)[1::3]
+        return (numpy.clip((y - center[1]) / halfHeight, -1.0, 1.0) + 1.0) / 2.0
+    return [(min(max((points[i] - center[1]) / halfHeight, -1.0), 1.0) + 1.0) / 2.0
+            for i in range(1, len(points), 3)]
+
+def flare(points, center, halfHeight, endFlare, curve, startFlare = 1.0):
+    '''
+    Applies a flare deformation to the vertices of a mesh.
+
+    points: Array with the x-, y- and z-coordinates of every vertex after each other.
+    center: Tuple with the coordinates for the center of the deformer handle.
+    halfHeight: The scale of the deformer handle along the y-axis.
+    endFlare: The scale in x and z at the high bound (endFlareX and endFlareZ).
+    curve: The amount the sides bulge out between the bounds (curve).
+    startFlare: The scale in x and z at the low bound (startFlareX and startFlareZ).
+    On exit: The x- and z-coordinates of every vertex have been scaled away from the
+             axis of the handle by startFlare + (endFlare - startFlare) * u +
+             4 * curve * u * (1 - u), where u is given by deformerParameter(...).
+             The points have been updated in place.
+    '''
+    if len(points) == 0:
+        return
+    u = deformerParameter(points, center, halfHeight)
+    if numpy != None:
+        p = numpy.frombuffer(points, dtype = numpy.float64).reshape(-1, 3)
+        scale = startFlare + (endFlare - startFlare) * u + 4.0 * curve * u * (1.0 - u)
+        p[:, 0] = center[0] + (p[:, 0] - center[0]) * scale
+        p[:, 2] = center[2] + (p[:, 2] - center[2]) * scale
+        return
+    for i in range(len(u)):
+        scale = startFlare + (endFlare - startFlare) * u[i] + 4.0 * curve * u[i] * (1.0 - u[i])
+        points[i * 3] = center[0] + (points[i * 3] - center[0]) * scale
+        points[i * 3 + 2] = center[2] + (points[i * 3 + 2] - center[2]) * scale
+
+def twist(points, center, halfHeight, endAngle, startAngle = 0.0):
+    '''
+    Applies a twist deformation to the vertices of a mesh.
+
+    points: Array with the x-, y- and z-coordinates of every vertex after each other.
+    center: Tuple with the coordinates for the center of the deformer handle.
+    halfHeight: The scale of the deformer handle along the y-axis.
+    endAngle: The rotation in degrees at the high bound (endAngle).
+    startAngle: The rotation in degrees at the low bound (startAngle).
+    On exit: Every vertex has been rotated around the axis of the handle by
+             startAngle + (endAngle - startAngle) * u degrees, where u is given by
+             deformerParameter(...). Positive angles rotate the same way as a
+             positive y rotation in Maya. The points have been updated in place.
+    '''
+    if len(points) == 0:
+        return
+    u = deformerParameter(points, center, halfHeight)
+    if numpy != None:
+        p = numpy.frombuffer(points, dtype = numpy.float64).reshape(-1, 3)
+        angle = numpy.radians(startAngle + (endAngle - startAngle) * u)
+        cos = numpy.cos(angle)
+        sin = numpy.sin(angle)
+        x = p[:, 0] - center[0]
+        z = p[:, 2] - center[2]
+        p[:, 0], p[:, 2] = center[0] + x * cos + z * sin, center[2] - x * sin + z * cos
+        return
+    for i in range(len(u)):
+        angle = math.radians(startAngle + (endAngle - startAngle) * u[i])
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        x = points[i * 3] - center[0]
+        z = points[i * 3 + 2] - center[2]
+        points[i * 3] = center[0] + x * cos + z * sin
+        points[i * 3 + 2] = center[2] - x * sin + z * cos
+
+def bakeDeformation(meshes, height, deformation):
+    '''
+    Deforms the meshes of a house the way its planned deformers would.
+
+    meshes: List with objects of the class mesh.Mesh that make up the house, the
+            house itself first.
+    height: The height of the house.
+    deformation: Tuple with the height the flare handle is moved to (None if it is
+                 not moved), the end flare, the curve of the flare and the end angle
+                 of the twist (None if the house gets no twist), see
+                 cityPlan.drawDeformation(...).
+    On exit: A flare and the occasional twist have been applied to the points of all
+             the meshes. The handles are centered in the bounding box of the first
+             mesh, the flare handle moved to flareY if it is given, and scaled to
+             half the height of the house, as House.addDeformer(...) sets them up.
+    '''
+    flareY, endFlare, curve, endAngle = deformation
+    box = meshes[0].boundingBox()
+    center = ((box[0] + box[3]) / 2.0, (box[1] + box[4]) / 2.0, (box[2] + box[5]) / 2.0)
+    flareCenter = center
+    if flareY != None:
+        flareCenter = (0, flareY, 0)
+    for m in meshes:
+        flare(m.points, flareCenter, height / 2.0, endFlare, curve)
+    if endAngle != None:
+        for m in meshes:
+            twist(m.points, center, height / 2.0, endAngle)
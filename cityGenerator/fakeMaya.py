@@ -0,0 +1,1836 @@
+import sys
+import math
+import re
+import types
+
+'''
+List of procedures in the module:
+    class Node:
+        A Node object is a node in the scene graph of a fake maya scene.
+
+        def __init__(self, name_, type, dag = False):
+            Initializes a Node object without connections.
+    class Scene:
+        A Scene object holds the nodes of a fake maya scene and records the
+        commands run on it.
+
+        def __init__(self, costs = None, keepCalls = True):
+            Initializes an empty scene with the default nodes of maya.
+        def clear(self):
+            Removes all nodes except the default ones.
+        def record(self, command, args, kwargs, caller):
+            Records a command and charges its cost.
+        def summary(self, key = "command"):
+            Sums the calls and costs by command or by calling procedure.
+        def report(self, top = 15):
+            Describes where the calls and costs went.
+        def uniqueName(self, name_, numbered = False):
+            Gives a name that no node has, in the way maya does.
+        def add(self, name_, type, dag = False, numbered = False):
+            Adds a node to the scene.
+        def forget(self, node):
+            Takes a node out of the scene.
+        def find(self, name_):
+            Finds the node of a name, path or component.
+        def remove(self, node):
+            Deletes a node with its children and history.
+        def makeTransform(self, name_, shapeType, numbered = False, parent = None):
+            Adds a transform with a shape.
+        def addHistory(self, shape, type, kwargs):
+            Adds a construction history node to a shape.
+        def worldMatrix(self, node):
+            Computes the world matrix of a transform.
+        def worldBox(self, node):
+            Computes the world space bounding box of a transform and its children.
+        def selected(self, args):
+            Gives the objects a command works on.
+    def install(costs = None, keepCalls = True):
+        Replaces maya with the fake one.
+    def command(name_, procedure):
+        Wraps a procedure as a recorded maya command.
+    def flag(kwargs, long, short, default = None):
+        Reads a flag given by its long or short name.
+    def flatten(args):
+        Collects the names in nested lists and tuples.
+    def component(name_):
+        Splits a component into the object name, the kind and the index range.
+    def boxCorners(box):
+        Lists the corners of a bounding box.
+    def transformPoint(point, matrix):
+        Transforms a point by a 4x4 matrix.
+    def multiply(a, b):
+        Multiplies two 4x4 matrices.
+    def localMatrix(node):
+        Computes the matrix of a transform relative to its parent.
+    def moveLike(node, attribute, args, kwargs):
+        Applies a move, rotate or scale command to a transform.
+    def primitive(type, defaultName):
+        Makes the procedure of a polygon primitive command.
+    def combine(args, kwargs, type, box):
+        Replaces polygon objects with one that combines them.
+    def unionBox(boxes):
+        Computes the box around a list of boxes.
+    def polyUnite(*args, **kwargs):
+        Combines polygon objects.
+    def polyBoolOp(*args, **kwargs):
+        Combines two polygon objects with a boolean operation.
+    def selectedFaces(args):
+        Counts the faces a component command works on, for every object.
+    def polyExtrudeFacet(*args, **kwargs):
+        Extrudes faces.
+    def polyChipOff(*args, **kwargs):
+        Duplicates or extracts faces.
+    def polySubdivideFacet(*args, **kwargs):
+        Subdivides faces.
+    def polySoftEdge(*args, **kwargs):
+        Softens or hardens edges.
+    def transforms(args, skipMissing = False):
+        Finds the transforms a command works on.
+    def xform(*args, **kwargs):
+        Queries or changes transforms.
+    def move(*args, **kwargs):
+        Moves transforms.
+    def rotate(*args, **kwargs):
+        Rotates transforms.
+    def scale(*args, **kwargs):
+        Scales transforms.
+    def select(*args, **kwargs):
+        Changes the selection.
+    def delete(*args, **kwargs):
+        Deletes nodes or their construction history.
+    def copyTransform(node, name_, shape, parent_):
+        Makes a transform with the values of another.
+    def duplicate(*args, **kwargs):
+        Copies transforms with their shapes and children.
+    def instance(*args, **kwargs):
+        Makes transforms that share the shape of another.
+    def reparent(node, parent_):
+        Moves a transform under another transform.
+    def group(*args, **kwargs):
+        Makes a transform with the given objects as children.
+    def parent(*args, **kwargs):
+        Changes the parents of transforms.
+    def hide(*args, **kwargs):
+        Hides transforms.
+    def showHidden(*args, **kwargs):
+        Shows hidden transforms.
+    def listRelatives(*args, **kwargs):
+        Lists the shapes, children or parent of a node.
+    def ls(*args, **kwargs):
+        Lists nodes.
+    def objExists(name_):
+        Checks if a node exists.
+    def rename(old, new):
+        Renames a node.
+    def createNode(type, **kwargs):
+        Creates a node of a type.
+    def setAttr(plug, *values, **kwargs):
+        Sets an attribute.
+    def getAttr(plug, **kwargs):
+        Gets an attribute.
+    def connectAttr(source, destination, **kwargs):
+        Connects two attributes.
+    def sets(*args, **kwargs):
+        Creates sets or assigns members to them.
+    def shadingNode(type, **kwargs):
+        Creates a shader or other rendering node.
+    def surfaceShaderList(shader, **kwargs):
+        Connects a shader to a shading group.
+    def nonLinear(*args, **kwargs):
+        Adds a nonlinear deformer to the selected objects.
+    def softSelect(**kwargs):
+        Changes the soft selection settings.
+    def exactWorldBoundingBox(*args, **kwargs):
+        Computes the world space bounding box of objects.
+    def camera(*args, **kwargs):
+        Creates, edits or queries a camera.
+    def light(type):
+        Makes the procedure of a light command.
+    def lookThru(*args, **kwargs):
+        Looks through a camera.
+    def idle(*args, **kwargs):
+        Does nothing, for commands that only change the user interface or undo.
+    def file(*args, **kwargs):
+        Starts, renames or saves the scene.
+    class MPoint:
+        A stand-in for maya.api.OpenMaya.MPoint.
+
+        def __init__(self, x = 0.0, y = 0.0, z = 0.0, w = 1.0):
+            Initializes a point.
+    class MObject:
+        A stand-in for maya.api.OpenMaya.MObject that refers to a node.
+
+        def __init__(self, node = None):
+            Initializes an MObject.
+    class MFnMesh:
+        A stand-in for maya.api.OpenMaya.MFnMesh that can create meshes.
+
+        def __init__(self):
+            Initializes an MFnMesh without a mesh.
+        def create(self, points, faceCounts, faceConnects, *args):
+            Creates a mesh.
+        def object(self):
+            Gives the mesh shape.
+        def name(self):
+            Gives the name of the mesh shape.
+    class MFnDagNode:
+        A stand-in for maya.api.OpenMaya.MFnDagNode.
+
+        def __init__(self, object_):
+            Initializes an MFnDagNode for a node.
+        def partialPathName(self):
+            Gives the name of the node.
+    class MDagPath:
+        A stand-in for maya.api.OpenMaya.MDagPath.
+
+        def __init__(self, node = None):
+            Initializes a path to a node.
+        def getAPathTo(object_):
+            Gives a path to a node.
+        def fullPathName(self):
+            Gives the full path of the node.
+    class MDGMessage:
+        A stand-in for maya.api.OpenMaya.MDGMessage with the callbacks for added
+        and removed nodes.
+
+        def addNodeAddedCallback(function, nodeType = "dependNode", clientData = None):
+            Registers a procedure that is called when a node is added.
+        def addNodeRemovedCallback(function, nodeType = "dependNode", clientData = None):
+            Registers a procedure that is called when a node is removed.
+    class MMessage:
+        A stand-in for maya.api.OpenMaya.MMessage that removes callbacks.
+
+        def removeCallback(id):
+            Removes a callback.
+    def addCallback(kind, function, clientData):
+        Registers a callback in the scene.
+'''
+
+# The fake maya runs the city generator without maya, so that it can be timed,
+# profiled and tested anywhere. install() puts modules named maya.cmds,
+# maya.api.OpenMaya and maya.standalone in sys.modules, which have to be in place
+# before the modules of the city generator are imported. Every command is
+# recorded with its arguments and the procedure that called it, and charged a
+# cost from a table, so the commands that dominate a city show up without maya.
+#
+# The scene graph has the nodes, names, parents, transforms, shapes, construction
+# history, sets and attributes that the commands create, and the names follow the
+# rules of maya, so that names the generator builds from other names resolve. The
+# meshes only keep their numbers of vertices and faces and a bounding box: the
+# primitives get the sizes and counts maya gives them, combined meshes get the
+# union of the boxes, and extruding faces upwards raises the top of the box.
+# Moving components, deformers and booleans leave the boxes as they are, and
+# parenting keeps the values of the transform instead of its place in the world.
+
+# The default cost of every command, in milliseconds. These are rough guesses of
+# how long maya takes, which are only meant to rank the commands and can be
+# replaced with measured ones. A pair gives a cost for the call and a cost for
+# every object or component range the command gets.
+DEFAULT_COSTS = {"default": 0.05,
+                 "setAttr": 0.02, "getAttr": 0.02, "connectAttr": 0.05, "objExists": 0.01,
+                 "ls": 0.05, "listRelatives": 0.02, "select": 0.02, "rename": 0.05,
+                 "xform": 0.05, "move": 0.05, "rotate": 0.05, "scale": 0.05,
+                 "hide": 0.02, "showHidden": 0.02, "softSelect": 0.1, "flushUndo": 0.1,
+                 "parent": (0.2, 0.05), "group": (0.2, 0.05), "delete": (0.3, 0.1), "sets": (0.3, 0.05),
+                 "createNode": 0.2, "shadingNode": 0.5, "surfaceShaderList": 0.1,
+                 "polyCube": 1.0, "polyCylinder": 1.2, "polySphere": 2.0, "polyPlane": 1.0,
+                 "polyPrism": 1.0, "polyCone": 1.0, "polyPipe": 1.5,
+                 "polyUnite": (1.5, 0.5), "polyBoolOp": 25.0, "polyExtrudeFacet": 1.5,
+                 "polyChipOff": 1.5, "polySubdivideFacet": 2.0, "polySoftEdge": 1.0,
+                 "duplicate": 0.8, "instance": 0.3, "nonLinear": 3.0, "exactWorldBoundingBox": 0.2,
+                 "camera": 1.0, "directionalLight": 1.0, "ambientLight": 1.0, "spotLight": 1.0,
+                 "lookThru": 0.5, "refresh": 5.0, "file": 10.0, "MFnMesh.create": 0.5}
+
+# The types of the nodes that are transforms.
+TRANSFORM_TYPES = ("transform", "lodGroup")
+
+# The scene the commands work on, made by install().
+scene = None
+
+class Node:
+    '''
+    A Node object is a node in the scene graph of a fake maya scene. The transforms
+    have their children and shape, and the shapes the transforms they are
+    instanced under. A mesh shape has its size and its construction history.
+
+    Attributes:
+        name: The name of the node.
+        type: The maya type of the node, for example "transform", "mesh" or "blinn".
+        dag: True for transforms and shapes, False for other nodes.
+        parent: The transform the node is a child of, or None.
+        children: List with the transforms that are children of the node.
+        shape: The shape of a transform, or None.
+        parents: List with the transforms a shape belongs to.
+        translate: List with the translation of a transform.
+        rotate: List with the rotation of a transform in degrees, in xyz order.
+        scale: List with the scale of a transform.
+        attributes: Dictionary from the names of attributes that have been set to
+                    their values.
+        vertices: The number of vertices of a mesh.
+        faces: The number of faces of a mesh.
+        box: List with the minimum and maximum x-, y- and z-coordinates of a mesh,
+             or None.
+        history: List with the construction history nodes of a mesh, or with the
+                 deformer of a deformer handle.
+        members: List with the members of a set.
+    '''
+    def __init__(self, name_, type, dag = False):
+        '''
+        Initializes a Node object without connections.
+
+        self: Object that is to be initialized.
+        name_: See Attributes.
+        type: See Attributes.
+        dag: See Attributes.
+        On exit: A node without parent, children, shape, history or members has been
+                 initialized, with an identity transform and an empty mesh.
+        '''
+        self.name = name_
+        self.type = type
+        self.dag = dag
+        self.parent = None
+        self.children = []
+        self.shape = None
+        self.parents = []
+        self.translate = [0.0, 0.0, 0.0]
+        self.rotate = [0.0, 0.0, 0.0]
+        self.scale = [1.0, 1.0, 1.0]
+        self.attributes = {}
+        self.vertices = 0
+        self.faces = 0
+        self.box = None
+        self.history = []
+        self.members = []
+
+class Scene:
+    '''
+    A Scene object holds the nodes of a fake maya scene, the selection and the
+    record of the commands that have been run.
+
+    Attributes:
+        nodes: Dictionary from the name of every node to the node.
+        counters: Dictionary from the beginning of a name to the next number that is
+                  tried for it, see uniqueName(...).
+        selection: List with the names of the selected objects and components.
+        connections: List with the pairs of connected attributes.
+        sceneName: The path the scene is saved to, or "".
+        softSelection: Dictionary with the flags of the last softSelect command.
+        lookThrough: The name of the camera that is looked through.
+        costs: Dictionary from the name of a command to its cost, see
+               DEFAULT_COSTS.
+        calls: List with a tuple for every command that has been run, with the
+               name of the command, the positional and keyword arguments, the name
+               of the procedure that ran it and its cost, or None if the calls are
+               not kept.
+        sums: Dictionary with the dictionaries made by summary(...) for "command"
+              and "caller", which are kept up to date as the commands are run.
+        callCount: The number of commands that have been run.
+        cost: The total cost of the commands.
+        callbacks: Dictionary from "added" and "removed" to dictionaries from the
+                   ids of the callbacks registered with MDGMessage to pairs of the
+                   procedure and its client data.
+        nextCallback: The id of the next callback.
+    '''
+    def __init__(self, costs = None, keepCalls = True):
+        '''
+        Initializes an empty scene with the default nodes of maya.
+
+        self: Object that is to be initialized.
+        costs: Dictionary with costs that replace the default costs, or None.
+        keepCalls: False if only the sums of the calls should be kept, which saves
+                   memory when the memory use of the generator is measured.
+        On exit: A scene has been initialized with the cameras, shader and shading
+                 group maya starts with, and without any recorded commands.
+        '''
+        self.costs = dict(DEFAULT_COSTS)
+        if costs != None:
+            self.costs.update(costs)
+        self.calls = None
+        if keepCalls:
+            self.calls = []
+        self.sums = {"command": {}, "caller": {}}
+        self.callCount = 0
+        self.cost = 0.0
+        self.callbacks = {"added": {}, "removed": {}}
+        self.nextCallback = 1
+        self.clear()
+
+    def clear(self):
+        '''
+        Removes all nodes except the default ones.
+
+        self: Object of the class Scene.
+        On exit: The scene only has the cameras persp, top, front and side, the shader
+                 lambert1 and the shading group initialShadingGroup, and nothing is
+                 selected. The recorded commands and the callbacks are kept, and the
+                 removed nodes are not reported to them.
+        '''
+        self.nodes = {}
+        self.counters = {}
+        self.selection = []
+        self.connections = []
+        self.sceneName = ""
+        self.softSelection = {}
+        self.lookThrough = "persp"
+        for name_ in ("persp", "top", "front", "side"):
+            self.makeTransform(name_, "camera")
+        self.add("lambert1", "lambert")
+        self.add("initialShadingGroup", "shadingEngine")
+
+    def record(self, command, args, kwargs, caller):
+        '''
+        Records a command and charges its cost.
+
+        self: Object of the class Scene.
+        command: The name of the command.
+        args: Tuple with the positional arguments of the command.
+        kwargs: Dictionary with the keyword arguments of the command.
+        caller: The name of the procedure that ran the command.
+        On exit: The command has been added to calls if they are kept and to the
+                 sums, and its cost has been added to cost. The cost is looked up in
+                 costs, with the default cost for commands that are not there, and
+                 pairs are charged for every name in the positional arguments.
+        '''
+        cost = self.costs.get(command, self.costs["default"])
+        if isinstance(cost, (tuple, list)):
+            cost = cost[0] + cost[1] * len(flatten(args))
+        if self.calls != None:
+            self.calls.append((command, args, kwargs, caller, cost))
+        for key, name_ in (("command", command), ("caller", caller)):
+            sums = self.sums[key].get(name_)
+            if sums == None:
+                sums = self.sums[key][name_] = [0, 0.0]
+            sums[0] = sums[0] + 1
+            sums[1] = sums[1] + cost
+        self.callCount = self.callCount + 1
+        self.cost = self.cost + cost
+
+    def summary(self, key = "command"):
+        '''
+        Sums the calls and costs by command or by calling procedure.
+
+        self: Object of the class Scene.
+        key: "command" or "caller".
+        On exit: A dictionary is returned from every command or procedure to a list
+                 with its number of calls and their total cost.
+        '''
+        return dict([(name_, list(sums)) for name_, sums in self.sums[key].items()])
+
+    def report(self, top = 15):
+        '''
+        Describes where the calls and costs went.
+
+        self: Object of the class Scene.
+        top: The number of commands and procedures that are listed.
+        On exit: A string is returned with the total number of calls and cost and the
+                 commands and the procedures that called them with the highest costs,
+                 with their calls and costs.
+        '''
+        lines = ["%d calls, cost %.1f ms" % (self.callCount, self.cost)]
+        for key, title in (("command", "command"), ("caller", "called from")):
+            sums = self.summary(key)
+            lines.append("%10s %12s  %s" % ("calls", "cost (ms)", title))
+            for name_ in sorted(sums, key = lambda n: (-sums[n][1], n))[:top]:
+                lines.append("%10d %12.1f  %s" % (sums[name_][0], sums[name_][1], name_))
+        return "\n".join(lines)
+
+    def uniqueName(self, name_, numbered = False):
+        '''
+        Gives a name that no node has, in the way maya does.
+
+        self: Object of the class Scene.
+        name_: The name that is asked for.
+        numbered: True if the name should get a number even if it is free, as the
+                  default names of maya do.
+        On exit: The name is returned if it is free and not numbered. Otherwise the
+                 digits at its end are replaced with the smallest number that gives
+                 a free name, starting from 1, and that name is returned.
+        '''
+        if not numbered and not name_ in self.nodes:
+            return name_
+        stem = name_.rstrip("0123456789")
+        i = self.counters.get(stem, 1)
+        while stem + str(i) in self.nodes:
+            i = i + 1
+        self.counters[stem] = i + 1
+        return stem + str(i)
+
+    def add(self, name_, type, dag = False, numbered = False):
+        '''
+        Adds a node to the scene.
+
+        self: Object of the class Scene.
+        name_: The name asked for, see uniqueName(...).
+        type: The type of the node.
+        dag: See Node.
+        numbered: See uniqueName(...).
+        On exit: A node with a free name has been added and is returned. The
+                 callbacks for added nodes have been called with an MObject of it.
+        '''
+        node = Node(self.uniqueName(name_, numbered), type, dag)
+        self.nodes[node.name] = node
+        for procedure, clientData in list(self.callbacks["added"].values()):
+            procedure(MObject(node), clientData)
+        return node
+
+    def forget(self, node):
+        '''
+        Takes a node out of the scene.
+
+        self: Object of the class Scene.
+        node: The node.
+        On exit: If the node was in the scene, it has been taken out of nodes and
+                 the callbacks for removed nodes have been called with an MObject of
+                 it. Its connections to other nodes are left to the caller.
+        '''
+        if self.nodes.get(node.name) != node:
+            return
+        del self.nodes[node.name]
+        for procedure, clientData in list(self.callbacks["removed"].values()):
+            procedure(MObject(node), clientData)
+
+    def find(self, name_):
+        '''
+        Finds the node of a name, path or component.
+
+        self: Object of the class Scene.
+        name_: The name of a node, a path with the name at its end, or a component
+               or attribute of a node.
+        On exit: The node is returned. ValueError is raised if there is no such node,
+                 as maya does.
+        '''
+        node = self.nodes.get(name_.split(".")[0].split("|")[-1])
+        if node == None:
+            raise ValueError("No object matches name: " + name_)
+        return node
+
+    def remove(self, node):
+        '''
+        Deletes a node with its children and history.
+
+        self: Object of the class Scene.
+        node: The node, which must be in the scene.
+        On exit: The node and its children have been removed. A transform has been
+                 taken away from its shape, and the shape has been removed with its
+                 history if no other transform shares it. A shape has been taken away
+                 from its transforms.
+        '''
+        for child in list(node.children):
+            self.remove(child)
+        if node.parent != None:
+            node.parent.children.remove(node)
+        if node.shape != None:
+            node.shape.parents.remove(node)
+            if len(node.shape.parents) == 0:
+                self.remove(node.shape)
+        for transform in node.parents:
+            transform.shape = None
+        for history in node.history:
+            self.forget(history)
+        self.forget(node)
+
+    def makeTransform(self, name_, shapeType, numbered = False, parent = None):
+        '''
+        Adds a transform with a shape.
+
+        self: Object of the class Scene.
+        name_: The name asked for the transform, see uniqueName(...).
+        shapeType: The type of the shape, or None for a transform without shape.
+        numbered: See uniqueName(...).
+        parent: The transform the new one is a child of, or None.
+        On exit: The transform and its shape have been added and the transform is
+                 returned. The shape is named after the transform, with "Shape"
+                 before its number.
+        '''
+        transform = self.add(name_, "transform", True, numbered)
+        if shapeType != None:
+            stem = transform.name.rstrip("0123456789")
+            transform.shape = self.add(stem + "Shape" + transform.name[len(stem):], shapeType, True)
+            transform.shape.parents.append(transform)
+        if parent != None:
+            transform.parent = parent
+            parent.children.append(transform)
+        return transform
+
+    def addHistory(self, shape, type, kwargs):
+        '''
+        Adds a construction history node to a shape.
+
+        self: Object of the class Scene.
+        shape: The mesh shape.
+        type: The type of the history node, for example "polyCube".
+        kwargs: The keyword arguments of the command that made the node.
+        On exit: If the constructionHistory flag was not false, a history node has
+                 been added to the shape and its name is returned, otherwise None is
+                 returned.
+        '''
+        if not flag(kwargs, "constructionHistory", "ch", True):
+            return None
+        history = self.add(type, type, numbered = True)
+        shape.history.append(history)
+        return history.name
+
+    def worldMatrix(self, node):
+        '''
+        Computes the world matrix of a transform.
+
+        self: Object of the class Scene.
+        node: The transform.
+        On exit: A list with the 16 values of the matrix from the space of the
+                 transform to world space is returned, row by row, with points as row
+                 vectors as in maya.
+        '''
+        matrix = localMatrix(node)
+        while node.parent != None:
+            node = node.parent
+            matrix = multiply(matrix, localMatrix(node))
+        return matrix
+
+    def worldBox(self, node):
+        '''
+        Computes the world space bounding box of a transform and its children.
+
+        self: Object of the class Scene.
+        node: The transform.
+        On exit: A list is returned with the minimum and maximum x-, y- and
+                 z-coordinates of the boxes of all the meshes under the transform in
+                 world space, or None if there are no meshes.
+        '''
+        points = []
+        if node.shape != None and node.shape.box != None:
+            matrix = self.worldMatrix(node)
+            points = [transformPoint(p, matrix) for p in boxCorners(node.shape.box)]
+        for child in node.children:
+            box = self.worldBox(child)
+            if box != None:
+                points.extend(boxCorners(box))
+        if len(points) == 0:
+            return None
+        return [min([p[i] for p in points]) for i in range(3)] + [max([p[i] for p in points]) for i in range(3)]
+
+    def selected(self, args):
+        '''
+        Gives the objects a command works on.
+
+        self: Object of the class Scene.
+        args: The positional arguments of the command.
+        On exit: A list is returned with the names in the arguments, or the selection
+                 if there are none.
+        '''
+        names = flatten(args)
+        if len(names) == 0:
+            return list(self.selection)
+        return names
+
+def install(costs = None, keepCalls = True):
+    '''
+    Replaces maya with the fake one.
+
+    costs: Dictionary with costs that replace the default costs, see
+           DEFAULT_COSTS, or None.
+    keepCalls: See Scene.
+    On exit: The modules maya, maya.cmds, maya.api, maya.api.OpenMaya and
+             maya.standalone have been put in sys.modules, so that modules imported
+             afterwards get the fake maya, and a new scene has been made. The
+             commands of maya.cmds and the creation of meshes with MFnMesh are
+             recorded in the scene, which is returned. Modules that imported maya
+             before keep the modules they got.
+    '''
+    global scene
+    scene = Scene(costs, keepCalls)
+    cmds = types.ModuleType("maya.cmds")
+    procedures = {"polyCube": primitive("polyCube", "pCube"), "polyCylinder": primitive("polyCylinder", "pCylinder"),
+                  "polySphere": primitive("polySphere", "pSphere"), "polyPlane": primitive("polyPlane", "pPlane"),
+                  "polyPrism": primitive("polyPrism", "pPrism"), "polyCone": primitive("polyCone", "pCone"),
+                  "polyPipe": primitive("polyPipe", "pPipe"), "polyUnite": polyUnite, "polyBoolOp": polyBoolOp,
+                  "polyExtrudeFacet": polyExtrudeFacet, "polyChipOff": polyChipOff,
+                  "polySubdivideFacet": polySubdivideFacet, "polySoftEdge": polySoftEdge, "xform": xform,
+                  "move": move, "rotate": rotate, "scale": scale, "select": select, "delete": delete,
+                  "duplicate": duplicate, "instance": instance, "group": group, "parent": parent, "hide": hide,
+                  "showHidden": showHidden, "listRelatives": listRelatives, "ls": ls, "objExists": objExists,
+                  "rename": rename, "createNode": createNode, "setAttr": setAttr, "getAttr": getAttr,
+                  "connectAttr": connectAttr, "sets": sets, "shadingNode": shadingNode,
+                  "surfaceShaderList": surfaceShaderList, "nonLinear": nonLinear, "softSelect": softSelect,
+                  "exactWorldBoundingBox": exactWorldBoundingBox, "camera": camera,
+                  "directionalLight": light("directionalLight"), "ambientLight": light("ambientLight"),
+                  "spotLight": light("spotLight"), "lookThru": lookThru, "refresh": idle, "flushUndo": idle,
+                  "file": file}
+    for name_ in procedures:
+        setattr(cmds, name_, command(name_, procedures[name_]))
+    openMaya = types.ModuleType("maya.api.OpenMaya")
+    for class_ in (MPoint, MObject, MFnMesh, MFnDagNode, MDagPath, MDGMessage, MMessage):
+        setattr(openMaya, class_.__name__, class_)
+    standalone = types.ModuleType("maya.standalone")
+    standalone.initialize = idle
+    standalone.uninitialize = idle
+    api = types.ModuleType("maya.api")
+    api.OpenMaya = openMaya
+    maya = types.ModuleType("maya")
+    maya.cmds = cmds
+    maya.api = api
+    maya.standalone = standalone
+    sys.modules.update({"maya": maya, "maya.cmds": cmds, "maya.api": api, "maya.api.OpenMaya": openMaya,
+                        "maya.standalone": standalone})
+    return scene
+
+def command(name_, procedure):
+    '''
+    Wraps a procedure as a recorded maya command.
+
+    name_: The name of the command.
+    procedure: The procedure that carries out the command on the scene.
+    On exit: A procedure is returned that records the command in the scene, with
+             the name of the procedure calling it, and then carries it out. The
+             procedures of the profiler module that count the commands are not
+             taken for the caller.
+    '''
+    def run(*args, **kwargs):
+        frame = sys._getframe(1)
+        while frame.f_globals.get("__name__") == "profiler" and frame.f_back != None:
+            frame = frame.f_back
+        scene.record(name_, args, kwargs, frame.f_code.co_name)
+        return procedure(*args, **kwargs)
+    run.__name__ = name_
+    return run
+
+def flag(kwargs, long, short, default = None):
+    '''
+    Reads a flag given by its long or short name.
+
+    kwargs: Dictionary with the keyword arguments of a command.
+    long: The long name of the flag.
+    short: The short name of the flag.
+    default: The value if the flag is not given.
+    On exit: The value of the flag is returned.
+    '''
+    if long in kwargs:
+        return kwargs[long]
+    return kwargs.get(short, default)
+
+def flatten(args):
+    '''
+    Collects the names in nested lists and tuples.
+
+    args: Tuple with the positional arguments of a command.
+    On exit: A list with all the strings in the arguments, in order, is returned.
+    '''
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.extend(flatten(arg))
+        elif isinstance(arg, str):
+            names.append(arg)
+    return names
+
+def component(name_):
+    '''
+    Splits a component into the object name, the kind and the index range.
+
+    name_: A name like "pCube1.f[2:5]".
+    On exit: A tuple is returned with the object name, the kind of component ("f",
+             "vtx" or "e") and the first and last index. If the name is not a
+             component, None is returned.
+    '''
+    match = re.match(r"^(.*)\.(f|vtx|e)\[(\d+)(?::(\d+))?\]$", name_)
+    if match == None:
+        return None
+    first = int(match.group(3))
+    last = first
+    if match.group(4) != None:
+        last = int(match.group(4))
+    return (match.group(1), match.group(2), first, last)
+
+def boxCorners(box):
+    '''
+    Lists the corners of a bounding box.
+
+    box: List with the minimum and maximum x-, y- and z-coordinates.
+    On exit: A list with the eight corners as tuples is returned.
+    '''
+    return [(x, y, z) for x in (box[0], box[3]) for y in (box[1], box[4]) for z in (box[2], box[5])]
+
+def transformPoint(point, matrix):
+    '''
+    Transforms a point by a 4x4 matrix.
+
+    point: Tuple with the coordinates of the point.
+    matrix: List with the 16 values of the matrix, row by row.
+    On exit: A tuple with the transformed point, taken as a row vector, is
+             returned.
+    '''
+    return tuple([point[0] * matrix[j] + point[1] * matrix[4 + j] + point[2] * matrix[8 + j] + matrix[12 + j]
+                  for j in range(3)])
+
+def multiply(a, b):
+    '''
+    Multiplies two 4x4 matrices.
+
+    a: List with the 16 values of the first matrix, row by row.
+    b: List with the 16 values of the second matrix, row by row.
+    On exit: The product a * b is returned as a list of 16 values.
+    '''
+    return [sum([a[row * 4 + k] * b[k * 4 + column] for k in range(4)]) for row in range(4) for column in range(4)]
+
+def localMatrix(node):
+    '''
+    Computes the matrix of a transform relative to its parent.
+
+    node: The transform.
+    On exit: A list is returned with the 16 values of the matrix that scales,
+             rotates around the x-, y- and z-axis in that order and translates, as
+             maya does with the default rotation order.
+    '''
+    matrix = [node.scale[0], 0, 0, 0, 0, node.scale[1], 0, 0, 0, 0, node.scale[2], 0, 0, 0, 0, 1]
+    for axis in range(3):
+        angle = math.radians(node.rotate[axis])
+        c = math.cos(angle)
+        s = math.sin(angle)
+        if axis == 0:
+            rotation = [1, 0, 0, 0, 0, c, s, 0, 0, -s, c, 0, 0, 0, 0, 1]
+        elif axis == 1:
+            rotation = [c, 0, -s, 0, 0, 1, 0, 0, s, 0, c, 0, 0, 0, 0, 1]
+        else:
+            rotation = [c, s, 0, 0, -s, c, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+        matrix = multiply(matrix, rotation)
+    matrix[12:15] = [matrix[12] + node.translate[0], matrix[13] + node.translate[1], matrix[14] + node.translate[2]]
+    return matrix
+
+def moveLike(node, attribute, args, kwargs):
+    '''
+    Applies a move, rotate or scale command to a transform.
+
+    node: The transform.
+    attribute: "translate", "rotate" or "scale".
+    args: The positional arguments of the command.
+    kwargs: The keyword arguments of the command.
+    On exit: The numbers in the arguments have been given to the axes named by the
+             flags x, y and z, or to all three in order without those flags. They
+             have replaced the values, or been added to them, or multiplied with
+             them for scale, if the relative flag is true.
+    '''
+    values = [arg for arg in args if isinstance(arg, (int, float))]
+    axes = [i for i in range(3) if kwargs.get("xyz"[i])]
+    if len(axes) == 0:
+        axes = [0, 1, 2]
+    current = getattr(node, attribute)
+    for axis, value in zip(axes, values):
+        if flag(kwargs, "relative", "r", False):
+            if attribute == "scale":
+                current[axis] = current[axis] * value
+            else:
+                current[axis] = current[axis] + value
+        else:
+            current[axis] = float(value)
+
+def primitive(type, defaultName):
+    '''
+    Makes the procedure of a polygon primitive command.
+
+    type: The name of the command, which is also the type of its history node.
+    defaultName: The name the objects get if no name is given.
+    On exit: A procedure is returned that creates the primitive with the size and
+             number of vertices and faces maya gives it, selects it and returns a
+             list with the transform and the history node.
+    '''
+    def create(*args, **kwargs):
+        transform = scene.makeTransform(flag(kwargs, "name", "n", defaultName), "mesh", not ("name" in kwargs or "n" in kwargs))
+        shape = transform.shape
+        if type == "polyCube":
+            w, h, d = flag(kwargs, "width", "w", 1), flag(kwargs, "height", "h", 1), flag(kwargs, "depth", "d", 1)
+            sx, sy, sz = flag(kwargs, "subdivisionsX", "sx", 1), flag(kwargs, "subdivisionsY", "sy", 1), flag(kwargs, "subdivisionsZ", "sz", 1)
+            shape.box = [-w / 2.0, -h / 2.0, -d / 2.0, w / 2.0, h / 2.0, d / 2.0]
+            shape.faces = 2 * (sx * sy + sy * sz + sx * sz)
+            shape.vertices = (sx + 1) * (sy + 1) * (sz + 1) - (sx - 1) * (sy - 1) * (sz - 1)
+        elif type == "polyPlane":
+            w, h = flag(kwargs, "width", "w", 1), flag(kwargs, "height", "h", 1)
+            sx, sy = flag(kwargs, "subdivisionsX", "sx", 10), flag(kwargs, "subdivisionsY", "sy", 10)
+            shape.box = [-w / 2.0, 0, -h / 2.0, w / 2.0, 0, h / 2.0]
+            shape.faces = sx * sy
+            shape.vertices = (sx + 1) * (sy + 1)
+        elif type == "polySphere":
+            r = flag(kwargs, "radius", "r", 1)
+            sx, sy = flag(kwargs, "subdivisionsX", "sx", 20), flag(kwargs, "subdivisionsY", "sy", 20)
+            shape.box = [-r, -r, -r, r, r, r]
+            shape.faces = sx * sy
+            shape.vertices = sx * (sy - 1) + 2
+        elif type == "polyPrism":
+            l, w = flag(kwargs, "length", "l", 2), flag(kwargs, "sideLength", "w", 2)
+            sides, sh = flag(kwargs, "numberOfSides", "ns", 3), flag(kwargs, "subdivisionsHeight", "sh", 1)
+            r = w / (2 * math.sin(math.pi / sides))
+            shape.box = [-r, -l / 2.0, -r, r, l / 2.0, r]
+            shape.faces = sides * sh + 2
+            shape.vertices = sides * (sh + 1)
+        elif type == "polyPipe":
+            r, h = flag(kwargs, "radius", "r", 1), flag(kwargs, "height", "h", 2)
+            sides, sh = flag(kwargs, "subdivisionsAxis", "sa", 20), flag(kwargs, "subdivisionsHeight", "sh", 1)
+            shape.box = [-r, -h / 2.0, -r, r, h / 2.0, r]
+            shape.faces = sides * (2 * sh + 2)
+            shape.vertices = sides * (2 * sh + 2)
+        else:
+            # Cylinders and cones, whose caps are split into triangles.
+            r, h = flag(kwargs, "radius", "r", 1), flag(kwargs, "height", "h", 2)
+            sx, sy = flag(kwargs, "subdivisionsX", "sx", 20), flag(kwargs, "subdivisionsY", "sy", 1)
+            caps = 2
+            if type == "polyCone":
+                caps = 1
+            shape.box = [-r, -h / 2.0, -r, r, h / 2.0, r]
+            shape.faces = sx * sy + caps * sx
+            shape.vertices = sx * (sy + 1) + caps
+        scene.selection = [transform.name]
+        return [transform.name, scene.addHistory(shape, type, kwargs)]
+    return create
+
+def combine(args, kwargs, type, box):
+    '''
+    Replaces polygon objects with one that combines them.
+
+    args: The positional arguments of the command, with the objects.
+    kwargs: The keyword arguments of the command.
+    type: The type of the history node.
+    box: Procedure that computes the bounding box of the new object from the world
+         space bounding boxes of the objects.
+    On exit: A mesh with the vertices and faces of all the polygon objects in the
+             arguments, or the selection if there are none, has been made,
+             named after the name flag or polySurface, and selected. The objects
+             have been removed, except for transforms with children, which have
+             only lost their shapes. A list with the new transform and its history
+             node is returned.
+    '''
+    # The history nodes returned with the objects by the commands are skipped, even
+    # if they have been deleted with the history, as the generator relies on.
+    nodes = [node for node in transforms(args, True) if node.shape != None and node.shape.type == "mesh"]
+    if len(nodes) == 0:
+        raise RuntimeError("%s: No polygon objects to work on." % type)
+    boxes = [scene.worldBox(node) for node in nodes]
+    transform = scene.makeTransform(flag(kwargs, "name", "n", "polySurface"), "mesh", not ("name" in kwargs or "n" in kwargs))
+    transform.shape.box = box([b for b in boxes if b != None])
+    for node in nodes:
+        transform.shape.vertices = transform.shape.vertices + node.shape.vertices
+        transform.shape.faces = transform.shape.faces + node.shape.faces
+    for node in nodes:
+        if len(node.children) == 0:
+            scene.remove(node)
+        else:
+            shape = node.shape
+            shape.parents.remove(node)
+            node.shape = None
+            if len(shape.parents) == 0:
+                scene.remove(shape)
+    scene.selection = [transform.name]
+    return [transform.name, scene.addHistory(transform.shape, type, kwargs)]
+
+def unionBox(boxes):
+    '''
+    Computes the box around a list of boxes.
+
+    boxes: List with bounding boxes.
+    On exit: The smallest bounding box around them is returned, or None if the list
+             is empty.
+    '''
+    if len(boxes) == 0:
+        return None
+    return [min([b[i] for b in boxes]) for i in range(3)] + [max([b[i] for b in boxes]) for i in range(3, 6)]
+
+def polyUnite(*args, **kwargs):
+    '''
+    Combines polygon objects.
+
+    On exit: See combine(...). The new object has the box around all the objects.
+    '''
+    return combine(args, kwargs, "polyUnite", unionBox)
+
+def polyBoolOp(*args, **kwargs):
+    '''
+    Combines two polygon objects with a boolean operation.
+
+    On exit: See combine(...). The new object has the box of the first object for
+             difference and intersection and the box around both for union.
+    '''
+    if flag(kwargs, "operation", "op", 1) == 1:
+        return combine(args, kwargs, "polyCBoolOp", unionBox)
+    return combine(args, kwargs, "polyCBoolOp", lambda boxes: (boxes + [None])[0])
+
+def selectedFaces(args):
+    '''
+    Counts the faces a component command works on, for every object.
+
+    args: The positional arguments of the command.
+    On exit: A dictionary from the shapes of the objects to the number of faces in
+             the arguments or the selection is returned. Objects without components
+             count with all their faces.
+    '''
+    faces = {}
+    for name_ in scene.selected(args):
+        parts = component(name_)
+        node = scene.find(name_)
+        if node.shape != None:
+            node = node.shape
+        if parts == None:
+            count = node.faces
+        elif parts[1] == "f":
+            count = parts[3] - parts[2] + 1
+        else:
+            continue
+        faces[node] = faces.get(node, 0) + count
+    return faces
+
+def polyExtrudeFacet(*args, **kwargs):
+    '''
+    Extrudes faces.
+
+    On exit: Every face has got four new faces and vertices around it, as a quad
+             does, and an extrusion upwards has raised the top of the box of the
+             mesh. The selection is kept, and a list with the history node is
+             returned.
+    '''
+    history = []
+    for shape, count in selectedFaces(args).items():
+        shape.faces = shape.faces + 4 * count
+        shape.vertices = shape.vertices + 4 * count
+        lift = flag(kwargs, "translate", "t", (0, 0, 0))[1]
+        if shape.box != None and lift > 0:
+            shape.box[4] = shape.box[4] + lift
+        history.append(scene.addHistory(shape, "polyExtrudeFace", kwargs))
+    return history
+
+def polyChipOff(*args, **kwargs):
+    '''
+    Duplicates or extracts faces.
+
+    On exit: With the duplicate flag the faces have been added to the mesh again.
+             A list with the history node is returned.
+    '''
+    history = []
+    for shape, count in selectedFaces(args).items():
+        if flag(kwargs, "duplicate", "dup", True):
+            shape.faces = shape.faces + count
+            shape.vertices = shape.vertices + 4 * count
+        history.append(scene.addHistory(shape, "polyChipOff", kwargs))
+    return history
+
+def polySubdivideFacet(*args, **kwargs):
+    '''
+    Subdivides faces.
+
+    On exit: Every face has been split into four, as a quad is, and a list with
+             the history node is returned.
+    '''
+    history = []
+    for shape, count in selectedFaces(args).items():
+        shape.faces = shape.faces + 3 * count
+        shape.vertices = shape.vertices + 5 * count
+        history.append(scene.addHistory(shape, "polySubdFace", kwargs))
+    return history
+
+def polySoftEdge(*args, **kwargs):
+    '''
+    Softens or hardens edges.
+
+    On exit: The objects have got history nodes unless the history flag was false,
+             and a list with them is returned. The meshes have not changed.
+    '''
+    return [scene.addHistory(shape, "polySoftEdge", kwargs) for shape in selectedFaces(args)]
+
+def transforms(args, skipMissing = False):
+    '''
+    Finds the transforms a command works on.
+
+    args: The positional arguments of the command.
+    skipMissing: True if names without a node should be skipped instead of
+                 raising ValueError.
+    On exit: A list is returned with the transforms among the objects in the
+             arguments, or in the selection if there are none. Components, shapes
+             and other nodes, like the history nodes returned by the commands that
+             create objects, are left out.
+    '''
+    nodes = []
+    for name_ in scene.selected(args):
+        if component(name_) != None or (skipMissing and not objExists(name_)):
+            continue
+        node = scene.find(name_)
+        if node.type in TRANSFORM_TYPES and not node in nodes:
+            nodes.append(node)
+    return nodes
+
+def xform(*args, **kwargs):
+    '''
+    Queries or changes transforms.
+
+    On exit: With the query flag, the world matrix, translation or rotation of the
+             first transform is returned. Otherwise the translation, rotation and
+             scale flags have replaced the values of the transforms, or been added
+             to them with the relative flag. World and object space are treated
+             alike, and pivots are ignored.
+    '''
+    nodes = transforms(args)
+    if flag(kwargs, "query", "q", False):
+        if flag(kwargs, "matrix", "m", False):
+            return scene.worldMatrix(nodes[0])
+        if flag(kwargs, "rotation", "ro", False):
+            return list(nodes[0].rotate)
+        return list(nodes[0].translate)
+    for node in nodes:
+        for long, short, attribute in (("translation", "t", "translate"), ("rotation", "ro", "rotate"),
+                                       ("scale", "s", "scale")):
+            value = flag(kwargs, long, short)
+            if value != None:
+                moveLike(node, attribute, value, {"relative": flag(kwargs, "relative", "r", False)})
+
+def move(*args, **kwargs):
+    '''
+    Moves transforms.
+
+    On exit: See moveLike(...). Components are not moved.
+    '''
+    for node in transforms(args):
+        moveLike(node, "translate", args, kwargs)
+
+def rotate(*args, **kwargs):
+    '''
+    Rotates transforms.
+
+    On exit: See moveLike(...).
+    '''
+    for node in transforms(args):
+        moveLike(node, "rotate", args, kwargs)
+
+def scale(*args, **kwargs):
+    '''
+    Scales transforms.
+
+    On exit: See moveLike(...). Components are not scaled, and the pivot is
+             ignored.
+    '''
+    for node in transforms(args):
+        moveLike(node, "scale", args, kwargs)
+
+def select(*args, **kwargs):
+    '''
+    Changes the selection.
+
+    On exit: The objects and components have replaced the selection, or been added
+             to it with the add flag. With the all flag every transform at the top
+             of the scene, except the default cameras, has been selected, and with
+             the clear flag nothing is selected. Missing objects raise ValueError.
+    '''
+    if flag(kwargs, "all", "all", False):
+        scene.selection = [name_ for name_, node in scene.nodes.items()
+                           if node.type in TRANSFORM_TYPES and node.parent == None
+                           and not name_ in ("persp", "top", "front", "side")]
+        return
+    if flag(kwargs, "clear", "cl", False):
+        scene.selection = []
+        return
+    names = flatten(args)
+    for name_ in names:
+        scene.find(name_)
+    if flag(kwargs, "add", "add", False):
+        scene.selection = scene.selection + names
+    else:
+        scene.selection = names
+
+def delete(*args, **kwargs):
+    '''
+    Deletes nodes or their construction history.
+
+    On exit: With the constructionHistory flag the history nodes of the meshes of
+             the objects have been removed. Otherwise the objects have been removed
+             with their children, see Scene.remove(...), and taken out of the
+             selection. Missing objects raise ValueError.
+    '''
+    nodes = [scene.find(name_) for name_ in scene.selected(args)]
+    if flag(kwargs, "constructionHistory", "ch", False):
+        for node in nodes:
+            shape = node.shape or node
+            for history in shape.history:
+                scene.forget(history)
+            shape.history = []
+        return
+    for node in nodes:
+        if scene.nodes.get(node.name) == node:
+            scene.remove(node)
+    scene.selection = [name_ for name_ in scene.selection if name_.split(".")[0] in scene.nodes]
+
+def copyTransform(node, name_, shape, parent_):
+    '''
+    Makes a transform with the values of another.
+
+    node: The transform that is copied.
+    name_: The name asked for the copy.
+    shape: The shape of the copy, or None.
+    parent_: The parent of the copy, or None.
+    On exit: The copy has been added and is returned.
+    '''
+    copy = scene.makeTransform(name_, None, parent = parent_)
+    copy.translate = list(node.translate)
+    copy.rotate = list(node.rotate)
+    copy.scale = list(node.scale)
+    copy.attributes = dict(node.attributes)
+    copy.shape = shape
+    if shape != None:
+        shape.parents.append(copy)
+    return copy
+
+def duplicate(*args, **kwargs):
+    '''
+    Copies transforms with their shapes and children.
+
+    On exit: Every transform has been copied with a new shape holding a copy of
+             its mesh, under the same parent, and so have its children. The copies
+             are selected and a list with their names is returned.
+    '''
+    def copyTree(node, name_, parent_):
+        shape = None
+        if node.shape != None:
+            shape = scene.add(node.shape.name, node.shape.type, True)
+            shape.vertices = node.shape.vertices
+            shape.faces = node.shape.faces
+            shape.box = node.shape.box and list(node.shape.box)
+            shape.attributes = dict(node.shape.attributes)
+        copy = copyTransform(node, name_, shape, parent_)
+        for child in node.children:
+            copyTree(child, child.name, copy)
+        return copy
+    names = [copyTree(node, flag(kwargs, "name", "n", node.name), node.parent).name for node in transforms(args)]
+    scene.selection = list(names)
+    return names
+
+def instance(*args, **kwargs):
+    '''
+    Makes transforms that share the shape of another.
+
+    On exit: Every transform has got a copy under the same parent that shares its
+             shape. The children are not instanced. The copies are selected and a
+             list with their names is returned.
+    '''
+    names = [copyTransform(node, flag(kwargs, "name", "n", node.name), node.shape, node.parent).name
+             for node in transforms(args)]
+    scene.selection = list(names)
+    return names
+
+def reparent(node, parent_):
+    '''
+    Moves a transform under another transform.
+
+    node: The transform.
+    parent_: The new parent, or None for the top of the scene.
+    On exit: The parent has been changed. The values of the transform are kept.
+    '''
+    if node.parent != None:
+        node.parent.children.remove(node)
+    node.parent = parent_
+    if parent_ != None:
+        parent_.children.append(node)
+
+def group(*args, **kwargs):
+    '''
+    Makes a transform with the given objects as children.
+
+    On exit: A transform has been made at the top of the scene, the objects, or the
+             selection unless the empty flag is true, have become its children, it
+             is selected and its name is returned.
+    '''
+    nodes = []
+    if not flag(kwargs, "empty", "em", False):
+        nodes = transforms(args)
+    node = scene.makeTransform(flag(kwargs, "name", "n", "group"), None, not ("name" in kwargs or "n" in kwargs))
+    for child in nodes:
+        reparent(child, node)
+    scene.selection = [node.name]
+    return node.name
+
+def parent(*args, **kwargs):
+    '''
+    Changes the parents of transforms.
+
+    On exit: With the world flag the transforms have been moved to the top of the
+             scene, otherwise under the last transform in the arguments, keeping
+             their values. A list with their names is returned. A transform can
+             not be moved under itself or its children, which raises RuntimeError.
+    '''
+    names = flatten(args)
+    if flag(kwargs, "world", "w", False):
+        parent_ = None
+    else:
+        parent_ = scene.find(names.pop())
+    nodes = transforms(names)
+    for node in nodes:
+        ancestor = parent_
+        while ancestor != None:
+            if ancestor == node:
+                raise RuntimeError("parent: Cannot parent %s to itself or its children." % node.name)
+            ancestor = ancestor.parent
+        reparent(node, parent_)
+    return [node.name for node in nodes]
+
+def hide(*args, **kwargs):
+    '''
+    Hides transforms.
+
+    On exit: The visibility of the transforms has been turned off.
+    '''
+    for node in transforms(args):
+        node.attributes["visibility"] = False
+
+def showHidden(*args, **kwargs):
+    '''
+    Shows hidden transforms.
+
+    On exit: The visibility of the transforms has been turned on.
+    '''
+    for node in transforms(args):
+        node.attributes["visibility"] = True
+
+def listRelatives(*args, **kwargs):
+    '''
+    Lists the shapes, children or parent of a node.
+
+    On exit: A list is returned with the shape of the transform with the shapes
+             flag, its parent with the parent flag, all nodes below it with the
+             allDescendents flag and otherwise its shape and child transforms. As in
+             maya, None is returned instead of an empty list.
+    '''
+    node = scene.find(flatten(args)[0])
+    if flag(kwargs, "parent", "p", False):
+        names = [node.parent.name] if node.parent != None else []
+    elif flag(kwargs, "shapes", "s", False):
+        names = [node.shape.name] if node.shape != None else []
+    elif flag(kwargs, "allDescendents", "ad", False):
+        names = []
+        stack = list(node.children)
+        while len(stack) > 0:
+            child = stack.pop()
+            names.append(child.name)
+            if child.shape != None:
+                names.append(child.shape.name)
+            stack.extend(child.children)
+        if node.shape != None:
+            names.append(node.shape.name)
+    else:
+        names = [child.name for child in node.children]
+        if node.shape != None:
+            names.insert(0, node.shape.name)
+    if len(names) == 0:
+        return None
+    return names
+
+def ls(*args, **kwargs):
+    '''
+    Lists nodes.
+
+    On exit: A list is returned with the selection with the selection flag, the
+             given names that exist or otherwise all nodes, restricted to the type
+             flag if it is given.
+    '''
+    if flag(kwargs, "selection", "sl", False):
+        names = list(scene.selection)
+    elif len(flatten(args)) > 0:
+        names = [name_ for name_ in flatten(args) if name_.split(".")[0].split("|")[-1] in scene.nodes]
+    else:
+        names = sorted(scene.nodes)
+    type = flag(kwargs, "type", "type")
+    if type != None:
+        names = [name_ for name_ in names if scene.find(name_).type == type]
+    return names
+
+def objExists(name_):
+    '''
+    Checks if a node exists.
+
+    On exit: True is returned if there is a node with the name, otherwise False.
+    '''
+    return name_.split(".")[0].split("|")[-1] in scene.nodes
+
+def rename(old, new):
+    '''
+    Renames a node.
+
+    On exit: The node has been given the new name, or the name maya makes of it if
+             it is taken, and the shape of a transform named after it has been
+             renamed along with it. The new name is returned.
+    '''
+    node = scene.find(old)
+    del scene.nodes[node.name]
+    oldName = node.name
+    node.name = scene.uniqueName(new)
+    scene.nodes[node.name] = node
+    if node.shape != None and node.shape.name.startswith(oldName.rstrip("0123456789")):
+        del scene.nodes[node.shape.name]
+        node.shape.name = scene.uniqueName(node.name + "Shape")
+        scene.nodes[node.shape.name] = node.shape
+    scene.selection = [(node.name if name_ == oldName else name_) for name_ in scene.selection]
+    return node.name
+
+def createNode(type, **kwargs):
+    '''
+    Creates a node of a type.
+
+    On exit: The node has been created, as a transform for the transform types, and
+             its name is returned.
+    '''
+    name_ = flag(kwargs, "name", "n", type)
+    numbered = not ("name" in kwargs or "n" in kwargs)
+    if type in TRANSFORM_TYPES:
+        node = scene.makeTransform(name_, None, numbered)
+        node.type = type
+        parent_ = flag(kwargs, "parent", "p")
+        if parent_ != None:
+            reparent(node, scene.find(parent_))
+        return node.name
+    return scene.add(name_, type, numbered = numbered).name
+
+def setAttr(plug, *values, **kwargs):
+    '''
+    Sets an attribute.
+
+    On exit: The value, or the tuple of values, has been stored under the name of
+             the attribute. A missing node raises ValueError.
+    '''
+    node = scene.find(plug)
+    if len(values) == 1:
+        node.attributes[plug.split(".", 1)[1]] = values[0]
+    else:
+        node.attributes[plug.split(".", 1)[1]] = tuple(values)
+
+def getAttr(plug, **kwargs):
+    '''
+    Gets an attribute.
+
+    On exit: The value that was set for the attribute is returned, or 0 if it has
+             not been set. A missing node raises ValueError.
+    '''
+    return scene.find(plug).attributes.get(plug.split(".", 1)[1], 0)
+
+def connectAttr(source, destination, **kwargs):
+    '''
+    Connects two attributes.
+
+    On exit: The pair has been added to the connections of the scene. Missing nodes
+             raise ValueError.
+    '''
+    scene.find(source)
+    scene.find(destination)
+    scene.connections.append((source, destination))
+
+def sets(*args, **kwargs):
+    '''
+    Creates sets or assigns members to them.
+
+    On exit: With the edit flag the objects and components have been added to the
+             set given by the forceElement, addElement or include flag. Otherwise a
+             set has been created, a shading group with the renderable flag, with
+             the objects or the selection as members unless the empty flag is true,
+             and its name is returned. Missing objects and sets raise ValueError.
+    '''
+    if flag(kwargs, "edit", "e", False):
+        target = None
+        for long, short in (("forceElement", "fe"), ("addElement", "add"), ("include", "in")):
+            target = target or flag(kwargs, long, short)
+        node = scene.find(target)
+        names = flatten(args)
+        for name_ in names:
+            scene.find(name_)
+        node.members.extend(names)
+        return
+    type = "objectSet"
+    if flag(kwargs, "renderable", "r", False):
+        type = "shadingEngine"
+    node = scene.add(flag(kwargs, "name", "n", "set"), type, numbered = not ("name" in kwargs or "n" in kwargs))
+    if not flag(kwargs, "empty", "em", False):
+        node.members = scene.selected(args)
+    return node.name
+
+def shadingNode(type, **kwargs):
+    '''
+    Creates a shader or other rendering node.
+
+    On exit: A node of the type has been created and its name is returned.
+    '''
+    return scene.add(flag(kwargs, "name", "n", type), type, numbered = not ("name" in kwargs or "n" in kwargs)).name
+
+def surfaceShaderList(shader, **kwargs):
+    '''
+    Connects a shader to a shading group.
+
+    On exit: The shader has been connected to the surface shader of the shading
+             group given by the add flag. Missing nodes raise ValueError.
+    '''
+    group_ = flag(kwargs, "add", "add")
+    connectAttr(shader + ".outColor", group_ + ".surfaceShader")
+
+def nonLinear(*args, **kwargs):
+    '''
+    Adds a nonlinear deformer to the selected objects.
+
+    On exit: A deformer of the type flag and a handle transform for it have been
+             created, with the objects as members of the deformer, and the handle is
+             selected. A list with the deformer and the handle is returned. The
+             meshes are not deformed.
+    '''
+    type = flag(kwargs, "type", "typ")
+    members = scene.selected(args)
+    deformer = scene.add(type, type, numbered = True)
+    deformer.members = members
+    handle = scene.makeTransform(deformer.name + "Handle", "deform" + type[0].upper() + type[1:])
+    # Deleting the handle deletes the deformer, as in maya.
+    handle.history.append(deformer)
+    scene.selection = [handle.name]
+    return [deformer.name, handle.name]
+
+def softSelect(**kwargs):
+    '''
+    Changes the soft selection settings.
+
+    On exit: The flags have been stored as attributes of the scene. Moving
+             components is not simulated, so they have no effect.
+    '''
+    scene.softSelection = dict(kwargs)
+
+def exactWorldBoundingBox(*args, **kwargs):
+    '''
+    Computes the world space bounding box of objects.
+
+    On exit: A list is returned with the minimum and maximum x-, y- and
+             z-coordinates around the meshes of the objects and their children, or
+             zeros if there are none.
+    '''
+    box = unionBox([b for b in [scene.worldBox(node) for node in transforms(args)] if b != None])
+    if box == None:
+        return [0.0] * 6
+    return box
+
+def camera(*args, **kwargs):
+    '''
+    Creates, edits or queries a camera.
+
+    On exit: With the query flag the field of view or a clipping plane is returned,
+             for the 35 mm lens and the film back maya gives new cameras. With the
+             edit flag the position and rotation flags have been set. Otherwise a
+             camera has been created and a list with its transform and shape is
+             returned.
+    '''
+    if flag(kwargs, "query", "q", False):
+        node = scene.find(flatten(args)[0])
+        shape = node.shape or node
+        focal = shape.attributes.get("focalLength", 35.0)
+        for long, short, aperture in (("horizontalFieldOfView", "hfv", 1.41732), ("verticalFieldOfView", "vfv", 0.94488)):
+            if flag(kwargs, long, short, False):
+                return math.degrees(2 * math.atan(aperture * 25.4 / 2.0 / focal))
+        if flag(kwargs, "nearClipPlane", "ncp", False):
+            return shape.attributes.get("nearClipPlane", 0.1)
+        if flag(kwargs, "farClipPlane", "fcp", False):
+            return shape.attributes.get("farClipPlane", 10000.0)
+        return None
+    if flag(kwargs, "edit", "e", False):
+        node = scene.find(flatten(args)[0])
+        if flag(kwargs, "position", "p") != None:
+            node.translate = [float(v) for v in flag(kwargs, "position", "p")]
+        if flag(kwargs, "rotation", "rot") != None:
+            node.rotate = [float(v) for v in flag(kwargs, "rotation", "rot")]
+        return None
+    node = scene.makeTransform(flag(kwargs, "name", "n", "camera"), "camera", not ("name" in kwargs or "n" in kwargs))
+    scene.selection = [node.name]
+    return [node.name, node.shape.name]
+
+def light(type):
+    '''
+    Makes the procedure of a light command.
+
+    type: The name of the command, which is also the type of the light shape.
+    On exit: A procedure is returned that creates a light with the name flag as the
+             name of its transform, selects it and returns the name of the shape.
+             The other flags are stored as attributes of the shape.
+    '''
+    def create(*args, **kwargs):
+        node = scene.makeTransform(flag(kwargs, "name", "n", type), type, not ("name" in kwargs or "n" in kwargs))
+        for key in kwargs:
+            if not key in ("name", "n"):
+                node.shape.attributes[key] = kwargs[key]
+        scene.selection = [node.name]
+        return node.shape.name
+    return create
+
+def lookThru(*args, **kwargs):
+    '''
+    Looks through a camera.
+
+    On exit: The camera has been stored as the one that is looked through. A
+             missing camera raises ValueError.
+    '''
+    scene.lookThrough = scene.find(flatten(args)[0]).name
+
+def idle(*args, **kwargs):
+    '''
+    Does nothing, for commands that only change the user interface or undo.
+
+    On exit: Nothing has changed.
+    '''
+    return None
+
+def file(*args, **kwargs):
+    '''
+    Starts, renames or saves the scene.
+
+    On exit: With the new flag the scene has been cleared. With the rename flag the
+             scene has been given the path. With the save flag a text file has been
+             written to the path, with a line for every node giving its type, name,
+             parent and for meshes the number of vertices and faces, and the path is
+             returned. With the query and sceneName flags the path is returned.
+    '''
+    if flag(kwargs, "new", "new", False):
+        scene.clear()
+        return None
+    if flag(kwargs, "rename", "rn") != None:
+        scene.sceneName = flag(kwargs, "rename", "rn")
+        return scene.sceneName
+    if flag(kwargs, "save", "s", False):
+        output = open(scene.sceneName, "w")
+        try:
+            for name_ in sorted(scene.nodes):
+                node = scene.nodes[name_]
+                line = "%s %s" % (node.type, name_)
+                if node.parent != None:
+                    line = line + " parent=" + node.parent.name
+                if node.type == "mesh":
+                    line = line + " vertices=%d faces=%d" % (node.vertices, node.faces)
+                output.write(line + "\n")
+        finally:
+            output.close()
+        return scene.sceneName
+    if flag(kwargs, "query", "q", False) and flag(kwargs, "sceneName", "sn", False):
+        return scene.sceneName
+    return None
+
+class MPoint:
+    '''
+    A stand-in for maya.api.OpenMaya.MPoint.
+
+    Attributes:
+        x, y, z, w: The coordinates of the point.
+    '''
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0, w = 1.0):
+        '''
+        Initializes a point.
+
+        self: Object that is to be initialized.
+        x, y, z, w: See Attributes.
+        On exit: The point has been initialized.
+        '''
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+class MObject:
+    '''
+    A stand-in for maya.api.OpenMaya.MObject that refers to a node, so that it
+    keeps referring to it when it is renamed.
+
+    Attributes:
+        node: The node of the scene.
+    '''
+    def __init__(self, node = None):
+        '''
+        Initializes an MObject.
+
+        self: Object that is to be initialized.
+        node: See Attributes.
+        On exit: The MObject has been initialized.
+        '''
+        self.node = node
+
+class MFnMesh:
+    '''
+    A stand-in for maya.api.OpenMaya.MFnMesh that can create meshes.
+
+    Attributes:
+        shape: The mesh shape that has been created, or None.
+    '''
+    def __init__(self):
+        '''
+        Initializes an MFnMesh without a mesh.
+
+        self: Object that is to be initialized.
+        On exit: The MFnMesh has been initialized.
+        '''
+        self.shape = None
+
+    def create(self, points, faceCounts, faceConnects, *args):
+        '''
+        Creates a mesh.
+
+        self: Object of the class MFnMesh.
+        points: List with MPoint objects.
+        faceCounts: List with the number of vertices of every face.
+        faceConnects: List with the vertex indices of all faces.
+        On exit: A mesh named polySurface with the vertices, faces and bounding box
+                 of the arguments has been created at the top of the scene, and its
+                 transform is returned as an MObject. Arguments that do not describe
+                 a mesh raise RuntimeError, as maya does. The call is recorded as
+                 the command MFnMesh.create.
+        '''
+        scene.record("MFnMesh.create", (), {}, sys._getframe(1).f_code.co_name)
+        if sum(faceCounts) != len(faceConnects) or (len(faceConnects) > 0 and max(faceConnects) >= len(points)):
+            raise RuntimeError("(kInvalidParameter): Invalid parameter passed for faceConnects")
+        transform = scene.makeTransform("polySurface", "mesh", True)
+        self.shape = transform.shape
+        self.shape.vertices = len(points)
+        self.shape.faces = len(faceCounts)
+        if len(points) > 0:
+            self.shape.box = [min([p.x for p in points]), min([p.y for p in points]), min([p.z for p in points]),
+                              max([p.x for p in points]), max([p.y for p in points]), max([p.z for p in points])]
+        return MObject(transform)
+
+    def object(self):
+        '''
+        Gives the mesh shape.
+
+        self: Object of the class MFnMesh.
+        On exit: The shape is returned as an MObject.
+        '''
+        return MObject(self.shape)
+
+    def name(self):
+        '''
+        Gives the name of the mesh shape.
+
+        self: Object of the class MFnMesh.
+        On exit: The current name of the shape is returned.
+        '''
+        return self.shape.name
+
+class MFnDagNode:
+    '''
+    A stand-in for maya.api.OpenMaya.MFnDagNode.
+
+    Attributes:
+        node: The node of the scene.
+    '''
+    def __init__(self, object_):
+        '''
+        Initializes an MFnDagNode for a node.
+
+        self: Object that is to be initialized.
+        object_: MObject of the node.
+        On exit: The MFnDagNode has been initialized.
+        '''
+        self.node = object_.node
+
+    def partialPathName(self):
+        '''
+        Gives the name of the node.
+
+        self: Object of the class MFnDagNode.
+        On exit: The current name of the node is returned, which is unique since
+                 the fake scene gives every node its own name.
+        '''
+        return self.node.name
+
+class MDagPath:
+    '''
+    A stand-in for maya.api.OpenMaya.MDagPath.
+
+    Attributes:
+        node: The node of the scene.
+    '''
+    def __init__(self, node = None):
+        '''
+        Initializes a path to a node.
+
+        self: Object that is to be initialized.
+        node: See Attributes.
+        On exit: The MDagPath has been initialized.
+        '''
+        self.node = node
+
+    @staticmethod
+    def getAPathTo(object_):
+        '''
+        Gives a path to a node.
+
+        object_: MObject of the node.
+        On exit: An MDagPath to the node is returned.
+        '''
+        return MDagPath(object_.node)
+
+    def fullPathName(self):
+        '''
+        Gives the full path of the node.
+
+        self: Object of the class MDagPath.
+        On exit: The names of the node and the transforms above it, each after a
+                 "|", are returned, with the first transform of a shape.
+        '''
+        names = [self.node.name]
+        node = self.node
+        if len(node.parents) > 0:
+            node = node.parents[0]
+            names.insert(0, node.name)
+        while node.parent != None:
+            node = node.parent
+            names.insert(0, node.name)
+        return "|" + "|".join(names)
+
+class MDGMessage:
+    '''
+    A stand-in for maya.api.OpenMaya.MDGMessage, with the callbacks for nodes that
+    are added to and removed from the scene. The node type is not checked, so the
+    callbacks are called for every node.
+    '''
+    @staticmethod
+    def addNodeAddedCallback(function, nodeType = "dependNode", clientData = None):
+        '''
+        Registers a procedure that is called when a node is added.
+
+        function: The procedure, called with the MObject of the node and clientData.
+        nodeType: Not used.
+        clientData: Any value the procedure gets.
+        On exit: The procedure has been registered in the scene and the id of the
+                 callback is returned.
+        '''
+        return addCallback("added", function, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType = "dependNode", clientData = None):
+        '''
+        Registers a procedure that is called when a node is removed.
+
+        function, nodeType, clientData: See addNodeAddedCallback(...).
+        On exit: The procedure has been registered in the scene and the id of the
+                 callback is returned.
+        '''
+        return addCallback("removed", function, clientData)
+
+class MMessage:
+    '''
+    A stand-in for maya.api.OpenMaya.MMessage that removes callbacks.
+    '''
+    @staticmethod
+    def removeCallback(id):
+        '''
+        Removes a callback.
+
+        id: The id given when the callback was registered.
+        On exit: The callback is no longer called. RuntimeError is raised if there
+                 is no such callback, as maya does.
+        '''
+        for callbacks in scene.callbacks.values():
+            if id in callbacks:
+                del callbacks[id]
+                return
+        raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+
+def addCallback(kind, function, clientData):
+    '''
+    Registers a callback in the scene.
+
+    kind: "added" or "removed".
+    function: The procedure.
+    clientData: The value the procedure gets.
+    On exit: The callback has been added to scene.callbacks under a new id, which
+             is returned.
+    '''
+    id = scene.nextCallback
+    scene.nextCallback = id + 1
+    scene.callbacks[kind][id] = (function, clientData)
+    return id
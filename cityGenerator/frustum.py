@@ -0,0 +1,175 @@
+import math
+
+'''
+List of procedures in the module:
+    class Frustum:
+        A Frustum object describes the part of the scene a camera can see.
+
+        def __init__(self, matrix, horizontalFov, verticalFov, near, far, margin = 0.0):
+            Initializes a Frustum object from the placement and lens of a camera.
+        def toCamera(self, point):
+            Transforms a point from world space to the space of the camera.
+        def toWorld(self, point):
+            Transforms a point from the space of the camera to world space.
+        def intersectsBox(self, minPoint, maxPoint):
+            Checks if a box may be seen by the camera.
+        def intersectsArea(self, area, height):
+            Checks if a block with a given height may be seen by the camera.
+        def groundRectangle(self, height):
+            Finds the rectangle on the ground under the part of the frustum up to a
+            height.
+'''
+
+class Frustum:
+    '''
+    A Frustum object describes the part of the scene a camera can see, as in maya a
+    camera looks along its negative z-axis. The frustum is bounded by four planes
+    through the camera and the near and far clipping planes, and all of them are
+    moved outwards by the margin, so that objects just outside the view, which may
+    still cast shadows or be reflected into it, are counted as seen.
+
+    Attributes:
+        position: Tuple with the world space coordinates of the camera.
+        axes: Tuple with the unit x-, y- and z-axis of the camera in world space.
+        horizontalAngle: Half the horizontal field of view, in radians.
+        verticalAngle: Half the vertical field of view, in radians.
+        near: The distance to the near clipping plane.
+        far: The distance to the far clipping plane.
+        margin: The distance the planes are moved outwards.
+    '''
+    def __init__(self, matrix, horizontalFov, verticalFov, near, far, margin = 0.0):
+        '''
+        Initializes a Frustum object from the placement and lens of a camera.
+
+        self: Object that is to be initialized.
+        matrix: List with the 16 values of the world matrix of the camera, row by
+                row as returned by maya.cmds.xform(camera, query = True,
+                matrix = True, worldSpace = True).
+        horizontalFov: The horizontal field of view in degrees.
+        verticalFov: The vertical field of view in degrees.
+        near: See Attributes.
+        far: See Attributes.
+        margin: See Attributes.
+        On exit: A Frustum object has been initialized. Scaling of the camera has been
+                 removed from the axes.
+        '''
+        axes = []
+        for row in range(3):
+            axis = matrix[row * 4:row * 4 + 3]
+            length = math.sqrt(axis[0] * axis[0] + axis[1] * axis[1] + axis[2] * axis[2])
+            axes.append((axis[0] / length, axis[1] / length, axis[2] / length))
+        self.position = (matrix[12], matrix[13], matrix[14])
+        self.axes = tuple(axes)
+        self.horizontalAngle = math.radians(horizontalFov) / 2.0
+        self.verticalAngle = math.radians(verticalFov) / 2.0
+        self.near = near
+        self.far = far
+        self.margin = margin
+
+    def toCamera(self, point):
+        '''
+        Transforms a point from world space to the space of the camera.
+
+        self: Object of the class Frustum.
+        point: Tuple with the world space coordinates of the point.
+        On exit: A tuple is returned with the coordinates of the point along the x-
+                 and y-axis of the camera and its distance in front of the camera.
+        '''
+        d = (point[0] - self.position[0], point[1] - self.position[1], point[2] - self.position[2])
+        x, y, z = [a[0] * d[0] + a[1] * d[1] + a[2] * d[2] for a in self.axes]
+        return (x, y, -z)
+
+    def toWorld(self, point):
+        '''
+        Transforms a point from the space of the camera to world space.
+
+        self: Object of the class Frustum.
+        point: Tuple with the coordinates of the point along the x- and y-axis of the
+               camera and its distance in front of the camera, as returned by
+               toCamera(...).
+        On exit: A tuple with the world space coordinates of the point is returned.
+        '''
+        x, y, depth = point
+        return tuple([self.position[i] + x * self.axes[0][i] + y * self.axes[1][i] - depth * self.axes[2][i]
+                      for i in range(3)])
+
+    def intersectsBox(self, minPoint, maxPoint):
+        '''
+        Checks if a box may be seen by the camera.
+
+        self: Object of the class Frustum.
+        minPoint: Tuple with the minimum x-, y- and z-coordinates of the box.
+        maxPoint: Tuple with the maximum x-, y- and z-coordinates of the box.
+        On exit: False is returned if all corners of the box are outside the same
+                 plane of the frustum, so that the box can not be seen. Otherwise
+                 True is returned. Boxes near the edges of the frustum may be counted
+                 as seen even if they are not.
+        '''
+        cosH = math.cos(self.horizontalAngle)
+        sinH = math.sin(self.horizontalAngle)
+        cosV = math.cos(self.verticalAngle)
+        sinV = math.sin(self.verticalAngle)
+        # Every corner gets the signed distances to the six planes, positive outside.
+        outside = [True] * 6
+        for x in (minPoint[0], maxPoint[0]):
+            for y in (minPoint[1], maxPoint[1]):
+                for z in (minPoint[2], maxPoint[2]):
+                    cx, cy, depth = self.toCamera((x, y, z))
+                    distances = (cx * cosH - depth * sinH, -cx * cosH - depth * sinH,
+                                 cy * cosV - depth * sinV, -cy * cosV - depth * sinV,
+                                 self.near - depth, depth - self.far)
+                    for i in range(6):
+                        if distances[i] <= self.margin:
+                            outside[i] = False
+        return not True in outside
+
+    def intersectsArea(self, area, height):
+        '''
+        Checks if a block with a given height may be seen by the camera.
+
+        self: Object of the class Frustum.
+        area: Tuple containing two tuples with the x- and z-coordinates for the
+              minimum and the maximum points of the block.
+        height: The height of the tallest object on the block.
+        On exit: intersectsBox(...) has been used to check the box from the ground to
+                 the height over the block, and the result is returned.
+        '''
+        return self.intersectsBox((area[0][0], 0, area[0][1]), (area[1][0], height, area[1][1]))
+
+    def groundRectangle(self, height):
+        '''
+        Finds the rectangle on the ground under the part of the frustum up to a height.
+
+        self: Object of the class Frustum.
+        height: The height of the tallest object in the scene.
+        On exit: A tuple containing two tuples with the minimum and the maximum x- and
+                 z-coordinates of the part of the frustum, with its planes moved
+                 outwards by the margin, between the ground and the height is
+                 returned, or None if the frustum does not reach that part of the
+                 scene. Boxes from the ground up to at most the height that are
+                 outside the rectangle can not be seen.
+        '''
+        # The corners of the frustum with its planes moved outwards by the margin,
+        # the near plane first.
+        corners = []
+        for depth in (self.near - self.margin, self.far + self.margin):
+            x = depth * math.tan(self.horizontalAngle) + self.margin / math.cos(self.horizontalAngle)
+            y = depth * math.tan(self.verticalAngle) + self.margin / math.cos(self.verticalAngle)
+            for corner in ((-x, -y), (x, -y), (x, y), (-x, y)):
+                corners.append(self.toWorld((corner[0], corner[1], depth)))
+        edges = ([(i, (i + 1) % 4) for i in range(4)] + [(i + 4, (i + 1) % 4 + 4) for i in range(4)] +
+                 [(i, i + 4) for i in range(4)])
+        # The part of the frustum between the ground and the height has the corners
+        # in between and the points where the edges cross the two levels as corners.
+        points = [corner for corner in corners if corner[1] >= 0 and corner[1] <= height]
+        for i, j in edges:
+            a = corners[i]
+            b = corners[j]
+            for level in (0, height):
+                if (a[1] - level) * (b[1] - level) < 0:
+                    t = (level - a[1]) / (b[1] - a[1])
+                    points.append((a[0] + t * (b[0] - a[0]), level, a[2] + t * (b[2] - a[2])))
+        if len(points) == 0:
+            return None
+        return ((min([p[0] for p in points]), min([p[2] for p in points])),
+                (max([p[0] for p in points]), max([p[2] for p in points])))
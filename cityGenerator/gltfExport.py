@@ -0,0 +1,377 @@
+import sys, math
+import json, struct, shutil, tempfile
+from array import array
+import cityPlan
+import cityScene
+
+'''
+List of procedures in the module:
+    class GlbWriter:
+        A GlbWriter object writes a binary glTF file, streaming the geometry to
+        disk while the scene is described.
+
+        def __init__(self, path):
+            Initializes a GlbWriter object for an empty scene.
+        def addMaterial(self, name_, colour, incandescence = (0, 0, 0)):
+            Adds a material to the file.
+        def addMesh(self, mesh_, name_):
+            Writes the geometry of a mesh to the file.
+        def addNode(self, name_, mesh_ = None, translation = None, rotation = None, scale = None, parent = None, light = None):
+            Adds a node to the scene.
+        def addLight(self, light):
+            Adds a light that nodes can use.
+        def writeView(self, data, target):
+            Writes an array to the binary buffer.
+        def close(self):
+            Writes the file.
+    def exportGlb(plan, path, environment, workers = 0):
+        Writes a planned city to a binary glTF file.
+    def addProp(writer, prototypes, prop, groups, spotLight = None):
+        Places a copy of a prototype in the scene of a GlbWriter.
+    def yRotation(angle):
+        Creates the quaternion for a rotation around the y-axis.
+    def xyRotation(x, y):
+        Creates the quaternion for a rotation around the x-axis followed by the y-axis.
+    def littleEndian(data):
+        Converts an array to little endian bytes.
+'''
+
+# A binary glTF (.glb) file is a JSON description of the scene followed by one binary
+# buffer with all the vertices and indices. The buffer is streamed to a temporary
+# file as the meshes are added, so only the JSON is kept in memory, and the two
+# parts are copied into the .glb file at the end. See
+# https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html for the format.
+GLB_MAGIC = 0x46546C67
+GLB_JSON = 0x4E4F534A
+GLB_BIN = 0x004E4942
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_INT = 5125
+
+class GlbWriter:
+    '''
+    A GlbWriter object writes a binary glTF file. The geometry of every mesh is
+    written to a temporary file as soon as it is added, and close() puts the JSON
+    description and the geometry together into the file. The faces are triangulated
+    and no normals are written, so viewers give the faces flat normals.
+
+    Attributes:
+        path: The path of the .glb file.
+        binary: The temporary file the binary buffer is streamed to.
+        length: The number of bytes written to the binary buffer.
+        gltf: Dictionary with the JSON description of the scene.
+        materialIndex: Dictionary from the name of a material to its index.
+    '''
+    def __init__(self, path):
+        '''
+        Initializes a GlbWriter object for an empty scene.
+
+        self: Object that is to be initialized.
+        path: See Attributes.
+        On exit: A GlbWriter object has been initialized with an empty scene and an
+                 empty temporary file for the binary buffer.
+        '''
+        self.path = path
+        self.binary = tempfile.TemporaryFile()
+        self.length = 0
+        self.gltf = {"asset": {"version": "2.0", "generator": "cityGenerator"}, "scene": 0,
+                     "scenes": [{"nodes": []}], "nodes": [], "meshes": [], "materials": [],
+                     "accessors": [], "bufferViews": []}
+        self.materialIndex = {}
+
+    def addMaterial(self, name_, colour, incandescence = (0, 0, 0)):
+        '''
+        Adds a material to the file.
+
+        self: Object of the class GlbWriter.
+        name_: The name of the material, used by the meshes.
+        colour: Triple with the RGB colour of the material.
+        incandescence: Triple with the RGB colour the material glows with.
+        On exit: A rough, non-metallic material has been added and its index is
+                 returned.
+        '''
+        material = {"name": name_,
+                    "pbrMetallicRoughness": {"baseColorFactor": [colour[0], colour[1], colour[2], 1.0],
+                                             "metallicFactor": 0.0, "roughnessFactor": 0.8}}
+        if tuple(incandescence) != (0, 0, 0):
+            material["emissiveFactor"] = [min(1.0, c) for c in incandescence]
+        self.materialIndex[name_] = len(self.gltf["materials"])
+        self.gltf["materials"].append(material)
+        return self.materialIndex[name_]
+
+    def addMesh(self, mesh_, name_):
+        '''
+        Writes the geometry of a mesh to the file.
+
+        self: Object of the class GlbWriter.
+        mesh_: Object of the class mesh.Mesh. Its faces have to be convex.
+        name_: The name of the mesh.
+        On exit: The vertices and the triangulated faces of the mesh have been written
+                 to the binary buffer, with one primitive for the faces of every
+                 material. Materials that have not been added get a grey material.
+                 The index of the mesh is returned, or None if the mesh has no faces.
+        '''
+        if mesh_.faceCount() == 0:
+            return None
+        points = array("f", mesh_.points)
+        accessors = self.gltf["accessors"]
+        accessors.append({"bufferView": self.writeView(points, ARRAY_BUFFER), "componentType": FLOAT,
+                          "count": len(points) // 3, "type": "VEC3",
+                          "min": [min(points[0::3]), min(points[1::3]), min(points[2::3])],
+                          "max": [max(points[0::3]), max(points[1::3]), max(points[2::3])]})
+        position = len(accessors) - 1
+        starts = array("i", [0] * mesh_.faceCount())
+        for i in range(1, len(starts)):
+            starts[i] = starts[i - 1] + mesh_.faceCounts[i - 1]
+        primitives = []
+        faces = mesh_.facesByMaterial()
+        for m in range(len(faces)):
+            if len(faces[m]) == 0:
+                continue
+            indices = array("I")
+            for f in faces[m]:
+                first = starts[f]
+                # Every face is split into a fan of triangles around its first vertex.
+                for j in range(1, mesh_.faceCounts[f] - 1):
+                    indices.extend((mesh_.faceConnects[first], mesh_.faceConnects[first + j],
+                                    mesh_.faceConnects[first + j + 1]))
+            accessors.append({"bufferView": self.writeView(indices, ELEMENT_ARRAY_BUFFER),
+                              "componentType": UNSIGNED_INT, "count": len(indices), "type": "SCALAR"})
+            material = mesh_.materials[m]
+            if not material in self.materialIndex:
+                self.addMaterial(material, (0.5, 0.5, 0.5))
+            primitives.append({"attributes": {"POSITION": position}, "indices": len(accessors) - 1,
+                               "material": self.materialIndex[material]})
+        self.gltf["meshes"].append({"name": name_, "primitives": primitives})
+        return len(self.gltf["meshes"]) - 1
+
+    def addNode(self, name_, mesh_ = None, translation = None, rotation = None, scale = None, parent = None, light = None):
+        '''
+        Adds a node to the scene.
+
+        self: Object of the class GlbWriter.
+        name_: The name of the node.
+        mesh_: The index of the mesh the node shows, or None.
+        translation: Tuple with the translation of the node, or None.
+        rotation: Tuple with the x-, y-, z- and w-components of the quaternion the
+                  node is rotated by, or None.
+        scale: Tuple with the scale of the node along the x-, y- and z-axis, or None.
+        parent: The index of the parent node, or None to add the node to the scene.
+        light: The index of a light added by addLight(...) that the node holds, or
+               None.
+        On exit: The node has been added and its index is returned.
+        '''
+        node = {"name": name_}
+        if mesh_ != None:
+            node["mesh"] = mesh_
+        if translation != None:
+            node["translation"] = list(translation)
+        if rotation != None:
+            node["rotation"] = list(rotation)
+        if scale != None:
+            node["scale"] = list(scale)
+        if light != None:
+            node["extensions"] = {"KHR_lights_punctual": {"light": light}}
+        nodes = self.gltf["nodes"]
+        nodes.append(node)
+        if parent == None:
+            self.gltf["scenes"][0]["nodes"].append(len(nodes) - 1)
+        else:
+            nodes[parent].setdefault("children", []).append(len(nodes) - 1)
+        return len(nodes) - 1
+
+    def addLight(self, light):
+        '''
+        Adds a light that nodes can use.
+
+        self: Object of the class GlbWriter.
+        light: Dictionary describing the light as in the KHR_lights_punctual
+               extension. The light shines along the negative z-axis of its node.
+        On exit: The light has been added and its index is returned.
+        '''
+        if not "extensions" in self.gltf:
+            self.gltf["extensionsUsed"] = ["KHR_lights_punctual"]
+            self.gltf["extensions"] = {"KHR_lights_punctual": {"lights": []}}
+        lights = self.gltf["extensions"]["KHR_lights_punctual"]["lights"]
+        lights.append(light)
+        return len(lights) - 1
+
+    def writeView(self, data, target):
+        '''
+        Writes an array to the binary buffer.
+
+        self: Object of the class GlbWriter.
+        data: An array with 4 byte floats or integers.
+        target: ARRAY_BUFFER for vertex data or ELEMENT_ARRAY_BUFFER for indices.
+        On exit: The array has been written to the temporary file as little endian.
+                 A buffer view of it has been added and its index is returned.
+        '''
+        data = littleEndian(data)
+        self.binary.write(data)
+        self.gltf["bufferViews"].append({"buffer": 0, "byteOffset": self.length, "byteLength": len(data),
+                                         "target": target})
+        self.length = self.length + len(data)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def close(self):
+        '''
+        Writes the file.
+
+        self: Object of the class GlbWriter.
+        On exit: The .glb file has been written with the JSON description, padded
+                 with spaces, followed by the binary buffer copied from the temporary
+                 file, which has been closed. The size of the file in bytes is
+                 returned.
+        '''
+        self.gltf["buffers"] = [{"byteLength": self.length}]
+        description = json.dumps(self.gltf, separators = (",", ":")).encode("utf-8")
+        description = description + b" " * (-len(description) % 4)
+        size = 12 + 8 + len(description) + 8 + self.length
+        output = open(self.path, "wb")
+        try:
+            output.write(struct.pack("<III", GLB_MAGIC, 2, size))
+            output.write(struct.pack("<II", len(description), GLB_JSON))
+            output.write(description)
+            output.write(struct.pack("<II", self.length, GLB_BIN))
+            self.binary.seek(0)
+            shutil.copyfileobj(self.binary, output)
+        finally:
+            output.close()
+            self.binary.close()
+        return size
+
+def exportGlb(plan, path, environment, workers = 0):
+    '''
+    Writes a planned city to a binary glTF file.
+
+    plan: Object of the class cityPlan.CityPlan, either complete or just started by
+          cityPlan.startPlan(...).
+    path: The path of the .glb file.
+    environment: Triple with the colour value of the environment, see
+                 cityGenerator.city(...).
+    workers: See cityPlan.iterBlockPlans(...).
+    On exit: The city has been written to the file without maya. The ground, the
+             houses and the fences and fountains of the parks are meshes of their
+             own, while the pavements, street lights, traffic lights, trees and
+             squares of grass are nodes that share one mesh per prototype, see
+             cityScene. The nodes are grouped under a node with the name of every
+             group in cityGenerator.buildCity(...). The sun is a directional light and
+             at night every street light holds a spot light. If the plan was not
+             complete, the blocks have been planned while they were written, and
+             the plan is complete. Every block is written as soon as it is planned,
+             so the geometry of the whole city is never in memory at the same time.
+             The size of the file in bytes is returned.
+    '''
+    params = plan.params
+    writer = GlbWriter(path)
+    try:
+        materials = cityScene.materialColours(plan, environment)
+        for name_ in sorted(materials):
+            writer.addMaterial(name_, materials[name_][0], materials[name_][1])
+        city = writer.addNode("city")
+        groups = {}
+        for group in ["blocks", "houses", "parks", "streetLights", "trafficLights", "trees"]:
+            groups[group] = writer.addNode(group, parent = city)
+        writer.addNode("Ground", writer.addMesh(cityScene.groundMesh(params["size"]), "Ground"), parent = city)
+        intensity = 1.0
+        if not params["daytime"]:
+            intensity = 0.05
+        sun = writer.addLight({"type": "directional", "intensity": intensity})
+        writer.addNode("directionalLight", translation = (0, 50, 0), rotation = xyRotation(*plan.lightRotation),
+                       parent = city, light = sun)
+        spotLight = None
+        if not params["daytime"]:
+            # The spot light of trafficLight.placeLight(...).
+            spotLight = writer.addLight({"type": "spot", "intensity": 0.672,
+                                         "spot": {"innerConeAngle": 0.0, "outerConeAngle": math.radians(125 / 2.0)}})
+        prototypes = {}
+        for blockPlan in cityPlan.iterBlockPlans(plan, workers):
+            center, width, depth = cityScene.blockPavement(blockPlan["area"])
+            if blockPlan["type"] == "house":
+                name_ = "House"
+                group = "houses"
+            else:
+                name_ = "Park"
+                group = "parks"
+            block = cityScene.blockMesh(blockPlan, params["booleans"], params["recessed"])
+            writer.addNode(name_, writer.addMesh(block, name_), translation = (center[0], 0, center[1]),
+                           parent = groups[group])
+            for prop in cityScene.blockProps(blockPlan):
+                addProp(writer, prototypes, prop, groups, spotLight)
+        for prop in cityScene.trafficLightProps(plan.streets, params["size"], plan.trafficLights):
+            addProp(writer, prototypes, prop, groups)
+        return writer.close()
+    finally:
+        writer.binary.close()
+
+def addProp(writer, prototypes, prop, groups, spotLight = None):
+    '''
+    Places a copy of a prototype in the scene of a GlbWriter.
+
+    writer: Object of the class GlbWriter.
+    prototypes: Dictionary from the name of every prototype that has been written
+                to the index of its mesh.
+    prop: Tuple describing the copy, see cityScene.
+    groups: Dictionary from the name of every group to the index of its node.
+    spotLight: The index of the light every street light holds, or None.
+    On exit: The mesh of the prototype has been written and added to prototypes if
+             it was not there. A node showing the mesh has been added to the group
+             given by cityScene.propGroup(...), and a street light has been given a
+             child node with the spot light, 2.6 units up and shining down.
+    '''
+    name_, translation, rotation, scale = prop
+    if not name_ in prototypes:
+        prototypes[name_] = writer.addMesh(cityScene.prototypeMesh(name_), name_)
+    quaternion = None
+    if rotation != 0:
+        quaternion = yRotation(rotation)
+    if tuple(scale) == (1, 1, 1):
+        scale = None
+    node = writer.addNode(name_, prototypes[name_], translation, quaternion, scale,
+                          groups[cityScene.propGroup(name_)])
+    if name_ == "streetLight" and spotLight != None:
+        writer.addNode("spotLight", translation = (0, 2.6, 0), rotation = xyRotation(-90, 0),
+                       parent = node, light = spotLight)
+
+def yRotation(angle):
+    '''
+    Creates the quaternion for a rotation around the y-axis.
+
+    angle: The angle in degrees.
+    On exit: A tuple with the x-, y-, z- and w-components of the quaternion is
+             returned.
+    '''
+    half = math.radians(angle) / 2.0
+    return (0.0, math.sin(half), 0.0, math.cos(half))
+
+def xyRotation(x, y):
+    '''
+    Creates the quaternion for a rotation around the x-axis followed by the y-axis.
+
+    x: The angle around the x-axis in degrees.
+    y: The angle around the y-axis in degrees.
+    On exit: A tuple with the x-, y-, z- and w-components of the quaternion is
+             returned. It rotates the same way as a transform in maya with the
+             rotation (x, y, 0) and the default rotate order.
+    '''
+    sx = math.sin(math.radians(x) / 2.0)
+    cx = math.cos(math.radians(x) / 2.0)
+    sy = math.sin(math.radians(y) / 2.0)
+    cy = math.cos(math.radians(y) / 2.0)
+    return (cy * sx, sy * cx, -sy * sx, cy * cx)
+
+def littleEndian(data):
+    '''
+    Converts an array to little endian bytes.
+
+    data: An array.
+    On exit: A byte string with the items of the array in little endian byte order
+             is returned.
+    '''
+    if sys.byteorder == "big":
+        data = array(data.typecode, data)
+        data.byteswap()
+    if hasattr(data, "tobytes"):
+        return data.tobytes()
+    return data.tostring()
@@ -0,0 +1,203 @@
+import math
+from collections import OrderedDict
+
+'''
+List of procedures in the module:
+    class HouseCache:
+        A HouseCache object keeps track of the house prototypes that have already
+        been built, so that houses with the same shape can be instanced.
+
+        def __init__(self, maxSize = 200, tolerance = 0.0):
+            Initializes an empty HouseCache object.
+        def __len__(self):
+            Returns the number of prototypes in the cache.
+        def get(self, key):
+            Looks up the prototype for a key.
+        def put(self, key, prototype):
+            Adds a prototype to the cache.
+        def hitRate(self):
+            Returns the share of the lookups that found a prototype.
+        def report(self):
+            Returns a summary of how well the cache worked.
+    def quantize(value, tolerance):
+        Rounds a value to the nearest multiple of the tolerance.
+    def facadeKey(facade, tolerance):
+        Creates the part of a cache key that describes the windows of a house.
+    def deformationKey(deformation, size, tolerance):
+        Creates the part of a cache key that describes the baked deformers of a house.
+'''
+
+class HouseCache:
+    '''
+    A HouseCache object keeps track of the house prototypes that have already
+    been built. The key of a prototype describes the shape of the house with all
+    continuous parameters rounded to the tolerance, and the value is whatever the
+    caller uses to make copies, in makeHouse(...) the name of a hidden polygon
+    object that is instanced and its size. The cache holds at most maxSize
+    prototypes and evicts the least recently used one when it is full.
+    A tolerance of 0 only lets houses that are exactly the same share a prototype.
+    A larger tolerance gives more hits, and thus faster cities, at the cost of less
+    variety, since similar houses become identical copies.
+
+    Attributes:
+        maxSize: The largest number of prototypes kept in the cache.
+        tolerance: The largest difference, in scene units, between two houses
+                   that can share a prototype.
+        prototypes: OrderedDict from key to prototype, least recently used first.
+        hits: Number of lookups that found a prototype.
+        misses: Number of lookups that did not find a prototype.
+        evictions: Number of prototypes that have been evicted.
+    '''
+    def __init__(self, maxSize = 200, tolerance = 0.0):
+        '''
+        Initializes an empty HouseCache object.
+
+        self: Object that is to be initialized.
+        maxSize: See Attributes.
+        tolerance: See Attributes.
+        On exit: A HouseCache object without prototypes has been initialized.
+        '''
+        self.maxSize = max(1, maxSize)
+        self.tolerance = tolerance
+        self.prototypes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        '''
+        Returns the number of prototypes in the cache.
+        '''
+        return len(self.prototypes)
+
+    def get(self, key):
+        '''
+        Looks up the prototype for a key.
+
+        self: Object of the class HouseCache.
+        key: Hashable description of the shape of a house.
+        On exit: If the cache has a prototype for the key it has been marked as the
+                 most recently used, the hit has been counted and the prototype is
+                 returned. Otherwise the miss has been counted and None is returned.
+        '''
+        if not key in self.prototypes:
+            self.misses = self.misses + 1
+            return None
+        # Reinsert the prototype to move it to the end of the order.
+        prototype = self.prototypes.pop(key)
+        self.prototypes[key] = prototype
+        self.hits = self.hits + 1
+        return prototype
+
+    def put(self, key, prototype):
+        '''
+        Adds a prototype to the cache.
+
+        self: Object of the class HouseCache.
+        key: Hashable description of the shape of the house.
+        prototype: The prototype, for example the name of its polygon object.
+        On exit: The prototype has been added as the most recently used. If the
+                 cache was full, the least recently used prototypes have been
+                 removed, and a list with them is returned so that the caller can
+                 delete them.
+        '''
+        if key in self.prototypes:
+            del self.prototypes[key]
+        self.prototypes[key] = prototype
+        evicted = []
+        while len(self.prototypes) > self.maxSize:
+            evicted.append(self.prototypes.popitem(last = False)[1])
+            self.evictions = self.evictions + 1
+        return evicted
+
+    def hitRate(self):
+        '''
+        Returns the share of the lookups that found a prototype.
+
+        self: Object of the class HouseCache.
+        On exit: The number of hits divided by the number of lookups is returned,
+                 or 0 if there have been no lookups.
+        '''
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / float(lookups)
+
+    def report(self):
+        '''
+        Returns a summary of how well the cache worked.
+
+        self: Object of the class HouseCache.
+        On exit: A string with the number of hits, misses and evictions, the hit
+                 rate and the number of prototypes in the cache is returned. If at
+                 most half of the lookups were hits, a second line warns that
+                 building the prototypes and instancing them probably took longer
+                 than building every copy directly.
+        '''
+        report = ("House cache: %d hits, %d misses (hit rate %.1f%%), %d prototypes, %d evicted, tolerance %g"
+                  % (self.hits, self.misses, 100.0 * self.hitRate(), len(self.prototypes),
+                     self.evictions, self.tolerance))
+        if self.misses > 0 and self.hitRate() <= 0.5:
+            report = report + ("\n  Most house prototypes were used only once, so instancing costs more"
+                               " than it saves. Use a larger tolerance or turn instancing off.")
+        return report
+
+def quantize(value, tolerance):
+    '''
+    Rounds a value to the nearest multiple of the tolerance.
+
+    value: The value.
+    tolerance: The step the value is rounded to.
+    On exit: The number of steps is returned as an integer, or the value itself
+             if the tolerance is 0. Values that are closer together than the
+             tolerance usually get the same result.
+    '''
+    if tolerance <= 0:
+        return value
+    return int(math.floor(value / tolerance + 0.5))
+
+def facadeKey(facade, tolerance):
+    '''
+    Creates the part of a cache key that describes the windows of a house.
+
+    facade: None, or a tuple with the columns, windowWidth, windowHeight, heightNum,
+            floorHeight and materials arguments of mesh.windowMesh(...).
+    tolerance: See the attributes of HouseCache.
+    On exit: A hashable tuple is returned with the rounded window size, the number
+             of windows in every column, the floor height and the number of columns
+             facing the front and the sides. The shaders of the individual windows
+             are only part of the key if the tolerance is 0, otherwise the windows
+             of a copy get the same shaders as the prototype.
+    '''
+    if facade == None:
+        return None
+    columns, windowWidth, windowHeight, heightNum, floorHeight, materials = facade
+    # The positions of the columns follow from the size of the house and the number
+    # of columns facing each way.
+    facingFront = len([c for c in columns if c[2] == 0])
+    key = (quantize(windowWidth, tolerance), quantize(windowHeight, tolerance), heightNum, floorHeight,
+           facingFront, len(columns) - facingFront)
+    if tolerance <= 0:
+        key = key + (tuple(materials),)
+    return key
+
+def deformationKey(deformation, size, tolerance):
+    '''
+    Creates the part of a cache key that describes the baked deformers of a house.
+
+    deformation: None, or a tuple as returned by cityPlan.drawDeformation(...).
+    size: Half the width of the house, used to turn the flare and twist into
+          distances so that they can be compared with the tolerance.
+    tolerance: See the attributes of HouseCache.
+    On exit: A hashable tuple is returned with the rounded flare height, the
+             rounded movement of the side of the house caused by the end flare,
+             the curve and the twist, or None if the house has no deformers.
+    '''
+    if deformation == None:
+        return None
+    flareY, endFlare, curve, endAngle = deformation
+    if flareY != None:
+        flareY = quantize(flareY, tolerance)
+    if endAngle != None:
+        endAngle = quantize(math.radians(endAngle) * size, tolerance)
+    return (flareY, quantize((endFlare - 1.0) * size, tolerance), quantize(curve * size, tolerance), endAngle)
@@ -0,0 +1,110 @@
+import maya.cmds as cmds
+
+'''
+List of procedures in the module:
+    def makeLodGroup(name_, levels, center, camera, distances):
+        Groups the levels of detail of an object under a LOD group node.
+    def lodGroups():
+        Lists the LOD group nodes in the scene.
+    def setLodCamera(camera, groups = None):
+        Changes the camera the levels of detail are chosen from.
+    def setLodDistances(distances, groups = None):
+        Changes the distances where the levels of detail switch.
+    def setLodLevel(level = None, groups = None):
+        Shows one level of detail, or lets the distance to the camera choose it again.
+'''
+
+# A LOD group node shows one of its children at a time. It measures the distance
+# from its camera and shows child i if the distance is between threshold[i - 1]
+# and threshold[i], unless displayLevel[i] forces the child to be shown (1) or
+# hidden (2). The nodes are connected the same way as by the lodGroup command, so
+# the levels switch while the camera moves, in the viewport and in renders.
+
+def makeLodGroup(name_, levels, center, camera, distances):
+    '''
+    Groups the levels of detail of an object under a LOD group node.
+
+    name_: The name the LOD group is given.
+    levels: List with the names of the objects for every level, the most detailed first.
+    center: Tuple with the x- and z-coordinates of the object. The distance to the
+            camera is measured from here.
+    camera: The name of the transform of the camera.
+    distances: List with the distances where the levels switch. Only the first
+               len(levels) - 1 distances are used.
+    On exit: A LOD group node has been created at the center, the levels have been
+             parented to it and it has been connected to the camera. The name of the
+             LOD group is returned.
+    '''
+    group = cmds.createNode("lodGroup", name = name_)
+    cmds.xform(group, translation = (center[0], 0, center[1]))
+    for i in range(len(levels)):
+        level = cmds.parent(levels[i], group)[0]
+        cmds.connectAttr(group + ".output[%d]" % i, level + ".lodVisibility")
+    setLodDistances(distances, [group])
+    setLodCamera(camera, [group])
+    return group
+
+def lodGroups():
+    '''
+    Lists the LOD group nodes in the scene.
+
+    On exit: A list with the names of all LOD group nodes is returned.
+    '''
+    return cmds.ls(type = "lodGroup")
+
+def setLodCamera(camera, groups = None):
+    '''
+    Changes the camera the levels of detail are chosen from.
+
+    camera: The name of the transform of the camera.
+    groups: List with the names of the LOD groups, or None for all LOD groups.
+    On exit: The groups measure their distance from the camera, and the levels that
+             are shown have been updated.
+    '''
+    if groups == None:
+        groups = lodGroups()
+    shape = cmds.listRelatives(camera, shapes = True)[0]
+    for group in groups:
+        cmds.connectAttr(camera + ".worldMatrix[0]", group + ".cameraMatrix", force = True)
+        cmds.connectAttr(shape + ".focalLength", group + ".focalLength", force = True)
+
+def setLodDistances(distances, groups = None):
+    '''
+    Changes the distances where the levels of detail switch.
+
+    distances: List with the distance from the camera where each level switches to
+               the next one.
+    groups: List with the names of the LOD groups, or None for all LOD groups.
+    On exit: The thresholds of the groups have been set. A group with n levels uses
+             the first n - 1 distances.
+    '''
+    if groups == None:
+        groups = lodGroups()
+    for group in groups:
+        count = len(cmds.listRelatives(group, children = True) or [])
+        for i in range(min(count - 1, len(distances))):
+            cmds.setAttr(group + ".threshold[%d]" % i, distances[i])
+
+def setLodLevel(level = None, groups = None):
+    '''
+    Shows one level of detail, or lets the distance to the camera choose it again.
+
+    level: The index of the level that is shown, or None to choose the levels from
+           the distance to the camera.
+    groups: List with the names of the LOD groups, or None for all LOD groups.
+    On exit: If level is None, every group shows the level for its distance.
+             Otherwise every group shows the given level, or its last level if it has
+             fewer levels, and hides the others. Nothing has been rebuilt.
+    '''
+    if groups == None:
+        groups = lodGroups()
+    for group in groups:
+        count = len(cmds.listRelatives(group, children = True) or [])
+        for i in range(count):
+            if level == None:
+                display = 0
+            elif i == min(level, count - 1):
+                display = 1
+            else:
+                display = 2
+            cmds.setAttr(group + ".displayLevel[%d]" % i, display)
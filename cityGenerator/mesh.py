@@ -0,0 +1,639 @@
+import math
+from array import array
+
+'''
+List of procedures in the module:
+    class Mesh:
+        A Mesh object is a polygon mesh description stored in flat arrays.
+
+        def __init__(self):
+            Initializes an empty Mesh object.
+        def vertexCount(self):
+            Returns the number of vertices in the mesh.
+        def faceCount(self):
+            Returns the number of faces in the mesh.
+        def materialId(self, material):
+            Returns the material ID for a shading group.
+        def addVertex(self, x, y, z):
+            Adds a vertex to the mesh.
+        def addFace(self, vertices, materialId):
+            Adds a face to the mesh.
+        def append(self, other):
+            Adds all the vertices and faces of another mesh to the mesh.
+        def translate(self, x, y, z, startVertex = 0):
+            Moves vertices of the mesh.
+        def rotateY(self, angle, startVertex = 0):
+            Rotates vertices of the mesh around the y-axis.
+        def facesByMaterial(self):
+            Sorts the faces of the mesh by material.
+        def boundingBox(self):
+            Computes the bounding box of the mesh.
+    def addRings(mesh, base, ringPoints, height, heightSegments):
+        Adds rings of vertices stacked along the y-axis to a mesh.
+    def addWall(mesh, first, count, heightSegments, materialId, inwards = False):
+        Adds the quads connecting rings of vertices created by addRings(...).
+    def circlePoints(radius, sides):
+        Returns the corners of a regular polygon in the xz-plane.
+    def addBox(mesh, base, size, material, heightSegments = 1):
+        Adds a box to a mesh.
+    def addCylinder(mesh, base, radius, height, sides, material, heightSegments = 1):
+        Adds a cylinder to a mesh.
+    def addPipe(mesh, base, radius, thickness, height, sides, material, heightSegments = 1):
+        Adds a pipe to a mesh.
+    def boxHouseMesh(height, width, depth, material, facade = None):
+        Creates the mesh for the body and foundation of a box house.
+    def cylinderHouseMesh(height, radius, sides, material, facade = None):
+        Creates the mesh for the body and foundation of a cylinder house.
+    def pipeHouseMesh(height, radius, sides, thickness, material, facade = None):
+        Creates the mesh for the body and foundation of a pipe house.
+    def boxWindowColumns(width, depth, windowWidth, widthNum, widthSpace, depthNum, depthSpace):
+        Computes where the window columns of a box house are placed.
+    def prismWindowColumns(radius, sides):
+        Computes where the window columns of a cylinder or pipe house are placed.
+    def windowMesh(columns, windowWidth, windowHeight, heightNum, floorHeight, materials, thickness = 0.1):
+        Creates the mesh for all the windows of a house.
+    def facadeLevels(height, windowHeight, heightNum, floorHeight):
+        Computes the heights of the horizontal edge loops of a house with recessed windows.
+    def addFacade(mesh, base, corners, height, facade, materialId, depth = 0.05):
+        Adds the outer wall of a house with recessed windows to a mesh.
+    def addRecessedPrism(mesh, base, corners, height, material, facade):
+        Adds a closed prism with recessed windows to a mesh.
+'''
+
+class Mesh:
+    '''
+    A Mesh object is a polygon mesh description stored in flat arrays, in the
+    same layout as the data Maya's MFnMesh.create takes. It does not depend on
+    Maya, so the geometry of a house can be generated and inspected anywhere,
+    and then committed to Maya in one call with tools.commitMesh(...).
+    The faces are listed counter clockwise seen from the outside.
+
+    Attributes:
+        points: Array with the x-, y- and z-coordinates of every vertex after
+                each other.
+        faceCounts: Array with the number of vertices in every face.
+        faceConnects: Array with the vertex indices of every face after each other.
+        materialIds: Array with the material ID of every face.
+        materials: List with the name of the shading group for every material ID.
+    '''
+    def __init__(self):
+        '''
+        Initializes an empty Mesh object.
+
+        self: Object that is to be initialized.
+        On exit: A Mesh object without vertices, faces or materials has been initialized.
+        '''
+        self.points = array("d")
+        self.faceCounts = array("i")
+        self.faceConnects = array("i")
+        self.materialIds = array("i")
+        self.materials = []
+
+    def vertexCount(self):
+        '''
+        Returns the number of vertices in the mesh.
+        '''
+        return len(self.points) // 3
+
+    def faceCount(self):
+        '''
+        Returns the number of faces in the mesh.
+        '''
+        return len(self.faceCounts)
+
+    def materialId(self, material):
+        '''
+        Returns the material ID for a shading group.
+
+        self: Object of the class Mesh.
+        material: Name of the shading group.
+        On exit: The shading group has been added to materials if it was not
+                 already there, and its material ID is returned.
+        '''
+        if material in self.materials:
+            return self.materials.index(material)
+        self.materials.append(material)
+        return len(self.materials) - 1
+
+    def addVertex(self, x, y, z):
+        '''
+        Adds a vertex to the mesh.
+
+        self: Object of the class Mesh.
+        x, y, z: Coordinates of the vertex.
+        On exit: The vertex has been added and its index is returned.
+        '''
+        self.points.extend((x, y, z))
+        return len(self.points) // 3 - 1
+
+    def addFace(self, vertices, materialId):
+        '''
+        Adds a face to the mesh.
+
+        self: Object of the class Mesh.
+        vertices: List with the indices of the vertices of the face, counter
+                  clockwise seen from the outside.
+        materialId: The material ID of the face.
+        On exit: The face has been added and its index is returned.
+        '''
+        self.faceCounts.append(len(vertices))
+        self.faceConnects.extend(vertices)
+        self.materialIds.append(materialId)
+        return len(self.faceCounts) - 1
+
+    def append(self, other):
+        '''
+        Adds all the vertices and faces of another mesh to the mesh.
+
+        self: Object of the class Mesh.
+        other: Object of the class Mesh that is added to self.
+        On exit: The vertices and faces of other have been added after the ones in
+                 self. The materials of other have been mapped to the material IDs
+                 of self.
+        '''
+        offset = self.vertexCount()
+        idMap = [self.materialId(m) for m in other.materials]
+        self.points.extend(other.points)
+        self.faceCounts.extend(other.faceCounts)
+        self.faceConnects.extend(array("i", [v + offset for v in other.faceConnects]))
+        self.materialIds.extend(array("i", [idMap[m] for m in other.materialIds]))
+
+    def translate(self, x, y, z, startVertex = 0):
+        '''
+        Moves vertices of the mesh.
+
+        self: Object of the class Mesh.
+        x, y, z: The translation.
+        startVertex: Index of the first vertex that will be moved.
+        On exit: All vertices from startVertex and on have been moved.
+        '''
+        p = self.points
+        for i in range(startVertex * 3, len(p), 3):
+            p[i] += x
+            p[i + 1] += y
+            p[i + 2] += z
+
+    def rotateY(self, angle, startVertex = 0):
+        '''
+        Rotates vertices of the mesh around the y-axis.
+
+        self: Object of the class Mesh.
+        angle: The angle in degrees. Positive angles rotate the same way as
+               a positive y rotation in Maya.
+        startVertex: Index of the first vertex that will be rotated.
+        On exit: All vertices from startVertex and on have been rotated around the
+                 y-axis through origo.
+        '''
+        cos = math.cos(math.radians(angle))
+        sin = math.sin(math.radians(angle))
+        p = self.points
+        for i in range(startVertex * 3, len(p), 3):
+            x = p[i]
+            z = p[i + 2]
+            p[i] = x * cos + z * sin
+            p[i + 2] = -x * sin + z * cos
+
+    def facesByMaterial(self):
+        '''
+        Sorts the faces of the mesh by material.
+
+        self: Object of the class Mesh.
+        On exit: A list is returned with one list of face indices for every
+                 material ID.
+        '''
+        faces = [[] for m in self.materials]
+        for i in range(len(self.materialIds)):
+            faces[self.materialIds[i]].append(i)
+        return faces
+
+    def boundingBox(self):
+        '''
+        Computes the bounding box of the mesh.
+
+        self: Object of the class Mesh.
+        On exit: A list with the minimum x-, y- and z-coordinates followed by the
+                 maximum x-, y- and z-coordinates is returned, in the same order as
+                 cmds.exactWorldBoundingBox(...) returns them.
+        '''
+        p = self.points
+        if len(p) == 0:
+            return [0.0] * 6
+        return [min(p[0::3]), min(p[1::3]), min(p[2::3]), max(p[0::3]), max(p[1::3]), max(p[2::3])]
+
+def addRings(mesh, base, ringPoints, height, heightSegments):
+    '''
+    Adds rings of vertices stacked along the y-axis to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the bottom center of the rings.
+    ringPoints: List of tuples with the x- and z-coordinates of one ring, relative
+                to base.
+    height: The distance between the lowest and the highest ring.
+    heightSegments: Number of segments between the lowest and the highest ring.
+    On exit: heightSegments + 1 rings of vertices have been added, and the index of
+             the first vertex is returned. Vertex j of ring i has the index
+             first + i * len(ringPoints) + j.
+    '''
+    first = mesh.vertexCount()
+    for i in range(heightSegments + 1):
+        y = base[1] + height * i / float(heightSegments)
+        for x, z in ringPoints:
+            mesh.addVertex(base[0] + x, y, base[2] + z)
+    return first
+
+def addWall(mesh, first, count, heightSegments, materialId, inwards = False):
+    '''
+    Adds the quads connecting rings of vertices created by addRings(...).
+
+    mesh: Object of the class Mesh.
+    first: Index of the first vertex in the rings.
+    count: Number of vertices in each ring.
+    heightSegments: Number of segments between the lowest and the highest ring.
+    materialId: Material ID for the faces.
+    inwards: If True, the faces point towards the y-axis instead of away from it.
+    On exit: count quads have been added for every segment. The rings are assumed
+             to go counter clockwise seen from above (from +x towards -z).
+    '''
+    for i in range(heightSegments):
+        low = first + i * count
+        high = low + count
+        for j in range(count):
+            k = (j + 1) % count
+            if inwards:
+                mesh.addFace([low + k, low + j, high + j, high + k], materialId)
+            else:
+                mesh.addFace([low + j, low + k, high + k, high + j], materialId)
+
+def circlePoints(radius, sides):
+    '''
+    Returns the corners of a regular polygon in the xz-plane.
+
+    radius: The distance from the center to the corners.
+    sides: Number of corners.
+    On exit: A list with the x- and z-coordinates of the corners is returned,
+             starting on the positive x-axis and going counter clockwise seen from
+             above (from +x towards -z).
+    '''
+    angle = 2.0 * math.pi / sides
+    return [(radius * math.cos(angle * i), -radius * math.sin(angle * i)) for i in range(sides)]
+
+def addBox(mesh, base, size, material, heightSegments = 1):
+    '''
+    Adds a box to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the center of the bottom of the box.
+    size: Tuple with the width, height and depth of the box.
+    material: Name of the shading group for the faces.
+    heightSegments: Number of segments the sides are divided in along the y-axis.
+    On exit: A closed box has been added to the mesh.
+    '''
+    w = size[0] / 2.0
+    d = size[2] / 2.0
+    materialId = mesh.materialId(material)
+    first = addRings(mesh, base, [(-w, d), (w, d), (w, -d), (-w, -d)], size[1], heightSegments)
+    top = first + heightSegments * 4
+    addWall(mesh, first, 4, heightSegments, materialId)
+    mesh.addFace([first + 3, first + 2, first + 1, first], materialId)
+    mesh.addFace([top, top + 1, top + 2, top + 3], materialId)
+
+def addCylinder(mesh, base, radius, height, sides, material, heightSegments = 1):
+    '''
+    Adds a cylinder to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the center of the bottom of the cylinder.
+    radius: The radius of the cylinder.
+    height: The height of the cylinder.
+    sides: Number of sides around the cylinder.
+    material: Name of the shading group for the faces.
+    heightSegments: Number of segments the sides are divided in along the y-axis.
+    On exit: A closed cylinder with one polygon on each cap has been added to the mesh.
+    '''
+    materialId = mesh.materialId(material)
+    first = addRings(mesh, base, circlePoints(radius, sides), height, heightSegments)
+    top = first + heightSegments * sides
+    addWall(mesh, first, sides, heightSegments, materialId)
+    mesh.addFace([first + j for j in range(sides - 1, -1, -1)], materialId)
+    mesh.addFace([top + j for j in range(sides)], materialId)
+
+def addPipe(mesh, base, radius, thickness, height, sides, material, heightSegments = 1):
+    '''
+    Adds a pipe to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the center of the bottom of the pipe.
+    radius: The outer radius of the pipe.
+    thickness: The distance between the outer and the inner wall.
+    height: The height of the pipe.
+    sides: Number of sides around the pipe.
+    material: Name of the shading group for the faces.
+    heightSegments: Number of segments the walls are divided in along the y-axis.
+    On exit: A closed pipe has been added to the mesh.
+    '''
+    materialId = mesh.materialId(material)
+    outer = addRings(mesh, base, circlePoints(radius, sides), height, heightSegments)
+    inner = addRings(mesh, base, circlePoints(radius - thickness, sides), height, heightSegments)
+    addWall(mesh, outer, sides, heightSegments, materialId)
+    addWall(mesh, inner, sides, heightSegments, materialId, True)
+    outerTop = outer + heightSegments * sides
+    innerTop = inner + heightSegments * sides
+    for j in range(sides):
+        k = (j + 1) % sides
+        mesh.addFace([outer + k, outer + j, inner + j, inner + k], materialId)
+        mesh.addFace([outerTop + j, outerTop + k, innerTop + k, innerTop + j], materialId)
+
+def boxHouseMesh(height, width, depth, material, facade = None):
+    '''
+    Creates the mesh for the body and foundation of a box house.
+
+    height: The height of the house.
+    width: The width of the house.
+    depth: The depth of the house.
+    material: Name of the shading group for the house.
+    facade: If not None, the windows that are recessed into the walls, see addFacade(...).
+    On exit: A Mesh object is returned with a box standing on the xz-plane, with
+             one segment per unit of height, and a slightly larger foundation box.
+    '''
+    mesh = Mesh()
+    if facade == None:
+        addBox(mesh, (0, 0, 0), (width, height, depth), material, max(1, int(height)))
+    else:
+        w = width / 2.0
+        d = depth / 2.0
+        addRecessedPrism(mesh, (0, 0, 0), [(-w, d), (w, d), (w, -d), (-w, -d)], height, material, facade)
+    addBox(mesh, (0, 0, 0), (width + 0.3, 0.8, depth + 0.3), material)
+    return mesh
+
+def cylinderHouseMesh(height, radius, sides, material, facade = None):
+    '''
+    Creates the mesh for the body and foundation of a cylinder house.
+
+    height: The height of the house.
+    radius: The radius of the house.
+    sides: Number of sides around the house.
+    material: Name of the shading group for the house.
+    facade: If not None, the windows that are recessed into the walls, see addFacade(...).
+    On exit: A Mesh object is returned with a cylinder standing on the xz-plane, with
+             one segment per unit of height, and a slightly larger foundation cylinder.
+    '''
+    mesh = Mesh()
+    if facade == None:
+        addCylinder(mesh, (0, 0, 0), radius, height, sides, material, max(1, int(height)))
+    else:
+        addRecessedPrism(mesh, (0, 0, 0), circlePoints(radius, sides), height, material, facade)
+    addCylinder(mesh, (0, 0, 0), radius + 0.15, 0.8, sides, material)
+    return mesh
+
+def pipeHouseMesh(height, radius, sides, thickness, material, facade = None):
+    '''
+    Creates the mesh for the body and foundation of a pipe house.
+
+    height: The height of the house.
+    radius: The outer radius of the house.
+    sides: Number of sides around the house.
+    thickness: The thickness of the walls of the house.
+    material: Name of the shading group for the house.
+    facade: If not None, the windows that are recessed into the outer wall, see 
+            addFacade(...).
+    On exit: A Mesh object is returned with a pipe standing on the xz-plane, with
+             one segment per unit of height, and a foundation pipe that is wider
+             on both sides.
+    '''
+    mesh = Mesh()
+    heightSegments = max(1, int(height))
+    if facade == None:
+        addPipe(mesh, (0, 0, 0), radius, thickness, height, sides, material, heightSegments)
+    else:
+        materialId = mesh.materialId(material)
+        outer, count, rings, cornerIndices = addFacade(mesh, (0, 0, 0), circlePoints(radius, sides), 
+                                                       height, facade, materialId)
+        inner = addRings(mesh, (0, 0, 0), circlePoints(radius - thickness, sides), height, heightSegments)
+        addWall(mesh, inner, sides, heightSegments, materialId, True)
+        outerTop = outer + (rings - 1) * count
+        innerTop = inner + heightSegments * sides
+        cornerIndices.append(count)
+        for j in range(sides):
+            k = (j + 1) % sides
+            # The outer edge of a side also runs through the corners of its windows.
+            side = [(c % count) for c in range(cornerIndices[j], cornerIndices[j + 1] + 1)]
+            mesh.addFace([outer + c for c in reversed(side)] + [inner + j, inner + k], materialId)
+            mesh.addFace([outerTop + c for c in side] + [innerTop + k, innerTop + j], materialId)
+    addPipe(mesh, (0, 0, 0), radius + 0.15, thickness + 0.3, 0.8, sides, material)
+    return mesh
+
+def boxWindowColumns(width, depth, windowWidth, widthNum, widthSpace, depthNum, depthSpace):
+    '''
+    Computes where the window columns of a box house are placed.
+    
+    width: The width of the house.
+    depth: The depth of the house.
+    windowWidth: The width of the windows.
+    widthNum: Number of window columns on each of the two sides along the width.
+    widthSpace: Space between the window columns along the width.
+    depthNum: Number of window columns on each of the two sides along the depth.
+    depthSpace: Space between the window columns along the depth.
+    On exit: A list is returned with a tuple for every window column containing
+             the x- and z-coordinates of the column and its rotation around the
+             y-axis in degrees. The columns along the width come first, front and
+             back after each other, followed by the columns along the depth.
+    '''
+    columns = []
+    for j in range(widthNum):
+        x = -width/2.0 + windowWidth/2.0 + widthSpace + (windowWidth + widthSpace) * j
+        columns.append((x, depth/2.0, 0))
+        columns.append((x, -depth/2.0, 0))
+    for j in range(depthNum):
+        z = -depth/2.0 + windowWidth/2.0 + depthSpace + (windowWidth + depthSpace) * j
+        columns.append((width/2.0, z, 90))
+        columns.append((-width/2.0, z, 90))
+    return columns
+
+def prismWindowColumns(radius, sides):
+    '''
+    Computes where the window columns of a cylinder or pipe house are placed.
+    
+    radius: The radius of the house.
+    sides: Number of sides around the house.
+    On exit: A list is returned with a tuple for every side of the house containing
+             the x- and z-coordinates of the middle of the side and the rotation
+             around the y-axis in degrees that makes a window face out from the side.
+    '''
+    angleR = 2.0 * math.pi / sides
+    distance = math.cos(angleR / 2.0) * radius
+    columns = []
+    for j in range(sides):
+        angle = math.pi/2.0 - angleR/2.0 + angleR * j
+        columns.append((math.sin(angle) * distance, math.cos(angle) * distance, math.degrees(angle)))
+    return columns
+
+def windowMesh(columns, windowWidth, windowHeight, heightNum, floorHeight, materials, thickness = 0.1):
+    '''
+    Creates the mesh for all the windows of a house.
+    
+    columns: List of tuples with the x- and z-coordinates and the rotation in degrees 
+             of every window column, as returned by boxWindowColumns(...) or 
+             prismWindowColumns(...).
+    windowWidth: The width of the windows.
+    windowHeight: The height of the windows.
+    heightNum: Number of windows in each column.
+    floorHeight: The height of one floor.
+    materials: List with the name of the shading group for every window, column 
+               by column from the bottom up.
+    thickness: The thickness of the windows.
+    On exit: A Mesh object is returned with one box of six faces for every window.
+             The windows are computed directly from the column positions, the 
+             lowest window being centered 0.8 + floorHeight above the ground.
+    '''
+    corners = []
+    for y in (-windowHeight/2.0, windowHeight/2.0):
+        for x, z in [(-windowWidth/2.0, thickness/2.0), (windowWidth/2.0, thickness/2.0),
+                     (windowWidth/2.0, -thickness/2.0), (-windowWidth/2.0, -thickness/2.0)]:
+            corners.append((x, y, z))
+    faces = [[3, 2, 1, 0], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+    mesh = Mesh()
+    materialIds = [mesh.materialId(m) for m in materials]
+    window = 0
+    for columnX, columnZ, angle in columns:
+        cos = math.cos(math.radians(angle))
+        sin = math.sin(math.radians(angle))
+        rotated = [(x * cos + z * sin, y, -x * sin + z * cos) for x, y, z in corners]
+        for k in range(heightNum):
+            centerY = 0.8 + floorHeight * (k + 1)
+            first = mesh.vertexCount()
+            for x, y, z in rotated:
+                mesh.addVertex(columnX + x, centerY + y, columnZ + z)
+            for face in faces:
+                mesh.addFace([first + v for v in face], materialIds[window])
+            window = window + 1
+    return mesh
+
+def facadeLevels(height, windowHeight, heightNum, floorHeight):
+    '''
+    Computes the heights of the horizontal edge loops of a house with recessed windows.
+
+    height: The height of the house.
+    windowHeight: The height of the windows.
+    heightNum: Number of windows in each column.
+    floorHeight: The height of one floor.
+    On exit: A tuple is returned containing a sorted list with the y-coordinates of
+             the edge loops and a dictionary that maps the index of every row of
+             faces holding windows to the number of the window in its column. The
+             windows are placed at the same heights as in windowMesh(...). There is
+             one edge loop per unit of height, except inside the windows, plus one
+             at the bottom and the top of every window.
+    '''
+    windows = []
+    for k in range(heightNum):
+        centerY = 0.8 + floorHeight * (k + 1)
+        windows.append((centerY - windowHeight/2.0, centerY + windowHeight/2.0))
+    segments = max(1, int(height))
+    levels = []
+    for i in range(segments + 1):
+        y = height * i / float(segments)
+        if not any(bottom - 1e-3 < y < top + 1e-3 for bottom, top in windows):
+            levels.append(y)
+    for bottom, top in windows:
+        levels.extend((bottom, top))
+    levels.sort()
+    levels = [y for i, y in enumerate(levels) if i == 0 or y - levels[i - 1] > 1e-9]
+    windowRows = {}
+    for k in range(heightNum):
+        windowRows[levels.index(windows[k][0])] = k
+    return (levels, windowRows)
+
+def addFacade(mesh, base, corners, height, facade, materialId, depth = 0.05):
+    '''
+    Adds the outer wall of a house with recessed windows to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the bottom center of the wall.
+    corners: List of tuples with the x- and z-coordinates of the corners of the
+             house, counter clockwise seen from above (from +x towards -z).
+    height: The height of the wall.
+    facade: Tuple with the columns, windowWidth, windowHeight, heightNum, floorHeight
+            and materials arguments of windowMesh(...).
+    materialId: Material ID for the wall.
+    depth: How far the windows are recessed into the wall.
+    On exit: The wall has been added as a grid of quads whose edges follow the
+             window rectangles, with the window quads pushed depth units into the
+             house and joined to the wall with four reveal faces. The reveals and
+             the back of every window get the window's material. A tuple is
+             returned containing the index of the first vertex, the number of
+             vertices in each ring, the number of rings and a list with the index
+             within the ring of every corner. The rings are laid out as by
+             addRings(...).
+    '''
+    columns, windowWidth, windowHeight, heightNum, floorHeight, materials = facade
+    levels, windowRows = facadeLevels(height, windowHeight, heightNum, floorHeight)
+    windowMaterialIds = [mesh.materialId(m) for m in materials]
+    # Insert the vertical window edges into the ring, side by side.
+    ringPoints = []
+    cornerIndices = []
+    windowSegments = {} # Maps the index of the segment starting at a ring point to a column.
+    normals = []
+    for s in range(len(corners)):
+        x0, z0 = corners[s]
+        x1, z1 = corners[(s + 1) % len(corners)]
+        length = math.hypot(x1 - x0, z1 - z0)
+        ux = (x1 - x0) / length
+        uz = (z1 - z0) / length
+        onSide = []
+        for c in range(len(columns)):
+            cx, cz = columns[c][0] - x0, columns[c][1] - z0
+            t = cx * ux + cz * uz
+            if abs(cx * uz - cz * ux) < 1e-6 and 0 < t - windowWidth/2.0 and t + windowWidth/2.0 < length:
+                onSide.append((t, c))
+        cornerIndices.append(len(ringPoints))
+        ringPoints.append((x0, z0))
+        normals.append((-uz, ux))
+        for t, c in sorted(onSide):
+            windowSegments[len(ringPoints)] = c
+            ringPoints.append((x0 + ux * (t - windowWidth/2.0), z0 + uz * (t - windowWidth/2.0)))
+            ringPoints.append((x0 + ux * (t + windowWidth/2.0), z0 + uz * (t + windowWidth/2.0)))
+            normals.extend([(-uz, ux)] * 2)
+    count = len(ringPoints)
+    first = mesh.vertexCount()
+    for y in levels:
+        for x, z in ringPoints:
+            mesh.addVertex(base[0] + x, base[1] + y, base[2] + z)
+    for i in range(len(levels) - 1):
+        low = first + i * count
+        high = low + count
+        for j in range(count):
+            k = (j + 1) % count
+            quad = [low + j, low + k, high + k, high + j]
+            if not (i in windowRows and j in windowSegments):
+                mesh.addFace(quad, materialId)
+                continue
+            windowId = windowMaterialIds[windowSegments[j] * heightNum + windowRows[i]]
+            nx, nz = normals[j]
+            inner = []
+            for v in quad:
+                p = mesh.points[v * 3:v * 3 + 3]
+                inner.append(mesh.addVertex(p[0] - nx * depth, p[1], p[2] - nz * depth))
+            for e in range(4):
+                f = (e + 1) % 4
+                mesh.addFace([quad[e], quad[f], inner[f], inner[e]], windowId)
+            mesh.addFace(inner, windowId)
+    return (first, count, len(levels), cornerIndices)
+
+def addRecessedPrism(mesh, base, corners, height, material, facade):
+    '''
+    Adds a closed prism with recessed windows to a mesh.
+
+    mesh: Object of the class Mesh.
+    base: Tuple with the coordinates for the center of the bottom of the prism.
+    corners: List of tuples with the x- and z-coordinates of the corners of the
+             prism, counter clockwise seen from above (from +x towards -z).
+    height: The height of the prism.
+    material: Name of the shading group for the wall and the caps.
+    facade: See addFacade(...).
+    On exit: The wall has been added with addFacade(...) and closed with one 
+             polygon on each cap.
+    '''
+    materialId = mesh.materialId(material)
+    first, count, rings, cornerIndices = addFacade(mesh, base, corners, height, facade, materialId)
+    top = first + (rings - 1) * count
+    mesh.addFace([first + j for j in range(count - 1, -1, -1)], materialId)
+    mesh.addFace([top + j for j in range(count)], materialId)
@@ -1,37 +1,220 @@
 import maya.cmds as cmds
-import random, math
 import trafficLight
 import tools
+import cityScene
+import cityPlan
 
 '''
 List of procedures in the module:
+    class TreeLibrary:
+        A TreeLibrary object keeps tree variants that are built once and instanced
+        for the trees in the parks and along the streets.
+
+        def __init__(self, variants, shaders):
+            Initializes a TreeLibrary object without any trees built.
+        def exists(self):
+            Checks if the variants of the library are still in the scene.
+        def prototype(self, tree):
+            Finds the variant that shows a planned tree, building it if needed.
+        def place(self, tree, x, z):
+            Places an instance of the variant of a planned tree.
+        def plantSquare(self, square):
+            Places instances for the trees of a square.
+        def placeStreetTree(self, tree, x):
+            Places instances for a street tree with its platform and fence.
+        def report(self):
+            Returns a summary of how many trees were instanced.
 
     def makeParkShaders():
         Creates the shaders that are necessary for creating parks.
-    def makeTreeShaders(num):
+    def makeTreeShaders(colours):
         Creates a number of shaders suitable for trees.
-    def makePark(wxd, treeShaders, daytime, lightGeom):
+    def makePark(plan, wxd, treeShaders, daytime, lightGeom, library = None):
         Creates a park block with trees, paths, fences and street lights.
-    def makeFountainPark(wxd, treeShaders, daytime, lightGeom):
+    def makeFountainPark(plan, wxd, treeShaders, daytime, lightGeom, library = None):
         Creates a park with a fountain in the middle.
+    def makeParkProxy(wxd):
+        Creates a simplified park for a level of detail.
     def makeFence(startPoint, endPoint, axis):
         Creates a fence between two points along either the x-axis or the z-axis.
-    def makeFountain():
+    def makeFences(fences):
+        Creates a number of fences as one polygonal object.
+    def makeFountain(plan):
         Creates a fountain.
-    def fountainTop(fountain):
-        Creates a top decoration for a fountain.
-    def makeTree(shaders):
+    def makeTree(tree, shaders):
         Creates a tree.
-    def placeTreesInSquare(squareBbox, shaders):
-        Places trees randomly in a given square.
-    def makeStreetTree(shaders):
+    def placeTreesInSquare(square, shaders, library = None):
+        Creates a square of grass with trees.
+    def makeStreetTree(tree, shaders):
         Creates a tree on a circular platform and with a circular fence around it.
-    def makeRowOfStreetTrees(num, coor, shaders, dir):
-        Makes a row with the specified number of street trees. 
-    def placeStreetTrees(house, wxd, treeShaders):
-        Places trees on empty areas around a cylinder or pipe houses.
+    def makeTreeGuard():
+        Creates the circular platform and fence of a street tree.
+    def makeRowOfStreetTrees(row, shaders, library = None):
+        Makes a row of street trees. 
+    def placeStreetTrees(house, rows, treeShaders, library = None):
+        Places rows of trees on empty areas around a cylinder or pipe houses.
 '''
 
+class TreeLibrary:
+    '''
+    A TreeLibrary object keeps tree variants that are built once in maya and
+    instanced for every tree in the parks and along the streets, so that the cost
+    of the vegetation grows with the number of variants instead of the number of
+    trees. Every crown shader gets the same shapes, which have crown scale 1 and
+    trunk heights and crown tops spread over the range that the planned trees have
+    relative to the size of their crowns. A planned tree is shown as an instance of
+    the variant with its shader and the closest shape, scaled by the scale of its
+    crown, so that the crown has the planned size and the trunk about the planned
+    height. The variants are built the first time they are needed and kept in the
+    hidden group "treeLibrary". A library outlives the build of its city, so that
+    regenerateCity(...) and later cities with the same crown shaders reuse the
+    variants that are already built.
+
+    Attributes:
+        variants: The number of variants asked for.
+        shaders: The list of crown shaders made by makeTreeShaders(...).
+        shapes: List with a list for every shader with the trunk height and the pull
+                of the crown top of every shape of that shader, for crown scale 1.
+        group: The name of the hidden group with the variants.
+        prototypes: Dictionary from the index of a shader and a shape to the name of
+                    the variant that has been built.
+        guard: The name of the platform and fence of the street trees, or None if it
+               has not been built.
+        instances: The number of trees that have been instanced.
+    '''
+    def __init__(self, variants, shaders):
+        '''
+        Initializes a TreeLibrary object without any trees built.
+
+        self: Object that is to be initialized.
+        variants: See Attributes. Every shader gets one shape, and the remaining
+                  variants are handed out to the shaders in turn, so that there are
+                  exactly as many variants as asked for unless there are more
+                  shaders than that.
+        shaders: See Attributes.
+        On exit: The shapes have been chosen and the hidden group "treeLibrary" has
+                 been created.
+        '''
+        self.variants = variants
+        self.shaders = shaders
+        low = cityPlan.TREE_HEIGHTS[0] / cityPlan.TREE_SCALES[1]
+        high = cityPlan.TREE_HEIGHTS[1] / cityPlan.TREE_SCALES[0]
+        self.shapes = []
+        for shader in range(len(shaders)):
+            count = variants // len(shaders)
+            if shader < variants % len(shaders):
+                count = count + 1
+            count = max(1, count)
+            # The heights are evenly spaced and the crown tops follow the golden ratio,
+            # so that the shapes cover both ranges for any number of shapes.
+            self.shapes.append([(low + (high - low) * (i + 0.5) / count,
+                                 low + (high - low) * (((i + 0.5) * 0.618034) % 1.0)) for i in range(count)])
+        self.prototypes = {}
+        self.guard = None
+        self.instances = 0
+        self.group = cmds.group(n = "treeLibrary", empty = True)
+        cmds.hide(self.group)
+
+    def exists(self):
+        '''
+        Checks if the variants of the library are still in the scene.
+
+        self: Object of the class TreeLibrary.
+        On exit: True is returned if the group with the variants and all the crown
+                 shaders exist, otherwise False, for example after the scene has
+                 been cleared.
+        '''
+        names = [self.group] + [shader[0] for shader in self.shaders]
+        return all([cmds.objExists(name_) for name_ in names])
+
+    def prototype(self, tree):
+        '''
+        Finds the variant that shows a planned tree, building it if needed.
+
+        self: Object of the class TreeLibrary.
+        tree: List describing the tree, see makeTree(...).
+        On exit: A tuple is returned with the name of the variant with the shader of
+                 the tree and the shape closest to its trunk height and crown top
+                 divided by its crown scale, and the crown scale. The variant has
+                 been built by makeTree(...) in "treeLibrary" if it did not exist.
+        '''
+        height, translation, shader, scale_ = tree[:4]
+        shapes = self.shapes[shader]
+        distances = [(shape[0] - height / scale_) ** 2 + (shape[1] - translation / scale_) ** 2
+                     for shape in shapes]
+        key = (shader, distances.index(min(distances)))
+        prototype = self.prototypes.get(key)
+        if prototype == None:
+            shape = shapes[key[1]]
+            prototype = makeTree([shape[0], shape[1], shader, 1.0], self.shaders)[0]
+            cmds.parent(prototype, self.group)
+            self.prototypes[key] = prototype
+        return (prototype, scale_)
+
+    def place(self, tree, x, z):
+        '''
+        Places an instance of the variant of a planned tree.
+
+        self: Object of the class TreeLibrary.
+        tree: List describing the tree, see makeTree(...).
+        x: The x-coordinate of the tree.
+        z: The z-coordinate of the tree.
+        On exit: An instance of the variant found by prototype(...) has been scaled
+                 by the crown scale and moved to the coordinates. It is still in
+                 "treeLibrary", and has to be parented elsewhere to be seen. Its name
+                 is returned.
+        '''
+        prototype, scale_ = self.prototype(tree)
+        instance = cmds.instance(prototype)[0]
+        cmds.xform(instance, translation = (x, 0, z), scale = (scale_, scale_, scale_))
+        self.instances = self.instances + 1
+        return instance
+
+    def plantSquare(self, square):
+        '''
+        Places instances for the trees of a square.
+
+        self: Object of the class TreeLibrary.
+        square: Dictionary describing the square, see placeTreesInSquare(...).
+        On exit: Every tree of the square has been placed by place(...) at its
+                 planned coordinates, and a list with the names of the instances is
+                 returned.
+        '''
+        return [self.place(tree, tree[4], tree[5]) for tree in square["trees"]]
+
+    def placeStreetTree(self, tree, x):
+        '''
+        Places instances for a street tree with its platform and fence.
+
+        self: Object of the class TreeLibrary.
+        tree: List describing the tree, see makeTree(...).
+        x: The x-coordinate of the tree, which is placed on the x-axis.
+        On exit: The tree has been placed by place(...), and an instance of the
+                 platform and fence, built by makeTreeGuard(...) in "treeLibrary" the
+                 first time, has been placed under it. A list with the names of the
+                 two instances is returned.
+        '''
+        if self.guard == None:
+            platform, fence = makeTreeGuard()
+            self.guard = cmds.polyUnite(platform, fence)[0]
+            cmds.delete(self.guard, ch = True)
+            cmds.parent(self.guard, self.group)
+        guard = cmds.instance(self.guard)[0]
+        cmds.xform(guard, translation = (x, 0, 0))
+        return [self.place(tree, x, 0), guard]
+
+    def report(self):
+        '''
+        Returns a summary of how many trees were instanced.
+
+        self: Object of the class TreeLibrary.
+        On exit: A string with the number of trees instanced since the library was
+                 made, the number of variants built for them and the number of
+                 variants asked for is returned.
+        '''
+        return ("Tree library: %d trees instanced from %d variants, %d asked for"
+                % (self.instances, len(self.prototypes), self.variants))
+
 def makeParkShaders():
     '''
     Creates the shaders that are necessary for creating parks.
@@ -47,118 +230,80 @@ def makeParkShaders():
     cmds.setAttr("fenceMaterial.reflectivity",0)
     cmds.setAttr("fenceMaterial.specularColor",0.137,0.137,0.137)    
 
-def makeTreeShaders(num):
+def makeTreeShaders(colours):
     '''
     Creates a number of shaders suitable for trees.
     
-    num: The number of different green coloured shaders that will be created.
-    On exit: Creates a shader for the tree trunk, and returns a list with the
-             specified number of shaders with different green colours.
+    colours: List with a hsv triple for every green coloured shader that will be 
+             created, see cityPlan.CityPlan.
+    On exit: Creates a shader for the tree trunk, and returns a list with a shader
+             for every colour.
     '''
     trunkShader = tools.makeShader((0.124,0.043,0.000), "trunkMaterial")
     cmds.setAttr("trunkMaterial.reflectivity", 0)
     cmds.setAttr("trunkMaterial.specularColor", 0, 0, 0)
     l =[]
-    for i in range(num):
-        hue = random.randint(75, 120)
-        saturation = random.uniform(0.6, 1)
-        value = random.uniform(0.15, 0.6)
-        RGB = tools.convertToRgb((hue, saturation, value))
+    for colour in colours:
+        RGB = tools.convertToRgb(colour)
         treeShader = tools.makeShader((RGB[0], RGB[1], RGB[2]), "treeMaterial")
         cmds.setAttr(treeShader[0] + ".reflectivity", 0)
         cmds.setAttr(treeShader[0] + ".specularColor", 0, 0, 0)
         l.append(treeShader)
     return l
     
-def makePark(wxd, treeShaders, daytime, lightGeom):
+def makePark(plan, wxd, treeShaders, daytime, lightGeom, library = None):
     '''
     Creates a park block with trees, paths, fences and street lights.
     
+    plan: Dictionary made by cityPlan.planPark(...).
     wxd: A tuple containing the width and the depth of the park.
     treeShaders: A list of shaders for the tree crowns.
     daytime: Boolean variable which is true if it is day and false if it is night.
     lightGeom: Tuple containing the object name and node name for a polygonal object,
                in this case a street light.
-    On exit: A park with three randomly placed paths has been created and street 
+    library: Object of the class TreeLibrary, or None. If given, the trees are
+             instances of its variants, parented to the park like the lights.
+    On exit: A park with the three planned paths has been created and street 
              lights placed using trafficLights.placeLights(...) at the intersection of 
              these paths. Trees and fences have also been created using 
-             placeTreesInSquare(...) and makeFence(...). Everything has been combined 
+             placeTreesInSquare(...) and makeFences(...). Everything has been combined
              into a single polygonal object except the lights, which are instead parented
              to this object. The park object is returned as a tuple containing the 
              object name and node name.
     '''
-    # Decide if the first path should be horisontal (along the x-axis) or vertical (along the z-axis).
-    dir = random.choice(["horisontal", "vertical"]) 
-    if dir == "horisontal":
-        path1 = random.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the first path.
-        path2 = random.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the second path.
-        path3 = random.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the third path.
-        # Place squares with grass and trees around the paths.
-        square1 = placeTreesInSquare(((-wxd[0]/2.0, -wxd[1]/2.0), (path2 - 0.5, path1 - 1)), treeShaders)
-        square2 = placeTreesInSquare(((-wxd[0]/2.0, path1 + 1), (path3 - 0.5, wxd[1]/2.0)), treeShaders)
-        square3 = placeTreesInSquare(((path2 + 0.5, -wxd[1]/2.0), (wxd[0]/2.0, path1 - 1)), treeShaders)
-        square4 = placeTreesInSquare(((path3 + 0.5, path1 + 1), (wxd[0]/2.0, wxd[1]/2.0)), treeShaders)
-        # Make fences around the park.
-        fence1 = makeFence((-wxd[0]/2.0,-wxd[1]/2.0), (path2 -0.5,-wxd[1]/2.0), "x")
-        fence2 = makeFence((path2 + 0.5,-wxd[1]/2.0), (wxd[0]/2.0,-wxd[1]/2.0), "x")
-        fence3 = makeFence((wxd[0]/2.0,-wxd[1]/2.0), (wxd[0]/2.0,path1 - 1), "z")
-        fence4 = makeFence((wxd[0]/2.0,path1 + 1), (wxd[0]/2.0,wxd[1]/2.0), "z")
-        fence5 = makeFence((wxd[0]/2.0,wxd[1]/2.0), (path3 + 0.5,wxd[1]/2.0), "x")
-        fence6 = makeFence((path3 - 0.5,wxd[1]/2.0), (-wxd[0]/2.0,wxd[1]/2.0), "x")
-        fence7 = makeFence((-wxd[0]/2.0,wxd[1]/2.0), (-wxd[0]/2.0,path1 + 1), "z")
-        fence8 = makeFence((-wxd[0]/2.0,path1 - 1), (-wxd[0]/2.0,-wxd[1]/2.0), "z")
-        # Create and place instances of street lights
-        light1 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light1[0], (path3 - 1.5,path1 + 0.9), daytime)
-        light2 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light2[0], (path3 + 1.5,path1 + 0.9), daytime)
-        light3 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light3[0], (path2 - 1.5,path1 - 0.9), daytime)
-        light4 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light4[0], (path2 + 1.5,path1 - 0.9), daytime)
-    if dir == "vertical":
-        path1 = random.uniform(-wxd[0]/2 + 2, wxd[0]/2 - 2) # x-coordinate for the first path.
-        path2 = random.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the second path.
-        path3 = random.uniform(-wxd[1]/2 + 2, wxd[1]/2 - 2) # z-coordinate for the third path.
-        # Place squares with grass and trees around the paths.
-        square1 = placeTreesInSquare(((-wxd[0]/2.0, -wxd[1]/2.0), (path1 - 1, path2 - 0.5)), treeShaders)
-        square2 = placeTreesInSquare(((-wxd[0]/2.0, path2 + 0.5), (path1 - 1, wxd[1]/2.0)), treeShaders)
-        square3 = placeTreesInSquare(((path1 + 1, -wxd[1]/2.0), (wxd[0]/2.0, path3 - 0.5)), treeShaders)
-        square4 = placeTreesInSquare(((path1 + 1, path3 + 0.5), (wxd[0]/2.0, wxd[1]/2.0)), treeShaders)
-        # Make fences around the park.
-        fence1 = makeFence((-wxd[0]/2.0,-wxd[1]/2.0), (path1 -1,-wxd[1]/2.0), "x")
-        fence2 = makeFence((path1 + 1,-wxd[1]/2.0), (wxd[0]/2.0,-wxd[1]/2.0), "x")
-        fence3 = makeFence((wxd[0]/2.0,-wxd[1]/2.0), (wxd[0]/2.0,path3 - 0.5), "z")
-        fence4 = makeFence((wxd[0]/2.0,path3 + 0.5), (wxd[0]/2.0,wxd[1]/2.0), "z")
-        fence5 = makeFence((wxd[0]/2.0,wxd[1]/2.0), (path1 + 1,wxd[1]/2.0), "x")
-        fence6 = makeFence((path1 - 1,wxd[1]/2.0), (-wxd[0]/2.0,wxd[1]/2.0), "x")
-        fence7 = makeFence((-wxd[0]/2.0,wxd[1]/2.0), (-wxd[0]/2.0,path2 + 0.5), "z")
-        fence8 = makeFence((-wxd[0]/2.0,path2 - 0.5), (-wxd[0]/2.0,-wxd[1]/2.0), "z")
-        # Create and place instances of street lights
-        light1 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light1[0], (path1 + 0.9,path3 - 1.5), daytime)
-        light2 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light2[0], (path1 + 0.9,path3 + 1.5), daytime)
-        light3 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light3[0], (path1 - 0.9,path2 - 1.5), daytime)
-        light4 = cmds.instance(lightGeom[0])
-        trafficLight.placeLight(light4[0], (path1 - 0.9,path2 + 1.5), daytime)
-    park = cmds.polyUnite(square1,square2,square3,square4,fence1, fence2, fence3,
-                          fence4, fence5, fence6, fence7, fence8)
+    # Place squares with grass and trees around the paths.
+    square1 = placeTreesInSquare(plan["squares"][0], treeShaders, library)
+    square2 = placeTreesInSquare(plan["squares"][1], treeShaders, library)
+    square3 = placeTreesInSquare(plan["squares"][2], treeShaders, library)
+    square4 = placeTreesInSquare(plan["squares"][3], treeShaders, library)
+    # Make fences around the park, leaving openings for the paths.
+    fences = makeFences(cityScene.parkFences(plan, wxd))
+    # Create and place instances of street lights at the paths.
+    lights = []
+    for xz in cityScene.parkLightPositions(plan):
+        light = cmds.instance(lightGeom[0])
+        trafficLight.placeLight(light[0], xz, daytime)
+        lights.append(light[0])
+    park = tools.uniteParts([square1, square2, square3, square4, fences])
     cmds.delete(park, ch = True)
-    cmds.parent((light1[0],light2[0],light3[0],light4[0]),park[0])
+    if library != None:
+        for square in plan["squares"]:
+            lights.extend(library.plantSquare(square))
+    cmds.parent(tuple(lights),park[0])
     return park
     
-def makeFountainPark(wxd, treeShaders, daytime, lightGeom):
+def makeFountainPark(plan, wxd, treeShaders, daytime, lightGeom, library = None):
     '''
     Creates a park with a fountain in the middle.
     
+    plan: Dictionary made by cityPlan.planFountainPark(...).
     wxd: A tuple containing the width and the depth of the park.
     treeShaders: A list of shaders for the tree crowns.
     daytime: Boolean variable which is true if it is day and false if it is night.
     lightGeom: Tuple containing the object name and node name for a polygonal object,
                in this case a street light.
-    On exit: A park with trees (placeTreesInSquare(...)), fences (makeFence(...)) 
+    library: See makePark(...).
+    On exit: A park with trees (placeTreesInSquare(...)), fences (makeFences(...))
              and street lights (trafficLight.placeLight(...)) has been created and
              a fountain has been created in the middle of the park using 
              makeFountain(...). Everything has been combined into a single polygonal 
@@ -167,37 +312,40 @@ def makeFountainPark(wxd, treeShaders, daytime, lightGeom):
              node name.
     '''
     # Make fences around the park.
-    fence1 = makeFence((-wxd[0]/2.0,wxd[1]/2.0), (-1,wxd[1]/2.0), "x")
-    fence2 = makeFence((1,wxd[1]/2.0), (wxd[0]/2.0,wxd[1]/2.0), "x")
-    fence3 = makeFence((wxd[0]/2.0,wxd[1]/2.0), (wxd[0]/2.0,1), "z")
-    fence4 = makeFence((wxd[0]/2.0,-1), (wxd[0]/2.0,-wxd[1]/2.0), "z")
-    fence5 = makeFence((wxd[0]/2.0,-wxd[1]/2.0), (1,-wxd[1]/2.0), "x")
-    fence6 = makeFence((-1,-wxd[1]/2.0), (-wxd[0]/2.0,-wxd[1]/2.0), "x")
-    fence7 = makeFence((-wxd[0]/2.0,-wxd[1]/2.0), (-wxd[0]/2.0,-1), "z")
-    fence8 = makeFence((-wxd[0]/2.0,1), (-wxd[0]/2.0,wxd[1]/2.0), "z")
-    fountain = makeFountain()
+    parts = [makeFences(cityScene.parkFences(plan, wxd)), makeFountain(plan["fountain"])]
     # Place squares with grass and trees around the paths.
-    square1 = placeTreesInSquare(((-wxd[0]/2.0, -wxd[1]/2.0), (-1,-1)), treeShaders)
-    square2 = placeTreesInSquare(((-wxd[0]/2.0, 1),(-1, wxd[1]/2.0)), treeShaders)
-    square3 = placeTreesInSquare(((1, -wxd[1]/2.0),(wxd[0]/2.0, -1)), treeShaders)
-    square4 = placeTreesInSquare(((1,1),(wxd[0]/2.0, wxd[1]/2.0)), treeShaders)
-    park = cmds.polyUnite(fence1, fence2, fence3, fence4, fence5, fence6, fence7,
-                          fence8, fountain, square1, square2, square3, square4)
+    for square in plan["squares"]:
+        parts.append(placeTreesInSquare(square, treeShaders, library))
+    park = tools.uniteParts(parts)
     cmds.delete(park, ch = True)
-    # Create and place instances of street lights
-    light1 = cmds.instance(lightGeom[0])
-    trafficLight.placeLight(light1[0], (-1.5,-0.9), daytime)
-    light2 = cmds.instance(lightGeom[0])
-    trafficLight.placeLight(light2[0], (-1.5,0.9), daytime)
-    light3 = cmds.instance(lightGeom[0])
-    trafficLight.placeLight(light3[0], (1.5,-0.9), daytime)
-    light4 = cmds.instance(lightGeom[0])
-    trafficLight.placeLight(light4[0], (1.5,0.9), daytime)
-    cmds.parent((light1[0],light2[0],light3[0],light4[0]),park[0])
+    # Create and place instances of street lights around the fountain.
+    lights = []
+    for xz in cityScene.parkLightPositions(plan):
+        light = cmds.instance(lightGeom[0])
+        trafficLight.placeLight(light[0], xz, daytime)
+        lights.append(light[0])
+    if library != None:
+        for square in plan["squares"]:
+            lights.extend(library.plantSquare(square))
+    cmds.parent(tuple(lights),park[0])
     return park
 
 
     
+def makeParkProxy(wxd):
+    '''
+    Creates a simplified park for a level of detail.
+    
+    wxd: A tuple defining the width and the depth of the park.
+    On exit: A cube of grass covering the whole park, without trees, paths, fences,
+             fountains or street lights, has been created at the origin. It is 
+             returned as a tuple with the object name and the node name.
+    '''
+    grass = cmds.polyCube(name = "parkProxy", h = 0.3, w = wxd[0], d = wxd[1])
+    cmds.xform(grass, translation = (0,0.15,0))
+    cmds.sets(grass[0], edit=True, forceElement="grassMaterialGroup")
+    return grass
+
 def makeFence(startPoint, endPoint, axis):
     '''
     Creates a fence between two points along either the x-axis or the z-axis.
@@ -205,128 +353,50 @@ def makeFence(startPoint, endPoint, axis):
     startPoint: Tuple with the coordinates where the fence will start.
     endPoint: Tuple with the coordinates where the fence will end.
     axis: String that specifies along which axis the fence will be created.
-    On exit: A fence polygonal object has been created between the specified points 
-             and a shader has been assigned to it. The fence object is returned as
-             a tuple with the object name and the node name.
+    On exit: A fence polygonal object has been created between the specified points
+             by makeFences(...) and is returned as a list with the object name and
+             the node name.
     '''
-    if axis == "x":
-        length = abs(startPoint[0] - endPoint[0])
-        poleNumber = int(length / 0.8)
-        if poleNumber != 0:
-            distance = float(endPoint[0] - startPoint[0]) / poleNumber
-        else:
-            distance = 0
-        bar = cmds.polyCube(name = "bar", h = 0.05, w = length, d = 0.05)
-        cmds.xform(bar,translation = (startPoint[0] + (endPoint[0] - startPoint[0])/2.0,0.8,startPoint[1]))
-        bar2 = cmds.duplicate(bar[0])
-        cmds.xform(bar2, translation = (0,-0.3,0), r = True)
-        fence = cmds.polyUnite(bar,bar2)
-        for i in range(poleNumber + 1):
-            pole = cmds.polyCube(name = "pole", h = 0.7, w = 0.1, d = 0.05)
-            cmds.xform(pole[0], translation = (startPoint[0] + i * distance,0.55,startPoint[1]))
-            fence = cmds.polyUnite(pole,fence)
-    else:
-        length = abs(startPoint[1] - endPoint[1])
-        poleNumber = int(length / 0.8)
-        if poleNumber != 0:
-            distance = float(endPoint[1] - startPoint[1]) / poleNumber
-        else:
-            distance = 0
-        bar = cmds.polyCube(name = "bar", h = 0.05, w = 0.05, d = length)
-        cmds.xform(bar,translation = (startPoint[0],0.8,startPoint[1]+ (endPoint[1] - startPoint[1])/2.0))
-        bar2 = cmds.duplicate(bar[0])
-        cmds.xform(bar2, translation = (0,-0.3,0), r = True)
-        fence = cmds.polyUnite(bar,bar2)
-        for i in range(poleNumber + 1):
-            pole = cmds.polyCube(name = "pole", h = 0.7, w = 0.05, d = 0.1)
-            cmds.xform(pole[0], translation = (startPoint[0],0.55,startPoint[1] + i * distance))
-            fence = cmds.polyUnite(pole,fence)
-    cmds.sets(fence[0], edit=True, forceElement="fenceMaterialGroup")
-    return fence
+    return makeFences([(startPoint, endPoint, axis)])
 
-def makeFountain():
-    '''
-    Creates a fountain.
-    
-    On exit: A fountain shaped polygonal object has been created, assigned a shader
-             and is returned as a tuple with the object name and node name. The 
-             procedure uses random numbers in order to create different looking fountains
-             every time it is called.
+def makeFences(fences):
     '''
-    steps = random.randint(1,3)
-    fountain = cmds.polyCylinder(name = "Fountain", h = 0.1)
-    cmds.xform(fountain, translation = (0, 0.25, 0))
-    cmds.select(fountain[0] + ".f[40:59]")
-    for i in range(steps):
-        scale_ = random.uniform(0.6, 0.95) 
-        cmds.polyExtrudeFacet(scale = (scale_, scale_, scale_))
-        translation = random.uniform(0.1, 0.6)
-        cmds.polyExtrudeFacet(translate = (0, translation, 0))
-    cmds.polyExtrudeFacet(scale = (0.9,0.9,0.9))
-    cmds.polyExtrudeFacet(translate = (0, -0.3,0))
-    scale_ = random.uniform(0.3,0.6)
-    cmds.polyExtrudeFacet(scale = (scale_,scale_,scale_))
-    translation = random.uniform(0.2,0.4)
-    cmds.polyExtrudeFacet(translate = (0,translation,0))
-    stepsUp = random.randint(1,3)
-    for i in range(stepsUp):
-        scale_ = random.uniform(0.4,0.9) 
-        cmds.polyExtrudeFacet(scale = (scale_,scale_,scale_))
-        translation = random.uniform(0.05,1)
-        cmds.polyExtrudeFacet(translate = (0,translation,0))
-    top = fountainTop(fountain) # Create a top for the fountain.
-    fountain = cmds.polyUnite(top[0],fountain)
-    cmds.sets(fountain[0], edit=True, forceElement="fountainMaterialGroup")
-    return fountain
+    Creates a number of fences as one polygonal object.
 
+    fences: List with the start point, the end point and the axis of every fence,
+            see cityScene.parkFences(...).
+    On exit: The bars and poles of all the fences have been generated as one mesh
+             by cityScene.fenceMesh(...) and created with tools.commitMesh(...), with
+             the fence shader assigned. The object is returned as a list with the
+             object name and the node name.
+    '''
+    return tools.commitMesh(cityScene.fenceMesh(fences), "fence")
 
-def fountainTop(fountain):
+def makeFountain(plan):
     '''
-    Creates a top decoration for a fountain.
+    Creates a fountain.
     
-    fountain: A object the top decoration will be placed on.
-    On exit: A top decoration has been created by adding a deformer to a 
-             basic polygonal object. The top is returned as a tuple
-             with the object name and node name.
+    plan: Dictionary made by cityPlan.planFountain().
+    On exit: A fountain shaped polygonal object has been created from the mesh made
+             by cityScene.fountainMesh(...), which revolves the profile of the steps
+             in the plan and has the top decoration with its flare and twist baked
+             in. The fountain shader has been assigned, and the object is returned
+             as a list with the object name and node name.
     '''
-    height = random.uniform(0.1,0.6)
-    # Decide which type of object will form the top.
-    type = random.choice(["cube", "cylinder", "prism", "cone", "sphere"])
-    if type == "cube":
-        top = cmds.polyCube(name = "top", h = height, w = 0.2, d = 0.2, sy = 10)
-    if type == "cylinder":
-        top = cmds.polyCylinder(name = "top",h = height, r = 0.1, sy = 10)
-    if type == "prism":
-        top = cmds.polyPrism(name = "top", l = height, w = 0.1, sh = 10)
-    if type == "cone":
-        top = cmds.polyCone(name = "top", h = height, r = 0.1, sy = 10)
-    if type == "sphere":
-        top = cmds.polySphere(name = "top",r = height/2.0) 
-    bbox = cmds.exactWorldBoundingBox(fountain)
-    cmds.xform(top, translation = (0,bbox[4]+ height/2.0,0))
-    flare = random.choice([0,1])
-    if flare == 1:
-        cmds.select(top[0])
-        flare = cmds.nonLinear(type = "flare")
-        cmds.setAttr(flare[0] + ".curve", random.uniform(-3,3))
-    twist = random.choice([0,1])
-    if type == "cube" or type == "prism":
-        if twist == 1:
-            cmds.select(top[0])
-            twist = cmds.nonLinear(type = "twist")
-            cmds.setAttr(twist[0] + ".endAngle", random.randint(-500, 500))
-    return top
-    
-def makeTree(shaders):
+    return tools.commitMesh(cityScene.fountainMesh(plan), "Fountain")
+
+def makeTree(tree, shaders):
     '''
     Creates a tree.
     
+    tree: List with the height of the trunk, how far the top of the crown is pulled
+          up, the index of the crown shader and the scale of the crown, see 
+          cityPlan.planTree(...).
     shaders: A list of shaders for the tree crown.
     On exit: A tree has been modeled, and is returned as a tuple 
-             containing the object name and the node name. Some of the
-             variables are chosen randomly to create different results.
+             containing the object name and the node name.
     '''
-    height = random.uniform(0.3,1.5)
+    height, translation, shader, scale_ = tree[:4]
     trunk = cmds.polyCylinder(name = "trunk", h = height, r = 0.07)
     cmds.sets(trunk[0], edit=True, forceElement="trunkMaterialGroup")
     cmds.xform(trunk, translation = (0,height/2.0 + 0.2,0))
@@ -334,166 +404,149 @@ def makeTree(shaders):
     cmds.xform(crown, translation = (0,height + 0.6,0))
     cmds.softSelect(sse = True, ssd = 0.86)
     cmds.select(crown[0] + ".vtx[381]")
-    translation = random.uniform(0.3,1.5)
     cmds.move(translation, y = True, r = True)
     cmds.softSelect(sse = False)
-    shader = random.choice(shaders)
-    scale_ = random.uniform(0.7,1.8)
     cmds.select(crown)
     cmds.scale(scale_, scale_, scale_, pivot = (0,height,0))
-    cmds.sets(crown[0], edit=True, forceElement= shader[1])
+    cmds.sets(crown[0], edit=True, forceElement= shaders[shader][1])
     tree = cmds.polyUnite(trunk[0],crown[0])
     cmds.delete(tree[0], ch = True)
     return tree
     
-def placeTreesInSquare(squareBbox, shaders):
+def placeTreesInSquare(square, shaders, library = None):
     '''
-    Places trees randomly in a given square.
+    Creates a square of grass with trees.
     
-    squareBbox: A list of two tuples containing the x- and z-coordinates for the
-                bounding box of a square.
+    square: Dictionary with the "bbox" of the square, a list of two tuples containing
+            the x- and z-coordinates for the bounding box, and its "trees", see 
+            cityPlan.planTreesInSquare(...).
     shaders: A list of shaders for the tree crowns.
+    library: Object of the class TreeLibrary, or None.
     On exit: A cube of the same size as the square been created and assigned a green
-             shader in order to make it look like grass. Trees have created using 
-             makeTree(...), and placed randomly using a dart throwing algorithm which 
-             gives up after six failed attempts. Everything is united into one object
-             which is returned as a tuple with the object name and the node name.             
+             shader in order to make it look like grass. Without a library, the trees
+             have been created using makeTree(...) and moved to their planned
+             positions. Everything is united into one object which is returned as a
+             tuple with the object name and the node name. With a library only the
+             grass is returned, and the trees are left to TreeLibrary.plantSquare(...).
     '''
-    treeList = []
+    squareBbox = square["bbox"]
     width = squareBbox[1][0] - squareBbox[0][0]
     depth = squareBbox[1][1] - squareBbox[0][1]
     grass = cmds.polyCube(name = "grass", h = 0.3, w = width, d = depth)
     cmds.xform(grass, translation = (squareBbox[0][0] + 0.5 * width,0.15,squareBbox[0][1] + 0.5 * depth))
     cmds.sets(grass[0], edit=True, forceElement="grassMaterialGroup")
-    while True:
-        failCount = 0
-        tree = makeTree(shaders)
-        treeList.append(tree)
-        bbox1 = cmds.exactWorldBoundingBox(tree[0])
-        radius = (bbox1[3] - bbox1[0]) / 2.0
-        coorx = random.uniform(squareBbox[0][0] + radius, squareBbox[1][0] - radius)
-        coorz = random.uniform(squareBbox[0][1] + radius, squareBbox[1][1] - radius)
-        cmds.xform(tree[0], translation = (coorx, 0, coorz))
-        while True:
-            failed = False
-            for j in treeList:
-                bbox1 = cmds.exactWorldBoundingBox(tree[0])
-                bbox2 = cmds.exactWorldBoundingBox(j[0])
-                # Check if the tree intersects with element j in treeList.
-                xinters = (bbox1[0] < bbox2[3] and bbox1[0] > bbox2[0])\
-                       or (bbox2[0] < bbox1[3] and bbox2[0] > bbox1[0])                
-                zinters = (bbox1[2] < bbox2[5] and bbox1[2] > bbox2[2])\
-                       or (bbox2[2] < bbox1[5] and bbox2[2] > bbox1[2])
-                if xinters and zinters:
-                    coorx = random.uniform(squareBbox[0][0] + radius, squareBbox[1][0] - radius)
-                    coorz = random.uniform(squareBbox[0][1] + radius, squareBbox[1][1] - radius)
-                    cmds.xform(tree[0], translation = (coorx, 0, coorz))               
-                    failCount = failCount + 1
-                    failed = True
-                    break               
-            if (failed == False) or (failCount > 5): 
-                break
-        if (failCount > 5) or (len(treeList) == 10):
-            break
-    cmds.delete(tree[0]) # Delete the last tree that was not successfully placed.         
-    treeList.pop() 
-    for i in treeList:
-        grass = cmds.polyUnite(grass[0], i[0])
-    return grass
+    if library != None:
+        return grass
+    parts = [grass]
+    for i in square["trees"]:
+        tree = makeTree(i, shaders)
+        cmds.xform(tree[0], translation = (i[4], 0, i[5]))
+        parts.append(tree)
+    return tools.uniteParts(parts)
     
-def makeStreetTree(shaders):
+def makeStreetTree(tree, shaders):
     '''
     Creates a tree on a circular platform and with a circular fence around it.
     
+    tree: List describing the tree, see makeTree(...).
     shaders: A list of shaders for the tree crowns.
-    On exit: A tree has been created using makeTree(...), a circular platform
-             has been created underneath it and a fence around it. Appropriate 
+    On exit: A tree has been created using makeTree(...), and a circular platform
+             underneath it and a fence around it using makeTreeGuard(). Appropriate
              shaders have been assigned. Everything is united into one polygonal
              object and returned as a tuple with the object name and the node 
              name.
     '''
-    tree = makeTree(shaders)
+    tree = makeTree(tree, shaders)
+    platform, fence = makeTreeGuard()
+    streetTree = cmds.polyUnite(tree,platform, fence)
+    cmds.delete(streetTree, ch = True)
+    return streetTree
+
+def makeTreeGuard():
+    '''
+    Creates the circular platform and fence of a street tree.
+
+    On exit: A circular platform and a fence of poles and two bars around it have
+             been created at the origin, with the fountain and black metal shaders.
+             A list with the platform and the fence is returned, each a tuple with
+             the object name and the node name.
+    '''
     platform = cmds.polyCylinder(name = "platform",h = 0.1, r = 0.8)
     cmds.move(0.25, y = True)
     cmds.sets(platform[0], edit=True, forceElement="fountainMaterialGroup")
     pole = cmds.polyCube(name = "pole", h = 0.6, w = 0.04, d = 0.04)
     cmds.xform(pole, t = (0.7,0.45,0))
+    parts = [pole]
     angle = 360/10.0
     for i in range(1,10):
         pole1 = cmds.polyCube(name = "pole", h = 0.6, w = 0.04, d = 0.04)
         cmds.rotate(angle * i, y = True)
         cmds.move(0.7,0.45,0, os = True)
-        pole = cmds.polyUnite(pole, pole1)
+        parts.append(pole1)
     bar = cmds.polyPipe(name = "bar", h = 0.1, r = 0.65, t = 0.04)
     cmds.move(0.65, y = True)
     bar1 = cmds.duplicate(bar[0])
     cmds.move(-0.2, y = True, r = True)
-    fence = cmds.polyUnite(pole, bar, bar1)
+    fence = tools.uniteParts(parts + [bar, bar1])
     cmds.sets(fence[0], edit=True, forceElement="blackMetalGroup")
-    streetTree = cmds.polyUnite(tree,platform, fence)
-    cmds.delete(streetTree, ch = True)
-    return streetTree
+    return [platform, fence]
     
-def makeRowOfStreetTrees(num, coor, shaders, dir):
+def makeRowOfStreetTrees(row, shaders, library = None):
     '''
-    Makes a row with the specified number of street trees. 
+    Makes a row of street trees. 
     
-    num: Number of street trees in the row.
-    coor: A tuple with the x- and z- coordinates the center of the row of trees
-          will be located at.
+    row: Dictionary with the coordinates "coor" for the center of the row, the 
+         direction "dir" of the row, which specifies if the trees should be placed 
+         along the x-axis (horisontal) or along the z-axis (vertical), and the 
+         "trees", see cityPlan.streetTreeRows(...).
     shaders: A list of shaders for the tree crowns.
-    dir: String which specifies if the trees should be placed along the x-axis
-         (horisontal) or along the z-axis (vertical).
-    On exit: The specified number of trees has been created using makeStreetTree(...),
-             and placed in a row at the given coordinates. All of the trees are 
-             combined and the resulting object is returned as a tuple with the 
-             object name and node name.
+    library: Object of the class TreeLibrary, or None.
+    On exit: A tree has been created using makeStreetTree(...) for every tree in
+             the row, and placed in a row at the given coordinates. All of the trees
+             are combined and the resulting object is returned as a tuple with the 
+             object name and node name. With a library the trees are instead placed
+             by TreeLibrary.placeStreetTree(...) in a group, which is returned as a
+             list with its name.
     '''
+    coor = row["coor"]
+    num = len(row["trees"])
     start =  -(num - 1)/2.0 * 2.8
-    tree = makeStreetTree(shaders)
-    cmds.xform(tree[0], t = (start, 0, 0), ws = True)
-    for i in range(1,num):
-        tree1 = makeStreetTree(shaders)
-        cmds.xform(tree1[0], t = (start + i * 2.8, 0, 0), ws = True)
-        tree = cmds.polyUnite(tree[0], tree1[0])
+    if library != None:
+        instances = []
+        for i in range(num):
+            instances.extend(library.placeStreetTree(row["trees"][i], start + i * 2.8))
+        group = cmds.group(*instances, n = "streetTrees")
+        cmds.xform(group, pivots = (0, 0, 0))
+        if row["dir"] == "vertical":
+            cmds.rotate(0, 90, 0, group)
+        cmds.xform(group, translation = (coor[0], 0,coor[1]), ws = True)
+        return [group]
+    trees = []
+    for i in range(num):
+        tree = makeStreetTree(row["trees"][i], shaders)
+        cmds.xform(tree[0], t = (start + i * 2.8, 0, 0), ws = True)
+        trees.append(tree)
+    tree = tools.uniteParts(trees)
     cmds.xform(tree[0], centerPivots = True)
-    if dir == "vertical":
+    if row["dir"] == "vertical":
         cmds.rotate(90, y = True)
     cmds.xform(tree[0], translation = (coor[0], 0,coor[1]), ws = True)
     return tree
 
-def placeStreetTrees(house, wxd, treeShaders):
+def placeStreetTrees(house, rows, treeShaders, library = None):
     '''
-    Places trees on empty areas around a cylinder or pipe houses.
+    Places rows of trees on empty areas around a cylinder or pipe houses.
     
     house: Object of the class House by which the trees will be created.
-    wxd: Tuple containing the width and depth of the area the house and
-         the trees will take up. 
+    rows: List with the planned rows of trees, see cityPlan.streetTreeRows(...).
+          It is empty if there is not a lot of empty space on the same block as 
+          the house.
     treeShaders: A list of shaders for the tree crowns.
-    On exit: If there is a lot of empty space on the same block as the house,
-             two rows of trees have been created using makeRowsOfStreetTrees(...)
+    library: Object of the class TreeLibrary, or None, see makeRowOfStreetTrees(...).
+    On exit: The rows of trees have been created using makeRowOfStreetTrees(...)
              and placed outside the house. The trees are parented to the house.
     '''
-    if wxd[0]/wxd[1] >= 1.5: # Check if there is too much empty space on the block.
-        distance = (wxd[0] - wxd[1]) / 2.0 # distance between the house and the street.
-        if distance > wxd[1]:
-            num = int((distance + 1.5) / 2.8)
-            tree1 = makeRowOfStreetTrees(num,((wxd[1] + distance)/ 2.0 + 1,0), treeShaders, "horisontal")
-            tree2 = makeRowOfStreetTrees(num,((-wxd[1] - distance)/ 2.0 - 1,0), treeShaders, "horisontal")
-        else:
-            num = int((wxd[1] + 3)/ 2.8)
-            tree1 = makeRowOfStreetTrees(num,((wxd[1] + distance)/ 2.0 + 1,0), treeShaders, "vertical")
-            tree2 = makeRowOfStreetTrees(num,((-wxd[1] - distance)/ 2.0 - 1,0), treeShaders, "vertical")
-        cmds.parent((tree1[0],tree2[0]), house.name)        
-    if wxd[1]/wxd[0] >= 1.5: # Check if there is too much empty space on the block.
-        distance = (wxd[1] - wxd[0]) / 2.0 # distance between the house and the street.
-        if distance > wxd[0]:
-            num = int((distance + 1.5) / 2.8)
-            tree1 = makeRowOfStreetTrees(num,(0,(wxd[0] + distance)/ 2.0 + 1), treeShaders, "vertical")
-            tree2 = makeRowOfStreetTrees(num,(0, (-wxd[0] - distance)/ 2.0 - 1), treeShaders, "vertical")
-        else:
-            num = int((wxd[0] + 3)/ 2.8)
-            tree1 = makeRowOfStreetTrees(num,(0,(wxd[0] + distance)/ 2.0 + 1), treeShaders, "horisontal")
-            tree2 = makeRowOfStreetTrees(num,(0, (-wxd[0] - distance)/ 2.0 - 1), treeShaders, "horisontal")
-        cmds.parent((tree1[0],tree2[0]), house.name)
-        
\ No newline at end of file
+    if len(rows) == 0:
+        return
+    trees = [makeRowOfStreetTrees(row, treeShaders, library)[0] for row in rows]
+    cmds.parent(tuple(trees), house.name)
@@ -0,0 +1,580 @@
+import json
+import os
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc, so the memory is not measured.
+    tracemalloc = None
+
+'''
+List of procedures in the module:
+    class Profiler:
+        A Profiler object measures the phases of building a city.
+
+        def __init__(self, modules):
+            Initializes a Profiler object that has not been started.
+        def start(self):
+            Starts counting the maya commands and nodes.
+        def stop(self):
+            Stops counting the maya commands and nodes.
+        def phase(self, name_, category = "phase", args = None):
+            Gives a context manager that measures a phase.
+        def begin(self, name_, category = "phase", args = None):
+            Starts measuring a phase.
+        def end(self):
+            Finishes measuring the innermost phase.
+        def iterate(self, iterable, name_, category = "plan"):
+            Generator that measures every step of an iterable as a phase.
+        def nodeAdded(self, node, clientData):
+            Counts a node created in maya.
+        def nodeRemoved(self, node, clientData):
+            Counts a node deleted in maya.
+        def report(self):
+            Gives the report of the phases measured so far.
+    class NullProfiler:
+        A NullProfiler object is used when the phases are not measured.
+
+        def phase(self, name_, category = "phase", args = None):
+            Gives a context manager that does nothing.
+        def iterate(self, iterable, name_, category = "plan"):
+            Returns the iterable.
+    class Phase:
+        A Phase object is the context manager of a phase of a Profiler.
+
+        def __init__(self, profiler, name_, category, args):
+            Initializes a Phase object.
+        def __enter__(self):
+            Begins the phase.
+        def __exit__(self, type, value, traceback):
+            Ends the phase.
+    class CountingCommands:
+        A CountingCommands object stands in for maya.cmds and counts the commands.
+
+        def __init__(self, commands, profiler):
+            Initializes a CountingCommands object.
+        def __getattr__(self, name_):
+            Gives a procedure that counts and runs a maya command.
+    class Report:
+        A Report object describes where the time, the commands and the memory went
+        when a city was built.
+
+        def __init__(self, phases):
+            Initializes a Report object.
+        def toDict(self):
+            Converts the report to a dictionary that can be written as JSON.
+        def totals(self):
+            Sums the phases that are not inside other phases.
+        def byName(self):
+            Sums the phases with the same name.
+        def summary(self, top = 5):
+            Describes the report as text.
+        def traceEvents(self):
+            Converts the phases to events of the Chrome trace format.
+        def write(self, path):
+            Writes the report to a JSON file that is also a Chrome trace.
+    def sumPhases(records):
+        Sums the metrics of phases.
+    def formatValue(value):
+        Formats a metric that may not have been measured.
+'''
+
+# The clock the phases are timed with.
+clock = getattr(time, "perf_counter", time.time)
+
+# The metrics of a phase that are summed in the totals and by name.
+METRICS = ("seconds", "commandCount", "nodesCreated", "nodesDeleted", "memory")
+
+class Profiler:
+    '''
+    A Profiler object measures the phases of building a city: the time, the number
+    of every maya command, the nodes created and deleted and, if tracemalloc is
+    tracing, the change in the memory allocated by Python. The phases can be nested
+    and are recorded in the order they start.
+    The commands are counted by replacing the cmds of the modules given with a
+    CountingCommands object between start() and stop(), and the nodes with
+    callbacks of maya.api.OpenMaya.MDGMessage. Nothing is replaced or registered
+    when the phases are not measured, see NullProfiler.
+
+    Attributes:
+        modules: List with the modules that use maya.cmds as cmds.
+        commands: Dictionary from the modules to their own cmds while the profiler
+                  is started, otherwise empty.
+        callbacks: List with the ids of the callbacks while the profiler is started.
+        counts: Dictionary from the name of every maya command to the number of
+                times it has been run.
+        commandCount: The number of maya commands that have been run.
+        nodesCreated: The number of nodes created, or None if maya can not report
+                      them.
+        nodesDeleted: The number of nodes deleted, or None.
+        origin: The time the profiler was initialized.
+        phases: List with a dictionary for every phase, see Report.
+        stack: List with the phases that have begun but not ended, innermost last,
+               each with the counts when it began.
+    '''
+    def __init__(self, modules):
+        '''
+        Initializes a Profiler object that has not been started.
+
+        self: Object that is to be initialized.
+        modules: See Attributes.
+        On exit: A Profiler without phases or counts has been initialized.
+        '''
+        self.modules = modules
+        self.commands = {}
+        self.callbacks = []
+        self.counts = {}
+        self.commandCount = 0
+        self.nodesCreated = None
+        self.nodesDeleted = None
+        self.origin = clock()
+        self.phases = []
+        self.stack = []
+
+    def start(self):
+        '''
+        Starts counting the maya commands and nodes.
+
+        self: Object of the class Profiler.
+        On exit: The cmds of every module has been replaced by a CountingCommands
+                 object, and callbacks that count the nodes created and deleted
+                 have been registered if maya.api.OpenMaya has them.
+        '''
+        for module in self.modules:
+            self.commands[module] = module.cmds
+            module.cmds = CountingCommands(module.cmds, self)
+        try:
+            import maya.api.OpenMaya as om
+            self.callbacks = [om.MDGMessage.addNodeAddedCallback(self.nodeAdded),
+                              om.MDGMessage.addNodeRemovedCallback(self.nodeRemoved)]
+            self.nodesCreated = 0
+            self.nodesDeleted = 0
+        except (ImportError, AttributeError):
+            self.callbacks = []
+
+    def stop(self):
+        '''
+        Stops counting the maya commands and nodes.
+
+        self: Object of the class Profiler.
+        On exit: The modules have their own cmds again and the callbacks have been
+                 removed. The counts are kept.
+        '''
+        for module in self.commands:
+            module.cmds = self.commands[module]
+        self.commands = {}
+        if self.callbacks != []:
+            import maya.api.OpenMaya as om
+            for callback in self.callbacks:
+                om.MMessage.removeCallback(callback)
+            self.callbacks = []
+
+    def phase(self, name_, category = "phase", args = None):
+        '''
+        Gives a context manager that measures a phase.
+
+        self: Object of the class Profiler.
+        name_: The name of the phase, usually the procedure it runs.
+        category: The kind of phase, for example "phase", "plan" or "block".
+        args: Dictionary with values that describe the phase, or None.
+        On exit: A Phase object is returned that calls begin(...) when it is entered
+                 and end() when it is left.
+        '''
+        return Phase(self, name_, category, args)
+
+    def begin(self, name_, category = "phase", args = None):
+        '''
+        Starts measuring a phase.
+
+        self: Object of the class Profiler.
+        name_, category, args: See phase(...).
+        On exit: The phase has been added to the phases, inside the innermost phase
+                 that has not ended, and the counts have been noted.
+        '''
+        memory = None
+        if tracemalloc != None and tracemalloc.is_tracing():
+            memory = tracemalloc.get_traced_memory()[0]
+        record = {"name": name_, "category": category, "args": args or {}, "depth": len(self.stack)}
+        self.phases.append(record)
+        self.stack.append((record, dict(self.counts), self.commandCount, self.nodesCreated, self.nodesDeleted,
+                           memory, clock()))
+
+    def end(self):
+        '''
+        Finishes measuring the innermost phase.
+
+        self: Object of the class Profiler.
+        On exit: The innermost phase that has not ended has been given its start and
+                 length in seconds, its number of maya commands in total and of every
+                 command, the number of nodes created and deleted and the number of
+                 nodes created less those deleted since the profiler was started, or
+                 None if they are not counted, and the change in the memory traced by tracemalloc
+                 in bytes, or None if tracemalloc is not tracing.
+        '''
+        now = clock()
+        record, counts, commandCount, nodesCreated, nodesDeleted, memory, start = self.stack.pop()
+        record["start"] = start - self.origin
+        record["seconds"] = now - start
+        record["commandCount"] = self.commandCount - commandCount
+        record["commands"] = dict([(name_, count - counts.get(name_, 0)) for name_, count in self.counts.items()
+                                   if count != counts.get(name_, 0)])
+        record["nodesCreated"] = None
+        record["nodesDeleted"] = None
+        record["nodes"] = None
+        if nodesCreated != None and self.nodesCreated != None:
+            record["nodesCreated"] = self.nodesCreated - nodesCreated
+            record["nodesDeleted"] = self.nodesDeleted - nodesDeleted
+            record["nodes"] = self.nodesCreated - self.nodesDeleted
+        record["memory"] = None
+        if memory != None and tracemalloc.is_tracing():
+            record["memory"] = tracemalloc.get_traced_memory()[0] - memory
+
+    def iterate(self, iterable, name_, category = "plan"):
+        '''
+        Generator that measures every step of an iterable as a phase.
+
+        self: Object of the class Profiler.
+        iterable: The iterable, for example a generator that plans the blocks.
+        name_: The name of the phases.
+        category: See phase(...).
+        On exit: The items of the iterable have been yielded, and the work done to
+                 get every item, and to find that there were no more, has been
+                 measured as a phase.
+        '''
+        iterator = iter(iterable)
+        while True:
+            self.begin(name_, category)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.end()
+                return
+            except:
+                self.end()
+                raise
+            self.end()
+            yield item
+
+    def nodeAdded(self, node, clientData):
+        '''
+        Counts a node created in maya.
+
+        self: Object of the class Profiler.
+        node: The MObject of the node.
+        clientData: Not used.
+        On exit: The number of nodes created has been increased by one.
+        '''
+        self.nodesCreated = self.nodesCreated + 1
+
+    def nodeRemoved(self, node, clientData):
+        '''
+        Counts a node deleted in maya.
+
+        self: Object of the class Profiler.
+        node: The MObject of the node.
+        clientData: Not used.
+        On exit: The number of nodes deleted has been increased by one.
+        '''
+        self.nodesDeleted = self.nodesDeleted + 1
+
+    def report(self):
+        '''
+        Gives the report of the phases measured so far.
+
+        self: Object of the class Profiler.
+        On exit: A Report object with the phases that have ended is returned.
+        '''
+        return Report([record for record in self.phases if "seconds" in record])
+
+class NullProfiler:
+    '''
+    A NullProfiler object is used when the phases are not measured. It has the
+    procedures of Profiler that mark the phases, and they do as little as possible,
+    so that the phases can be marked in the code without slowing the city down.
+    '''
+    def phase(self, name_, category = "phase", args = None):
+        '''
+        Gives a context manager that does nothing.
+
+        self: Object of the class NullProfiler.
+        name_, category, args: Not used.
+        On exit: NULL_PHASE is returned.
+        '''
+        return NULL_PHASE
+
+    def iterate(self, iterable, name_, category = "plan"):
+        '''
+        Returns the iterable.
+
+        self: Object of the class NullProfiler.
+        iterable: Any iterable.
+        name_, category: Not used.
+        On exit: The iterable is returned as it is.
+        '''
+        return iterable
+
+class Phase:
+    '''
+    A Phase object is the context manager of a phase of a Profiler, made by
+    Profiler.phase(...).
+
+    Attributes:
+        profiler: The Profiler object, or None for NULL_PHASE, which does nothing.
+        name: The name of the phase.
+        category: The category of the phase.
+        args: Dictionary describing the phase, or None.
+    '''
+    def __init__(self, profiler, name_, category, args):
+        '''
+        Initializes a Phase object.
+
+        self: Object that is to be initialized.
+        profiler, name_, category, args: See Attributes.
+        On exit: The Phase object has been initialized.
+        '''
+        self.profiler = profiler
+        self.name = name_
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        '''
+        Begins the phase.
+
+        self: Object of the class Phase.
+        On exit: Unless the phase is NULL_PHASE, the phase has begun in the profiler.
+                 The Phase object is returned.
+        '''
+        if self.profiler != None:
+            self.profiler.begin(self.name, self.category, self.args)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        '''
+        Ends the phase.
+
+        self: Object of the class Phase.
+        type, value, traceback: The exception that left the phase, or None.
+        On exit: Unless the phase is NULL_PHASE, the phase has ended in the profiler.
+                 False is returned, so that exceptions are not caught.
+        '''
+        if self.profiler != None:
+            self.profiler.end()
+        return False
+
+class CountingCommands:
+    '''
+    A CountingCommands object stands in for maya.cmds and counts the commands
+    before running them. The procedures are made the first time a command is used
+    and kept as attributes, so that later uses cost one more call.
+
+    Attributes:
+        commands: The maya.cmds module.
+        profiler: The Profiler object whose counts are increased.
+    '''
+    def __init__(self, commands, profiler):
+        '''
+        Initializes a CountingCommands object.
+
+        self: Object that is to be initialized.
+        commands, profiler: See Attributes.
+        On exit: The CountingCommands object has been initialized.
+        '''
+        self.commands = commands
+        self.profiler = profiler
+
+    def __getattr__(self, name_):
+        '''
+        Gives a procedure that counts and runs a maya command.
+
+        self: Object of the class CountingCommands.
+        name_: The name of the command.
+        On exit: A procedure is returned, and kept as an attribute, that increases
+                 the count of the command and the number of commands of the profiler
+                 and runs the command with its arguments. AttributeError is raised if
+                 maya.cmds has no such command.
+        '''
+        command = getattr(self.commands, name_)
+        profiler = self.profiler
+        def run(*args, **kwargs):
+            profiler.counts[name_] = profiler.counts.get(name_, 0) + 1
+            profiler.commandCount = profiler.commandCount + 1
+            return command(*args, **kwargs)
+        run.__name__ = name_
+        setattr(self, name_, run)
+        return run
+
+class Report:
+    '''
+    A Report object describes where the time, the commands and the memory went
+    when a city was built, phase by phase.
+
+    Attributes:
+        phases: List with a dictionary for every phase, in the order they started,
+                with the "name", "category", "args" and "depth" of the phase, where
+                0 is a phase inside no other phase, the "start" in seconds after the
+                profiler was made, the length in "seconds", the "commandCount", the
+                number of every command in "commands", the "nodesCreated" and
+                "nodesDeleted", the net number of "nodes" created since profiling
+                started at the end of the phase, and the change in the traced "memory" in bytes. Nodes
+                and memory are None when they were not measured. The numbers of an
+                outer phase include those of its inner phases.
+    '''
+    def __init__(self, phases):
+        '''
+        Initializes a Report object.
+
+        self: Object that is to be initialized.
+        phases: See Attributes.
+        On exit: The Report object has been initialized.
+        '''
+        self.phases = phases
+
+    def toDict(self):
+        '''
+        Converts the report to a dictionary that can be written as JSON.
+
+        self: Object of the class Report.
+        On exit: A dictionary is returned with the version of the format, the totals
+                 and the phases.
+        '''
+        return {"version": 1, "totals": self.totals(), "phases": self.phases}
+
+    def totals(self):
+        '''
+        Sums the phases that are not inside other phases.
+
+        self: Object of the class Report.
+        On exit: A dictionary is returned with the sums of the metrics (see METRICS)
+                 of the phases of depth 0, where a metric that was not measured is
+                 None, and the number of every command in "commands".
+        '''
+        return sumPhases([record for record in self.phases if record["depth"] == 0])
+
+    def byName(self):
+        '''
+        Sums the phases with the same name.
+
+        self: Object of the class Report.
+        On exit: A list is returned with a tuple for every name of a phase, in the
+                 order of the first phase with the name, with the name, the depth of
+                 that phase, the number of phases with the name and their sums, see
+                 totals().
+        '''
+        names = []
+        groups = {}
+        for record in self.phases:
+            key = (record["depth"], record["name"])
+            if not key in groups:
+                names.append(key)
+                groups[key] = []
+            groups[key].append(record)
+        return [(name_, depth, len(groups[(depth, name_)]), sumPhases(groups[(depth, name_)]))
+                for depth, name_ in names]
+
+    def summary(self, top = 5):
+        '''
+        Describes the report as text.
+
+        self: Object of the class Report.
+        top: The number of blocks and commands listed.
+        On exit: A string is returned with a line for every name of a phase,
+                 indented by its depth, with the number of phases, the time, the
+                 commands, the nodes created and the memory, followed by the slowest
+                 blocks and the most used commands.
+        '''
+        lines = ["%-34s %6s %9s %9s %8s %10s" % ("phase", "count", "seconds", "commands", "nodes", "memory")]
+        for name_, depth, count, sums in self.byName():
+            lines.append("%-34s %6d %9.3f %9d %8s %10s" % ("  " * depth + name_, count, sums["seconds"],
+                                                          sums["commandCount"], formatValue(sums["nodesCreated"]),
+                                                          formatValue(sums["memory"])))
+        blocks = sorted([record for record in self.phases if record["category"] == "block"],
+                        key = lambda record: record["seconds"], reverse = True)[:top]
+        if blocks != []:
+            lines.append("Slowest blocks:")
+            for record in blocks:
+                lines.append("    block %s (%s): %.3f s, %d commands" % (record["args"].get("index"), record["name"],
+                                                                      record["seconds"], record["commandCount"]))
+        commands = sorted(self.totals()["commands"].items(), key = lambda item: item[1], reverse = True)[:top]
+        if commands != []:
+            lines.append("Most used commands: " + ", ".join(["%s %d" % command for command in commands]))
+        return "\n".join(lines)
+
+    def traceEvents(self):
+        '''
+        Converts the phases to events of the Chrome trace format.
+
+        self: Object of the class Report.
+        On exit: A list is returned with a complete event for every phase, with the
+                 times in microseconds and the metrics as arguments, and a counter
+                 event with the number of nodes at the end of every phase, if the
+                 nodes were counted.
+        '''
+        events = []
+        pid = os.getpid()
+        for record in self.phases:
+            args = dict(record["args"])
+            for metric in METRICS[1:]:
+                if record[metric] != None:
+                    args[metric] = record[metric]
+            events.append({"name": record["name"], "cat": record["category"], "ph": "X", "pid": pid, "tid": 0,
+                           "ts": record["start"] * 1e6, "dur": record["seconds"] * 1e6, "args": args})
+        ends = sorted([record for record in self.phases if record["nodes"] != None],
+                      key = lambda record: record["start"] + record["seconds"])
+        for record in ends:
+            events.append({"name": "nodes", "ph": "C", "pid": pid, "tid": 0,
+                           "ts": (record["start"] + record["seconds"]) * 1e6, "args": {"nodes": record["nodes"]}})
+        return events
+
+    def write(self, path):
+        '''
+        Writes the report to a JSON file that is also a Chrome trace.
+
+        self: Object of the class Report.
+        path: The path of the file.
+        On exit: The file has a JSON object with the events of traceEvents() under
+                 "traceEvents", which chrome://tracing and Perfetto open as a
+                 timeline, and the dictionary of toDict() under "report", which they
+                 ignore.
+        '''
+        output = open(path, "w")
+        try:
+            json.dump({"traceEvents": self.traceEvents(), "displayTimeUnit": "ms", "report": self.toDict()}, output)
+        finally:
+            output.close()
+
+def sumPhases(records):
+    '''
+    Sums the metrics of phases.
+
+    records: List with dictionaries of phases, see Report.
+    On exit: A dictionary is returned with the sum of every metric in METRICS, or
+             None for a metric that some phase did not measure, and the sums of the
+             commands in "commands".
+    '''
+    sums = {"commands": {}}
+    for metric in METRICS:
+        values = [record[metric] for record in records]
+        sums[metric] = None
+        if not None in values:
+            sums[metric] = sum(values)
+    for record in records:
+        for name_, count in record["commands"].items():
+            sums["commands"][name_] = sums["commands"].get(name_, 0) + count
+    return sums
+
+def formatValue(value):
+    '''
+    Formats a metric that may not have been measured.
+
+    value: A number or None.
+    On exit: The number is returned as a string, or "-" for None.
+    '''
+    if value == None:
+        return "-"
+    return str(value)
+
+# The Profiler used when the phases are not measured, and the phase it gives.
+NULL = NullProfiler()
+NULL_PHASE = Phase(None, None, None, None)
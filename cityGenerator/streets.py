@@ -1,154 +1,347 @@
 import random
+from array import array
 
 '''
 List of procedures in the module:
-    class Street:
-        A Street object is a node in a binary tree that forms the street structure
-        of the city.
-        
-        def __init__(self,split, minPoint, maxPoint):
-            Initializes a Street object with the given parameters. 
-        def listAreas(self, minPoint, maxPoint, list = []):
-            Recursive procedure that creates a list of all the blocks formed by 
-            the street structure.
-        def split_(self, minPoint, maxPoint, maxSideLimit, minSideLimit):
-            Procedure that creates a street structure by recursively splitting the city into
+    class StreetTree:
+        A StreetTree object stores the binary tree that forms the street structure
+        of the city in flat arrays.
+
+        def __init__(self, split, minPoint, maxPoint):
+            Initializes a StreetTree object with a root street.
+        def __len__(self):
+            Returns the number of streets in the tree.
+        def addStreet(self, split, minPoint, maxPoint):
+            Appends a street to the arrays of the tree.
+        def streetSplit(self, i):
+            Returns the split tuple of a street.
+        def startPoint(self, i):
+            Returns the start point of a street.
+        def endPoint(self, i):
+            Returns the end point of a street.
+        def sideRectangle(self, i, side):
+            Returns the rectangle on one side of a street.
+        def listLeaves(self):
+            Creates a list of the street and side of every block.
+        def listAreas(self):
+            Creates a list of all the blocks formed by the street structure.
+        def split_(self, maxSideLimit, minSideLimit):
+            Creates the street structure by iteratively splitting the city into
             rectangles.
-        def splitRectangle(self, minPoint, maxPoint, minSideLimit, maxSideLimit):
-            Creates a street that splits a rectangle in two.            
+        def iterLeaves(self, maxSideLimit, minSideLimit):
+            Generator that creates the street structure and yields the street and
+            side of every block as soon as it is finished.
+        def iterAreas(self, maxSideLimit, minSideLimit):
+            Generator that creates the street structure and yields every block as
+            soon as it is finished.
+        def toDict(self):
+            Converts the street structure to a dictionary of lists.
+    def streetTreeFromDict(data):
+        Creates a StreetTree object from a dictionary made by StreetTree.toDict().
+    def pickSplit(minPoint, maxPoint, minSideLimit, maxSideLimit):
+        Picks the direction and coordinate of a street that splits a rectangle in two.
 '''
 
-class Street:
+HORISONTAL = 0
+VERTICAL = 1
+DIRECTIONS = ("horisontal", "vertical")
+SMALLER = 0
+LARGER = 1
+# Names of the arrays holding the streets, see StreetTree.
+ARRAYS = ("direction", "coordinate", "smaller", "larger", "minX", "minZ", "maxX", "maxZ")
+
+class StreetTree:
     '''
-    A Street object is a node in a binary tree that forms the street structure
+    A StreetTree object stores the binary tree that forms the street structure
     of the city. The streets can either be horisontal (parallel with the x-axis)
-    or vertical (parallel with the z-axis). 
-    The root node of the tree splits the entire city in two rectangles. These
+    or vertical (parallel with the z-axis).
+    The root street (index 0) splits the entire city in two rectangles. These
     rectangles may in turn be split by the children of the root. The grandchildren
     may then split their respective rectangles, and so on. The tree is constructed
-    with the method split_(...). 
-    
+    with the method split_(...).
+    Instead of one object per street, every street is a row in a set of flat
+    arrays, and the tree is built and walked with an explicit stack. This keeps
+    the memory use low and avoids the recursion limit for very large cities.
+    The streets are stored in the order they are created, which is the same as
+    a depth first traversal visiting the smaller side before the larger side.
+
     Attributes:
-        smaller: If not None, then it is an object of the class Street. This is the
-                 child of self that represents the street splitting the rectangle
-                 on the more negative side of self. 
-        larger: If not None, then it is an object of the class Street. This is the
-                 child of self that represents the street splitting the rectangle
-                 on the more negative side of self. 
-        split: This is a tuple containing a string with the direction of the street 
-               ("horisontal" or "vertical") and the coordinate where the street splits the
-               rectangle. If the direction is "horisontal" this is the z-coordinate for 
-               the street, and if it is "vertical" it is the x-coordinate.
-        start: Tuple with the coordinates for the start point of the street self.
-        end: Tuple with the coordinates for the end point of the street self.
-    
+        direction: Array with the direction of every street (HORISONTAL or VERTICAL).
+        coordinate: Array with the coordinate where every street splits its
+                    rectangle. If the direction is HORISONTAL this is the z-coordinate
+                    for the street, and if it is VERTICAL it is the x-coordinate.
+        smaller: Array with the index of the street splitting the rectangle on the
+                 more negative side of every street, or -1 if that rectangle is a block.
+        larger: Array with the index of the street splitting the rectangle on the
+                more positive side of every street, or -1 if that rectangle is a block.
+        minX, minZ, maxX, maxZ: Arrays with the bounds of the rectangle every street
+                                is splitting.
     '''
-    def __init__(self,split, minPoint, maxPoint):
+    def __init__(self, split, minPoint, maxPoint):
         '''
-        Initializes a Street object with the given parameters. 
-        
-        self: Object that is to be intialized. 
-        split: See attributes.
-        minPoint: Tuple containing the minimum x- and z- coordinates of the
-                  rectangle self is splitting.
-        maxPoint: Tuple containing the maximum x- and z- coordinates of the
-                  rectangle self is splitting.
-        On exit: The Street object has been initialized with the correct parameters.
-                 Note that both children are initialized as None.              
-        '''
-        self.smaller = None
-        self.larger = None
-        self.split = split 
-        if (self.split[0] == "horisontal"):
-            self.start = (minPoint[0], self.split[1])
-            self.end = (maxPoint[0], self.split[1])
-        else:
-            self.start = (self.split[1], minPoint[1])
-            self.end = (self.split[1], maxPoint[1])               
-
-    def listAreas(self, minPoint, maxPoint, list = []):
-        '''
-        Recursive procedure that creates a list of all the blocks formed by 
-        the street structure.
-    
-        self: An object of the class Street.
+        Initializes a StreetTree object with a root street.
+
+        self: Object that is to be intialized.
+        split: Tuple containing a string with the direction of the root street
+               ("horisontal" or "vertical") and the coordinate where it splits the city.
+        minPoint: Tuple containing the minimum x- and z- coordinates of the city.
+        maxPoint: Tuple containing the maximum x- and z- coordinates of the city.
+        On exit: The StreetTree object has been initialized with the root street as
+                 its only street.
+        '''
+        self.direction = array("b")
+        self.coordinate = array("d")
+        self.smaller = array("i")
+        self.larger = array("i")
+        self.minX = array("d")
+        self.minZ = array("d")
+        self.maxX = array("d")
+        self.maxZ = array("d")
+        self.addStreet(split, minPoint, maxPoint)
+
+    def __len__(self):
+        '''
+        Returns the number of streets in the tree.
+        '''
+        return len(self.direction)
+
+    def addStreet(self, split, minPoint, maxPoint):
+        '''
+        Appends a street to the arrays of the tree.
+
+        self: Object of the class StreetTree.
+        split: Tuple containing the direction string and the coordinate of the street.
         minPoint: Tuple containing the minimum x- and z- coordinates of the
-                  rectangle self is splitting.
+                  rectangle the street is splitting.
         maxPoint: Tuple containing the maximum x- and z- coordinates of the
-                  rectangle self is splitting.
-        list: A list containing all the blocks that have already been listed.
+                  rectangle the street is splitting.
+        On exit: The street has been added without children, and its index is returned.
+        '''
+        self.direction.append(DIRECTIONS.index(split[0]))
+        self.coordinate.append(split[1])
+        self.smaller.append(-1)
+        self.larger.append(-1)
+        self.minX.append(minPoint[0])
+        self.minZ.append(minPoint[1])
+        self.maxX.append(maxPoint[0])
+        self.maxZ.append(maxPoint[1])
+        return len(self.direction) - 1
+
+    def streetSplit(self, i):
+        '''
+        Returns the split tuple of a street.
+
+        self: Object of the class StreetTree.
+        i: Index of the street.
+        On exit: A tuple with the direction string ("horisontal" or "vertical") and
+                 the coordinate of the street is returned.
+        '''
+        return (DIRECTIONS[self.direction[i]], self.coordinate[i])
+
+    def startPoint(self, i):
+        '''
+        Returns the start point of a street.
+
+        self: Object of the class StreetTree.
+        i: Index of the street.
+        On exit: A tuple with the coordinates for the start point of the street
+                 is returned.
+        '''
+        if self.direction[i] == HORISONTAL:
+            return (self.minX[i], self.coordinate[i])
+        return (self.coordinate[i], self.minZ[i])
+
+    def endPoint(self, i):
+        '''
+        Returns the end point of a street.
+
+        self: Object of the class StreetTree.
+        i: Index of the street.
+        On exit: A tuple with the coordinates for the end point of the street
+                 is returned.
+        '''
+        if self.direction[i] == HORISONTAL:
+            return (self.maxX[i], self.coordinate[i])
+        return (self.coordinate[i], self.maxZ[i])
+
+    def sideRectangle(self, i, side):
+        '''
+        Returns the rectangle on one side of a street.
+
+        self: Object of the class StreetTree.
+        i: Index of the street.
+        side: SMALLER for the rectangle on the more negative side of the street,
+              LARGER for the rectangle on the more positive side.
+        On exit: A tuple containing two tuples with the coordinates for the minimum
+                 and the maximum points of the rectangle is returned.
+        '''
+        if side == SMALLER:
+            return ((self.minX[i], self.minZ[i]), self.endPoint(i))
+        return (self.startPoint(i), (self.maxX[i], self.maxZ[i]))
+
+    def listLeaves(self):
+        '''
+        Creates a list of the street and side of every block.
+
+        self: Object of the class StreetTree.
+        On exit: A list is returned with a tuple for every block in the city,
+                 containing the index of the street the block is next to in the
+                 tree and the side of the street (SMALLER or LARGER) the block is
+                 on. The pair identifies the block as long as the street structure
+                 is the same. The blocks are listed in depth first order, smaller
+                 side before larger side.
+        '''
+        leaves = []
+        stack = [(0, LARGER), (0, SMALLER)]
+        while stack:
+            i, side = stack.pop()
+            if side == SMALLER:
+                child = self.smaller[i]
+            else:
+                child = self.larger[i]
+            if child == -1:
+                leaves.append((i, side))
+            else:
+                stack.append((child, LARGER))
+                stack.append((child, SMALLER))
+        return leaves
+
+    def listAreas(self):
+        '''
+        Creates a list of all the blocks formed by the street structure.
+
+        self: Object of the class StreetTree.
         On exit: A list is returned that contains the bounding box coordinates
-                 for every block in the city. Each element in the list is a 
+                 for every block in the city. Each element in the list is a
                  tuple containing two tuples with the coordinates for the minimum
-                 and the maximum points of the block. 
-    '''
-        if (self.smaller == None):
-            list.append((minPoint,self.end))
-        else:
-            self.smaller.listAreas(minPoint, self.end, list)
-        if (self.larger == None):
-            list.append((self.start, maxPoint))
-        else:
-            self.larger.listAreas(self.start, maxPoint, list)
-        return list
-        
-    def split_(self, minPoint, maxPoint, maxSideLimit, minSideLimit):
-        '''
-        Procedure that creates a street structure by recursively splitting the city into
+                 and the maximum points of the block. The blocks are listed in
+                 the same order as listLeaves() lists them.
+        '''
+        return [self.sideRectangle(i, side) for i, side in self.listLeaves()]
+
+    def split_(self, maxSideLimit, minSideLimit):
+        '''
+        Creates the street structure by iteratively splitting the city into
         rectangles.
 
-        self: Object of the class Street.
-        minPoint: Tuple containing the minimum x- and z- coordinates of the
-                  rectangle self is splitting.
-        maxPoint: Tuple containing the maximum x- and z- coordinates of the
-                  rectangle self is splitting.
+        self: Object of the class StreetTree, containing only the root street.
         maxSideLimit: The maximum side length for the final rectangles.
         minSideLimit: The minimum side length for the final rectangles.
-        On exit: A binary tree has been created with the self argument 
-                 in the first procedure call as the root node. This tree 
-                 forms the street structure for the city.
-        '''
-        self.smaller = self.splitRectangle(minPoint, self.end, minSideLimit, maxSideLimit)
-        if self.smaller != None:
-            self.smaller.split_(minPoint, self.end, maxSideLimit, minSideLimit)
-        self.larger = self.splitRectangle(self.start, maxPoint, minSideLimit, maxSideLimit) 
-        if self.larger != None:
-            self.larger.split_(self.start, maxPoint, maxSideLimit, minSideLimit)
-        
-    def splitRectangle(self, minPoint, maxPoint, minSideLimit, maxSideLimit):
-        '''
-        Creates a street that splits a rectangle in two.
-        
-        self: Object of the class Street.
-        minPoint: Tuple containing the minimum x- and z- coordinates of the
-                  rectangle that is to be split by the new street.
-        maxPoint: Tuple containing the maximum x- and z- coordinates of the
-                  rectangle that is to be split by the new street.
+        On exit: Streets have been added until no rectangle has a side longer than
+                 maxSideLimit. The rectangles are split in depth first order, smaller
+                 side before larger side, so the random numbers are drawn in the
+                 same order as a recursive construction would draw them. The
+                 splitting is done by iterLeaves(...), whose blocks are ignored.
+        '''
+        for leaf in self.iterLeaves(maxSideLimit, minSideLimit):
+            pass
+
+    def iterLeaves(self, maxSideLimit, minSideLimit):
+        '''
+        Generator that creates the street structure and yields the street and
+        side of every block as soon as it is finished.
+
+        self: Object of the class StreetTree, containing only the root street.
+        maxSideLimit: The maximum side length for the final rectangles.
+        minSideLimit: The minimum side length for the final rectangles.
+        On exit: Streets have been added as described in split_(...), and
+                 every block has been yielded as a tuple with the index of its street
+                 and its side, in the same order as listLeaves() lists them. A block
+                 is yielded as soon as the rectangle is known not to be split any
+                 further, so only the rectangles still waiting on the stack are kept
+                 in memory. Note that if the caller draws random numbers between the
+                 blocks, the following streets will differ from the ones split_(...)
+                 would have created for the same seed.
+        '''
+        stack = [(0, LARGER), (0, SMALLER)]
+        while stack:
+            i, side = stack.pop()
+            minPoint, maxPoint = self.sideRectangle(i, side)
+            split = pickSplit(minPoint, maxPoint, minSideLimit, maxSideLimit)
+            if split == None:
+                yield (i, side)
+                continue
+            child = self.addStreet(split, minPoint, maxPoint)
+            if side == SMALLER:
+                self.smaller[i] = child
+            else:
+                self.larger[i] = child
+            stack.append((child, LARGER))
+            stack.append((child, SMALLER))
+
+    def iterAreas(self, maxSideLimit, minSideLimit):
+        '''
+        Generator that creates the street structure and yields every block as
+        soon as it is finished.
+
+        self: Object of the class StreetTree, containing only the root street.
         maxSideLimit: The maximum side length for the final rectangles.
         minSideLimit: The minimum side length for the final rectangles.
-        On exit: A new Street object has been initialized to split the given
-                 rectangle. With a probability of 80% the rectangle is split
-                 across its longer side. A side will not be split if it is 
-                 already shorter than the maximum side length.
-        '''
-        width = maxPoint[0] - minPoint[0]
-        depth = maxPoint[1] - minPoint[1]
-        if width <= maxSideLimit and depth <= maxSideLimit: 
-            return None
-        startSplitRange = minPoint[0]
-        endSplitRange = maxPoint[0]
-        dir = "vertical"
-        if (width > maxSideLimit and depth > maxSideLimit):
-            prob = random.random()
-            if (prob > 0.8 and width >= depth) or (prob <= 0.8 and width < depth):  
-                startSplitRange = minPoint[1]
-                endSplitRange = maxPoint[1]
-                dir = "horisontal"            
-        elif (depth > maxSideLimit):
+        On exit: The blocks yielded by iterLeaves(...) have been yielded as tuples
+                 containing two tuples with the coordinates for the minimum and the
+                 maximum points of the block, in the same order as listAreas()
+                 lists them.
+        '''
+        for i, side in self.iterLeaves(maxSideLimit, minSideLimit):
+            yield self.sideRectangle(i, side)
+
+    def toDict(self):
+        '''
+        Converts the street structure to a dictionary of lists.
+
+        self: Object of the class StreetTree.
+        On exit: A dictionary is returned with a list for every array attribute,
+                 which can be written as JSON.
+        '''
+        data = {}
+        for name in ARRAYS:
+            data[name] = getattr(self, name).tolist()
+        return data
+
+def streetTreeFromDict(data):
+    '''
+    Creates a StreetTree object from a dictionary made by StreetTree.toDict().
+
+    data: The dictionary.
+    On exit: A StreetTree object with the streets in the dictionary is returned.
+    '''
+    street = StreetTree(("horisontal", 0), (0, 0), (0, 0))
+    for name in ARRAYS:
+        setattr(street, name, array(getattr(street, name).typecode, data[name]))
+    return street
+
+def pickSplit(minPoint, maxPoint, minSideLimit, maxSideLimit):
+    '''
+    Picks the direction and coordinate of a street that splits a rectangle in two.
+
+    minPoint: Tuple containing the minimum x- and z- coordinates of the
+              rectangle that is to be split by the new street.
+    maxPoint: Tuple containing the maximum x- and z- coordinates of the
+              rectangle that is to be split by the new street.
+    minSideLimit: The minimum side length for the final rectangles.
+    maxSideLimit: The maximum side length for the final rectangles.
+    On exit: A tuple with the direction ("horisontal" or "vertical") and the
+             coordinate of the new street is returned, or None if the rectangle
+             should not be split. With a probability of 80% the rectangle is split
+             across its longer side. A side will not be split if it is already
+             shorter than the maximum side length.
+    '''
+    width = maxPoint[0] - minPoint[0]
+    depth = maxPoint[1] - minPoint[1]
+    if width <= maxSideLimit and depth <= maxSideLimit:
+        return None
+    startSplitRange = minPoint[0]
+    endSplitRange = maxPoint[0]
+    dir = "vertical"
+    if (width > maxSideLimit and depth > maxSideLimit):
+        prob = random.random()
+        if (prob > 0.8 and width >= depth) or (prob <= 0.8 and width < depth):
             startSplitRange = minPoint[1]
             endSplitRange = maxPoint[1]
-            dir = "horisontal"     
-        splitValue = random.uniform(startSplitRange + minSideLimit, endSplitRange - minSideLimit)                          
-        return Street((dir, splitValue), minPoint, maxPoint)
-        
-
+            dir = "horisontal"
+    elif (depth > maxSideLimit):
+        startSplitRange = minPoint[1]
+        endSplitRange = maxPoint[1]
+        dir = "horisontal"
+    splitValue = random.uniform(startSplitRange + minSideLimit, endSplitRange - minSideLimit)
+    return (dir, splitValue)
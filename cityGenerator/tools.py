@@ -1,16 +1,29 @@
 import maya.cmds as cmds
-import random, math
+import maya.api.OpenMaya as om
 
 '''
 List of procedures in the module:
 
     def convertToRgb(colour):
         Converts hue, saturation and brightness of a colour to corresponding RGB value.
-    def getRandomValue(range):
-        Picks a random value between a start point and endpoint, wrapping back to 0 
-        when reaching 1.
     def makeShader(colour, materialName = "material", type = "blinn"):
         Creates a shader of the specified type and colour.
+    def faceRanges(name_, faces):
+        Creates compact component strings for a list of faces.
+    def commitMesh(mesh_, name_, shading = None):
+        Creates a polygonal object from a Mesh object.
+    def uniteParts(parts):
+        Combines polygonal objects into one with a single polyUnite.
+    class ShadingBatch:
+        A ShadingBatch object collects face assignments for many objects, so that
+        every shading group can be assigned with one command.
+
+        def __init__(self):
+            Initializes an empty ShadingBatch object.
+        def add(self, shape, material, faces):
+            Adds faces of a mesh shape that should get a shading group.
+        def commit(self):
+            Assigns all the collected faces to their shading groups.
 '''
 
 def convertToRgb(colour):
@@ -38,26 +51,6 @@ def convertToRgb(colour):
     RGB = (point[0] + colour[2] - chroma, point[1] + colour[2] - chroma, point[2] + colour[2] - chroma)
     return RGB
     
-def getRandomValue(range):
-    '''
-    Picks a random value between a start point and endpoint, wrapping back to 0 
-    when reaching 1.
-    
-    range: A tuple defining the range from which the value will be picked.
-    On exit: A random value between 0 and 1 has been picked so that the
-             following is true: 
-             range[0] <=  range[1] --> range[0] <= value <= range[1]
-             range[1] < range[0] --> (value > range[0] or value < range[1])
-             The random value is returned.
-    '''
-    if range[0] <= range[1]:
-        randomValue = random.uniform(range[0],range[1])
-    else:
-        randomValue = random.uniform(range[0],1 + range[1])
-        if randomValue > 1:
-             randomValue = randomValue - 1
-    return randomValue
-
 def makeShader(colour, materialName = "material", type = "blinn"):
     '''
     Creates a shader of the specified type and colour.
@@ -74,4 +67,123 @@ def makeShader(colour, materialName = "material", type = "blinn"):
     cmds.setAttr(shader + ".color", colour[0], colour[1], colour[2])
     cmds.surfaceShaderList(shader, add=shadingGroup)
     shader = cmds.rename(shader, materialName)
-    return (shader, shadingGroup)
\ No newline at end of file
+    return (shader, shadingGroup)
+
+def faceRanges(name_, faces):
+    '''
+    Creates compact component strings for a list of faces.
+    
+    name_: The name of the polygonal object.
+    faces: A sorted list with face indices.
+    On exit: A list of component strings is returned where every run of 
+             consecutive faces is written as one range, e.g. name_.f[0:5].
+    '''
+    ranges = []
+    i = 0
+    while i < len(faces):
+        j = i
+        while j + 1 < len(faces) and faces[j + 1] == faces[j] + 1:
+            j = j + 1
+        ranges.append(name_ + ".f[" + str(faces[i]) + ":" + str(faces[j]) + "]")
+        i = j + 1
+    return ranges
+
+def commitMesh(mesh_, name_, shading = None):
+    '''
+    Creates a polygonal object from a Mesh object.
+    
+    mesh_: Object of the class mesh.Mesh.
+    name_: The name the polygonal object will be given.
+    shading: Object of the class ShadingBatch, or None.
+    On exit: A polygonal object has been created with a single MFnMesh.create call,
+             edges sharper than 30 degrees have been made hard and every material
+             of the mesh has been assigned to its faces with one sets command. If
+             shading is given, the faces are instead added to it and assigned when
+             shading.commit() is called. The object is returned as a list with the 
+             object name and the shape name.
+    '''
+    p = mesh_.points
+    points = [om.MPoint(p[i], p[i + 1], p[i + 2]) for i in range(0, len(p), 3)]
+    fnMesh = om.MFnMesh()
+    transform = fnMesh.create(points, list(mesh_.faceCounts), list(mesh_.faceConnects))
+    name_ = cmds.rename(om.MFnDagNode(transform).partialPathName(), name_)
+    cmds.polySoftEdge(name_, angle = 30, ch = False)
+    faces = mesh_.facesByMaterial()
+    for i in range(len(faces)):
+        if len(faces[i]) == 0:
+            continue
+        if shading != None:
+            shading.add(fnMesh.object(), mesh_.materials[i], faces[i])
+        else:
+            cmds.sets(faceRanges(name_, faces[i]), edit=True, forceElement= mesh_.materials[i])
+    return [name_, fnMesh.name()]
+
+def uniteParts(parts):
+    '''
+    Combines polygonal objects into one with a single polyUnite.
+
+    parts: List with the polygonal objects, each a list or tuple with the object name
+           first, as returned by the commands that create them.
+    On exit: If there is more than one part, the parts have been replaced by one
+             object with their vertices and faces in the order of the list, each
+             face keeping its shader. This is the object that uniting the parts one
+             at a time in the same order gives, but the combined mesh is copied once
+             instead of once for every part, and no intermediate objects are left.
+             The object is returned as a list with the object name and the node
+             name. A single part is returned unchanged.
+    '''
+    if len(parts) == 1:
+        return parts[0]
+    return cmds.polyUnite(*[part[0] for part in parts])
+
+class ShadingBatch:
+    '''
+    A ShadingBatch object collects the faces that should be assigned to every 
+    shading group, for any number of objects, so that each shading group is 
+    assigned with a single sets command instead of one per object. The shapes are
+    stored as MObjects and their paths are looked up in commit(), so the objects 
+    may be renamed, moved and reparented in between. The faces must not be changed
+    by later operations, and objects that are going to be instanced or combined 
+    with booleans should not be added since those need their shading right away.
+    
+    Attributes:
+        faces: Dictionary from the name of a shading group to a list of tuples, each
+               containing the MObject of a mesh shape and a sorted list of face indices.
+    '''
+    def __init__(self):
+        '''
+        Initializes an empty ShadingBatch object.
+        
+        self: Object that is to be initialized.
+        On exit: A ShadingBatch object without any faces has been initialized.
+        '''
+        self.faces = {}
+
+    def add(self, shape, material, faces):
+        '''
+        Adds faces of a mesh shape that should get a shading group.
+        
+        self: Object of the class ShadingBatch.
+        shape: MObject of the mesh shape.
+        material: Name of the shading group.
+        faces: A sorted list with face indices.
+        On exit: The faces have been added to the list for the shading group.
+        '''
+        if not material in self.faces:
+            self.faces[material] = []
+        self.faces[material].append((shape, faces))
+
+    def commit(self):
+        '''
+        Assigns all the collected faces to their shading groups.
+        
+        self: Object of the class ShadingBatch.
+        On exit: Every shading group has been assigned to all its faces with one sets
+                 command, and the ShadingBatch object is empty again.
+        '''
+        for material in self.faces:
+            ranges = []
+            for shape, faces in self.faces[material]:
+                ranges.extend(faceRanges(om.MDagPath.getAPathTo(shape).fullPathName(), faces))
+            cmds.sets(ranges, edit=True, forceElement= material)
+        self.faces = {}
@@ -1,6 +1,6 @@
 import maya.cmds as cmds
-import random, math
 import tools
+import cityScene
 
 '''
 List of procedures in the module:
@@ -9,9 +9,9 @@ List of procedures in the module:
         Creates shaders for traffic lights and street lights.
     def makeTrafficLight(glow):
         Creates a traffic light.
-    def trafficLights(street,size,daytime):
+    def trafficLights(street,size,daytime,choices):
         Creates traffic lights for the city.
-    def placeTrafficLights(street,trafficLights, size):
+    def placeTrafficLights(street,trafficLights, size, choices):
         Creates instances of traffic lights and places them throughout the city.
     def makeStreetLight():
         Creates a street light.
@@ -103,14 +103,16 @@ def makeTrafficLight(glow):
     cmds.delete(trafficLight[0], ch = True)
     return trafficLight
     
-def trafficLights(street,size,daytime):
+def trafficLights(street,size,daytime,choices):
     '''
     Creates traffic lights for the city.
     
-    street: An object of the class Street, which is the root node of the binary
-            tree that makes up the street structure for the city.
+    street: An object of the class StreetTree, which holds the binary tree that
+            makes up the street structure for the city.
     size: Tuple that contains the x- and z-components for the size of the city.
     daytime: Boolean variable which is true if it is day and false if it is night.
+    choices: List with the types of the traffic lights at the start and the end of 
+             every street, see cityPlan.planTrafficLights(...).
     On exit: Traffic lights polygonal objects of each type ("R", "G", "Y", "RY") have 
              been created using makeTrafficLight(...) and instances placed using 
              placeTrafficLights(...). 
@@ -121,66 +123,30 @@ def trafficLights(street,size,daytime):
     YellowLightGeom = makeTrafficLight("Y")
     GreenLightGeom = makeTrafficLight("G")
     cmds.group(RedLightGeom[0], RedYellowLightGeom[0], YellowLightGeom[0], GreenLightGeom[0], name = "trafficLights")
-    placeTrafficLights(street, [RedLightGeom,RedYellowLightGeom,YellowLightGeom,GreenLightGeom], size)
+    placeTrafficLights(street, [RedLightGeom,RedYellowLightGeom,YellowLightGeom,GreenLightGeom], size, choices)
     cmds.hide(RedLightGeom[0],RedYellowLightGeom[0],YellowLightGeom[0],GreenLightGeom[0])
         
-def placeTrafficLights(street,trafficLights, size):
+def placeTrafficLights(street,trafficLights, size, choices):
     '''
     Creates instances of traffic lights and places them throughout the city.
     
-    street: An object of the class Street.
+    street: An object of the class StreetTree.
     trafficLights: A list containing four traffic light objects of different type.
     size: Tuple that contains the x- and z-components for the size of the city.
+    choices: List with a pair of indices into trafficLights for every street, which 
+             give the traffic lights at the start and at the end of the street.
     On exit: Traffic light instances have been placed at the start point and end point 
-             of the street, except if this is at the edge of the city. The procedure is
-             recursively called in order to place traffic lights for every street in the
-             binary tree that makes up the street structure for the city. 
+             of every street in the tree, except if this is at the edge of the city,
+             as placed by cityScene.trafficLightPlacements(...). The streets are 
+             visited in the order they are stored in the tree, which is the order 
+             they were created in. 
     '''
-    #randomly pick which geometries should be instanced.
-    num1 = random.random()
-    if num1 > 0.6:
-        geom1 = trafficLights[0]
-    elif num1 > 0.2:
-        geom1 = trafficLights[3]
-    elif num1 > 0.1:
-        geom1 = trafficLights[2]
-    else:
-        geom1 = trafficLights[1]
-    num2 = random.random()
-    if num2 > 0.6:
-        geom2 = trafficLights[0]
-    elif num2 > 0.2:
-        geom2 = trafficLights[3]
-    elif num2 > 0.1:
-        geom2 = trafficLights[2]
-    else:
-        geom2 = trafficLights[1]
-    if street.split[0] == "horisontal":
-        if street.start[0] != -size[0]/2.0:            
-            light1 = cmds.instance(geom1[0])
-            light2 = cmds.instance(geom1[0])
-            cmds.xform(light1, rotation = (0,90,0), translation = (street.start[0]+3, 0, street.start[1] + 2.2))
-            cmds.xform(light2, rotation = (0,90,0), translation = (street.start[0]+3, 0, street.start[1] - 2.2))
-        if street.end[0] != size[0]/2.0:
-            light1 = cmds.instance(geom2[0])
-            light2 = cmds.instance(geom2[0])
-            cmds.xform(light1, rotation = (0,-90,0), translation = (street.end[0]-3, 0, street.end[1] + 2.2))
-            cmds.xform(light2, rotation = (0,-90,0), translation = (street.end[0]-3, 0, street.end[1] - 2.2))
-    else:
-        if street.start[1] != -size[1]/2.0:
-            light1 = cmds.instance(geom1[0])
-            light2 = cmds.instance(geom1[0])
-            cmds.xform(light1, translation = (street.start[0] + 2.2, 0, street.start[1] + 3))
-            cmds.xform(light2, translation = (street.start[0] - 2.2, 0, street.start[1] + 3))
-        if street.end[1] != size[1]/2.0:
-            light1 = cmds.instance(geom2[0])
-            light2 = cmds.instance(geom2[0])
-            cmds.xform(light1, rotation = (0,180,0), translation = (street.end[0] + 2.2, 0, street.end[1] - 3))
-            cmds.xform(light2, rotation = (0,180,0), translation = (street.end[0] - 2.2, 0, street.end[1] - 3))
-    if street.smaller != None:
-        placeTrafficLights(street.smaller, trafficLights, size)
-    if street.larger != None:
-        placeTrafficLights(street.larger, trafficLights, size)
+    placements = cityScene.trafficLightPlacements(street, size, choices)
+    for i in range(0, len(placements), 2):
+        light1 = cmds.instance(trafficLights[placements[i][0]][0])
+        light2 = cmds.instance(trafficLights[placements[i + 1][0]][0])
+        for light, (type, x, z, rotation) in ((light1, placements[i]), (light2, placements[i + 1])):
+            cmds.xform(light, rotation = (0,rotation,0), translation = (x, 0, z))
         
 def makeStreetLight():
     '''
@@ -230,23 +196,16 @@ def placeStreetLight(blockList,daytime,lightGeom):
     lightGeom: Tuple containing the object name and node name for a polygonal object,
                in this case a street light.
     On exit: The polygonal object (lightGeom) has been instanced and placed around
-             every block in blockList using placeLight(...). 
+             every block in blockList using placeLight(...), at the positions given
+             by cityScene.streetLightPositions(...). 
     '''
     for i in blockList:
-        widthNumber = int(i.width / 5.0 - 1) #number of objects placed along the width of the block
-        widthDistance = i.width / (widthNumber + 1) #distance between every object
-        depthNumber = int(i.depth / 5.0 - 1) #number of objects placed along the depth of the block
-        depthDistance = i.depth / (depthNumber + 1) #distance between every object
-        for j in range(widthNumber):
-            light1 = cmds.instance(lightGeom[0])
-            light2 = cmds.instance(lightGeom[0])
-            placeLight(light1,(i.center[0] - i.width/2.0 + (j+1) * widthDistance, i.center[1] - i.depth/2.0 + 0.2), daytime)
-            placeLight(light2,(i.center[0] - i.width/2.0 + (j+1) * widthDistance, i.center[1] + i.depth/2.0 - 0.2), daytime)
-        for j in range(depthNumber):
+        positions = cityScene.streetLightPositions(i.center, i.width, i.depth)
+        for j in range(0, len(positions), 2):
             light1 = cmds.instance(lightGeom[0])
             light2 = cmds.instance(lightGeom[0])
-            placeLight(light1, (i.center[0] - i.width/2.0 + 0.2, i.center[1] - i.depth/2.0 + (j+1) * depthDistance), daytime)
-            placeLight(light2, (i.center[0] + i.width/2.0 - 0.2, i.center[1] - i.depth/2.0 + (j+1) * depthDistance), daytime)
+            placeLight(light1, positions[j], daytime)
+            placeLight(light2, positions[j + 1], daytime)
 
 def placeLight(light, xz, daytime):
     '''
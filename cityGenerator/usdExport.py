@@ -0,0 +1,348 @@
+import os, math
+from array import array
+import cityPlan
+import cityScene
+
+'''
+List of procedures in the module:
+    class UsdaLayer:
+        A UsdaLayer object writes a USD text layer, streaming the prims to disk as
+        they are added.
+
+        def __init__(self, path, prims, metadata = None):
+            Creates the layer file and opens the prims the content is nested in.
+        def write(self, text):
+            Adds text inside the innermost open prim.
+        def close(self):
+            Closes the open prims and the file.
+    class PointInstancer:
+        A PointInstancer object collects the copies of a few prototypes that
+        become one PointInstancer prim.
+
+        def __init__(self, name_):
+            Initializes a PointInstancer object without copies.
+        def add(self, prop):
+            Adds a copy of a prototype.
+        def text(self, indent, looks):
+            Describes the PointInstancer prim in USD text.
+    def exportUsda(plan, path, environment, workers = 0):
+        Writes a planned city to a layered USD text scene.
+    def meshText(mesh_, name_, indent, looks, translation = None):
+        Describes a mesh as a Mesh prim in USD text.
+    def materialText(name_, colour, incandescence, indent, looks):
+        Describes a material as a Material prim with a UsdPreviewSurface.
+    def formatTuples(values, size):
+        Formats the values in an array as a USD array of tuples.
+    def indentLines(lines, indent):
+        Joins lines of USD text after indenting them.
+'''
+
+# The scene is split into layers that are combined by the root layer through its
+# subLayers: one layer for the houses of every zone, one for the parks and one for
+# the street furniture and trees, which are PointInstancer prims with their
+# prototypes as children. The root layer holds the materials, the ground and the
+# sun. All the layers define their prims under the prim /City, and the layers are
+# written as the blocks are planned, so the text of the whole city is never in
+# memory. Only the positions, orientations, scales and prototype indices of the
+# copies are kept until the end. See https://openusd.org for the format.
+
+class UsdaLayer:
+    '''
+    A UsdaLayer object writes a USD text layer. The layer is a chain of nested Xform
+    prims, and everything written with write(...) ends up in the innermost of them.
+
+    Attributes:
+        path: The path of the layer file.
+        file: The open layer file.
+        depth: The number of prims that are open.
+    '''
+    def __init__(self, path, prims, metadata = None):
+        '''
+        Creates the layer file and opens the prims the content is nested in.
+
+        self: Object that is to be initialized.
+        path: See Attributes.
+        prims: List with the names of the nested Xform prims, outermost first.
+        metadata: List with lines of layer metadata, for example subLayers, or None.
+        On exit: The file has been created with the header and the metadata of the
+                 layer, and the prims have been opened.
+        '''
+        self.path = path
+        self.file = open(path, "w")
+        self.file.write("#usda 1.0\n(\n")
+        for line in ['defaultPrim = "City"', "metersPerUnit = 1", 'upAxis = "Y"'] + (metadata or []):
+            self.file.write("    %s\n" % line)
+        self.file.write(")\n\n")
+        self.depth = 0
+        for prim in prims:
+            self.write('def Xform "%s"\n{\n' % prim)
+            self.depth = self.depth + 1
+
+    def write(self, text):
+        '''
+        Adds text inside the innermost open prim.
+
+        self: Object of the class UsdaLayer.
+        text: String with whole lines of USD text, indented for the top level.
+        On exit: The lines have been indented to the innermost prim and written.
+        '''
+        self.file.write(indentLines(text.rstrip("\n").split("\n"), "    " * self.depth))
+
+    def close(self):
+        '''
+        Closes the open prims and the file.
+
+        self: Object of the class UsdaLayer.
+        On exit: The closing braces of all the open prims have been written and the
+                 file has been closed.
+        '''
+        while self.depth > 0:
+            self.depth = self.depth - 1
+            self.write("}")
+        self.file.close()
+
+class PointInstancer:
+    '''
+    A PointInstancer object collects the copies of a few prototypes that become one
+    PointInstancer prim. The prototypes are numbered in the order they are first
+    used.
+
+    Attributes:
+        name: The name of the prim.
+        prototypes: List with the names of the prototypes, see cityScene.
+        protoIndices: Array with the index of the prototype of every copy.
+        positions: Array with the x-, y- and z-coordinates of every copy.
+        orientations: Array with the rotation of every copy around the y-axis, in
+                      degrees.
+        scales: Array with the scale of every copy along the x-, y- and z-axis.
+    '''
+    def __init__(self, name_):
+        '''
+        Initializes a PointInstancer object without copies.
+
+        self: Object that is to be initialized.
+        name_: See Attributes.
+        On exit: A PointInstancer object without prototypes and copies has been
+                 initialized.
+        '''
+        self.name = name_
+        self.prototypes = []
+        self.protoIndices = array("i")
+        self.positions = array("f")
+        self.orientations = array("f")
+        self.scales = array("f")
+
+    def add(self, prop):
+        '''
+        Adds a copy of a prototype.
+
+        self: Object of the class PointInstancer.
+        prop: Tuple describing the copy, see cityScene.
+        On exit: The prototype has been added to prototypes if it was not there, and
+                 the copy has been added to the arrays.
+        '''
+        name_, translation, rotation, scale = prop
+        if not name_ in self.prototypes:
+            self.prototypes.append(name_)
+        self.protoIndices.append(self.prototypes.index(name_))
+        self.positions.extend(translation)
+        self.orientations.append(rotation)
+        self.scales.extend(scale)
+
+    def text(self, indent, looks):
+        '''
+        Describes the PointInstancer prim in USD text.
+
+        self: Object of the class PointInstancer.
+        indent: String the lines are indented with.
+        looks: The path of the prim with the materials.
+        On exit: A string is returned with the PointInstancer prim, with the meshes of
+                 the prototypes made by cityScene.prototypeMesh(...) as children. The
+                 orientations are quaternions written as (real, i, j, k).
+        '''
+        orientations = array("f")
+        for angle in self.orientations:
+            half = math.radians(angle) / 2.0
+            orientations.extend((math.cos(half), 0.0, math.sin(half), 0.0))
+        path = "/City/Props/" + self.name
+        lines = ['def PointInstancer "%s"' % self.name, "{",
+                 "    rel prototypes = [%s]" % ", ".join(["<%s/Prototypes/%s>" % (path, name_)
+                                                          for name_ in self.prototypes]),
+                 "    int[] protoIndices = [%s]" % ", ".join([str(i) for i in self.protoIndices]),
+                 "    point3f[] positions = %s" % formatTuples(self.positions, 3),
+                 "    quath[] orientations = %s" % formatTuples(orientations, 4),
+                 "    float3[] scales = %s" % formatTuples(self.scales, 3), "",
+                 '    def Scope "Prototypes"', "    {"]
+        text = indentLines(lines, indent)
+        for name_ in self.prototypes:
+            text = text + meshText(cityScene.prototypeMesh(name_), name_, indent + "        ", looks)
+        return text + indent + "    }\n" + indent + "}\n"
+
+def exportUsda(plan, path, environment, workers = 0):
+    '''
+    Writes a planned city to a layered USD text scene.
+
+    plan: Object of the class cityPlan.CityPlan, either complete or just started by
+          cityPlan.startPlan(...).
+    path: The path of the root layer, ending with .usda. The other layers are
+          written next to it, with the name of the group added to the name of the
+          root layer.
+    environment: Triple with the colour value of the environment, see
+                 cityGenerator.city(...).
+    workers: See cityPlan.iterBlockPlans(...).
+    On exit: The city has been written without maya or the USD library. The houses
+             are Mesh prims grouped by the zone they are in, in one layer for every
+             zone, and the parks are Mesh prims with their fences and fountains in a
+             layer of their own. The zones are numbered from the center of the city
+             outwards, see cityPlan.makeZoneHeights(...). The pavements, street
+             lights, traffic lights, trees and squares of grass are copies in a
+             PointInstancer prim for every group given by cityScene.propGroup(...), in
+             a third layer. The root layer has the materials, the ground and the sun
+             and lists the other layers as sublayers. If the plan was not complete, the blocks have been planned
+             while they were written, and the plan is complete. A list with the
+             paths of all the layers, the root layer first, is returned.
+    '''
+    params = plan.params
+    looks = "/City/Looks"
+    base = os.path.splitext(path)[0]
+    layers = {}
+    instancers = {}
+    zones = [list(heightInt) for heightInt in cityPlan.makeZoneHeights(params["size"], params["houseHeightInt"])]
+    count = 0
+    try:
+        for blockPlan in cityPlan.iterBlockPlans(plan, workers):
+            center, width, depth = cityScene.blockPavement(blockPlan["area"])
+            if blockPlan["type"] == "house":
+                zone = zones.index(list(blockPlan["inputs"]["zone"]))
+                group = "zone%d" % zone
+                prims = ["City", "Houses", "Zone%d" % zone]
+                name_ = "House%d" % count
+            else:
+                group = "parks"
+                prims = ["City", "Parks"]
+                name_ = "Park%d" % count
+            if not group in layers:
+                layers[group] = UsdaLayer(base + "_" + group + ".usda", prims)
+            block = cityScene.blockMesh(blockPlan, params["booleans"], params["recessed"])
+            layers[group].write(meshText(block, name_, "", looks, (center[0], 0, center[1])))
+            count = count + 1
+            for prop in cityScene.blockProps(blockPlan):
+                group = cityScene.propGroup(prop[0])
+                if not group in instancers:
+                    instancers[group] = PointInstancer(group[0].upper() + group[1:])
+                instancers[group].add(prop)
+        instancers["trafficLights"] = PointInstancer("TrafficLights")
+        for prop in cityScene.trafficLightProps(plan.streets, params["size"], plan.trafficLights):
+            instancers["trafficLights"].add(prop)
+        layers["props"] = UsdaLayer(base + "_props.usda", ["City", "Props"])
+        for group in sorted(instancers):
+            layers["props"].file.write(instancers[group].text("    " * layers["props"].depth, looks))
+    finally:
+        for layer in layers.values():
+            layer.close()
+    names = sorted(layers)
+    subLayers = ", ".join(["@./%s@" % os.path.basename(layers[group].path) for group in names])
+    root = UsdaLayer(path, ["City"], ["subLayers = [%s]" % subLayers])
+    try:
+        root.write('def Scope "Looks"\n{')
+        root.depth = root.depth + 1
+        materials = cityScene.materialColours(plan, environment)
+        for name_ in sorted(materials):
+            root.file.write(materialText(name_, materials[name_][0], materials[name_][1], "    " * root.depth, looks))
+        root.depth = root.depth - 1
+        root.write("}")
+        root.write(meshText(cityScene.groundMesh(params["size"]), "Ground", "", looks))
+        intensity = 1.0
+        if not params["daytime"]:
+            intensity = 0.05
+        # The light shines along its negative z-axis, as in maya.
+        root.write('def DistantLight "directionalLight"\n{\n'
+                   '    float inputs:intensity = %g\n'
+                   '    float3 xformOp:rotateXYZ = (%g, %g, 0)\n'
+                   '    double3 xformOp:translate = (0, 50, 0)\n'
+                   '    uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:rotateXYZ"]\n}'
+                   % (intensity, plan.lightRotation[0], plan.lightRotation[1]))
+    finally:
+        root.close()
+    return [path] + [layers[group].path for group in names]
+
+def meshText(mesh_, name_, indent, looks, translation = None):
+    '''
+    Describes a mesh as a Mesh prim in USD text.
+
+    mesh_: Object of the class mesh.Mesh.
+    name_: The name of the prim.
+    indent: String the lines are indented with.
+    looks: The path of the prim with the materials, which are named after the
+           materials of the mesh.
+    translation: Tuple with the translation of the prim, or None.
+    On exit: A string is returned with the Mesh prim, which has flat faces. A mesh
+             with one material is bound to it, otherwise the faces of every
+             material are bound to it through a GeomSubset.
+    '''
+    lines = ['def Mesh "%s" (' % name_, '    prepend apiSchemas = ["MaterialBindingAPI"]', ")", "{",
+             "    int[] faceVertexCounts = [%s]" % ", ".join([str(c) for c in mesh_.faceCounts]),
+             "    int[] faceVertexIndices = [%s]" % ", ".join([str(c) for c in mesh_.faceConnects]),
+             "    point3f[] points = %s" % formatTuples(mesh_.points, 3),
+             '    uniform token subdivisionScheme = "none"']
+    if translation != None:
+        lines.append("    double3 xformOp:translate = (%.7g, %.7g, %.7g)" % tuple(translation))
+        lines.append('    uniform token[] xformOpOrder = ["xformOp:translate"]')
+    faces = mesh_.facesByMaterial()
+    used = [m for m in range(len(faces)) if len(faces[m]) > 0]
+    if len(used) == 1:
+        lines.append("    rel material:binding = <%s/%s>" % (looks, mesh_.materials[used[0]]))
+    else:
+        for m in used:
+            lines.extend(["", '    def GeomSubset "%s" (' % mesh_.materials[m],
+                          '        prepend apiSchemas = ["MaterialBindingAPI"]', "    )", "    {",
+                          '        uniform token elementType = "face"',
+                          '        uniform token familyName = "materialBind"',
+                          "        int[] indices = [%s]" % ", ".join([str(f) for f in faces[m]]),
+                          "        rel material:binding = <%s/%s>" % (looks, mesh_.materials[m]), "    }"])
+    lines.append("}")
+    return indentLines(lines, indent)
+
+def materialText(name_, colour, incandescence, indent, looks):
+    '''
+    Describes a material as a Material prim with a UsdPreviewSurface.
+
+    name_: The name of the material.
+    colour: Triple with the RGB colour of the material.
+    incandescence: Triple with the RGB colour the material glows with.
+    indent: String the lines are indented with.
+    looks: The path of the prim the material is added to.
+    On exit: A string is returned with the Material prim.
+    '''
+    lines = ['def Material "%s"' % name_, "{",
+             "    token outputs:surface.connect = <%s/%s/Surface.outputs:surface>" % (looks, name_), "",
+             '    def Shader "Surface"', "    {",
+             '        uniform token info:id = "UsdPreviewSurface"',
+             "        color3f inputs:diffuseColor = (%g, %g, %g)" % tuple(colour),
+             "        color3f inputs:emissiveColor = (%g, %g, %g)" % tuple(incandescence),
+             "        float inputs:roughness = 0.8",
+             "        token outputs:surface", "    }", "}"]
+    return indentLines(lines, indent)
+
+def formatTuples(values, size):
+    '''
+    Formats the values in an array as a USD array of tuples.
+
+    values: Array with the values of all the tuples after each other.
+    size: The number of values in every tuple.
+    On exit: A string with the tuples in square brackets is returned. The values
+             are written with 7 significant digits.
+    '''
+    format_ = "(" + ", ".join(["%.7g"] * size) + ")"
+    return "[" + ", ".join([format_ % tuple(values[i:i + size]) for i in range(0, len(values), size)]) + "]"
+
+def indentLines(lines, indent):
+    '''
+    Joins lines of USD text after indenting them.
+
+    lines: List with the lines, without line breaks.
+    indent: String the lines are indented with.
+    On exit: A string is returned with every line indented and ended by a line
+             break. Empty lines are not indented.
+    '''
+    return "".join([(indent + line).rstrip() + "\n" for line in lines])
@@ -6,9 +6,15 @@ import cityGenerator.cityGenerator as cityGenerator
 List of procedures in the module:
     def createGUI(): 
         Creates a user interface for the city generator script.
+    def readArguments():
+        Reads the arguments for the city generator from the user interface.
+    def generate(arguments, seed = None):
+        Calls the procedure cityGenerator.city(...) with the given arguments.
     def defaultButtonPush(args):
         Calls the procedure cityGenerator.city(...) with the user specified 
         arguments.
+    def regenerateButtonPush(args):
+        Changes the city with the same name to match the user specified arguments.
     def changeMaxHeight(args):
         Changes the maximum house height if it is smaller than the minimum house height.
     def changeMinHeight(args):
@@ -20,10 +26,12 @@ List of procedures in the module:
         Changes the minimum house width so that it is at least 10 units smaller 
         than the maximum house height.
     def windows(args):
-        Changes the booleans checkbox to be disabled and unchecked when the windows 
-        checkbox is unchecked.
+        Changes the booleans and recessed windows checkboxes to be disabled and 
+        unchecked when the windows checkbox is unchecked.
     def booleans(args):
         Opens a confirm window, to let the user know the risk of enabling booleans.
+    def recessed(args):
+        Unchecks the booleans checkbox when the recessed windows checkbox is checked.
     def nighttime(args):
         Changes the city image and the environment colour to match the daytime/nighttime 
         checkboxes. Also uncheckes the daytime checkbox when nighttime is checked and checkes
@@ -77,7 +85,7 @@ def createGUI():
     cmds.intSliderGrp("maxHeight", field=True, label="Maximum house height", minValue=4, maxValue=40, fieldMinValue=4, fieldMaxValue=40, value=30, cal = [1,"left"],parent = layout2, dc = changeMinHeight)
     cmds.intSliderGrp("minWidth", field=True, label="Minimum house width", minValue=2, maxValue=20, fieldMinValue=2, fieldMaxValue=20, value=5, cal = [1,"left"],parent = layout2, dc = changeMaxWidth)
     cmds.intSliderGrp("maxWidth", field=True, label="Maximum house width", minValue=12, maxValue=30, fieldMinValue=12, fieldMaxValue=30, value=20, cal = [1,"left"],parent = layout2, dc = changeMinWidth)
-    cmds.checkBoxGrp("features", numberOfCheckBoxes=3, label1="Windows", label2 = "Booleans", label3="Deformers", v1=True, v2 = False, v3 = True, cc1 =  windows, cc2 = booleans, cal = [1,"left"],parent = layout2,cw = [1,140])
+    cmds.checkBoxGrp("features", numberOfCheckBoxes=4, label1="Windows", label2 = "Booleans", label3="Deformers", label4 = "Recessed windows", v1=True, v2 = False, v3 = True, v4 = False, cc1 =  windows, cc2 = booleans, cc4 = recessed, cal = [1,"left"],parent = layout2,cw = [1,140])
     cmds.checkBoxGrp("time", numberOfCheckBoxes=3, label1="Daytime", label2="Nighttime", label3 = "All windows glow", v1=True, v2 = False, v3 = False, enable3 = False, cal = [1,"left"], parent = layout2,cw = [1,140], cc1 = daytime, cc2 = nighttime )
     cmds.colorSliderGrp("environment", label="Environment colour", hsv=(204, 0.451, 1), parent = layout2, cal = [1,"left"] )
     layout3 = cmds.columnLayout(parent = layout1)
@@ -103,19 +111,20 @@ def createGUI():
     cmds.canvas("valueCanvas2", hsvValue=(0, 1, 1), width=70, height=15)
     cmds.floatSliderGrp("value2", field=True, label="Value", minValue=0, maxValue=1, fieldMinValue=0, fieldMaxValue=1, value=1,cw3 = [70,70,170], dc = valueChange2, step = 0.01)
     cmds.button(label = "Randomize", command = randomize, parent = layout3)
-    layout4 = cmds.rowLayout(numberOfColumns=2, parent = layout0, cw2 = [690,110])
-    cmds.button(label="Generate City", command = defaultButtonPush, parent = layout4, w = 685, h = 50)
+    layout4 = cmds.rowLayout(numberOfColumns=3, parent = layout0, cw3 = [575,115,110])
+    cmds.button(label="Generate City", command = defaultButtonPush, parent = layout4, w = 570, h = 50)
+    cmds.button(label="Regenerate", command = regenerateButtonPush, parent = layout4, w = 110, h = 50)
     cmds.button(label="Clear Scene", command = clearScene, parent = layout4, w = 110, h = 50)
     cmds.showWindow()
 
-def defaultButtonPush(args):
+def readArguments():
     '''
-    Calls the procedure cityGenerator.city(...) with the user specified 
-    arguments.
+    Reads the arguments for the city generator from the user interface.
     
-    args: Dummy argument needed to satisfy the command interface.
-    On exit: The cityGenerator.city(...) procedure has been called with
-             the arguments specified by the user. 
+    On exit: A tuple is returned with the name, size, house height range, house 
+             width range, windows, booleans, deformers, daytime, glow, environment, 
+             colour range and recessed arguments of cityGenerator.city(...), in the
+             order of cityGenerator.regenerateCity(...).
     '''
     Name_ = cmds.textField("cityName", query = True, text = True)
     if Name_ == "":
@@ -129,6 +138,7 @@ def defaultButtonPush(args):
     windows = cmds.checkBoxGrp("features", query = True, v1 = True)
     booleans = cmds.checkBoxGrp("features", query = True, v2 = True)
     deformers = cmds.checkBoxGrp("features", query = True, v3 = True)
+    recessed = cmds.checkBoxGrp("features", query = True, v4 = True)
     dayTime = cmds.checkBoxGrp("time", query = True, v1=True)
     glow = cmds.checkBoxGrp("time", query = True, v3=True)
     environment = cmds.colorSliderGrp("environment", query = True, rgbValue = True)
@@ -138,8 +148,52 @@ def defaultButtonPush(args):
     colourRangeEnd = (cmds.intSliderGrp("hue2", query = True, value = True),
     cmds.floatSliderGrp("saturation2", query = True, value = True), 
     cmds.floatSliderGrp("value2", query = True, value = True))
-    cityGenerator.city(Name_, (cityWidth,cityDepth),(minHeight,maxHeight),
-    (minWidth,maxWidth), windows, booleans, deformers, dayTime, glow, environment,(colourRangeStart,colourRangeEnd))    
+    return (Name_, (cityWidth,cityDepth), (minHeight,maxHeight), (minWidth,maxWidth),
+            windows, booleans, deformers, dayTime, glow, environment,
+            (colourRangeStart,colourRangeEnd), recessed)
+
+def generate(arguments, seed = None):
+    '''
+    Calls the procedure cityGenerator.city(...) with the given arguments.
+    
+    arguments: Tuple made by readArguments().
+    seed: The seed of the city, or None to pick a new one.
+    On exit: The city has been generated with block streams, so that it can be 
+             changed later by regenerateButtonPush(...).
+    '''
+    if seed == None:
+        seed = random.randint(0, 1000000000)
+    cityGenerator.city(*arguments[:11], recessed = arguments[11], seed = seed,
+                       blockStreams = True)
+
+def defaultButtonPush(args):
+    '''
+    Calls the procedure cityGenerator.city(...) with the user specified 
+    arguments.
+    
+    args: Dummy argument needed to satisfy the command interface.
+    On exit: The cityGenerator.city(...) procedure has been called with
+             the arguments specified by the user and a new seed. 
+    '''
+    generate(readArguments())
+
+def regenerateButtonPush(args):
+    '''
+    Changes the city with the same name to match the user specified arguments.
+    
+    args: Dummy argument needed to satisfy the command interface.
+    On exit: If possible, only the blocks affected by the changed arguments have been
+             rebuilt by cityGenerator.regenerateCity(...). Otherwise the scene has been
+             cleared and the city has been generated again with the same seed.
+    '''
+    arguments = readArguments()
+    if cityGenerator.regenerateCity(*arguments) == None:
+        seed = None
+        build = cityGenerator.builtCities.get(arguments[0])
+        if build != None:
+            seed = build.plan.seed
+        clearScene(args)
+        generate(arguments, seed)
 
 def changeMaxHeight(args):
     '''
@@ -201,18 +255,19 @@ def changeMinWidth(args):
         
 def windows(args):
     '''
-    Changes the booleans checkbox to be disabled and unchecked when the windows 
-    checkbox is unchecked.
+    Changes the booleans and recessed windows checkboxes to be disabled and 
+    unchecked when the windows checkbox is unchecked.
     
     args: Dummy argument needed to satisfy the command interface.
-    On exit: If the windows checkbox is checked the booleans checkbox has been enabled.
-             If it is unchecked, the booleans checkbox has been unchecked and disabled.
+    On exit: If the windows checkbox is checked the booleans and recessed windows 
+             checkboxes have been enabled. If it is unchecked, they have been 
+             unchecked and disabled.
     '''
     windows = cmds.checkBoxGrp("features", query = True, v1 = True)
     if windows == False:
-        cmds.checkBoxGrp("features", edit = True, v2 = False, enable2 = False)
+        cmds.checkBoxGrp("features", edit = True, v2 = False, enable2 = False, v4 = False, enable4 = False)
     else:
-        cmds.checkBoxGrp("features", edit = True, enable2 = True)
+        cmds.checkBoxGrp("features", edit = True, enable2 = True, enable4 = True)
         
 def booleans(args):
     '''
@@ -232,6 +287,20 @@ def booleans(args):
         dismissString="No" )
         if confirm == "No":
             cmds.checkBoxGrp("features", edit = True, v2 = False)
+        else:
+            cmds.checkBoxGrp("features", edit = True, v4 = False)
+
+def recessed(args):
+    '''
+    Unchecks the booleans checkbox when the recessed windows checkbox is checked.
+    
+    args: Dummy argument needed to satisfy the command interface.
+    On exit: If the recessed windows checkbox is checked, the booleans checkbox has
+             been unchecked, since the recessed windows replace the booleans.
+    '''
+    recessed = cmds.checkBoxGrp("features", query = True, v4 = True)
+    if recessed == True:
+        cmds.checkBoxGrp("features", edit = True, v2 = False)
 
 def nighttime(args):
     '''
@@ -407,11 +476,13 @@ def clearScene(arg):
     
     args: Dummy argument needed to satisfy the command interface.
     On exit: All objects and shaders in the scene have been deleted, and the active camera
-             has been changed to the default "persp" camera.
+             has been changed to the default "persp" camera. The cities that were built
+             can no longer be regenerated.
     '''
     cmds.select(all = True)
     cmds.delete()
     cmds.lookThru("persp")
+    cityGenerator.builtCities.clear()
     
 createGUI()
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import the pure modules of the city generator directly, without maya.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cityGenerator"))
@@ -0,0 +1,32 @@
+import random
+
+import blockIndex
+
+def makeAreas():
+    # A 6 by 4 grid of blocks with 2 units of street between them.
+    areas = []
+    for row in range(4):
+        for column in range(6):
+            minPoint = (column * 10.0 - 30, row * 10.0 - 20)
+            areas.append((minPoint, (minPoint[0] + 8, minPoint[1] + 8)))
+    return areas
+
+def test_rectangle_query_matches_checking_every_block():
+    areas = makeAreas()
+    index = blockIndex.BlockIndex(areas)
+    rng = random.Random(3)
+    for i in range(200):
+        x = sorted([rng.uniform(-40, 40), rng.uniform(-40, 40)])
+        z = sorted([rng.uniform(-30, 30), rng.uniform(-30, 30)])
+        rectangle = ((x[0], z[0]), (x[1], z[1]))
+        expected = [j for j, area in enumerate(areas) if blockIndex.rectanglesIntersect(area, rectangle)]
+        assert index.blocksInRectangle(rectangle[0], rectangle[1]) == expected
+
+def test_blocks_added_later_are_found():
+    index = blockIndex.BlockIndex([], 10, ((-30, -20), (30, 20)))
+    for area in makeAreas():
+        index.addBlock(area)
+    assert len(index) == 24
+    assert index.blocksInRectangle((-3, -3), (1, 1)) == [8, 9, 14, 15]
+    assert index.blocksInRectangle((-29, -19), (-29, -19)) == [0]
+    assert index.blocksInRectangle((100, 100), (101, 101)) == []
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+import cityPlan
+
+def makeParams(streaming = False):
+    '''
+    Returns the parameters of a small city with block streams.
+    '''
+    return cityPlan.cityParams((120, 120), (4, 30), (5, 20), True, False, True, True, False,
+                               ((0, 1, 1), (120, 1, 1)), streaming, False, True)
+
+@pytest.fixture(scope = "module")
+def plan():
+    return cityPlan.planCity(makeParams(), 7)
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_plan_is_the_same_for_any_number_of_workers(plan, workers):
+    assert cityPlan.planCity(makeParams(), 7, workers).toDict() == plan.toDict()
+
+def test_streaming_does_not_change_a_plan_with_block_streams(plan):
+    streamed = cityPlan.planCity(makeParams(True), 7).toDict()
+    data = plan.toDict()
+    assert streamed.pop("params")["streaming"]
+    del data["params"]
+    assert streamed == data
+
+def test_json_roundtrip_is_exact(plan, tmp_path):
+    path = str(tmp_path / "plan.json")
+    plan.save(path)
+    # JSON has no tuples, so the plan is compared with its JSON form.
+    assert cityPlan.loadPlan(path).toDict() == json.loads(json.dumps(plan.toDict()))
+
+def test_binary_roundtrip_is_exact(plan, tmp_path):
+    path = str(tmp_path / "plan.bin")
+    plan.save(path)
+    assert cityPlan.loadPlan(path).toDict() == plan.toDict()
+
+def test_other_plan_versions_are_rejected(plan):
+    data = plan.toDict()
+    data["version"] = cityPlan.PLAN_VERSION - 1
+    with pytest.raises(ValueError):
+        cityPlan.planFromDict(data)
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+import frustum
+
+def lookDown(height, fov = 90.0, near = 0.1, far = 1000.0, margin = 0.0):
+    '''
+    Returns a frustum of a camera at a height over the origin that looks straight down.
+    '''
+    # The z-axis of the camera points up, since the camera looks along its negative z-axis.
+    matrix = [1, 0, 0, 0,
+              0, 0, -1, 0,
+              0, 1, 0, 0,
+              0, height, 0, 1]
+    return frustum.Frustum(matrix, fov, fov, near, far, margin)
+
+def lookForward(fov = 90.0, near = 0.1, far = 100.0, margin = 0.0):
+    '''
+    Returns a frustum of a camera at the origin that looks along the negative z-axis.
+    '''
+    matrix = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+    return frustum.Frustum(matrix, fov, fov, near, far, margin)
+
+def test_toCamera_and_toWorld_are_inverse():
+    view = lookDown(50.0)
+    point = (3.0, 7.0, -2.0)
+    assert view.toCamera(point) == pytest.approx((3.0, 2.0, 43.0))
+    assert view.toWorld(view.toCamera(point)) == pytest.approx(point)
+
+@pytest.mark.parametrize("point, seen", [
+    ((0, 0, -10), True),
+    ((0, 0, 10), False),
+    ((0, 0, -0.05), False),
+    ((0, 0, -150), False),
+    ((9, 0, -10), True),
+    ((11, 0, -10), False),
+    ((0, -11, -10), False),
+])
+def test_intersectsBox_checks_every_plane(point, seen):
+    assert lookForward().intersectsBox(point, point) == seen
+
+def test_box_across_a_plane_is_seen():
+    assert lookForward().intersectsBox((5, -1, -11), (15, 1, -9))
+
+def test_margin_moves_the_planes_outwards():
+    point = (11, 0, -10)
+    assert not lookForward().intersectsBox(point, point)
+    assert lookForward(margin = 1.0).intersectsBox(point, point)
+    assert lookForward(margin = 1.0).intersectsBox((0, 0, -100.5), (0, 0, -100.5))
+
+def test_intersectsArea_uses_the_height_of_the_block():
+    area = ((-1, -1), (1, 1))
+    # The camera only sees between 1 and 2 over the ground.
+    view = lookDown(50.0, near = 48.0, far = 49.0)
+    assert not view.intersectsArea(area, 0.5)
+    assert view.intersectsArea(area, 5.0)
+    assert not lookDown(50.0, far = 10.0).intersectsArea(area, 5.0)
+
+def test_groundRectangle_of_a_camera_looking_down():
+    rectangle = lookDown(50.0).groundRectangle(10.0)
+    # The ground is 50 below the camera and the field of view is 90 degrees.
+    assert rectangle[0] == pytest.approx((-50.0, -50.0))
+    assert rectangle[1] == pytest.approx((50.0, 50.0))
+
+def test_groundRectangle_is_None_out_of_reach():
+    assert lookDown(50.0, far = 30.0).groundRectangle(10.0) == None
+
+def test_groundRectangle_contains_every_point_in_view():
+    view = lookForward(fov = 60.0, far = 50.0, margin = 2.0)
+    rectangle = view.groundRectangle(5.0)
+    for x in range(-40, 41, 2):
+        for z in range(-60, 5, 2):
+            for y in (0, 2.5, 5):
+                if view.intersectsBox((x, y, z), (x, y, z)):
+                    assert rectangle[0][0] <= x <= rectangle[1][0]
+                    assert rectangle[0][1] <= z <= rectangle[1][1]
@@ -0,0 +1,42 @@
+import houseCache
+
+def test_lru_evicts_the_least_recently_used_prototype():
+    cache = houseCache.HouseCache(2)
+    assert cache.put("a", "houseA") == []
+    assert cache.put("b", "houseB") == []
+    assert cache.put("c", "houseC") == ["houseA"]
+    assert cache.get("a") == None
+    assert list(cache.prototypes) == ["b", "c"]
+
+def test_lookup_makes_a_prototype_the_most_recently_used():
+    cache = houseCache.HouseCache(2)
+    cache.put("a", "houseA")
+    cache.put("b", "houseB")
+    assert cache.get("a") == "houseA"
+    assert cache.put("c", "houseC") == ["houseB"]
+    assert list(cache.prototypes) == ["a", "c"]
+
+def test_putting_a_key_again_replaces_its_prototype():
+    cache = houseCache.HouseCache(2)
+    cache.put("a", "houseA")
+    cache.put("b", "houseB")
+    assert cache.put("a", "houseA2") == []
+    assert len(cache) == 2
+    assert cache.put("c", "houseC") == ["houseB"]
+
+def test_counts_and_hit_rate():
+    cache = houseCache.HouseCache(1)
+    assert cache.hitRate() == 0.0
+    cache.get("a")
+    cache.put("a", "houseA")
+    cache.get("a")
+    cache.get("a")
+    cache.put("b", "houseB")
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+    assert abs(cache.hitRate() - 2 / 3.0) < 1e-12
+    assert "2 hits, 1 misses" in cache.report()
+
+def test_quantize():
+    assert houseCache.quantize(2.3, 0) == 2.3
+    assert houseCache.quantize(2.3, 0.5) == houseCache.quantize(2.6, 0.5)
+    assert houseCache.quantize(2.3, 0.5) != houseCache.quantize(3.3, 0.5)